@@ -1,8 +1,14 @@
 from django.contrib import admin
 
-from accounts.models import Profile
+from accounts.models import NotificationCounts, Profile
 
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("user",)
+
+
+@admin.register(NotificationCounts)
+class NotificationCountsAdmin(admin.ModelAdmin):
+    list_display = ("user", "updated_at")
+    readonly_fields = ("user", "counts", "updated_at")
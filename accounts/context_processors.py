@@ -1,6 +1,6 @@
 import logging
 
-from django.core.cache import cache
+from accounts import notifications
 
 logger = logging.getLogger(__name__)
 
@@ -21,116 +21,17 @@ def theme_context(request):
 def notification_count(request):
     """
     Add notification count and breakdown to all templates for authenticated users.
-    Results are cached for 60 seconds to reduce database queries.
+
+    Counts are materialized per user (see accounts.notifications), so this is a
+    row lookup and an unread-scene count rather than a recount of every category.
     """
     context = {"notification_count": 0, "notification_breakdown": {}}
 
     if request.user.is_authenticated:
-        cache_key = f"notification_count_{request.user.id}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
         try:
-            profile = request.user.profile
-            breakdown = {}
-            count = 0
-
-            # Count unread scenes
-            unread_scenes = profile.unread_scenes().count()
-            if unread_scenes > 0:
-                breakdown["Unread Scenes"] = unread_scenes
-                count += unread_scenes
-
-            # Count weekly XP requests (for players)
-            weekly_xp = len(profile.get_unfulfilled_weekly_xp_requests())
-            if weekly_xp > 0:
-                breakdown["Weekly XP Requests"] = weekly_xp
-                count += weekly_xp
-
-            # Count XP requests (for STs)
-            if profile.is_st():
-                # XP requests from scenes
-                xp_requests = profile.xp_requests().count()
-                if xp_requests > 0:
-                    breakdown["Scene XP Requests"] = xp_requests
-                    count += xp_requests
-
-                # Count items needing approval
-                chars_to_approve = profile.characters_to_approve().count()
-                if chars_to_approve > 0:
-                    breakdown["Characters to Approve"] = chars_to_approve
-                    count += chars_to_approve
-
-                locs_to_approve = profile.locations_to_approve().count()
-                if locs_to_approve > 0:
-                    breakdown["Locations to Approve"] = locs_to_approve
-                    count += locs_to_approve
-
-                items_to_approve = profile.items_to_approve().count()
-                if items_to_approve > 0:
-                    breakdown["Items to Approve"] = items_to_approve
-                    count += items_to_approve
-
-                rotes_to_approve = len(profile.rotes_to_approve())
-                if rotes_to_approve > 0:
-                    breakdown["Rotes to Approve"] = rotes_to_approve
-                    count += rotes_to_approve
-
-                # Freebies to approve
-                freebies = profile.freebies_to_approve().count()
-                if freebies > 0:
-                    breakdown["Freebies to Approve"] = freebies
-                    count += freebies
-
-                # XP spend requests
-                xp_spend = profile.xp_spend_requests().count()
-                if xp_spend > 0:
-                    breakdown["XP Spend Requests"] = xp_spend
-                    count += xp_spend
-
-                # Count image approvals
-                char_images = profile.character_images_to_approve().count()
-                if char_images > 0:
-                    breakdown["Character Images to Approve"] = char_images
-                    count += char_images
-
-                loc_images = profile.location_images_to_approve().count()
-                if loc_images > 0:
-                    breakdown["Location Images to Approve"] = loc_images
-                    count += loc_images
-
-                item_images = profile.item_images_to_approve().count()
-                if item_images > 0:
-                    breakdown["Item Images to Approve"] = item_images
-                    count += item_images
-
-                # Count scenes needing attention
-                from game.models import Scene
-
-                scenes_attention = Scene.objects.waiting_for_st().count()
-                if scenes_attention > 0:
-                    breakdown["Scenes Needing Attention"] = scenes_attention
-                    count += scenes_attention
-
-                # Count updated journals
-                journals = profile.get_updated_journals().count()
-                if journals > 0:
-                    breakdown["Updated Journals"] = journals
-                    count += journals
-
-                # Count weekly XP approvals (for STs)
-                weekly_xp_approve = len(profile.get_unfulfilled_weekly_xp_requests_to_approve())
-                if weekly_xp_approve > 0:
-                    breakdown["Weekly XP to Approve"] = weekly_xp_approve
-                    count += weekly_xp_approve
-
+            count, breakdown = notifications.get_breakdown(request.user)
             context["notification_count"] = count
             context["notification_breakdown"] = breakdown
-
-            # Cache for 60 seconds
-            cache.set(cache_key, context, 60)
-
         except Exception as e:
             # Log the error for debugging, but return 0 notifications to avoid breaking the page
             logger.warning(
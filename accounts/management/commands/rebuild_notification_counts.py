@@ -0,0 +1,41 @@
+"""
+Management command to rebuild materialized notification counts.
+
+Counts are kept current by signal handlers, but changes made without model
+signals (raw SQL, queryset.update(), loaddata --raw) leave them stale. This
+recomputes every category from scratch.
+
+Usage:
+    python manage.py rebuild_notification_counts               # Every user
+    python manage.py rebuild_notification_counts --user alice  # One user
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import notifications
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's notification badge counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            metavar="USERNAME",
+            help="Only rebuild this user's counts (may be given more than once)",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.select_related("profile").order_by("pk")
+        usernames = options["usernames"]
+        if usernames:
+            users = users.filter(username__in=usernames)
+            missing = set(usernames) - set(users.values_list("username", flat=True))
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+
+        rebuilt = notifications.rebuild(users.iterator())
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt notification counts for {rebuilt} users"))
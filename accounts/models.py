@@ -354,34 +354,11 @@ class Profile(ValidatedSaveMixin, models.Model):
 
         This helps track which weekly XP requests the user still needs to submit.
         """
-        char_list = self.my_characters()
-        char_week_pairs = Week.characters.through.objects.filter(
-            charactermodel_id__in=char_list
-        ).values_list("charactermodel_id", "week_id")
-
-        existing_requests = set(
-            WeeklyXPRequest.objects.filter(
-                character_id__in=[c for (c, w) in char_week_pairs],
-                week_id__in=[w for (c, w) in char_week_pairs],
-            ).values_list("character_id", "week_id")
-        )
-
-        missing_pairs = []
-        for char_id, week_id in char_week_pairs:
-            if (char_id, week_id) not in existing_requests:
-                missing_pairs.append((char_id, week_id))
-
-        # Early return if no missing pairs
-        if not missing_pairs:
+        char_map = {c.pk: c for c in self.my_characters().filter(npc=False)}
+        if not char_map:
             return []
-
-        char_map = {c.pk: c for c in char_list}
-        # Only fetch weeks that are actually needed (not all weeks in the database)
-        week_ids = set(w for (c, w) in missing_pairs)
-        week_map = {w.pk: w for w in Week.objects.filter(pk__in=week_ids)}
-
-        results = [(char_map[c], week_map[w]) for (c, w) in missing_pairs]
-        return [pair for pair in results if not pair[0].npc]
+        rows = WeeklyXPRequest.objects.missing_for(list(char_map))
+        return [(char_map[row.charactermodel_id], row.week) for row in rows]
 
     def get_unfulfilled_weekly_xp_requests_to_approve(self):
         """Get all character/week pairs with unapproved XP requests for storyteller review.
@@ -393,32 +370,25 @@ class Profile(ValidatedSaveMixin, models.Model):
 
         This is used by storytellers to review and approve pending weekly XP requests.
         """
-        # Only fetch characters in chronicles where this user is ST
-        char_list = Character.objects.filter(chronicle__st_relationships__user=self.user)
-
-        char_week_pairs = Week.characters.through.objects.filter(
-            charactermodel_id__in=char_list
-        ).values_list("charactermodel_id", "week_id")
-
-        unapproved_reqs = set(
-            WeeklyXPRequest.objects.filter(
-                approved=False,
-                character_id__in=[c for (c, w) in char_week_pairs],
-                week_id__in=[w for (c, w) in char_week_pairs],
-            ).values_list("character_id", "week_id")
-        )
-
-        result_pairs = list(unapproved_reqs)
+        return [
+            (request.character, request.week)
+            for request in self.weekly_xp_requests_to_approve()
+        ]
 
-        # Early return if no unapproved requests
-        if not result_pairs:
-            return []
+    def weekly_xp_requests_to_approve(self):
+        """Get unapproved weekly XP requests in chronicles where this user is ST.
 
-        char_map = {c.pk: c for c in char_list}
-        # Only fetch weeks that are actually needed (not all weeks in the database)
-        week_ids = set(w for (c, w) in result_pairs)
-        week_map = {w.pk: w for w in Week.objects.filter(pk__in=week_ids)}
-        return [(char_map[c], week_map[w]) for (c, w) in result_pairs]
+        Returns a list of WeeklyXPRequest objects with week and character (as
+        its concrete class) already loaded, so callers need no per-request
+        queries.
+        """
+        return (
+            WeeklyXPRequest.objects.pending()
+            .for_storyteller(self.user)
+            .participated()
+            .order_by("week__end_date", "pk")
+            .resolved()
+        )
 
     def xp_spend_requests(self):
         """Get all characters waiting for XP spend approval.
@@ -427,8 +397,10 @@ class Profile(ValidatedSaveMixin, models.Model):
         awaiting storyteller approval.
 
         UPDATED: Optimized to use a single database query instead of N+1 queries.
+        Each character carries its with_xp_ledger() annotations, so the queue
+        can show pending spend counts and costs without further queries.
         """
-        return Character.objects.filter(xp_spendings__approved="Pending").distinct()
+        return Character.objects.with_xp_ledger().filter(xp_pending_count__gt=0)
 
     def unread_scenes(self):
         """Get scenes that the user has not marked as read.
@@ -439,3 +411,23 @@ class Profile(ValidatedSaveMixin, models.Model):
         return Scene.objects.filter(
             user_read_statuses__user=self.user, user_read_statuses__read=False
         ).distinct()
+
+
+class NotificationCounts(models.Model):
+    """Materialized notification badge counts for one user.
+
+    counts maps category keys from accounts.notifications.CATEGORIES to the
+    number of pending items. Rows are created on first read and kept current
+    by the signal handlers in accounts.signals; see accounts.notifications.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="notification_counts")
+    counts = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Notification Counts"
+        verbose_name_plural = "Notification Counts"
+
+    def __str__(self):
+        return f"Notification counts for {self.user.username}"
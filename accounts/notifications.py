@@ -0,0 +1,228 @@
+"""
+Materialized notification counts.
+
+The notification badge is rendered on every page for logged-in users, so its
+counts are stored per user in a NotificationCounts row rather than recounted
+on each request. Reading the badge is a row lookup plus one count of the
+user's unread scenes, which changes with every post and is cheaper to count
+on read than to keep stored for every participant.
+
+Signal handlers (accounts.signals) call mark_stale() with the categories a
+change can affect and who it affects. The affected users' stale categories
+are recounted once, after the transaction commits, so a request that saves
+many objects refreshes each user's counts once. rebuild_notification_counts
+recomputes everything from scratch.
+"""
+
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+
+@dataclass(frozen=True)
+class Category:
+    label: str
+    count: Callable
+    st_only: bool = True
+    # Live categories are counted from the User on every read and never stored
+    live: bool = False
+
+
+def _count_rotes(profile):
+    from characters.models.mage.rote import Rote
+
+    return Rote.objects.filter(
+        status__in=["Un", "Sub"], chronicle__in=profile.user.chronicle_set.all()
+    ).count()
+
+
+def _count_unread_scenes(user):
+    from game.models import UserSceneReadStatus
+
+    return UserSceneReadStatus.objects.filter(
+        user=user, read=False, scene__isnull=False
+    ).count()
+
+
+def _count_scenes_waiting(profile):
+    from game.models import Scene
+
+    return Scene.objects.waiting_for_st().count()
+
+
+# Badge categories in display order. Keys are what NotificationCounts stores.
+CATEGORIES = {
+    "unread_scenes": Category("Unread Scenes", _count_unread_scenes, st_only=False, live=True),
+    "weekly_xp_requests": Category(
+        "Weekly XP Requests", lambda p: len(p.get_unfulfilled_weekly_xp_requests()), st_only=False
+    ),
+    "scene_xp_requests": Category("Scene XP Requests", lambda p: p.xp_requests().count()),
+    "characters_to_approve": Category(
+        "Characters to Approve", lambda p: p.characters_to_approve().count()
+    ),
+    "locations_to_approve": Category(
+        "Locations to Approve", lambda p: p.locations_to_approve().count()
+    ),
+    "items_to_approve": Category("Items to Approve", lambda p: p.items_to_approve().count()),
+    "rotes_to_approve": Category("Rotes to Approve", _count_rotes),
+    "freebies_to_approve": Category(
+        "Freebies to Approve", lambda p: p.freebies_to_approve().count()
+    ),
+    "xp_spend_requests": Category("XP Spend Requests", lambda p: p.xp_spend_requests().count()),
+    "character_images_to_approve": Category(
+        "Character Images to Approve", lambda p: p.character_images_to_approve().count()
+    ),
+    "location_images_to_approve": Category(
+        "Location Images to Approve", lambda p: p.location_images_to_approve().count()
+    ),
+    "item_images_to_approve": Category(
+        "Item Images to Approve", lambda p: p.item_images_to_approve().count()
+    ),
+    "scenes_needing_attention": Category("Scenes Needing Attention", _count_scenes_waiting),
+    "updated_journals": Category("Updated Journals", lambda p: p.get_updated_journals().count()),
+    "weekly_xp_to_approve": Category(
+        "Weekly XP to Approve", lambda p: len(p.get_unfulfilled_weekly_xp_requests_to_approve())
+    ),
+}
+
+# Who a stale mark applies to, resolved to user ids when the marks are flushed
+USER = "user"
+CHARACTER = "character"
+CHRONICLE = "chronicle"
+STORYTELLERS = "storytellers"
+
+_pending = threading.local()
+
+
+def refresh_counts(user, keys=None):
+    """
+    Recount the given categories (all of them by default) for a user and store them.
+
+    Storyteller-only categories are dropped for users who are not storytellers.
+    Live categories are never stored.
+
+    Returns:
+        NotificationCounts: The updated row.
+    """
+    from accounts.models import NotificationCounts
+
+    profile = user.profile
+    is_st = profile.is_st()
+    keys = CATEGORIES.keys() if keys is None else keys
+    fresh = {
+        key: CATEGORIES[key].count(profile)
+        for key in keys
+        if not CATEGORIES[key].live and (is_st or not CATEGORIES[key].st_only)
+    }
+
+    with transaction.atomic():
+        row, created = NotificationCounts.objects.select_for_update().get_or_create(
+            user=user, defaults={"counts": fresh}
+        )
+        if not created:
+            row.counts.update(fresh)
+            row.counts = {
+                key: n
+                for key, n in row.counts.items()
+                if key in CATEGORIES
+                and not CATEGORIES[key].live
+                and (is_st or not CATEGORIES[key].st_only)
+            }
+            row.save(update_fields=["counts", "updated_at"])
+    return row
+
+
+def get_breakdown(user):
+    """
+    Return (total, {label: count}) for a user's badge, building the row if needed.
+
+    Only non-zero categories are included, in CATEGORIES order.
+    """
+    from accounts.models import NotificationCounts
+
+    counts = NotificationCounts.objects.filter(user=user).values_list("counts", flat=True).first()
+    if counts is None:
+        counts = refresh_counts(user).counts
+    counts = {**counts, **{key: c.count(user) for key, c in CATEGORIES.items() if c.live}}
+
+    breakdown = {
+        category.label: counts[key]
+        for key, category in CATEGORIES.items()
+        if counts.get(key, 0) > 0
+    }
+    return sum(breakdown.values()), breakdown
+
+
+def mark_stale(target, ids, keys):
+    """
+    Schedule a recount of keys for everyone a change affects.
+
+    Args:
+        target: USER, CHARACTER (the owner and the chronicle's storytellers),
+            CHRONICLE (its storytellers) or STORYTELLERS (all of them)
+        ids: User, character or chronicle ids; ignored for STORYTELLERS
+        keys: Category keys to recount, or None for all of them
+    """
+    if not hasattr(_pending, "marks"):
+        _pending.marks = defaultdict(set)
+    keys = frozenset(CATEGORIES) if keys is None else frozenset(keys)
+    ids = [None] if target == STORYTELLERS else [i for i in ids if i is not None]
+    for id_ in ids:
+        _pending.marks[(target, id_)] |= keys
+    if ids:
+        # robust: a failed recount is logged rather than failing the request
+        transaction.on_commit(flush, robust=True)
+
+
+def flush():
+    """Recount everything marked stale. Runs on commit; extra calls are no-ops."""
+    marks = getattr(_pending, "marks", None)
+    if not marks:
+        return
+    _pending.marks = defaultdict(set)
+
+    stale = defaultdict(set)
+    for (target, id_), keys in marks.items():
+        for user_id in _resolve(target, id_):
+            stale[user_id] |= keys
+
+    for user in User.objects.filter(pk__in=stale).select_related("profile"):
+        refresh_counts(user, stale[user.pk])
+
+
+def _resolve(target, id_):
+    from characters.models.core import CharacterModel
+    from game.models import STRelationship
+
+    relationships = STRelationship.objects.exclude(user=None)
+    if target == USER:
+        return [id_]
+    if target == STORYTELLERS:
+        return set(relationships.values_list("user_id", flat=True))
+    if target == CHARACTER:
+        character = CharacterModel.objects.filter(pk=id_).values("owner_id", "chronicle_id").first()
+        if character is None:
+            return []
+        user_ids = set(
+            relationships.filter(chronicle_id=character["chronicle_id"]).values_list(
+                "user_id", flat=True
+            )
+        )
+        if character["owner_id"]:
+            user_ids.add(character["owner_id"])
+        return user_ids
+    return set(relationships.filter(chronicle_id=id_).values_list("user_id", flat=True))
+
+
+def rebuild(users=None):
+    """Recompute every category for the given users (default: all). Returns the count."""
+    users = User.objects.select_related("profile") if users is None else users
+    rebuilt = 0
+    for user in users:
+        refresh_counts(user)
+        rebuilt += 1
+    return rebuilt
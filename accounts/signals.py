@@ -1,7 +1,24 @@
+from collections import defaultdict
+
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from accounts import notifications
+from accounts.notifications import CHARACTER, CHRONICLE, STORYTELLERS, USER
+from characters.models.core.character import CharacterModel
+from characters.models.mage.rote import Rote
+from game.models import (
+    JournalEntry,
+    Scene,
+    STRelationship,
+    Week,
+    WeeklyXPRequest,
+    XPSpendingRequest,
+)
+from items.models.core.item import ItemModel
+from locations.models.core.location import LocationModel
+
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -14,3 +31,117 @@ def create_user_profile(sender, instance, created, **kwargs):
         from accounts.models import Profile
 
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+def create_notification_counts(sender, instance, created, **kwargs):
+    """Start a new user's notification counts at zero.
+
+    A new user owns nothing and storytells nothing yet, so an empty row is
+    accurate and their first page view doesn't have to build it.
+    """
+    if created:
+        from accounts.models import NotificationCounts
+
+        NotificationCounts.objects.get_or_create(user=instance)
+
+
+# Notification counts: each handler marks the categories its model feeds as
+# stale for the users who can see them. Unread scenes are counted live, so read
+# statuses need no handler. See accounts.notifications.
+
+WEEKLY_XP_KEYS = ["weekly_xp_requests", "weekly_xp_to_approve"]
+
+
+@receiver(post_save, sender=Scene)
+@receiver(post_delete, sender=Scene)
+def scene_changed(sender, instance, **kwargs):
+    notifications.mark_stale(CHRONICLE, [instance.chronicle_id], ["scene_xp_requests"])
+    notifications.mark_stale(STORYTELLERS, None, ["scenes_needing_attention"])
+
+
+def _game_object_keys(instance):
+    """(chronicle keys, owner keys) of the queues an object's changes affect."""
+    if isinstance(instance, CharacterModel):
+        return (
+            (
+                "characters_to_approve",
+                "freebies_to_approve",
+                "character_images_to_approve",
+                "weekly_xp_to_approve",
+            ),
+            ("weekly_xp_requests",),
+        )
+    if isinstance(instance, LocationModel):
+        return ("locations_to_approve", "location_images_to_approve"), ()
+    if isinstance(instance, ItemModel):
+        return ("items_to_approve", "item_images_to_approve"), ()
+    if isinstance(instance, Rote):
+        return ("rotes_to_approve",), ()
+    return (), ()
+
+
+def game_objects_changed(objects):
+    """
+    Mark the approval and image queues of several game objects stale.
+
+    Objects are grouped by the keys they affect, so each group costs one
+    mark_stale() call covering all of its chronicles (or owners).
+    """
+    chronicle_ids = defaultdict(set)
+    owner_ids = defaultdict(set)
+    for obj in objects:
+        chronicle_keys, owner_keys = _game_object_keys(obj)
+        if chronicle_keys:
+            chronicle_ids[chronicle_keys].add(obj.chronicle_id)
+        if owner_keys:
+            owner_ids[owner_keys].add(obj.owner_id)
+    for keys, ids in chronicle_ids.items():
+        notifications.mark_stale(CHRONICLE, list(ids), list(keys))
+    for keys, ids in owner_ids.items():
+        notifications.mark_stale(USER, list(ids), list(keys))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def game_object_changed(sender, instance, **kwargs):
+    """Approval and image queues for characters, locations, items and rotes."""
+    game_objects_changed([instance])
+
+
+@receiver(post_save, sender=WeeklyXPRequest)
+@receiver(post_delete, sender=WeeklyXPRequest)
+def weekly_xp_request_changed(sender, instance, **kwargs):
+    notifications.mark_stale(CHARACTER, [instance.character_id], WEEKLY_XP_KEYS)
+
+
+@receiver(m2m_changed, sender=Week.characters.through)
+def week_characters_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        character_ids = [instance.pk]
+    elif action == "pre_clear":
+        character_ids = list(instance.characters.values_list("pk", flat=True))
+    else:
+        character_ids = pk_set
+    notifications.mark_stale(CHARACTER, character_ids, WEEKLY_XP_KEYS)
+
+
+@receiver(post_save, sender=XPSpendingRequest)
+@receiver(post_delete, sender=XPSpendingRequest)
+def xp_spending_request_changed(sender, instance, **kwargs):
+    notifications.mark_stale(STORYTELLERS, None, ["xp_spend_requests"])
+
+
+@receiver(post_save, sender=JournalEntry)
+@receiver(post_delete, sender=JournalEntry)
+def journal_entry_changed(sender, instance, **kwargs):
+    notifications.mark_stale(STORYTELLERS, None, ["updated_journals"])
+
+
+@receiver(post_save, sender=STRelationship)
+@receiver(post_delete, sender=STRelationship)
+def st_relationship_changed(sender, instance, **kwargs):
+    # Changes whether the user sees storyteller categories, and for which chronicles
+    notifications.mark_stale(USER, [instance.user_id], None)
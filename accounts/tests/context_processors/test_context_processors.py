@@ -6,6 +6,7 @@ from django.contrib.auth.models import User
 from django.test import RequestFactory, TestCase
 from django.utils import timezone
 
+from accounts import notifications
 from accounts.context_processors import notification_count, theme_context
 from characters.models.core.human import Human
 from characters.models.mage.rote import Rote
@@ -65,13 +66,18 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         self.location = LocationModel.objects.create(name="Test Location", chronicle=self.chronicle)
 
+    def notification_count(self, request):
+        """Refresh the counts as a commit would (TestCase never commits), then read them."""
+        notifications.flush()
+        return notification_count(request)
+
     def test_unauthenticated_user_gets_zero_notifications(self):
         """Test that unauthenticated users get zero notifications."""
         from django.contrib.auth.models import AnonymousUser
 
         request = self.factory.get("/")
         request.user = AnonymousUser()
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertEqual(context["notification_count"], 0)
         self.assertEqual(context["notification_breakdown"], {})
 
@@ -79,7 +85,7 @@ class TestNotificationCountContextProcessor(TestCase):
         """Test authenticated user with no pending items."""
         request = self.factory.get("/")
         request.user = self.user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertEqual(context["notification_count"], 0)
 
     def test_unread_scenes_counted(self):
@@ -90,7 +96,7 @@ class TestNotificationCountContextProcessor(TestCase):
         UserSceneReadStatus.objects.create(user=self.user, scene=scene, read=False)
         request = self.factory.get("/")
         request.user = self.user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertEqual(context["notification_count"], 1)
         self.assertIn("Unread Scenes", context["notification_breakdown"])
 
@@ -108,7 +114,7 @@ class TestNotificationCountContextProcessor(TestCase):
         # No WeeklyXPRequest exists, so it should be counted as unfulfilled
         request = self.factory.get("/")
         request.user = self.user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertEqual(context["notification_count"], 1)
         self.assertIn("Weekly XP Requests", context["notification_breakdown"])
 
@@ -123,7 +129,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Scene XP Requests", context["notification_breakdown"])
 
     def test_st_sees_characters_to_approve(self):
@@ -137,7 +143,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Characters to Approve", context["notification_breakdown"])
 
     def test_st_sees_locations_to_approve(self):
@@ -147,7 +153,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Locations to Approve", context["notification_breakdown"])
 
     def test_st_sees_items_to_approve(self):
@@ -155,7 +161,7 @@ class TestNotificationCountContextProcessor(TestCase):
         ItemModel.objects.create(name="Pending Item", chronicle=self.chronicle, status="Sub")
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Items to Approve", context["notification_breakdown"])
 
     def test_st_sees_rotes_to_approve(self):
@@ -176,7 +182,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Rotes to Approve", context["notification_breakdown"])
 
     def test_st_sees_freebies_to_approve(self):
@@ -198,7 +204,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Freebies to Approve", context["notification_breakdown"])
 
     def test_st_sees_character_images_to_approve(self):
@@ -218,7 +224,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         # The character has an image, so it should be counted
         self.assertIn("Character Images to Approve", context["notification_breakdown"])
 
@@ -232,7 +238,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Location Images to Approve", context["notification_breakdown"])
 
     def test_st_sees_item_images_to_approve(self):
@@ -245,7 +251,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Item Images to Approve", context["notification_breakdown"])
 
     def test_st_sees_scenes_needing_attention(self):
@@ -258,7 +264,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Scenes Needing Attention", context["notification_breakdown"])
 
     def test_st_sees_updated_journals(self):
@@ -274,7 +280,7 @@ class TestNotificationCountContextProcessor(TestCase):
         JournalEntry.objects.create(journal=journal, st_message="", date=timezone.now())
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Updated Journals", context["notification_breakdown"])
 
     def test_st_sees_weekly_xp_to_approve(self):
@@ -302,7 +308,7 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("Weekly XP to Approve", context["notification_breakdown"])
 
     def test_st_sees_xp_spend_requests(self):
@@ -326,17 +332,21 @@ class TestNotificationCountContextProcessor(TestCase):
         )
         request = self.factory.get("/")
         request.user = self.st_user
-        context = notification_count(request)
+        context = self.notification_count(request)
         self.assertIn("XP Spend Requests", context["notification_breakdown"])
 
     def test_notification_count_handles_exceptions(self):
         """Test that notification_count returns 0 on exception.
 
         We simulate this by creating a user without a profile (which shouldn't
-        happen in normal operation but tests the exception handling).
+        happen in normal operation but tests the exception handling). The
+        stored counts are removed so the profile is needed to rebuild them.
         """
         from unittest.mock import patch
 
+        from accounts.models import NotificationCounts
+
+        NotificationCounts.objects.filter(user=self.user).delete()
         request = self.factory.get("/")
         request.user = self.user
 
@@ -0,0 +1,196 @@
+"""Tests for materialized notification counts."""
+
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts import notifications
+from accounts.models import NotificationCounts
+from characters.models.core.human import Human
+from game.models import (
+    Chronicle,
+    Gameline,
+    Scene,
+    STRelationship,
+    UserSceneReadStatus,
+    Week,
+    XPSpendingRequest,
+)
+from locations.models.core import LocationModel
+
+
+class NotificationCountsTestCase(TestCase):
+    def setUp(self):
+        self.player = User.objects.create_user("player", "player@test.com", "password")
+        self.st = User.objects.create_user("st", "st@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        self.gameline = Gameline.objects.create(name="Test Gameline")
+        STRelationship.objects.create(
+            user=self.st, chronicle=self.chronicle, gameline=self.gameline
+        )
+        self.location = LocationModel.objects.create(name="Bar", chronicle=self.chronicle)
+
+    def breakdown(self, user):
+        return notifications.get_breakdown(User.objects.get(pk=user.pk))[1]
+
+
+class TestGetBreakdown(NotificationCountsTestCase):
+    def test_new_users_start_at_zero(self):
+        self.assertEqual(NotificationCounts.objects.get(user=self.player).counts, {})
+
+    def test_missing_row_built_on_read(self):
+        NotificationCounts.objects.filter(user=self.player).delete()
+        self.assertEqual(notifications.get_breakdown(self.player), (0, {}))
+        self.assertTrue(NotificationCounts.objects.filter(user=self.player).exists())
+
+    def test_read_is_two_queries(self):
+        notifications.refresh_counts(self.st)
+        # The stored row and the live unread-scene count
+        with self.assertNumQueries(2):
+            notifications.get_breakdown(self.st)
+
+    def test_breakdown_in_category_order(self):
+        scene = Scene.objects.create(name="Scene", chronicle=self.chronicle, location=self.location)
+        UserSceneReadStatus.objects.create(user=self.st, scene=scene, read=False)
+        NotificationCounts.objects.filter(user=self.st).update(
+            counts={"updated_journals": 2, "items_to_approve": 0}
+        )
+        total, breakdown = notifications.get_breakdown(self.st)
+        self.assertEqual(total, 3)
+        self.assertEqual(list(breakdown), ["Unread Scenes", "Updated Journals"])
+
+    def test_players_get_no_storyteller_categories(self):
+        row = notifications.refresh_counts(self.player)
+        self.assertEqual(set(row.counts), {"weekly_xp_requests"})
+
+    def test_unread_scenes_never_stored(self):
+        NotificationCounts.objects.filter(user=self.st).update(counts={"unread_scenes": 5})
+        self.assertEqual(notifications.get_breakdown(self.st), (0, {}))
+        row = notifications.refresh_counts(self.st)
+        self.assertNotIn("unread_scenes", row.counts)
+
+
+class TestSignalUpdates(NotificationCountsTestCase):
+    def setUp(self):
+        super().setUp()
+        notifications.rebuild(User.objects.all())
+
+    def test_unread_scene_counted_and_cleared(self):
+        scene = Scene.objects.create(name="Scene", chronicle=self.chronicle, location=self.location)
+        with self.captureOnCommitCallbacks(execute=True):
+            status = UserSceneReadStatus.objects.create(user=self.player, scene=scene, read=False)
+        self.assertEqual(self.breakdown(self.player), {"Unread Scenes": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            status.read = True
+            status.save()
+        self.assertEqual(self.breakdown(self.player), {})
+
+    def test_post_marks_participants_unread(self):
+        scene = Scene.objects.create(name="Scene", chronicle=self.chronicle, location=self.location)
+        author = Human.objects.create(name="Author", owner=self.st, chronicle=self.chronicle)
+        reader = Human.objects.create(name="Reader", owner=self.player, chronicle=self.chronicle)
+        scene.characters.add(author, reader)
+        with self.captureOnCommitCallbacks(execute=True):
+            scene.add_post(author, "", "Hello")
+        self.assertEqual(self.breakdown(self.player), {"Unread Scenes": 1})
+
+    def test_submitted_character_reaches_chronicle_storytellers(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            character = Human.objects.create(
+                name="New", owner=self.player, chronicle=self.chronicle, status="Sub"
+            )
+        self.assertEqual(self.breakdown(self.st)["Characters to Approve"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            character.status = "App"
+            character.save()
+        self.assertNotIn("Characters to Approve", self.breakdown(self.st))
+
+    def test_other_chronicle_storytellers_untouched(self):
+        other = Chronicle.objects.create(name="Other Chronicle")
+        with self.captureOnCommitCallbacks(execute=True):
+            Human.objects.create(name="New", owner=self.player, chronicle=other, status="Sub")
+        self.assertNotIn("Characters to Approve", self.breakdown(self.st))
+
+    def test_week_membership_updates_weekly_xp_requests(self):
+        character = Human.objects.create(
+            name="Weekly", owner=self.player, chronicle=self.chronicle, status="App"
+        )
+        week = Week.objects.create(end_date=date.today())
+        with self.captureOnCommitCallbacks(execute=True):
+            week.characters.add(character)
+        self.assertEqual(self.breakdown(self.player), {"Weekly XP Requests": 1})
+
+    def test_xp_spend_requests_reach_all_storytellers(self):
+        character = Human.objects.create(
+            name="Spender", owner=self.player, chronicle=self.chronicle, status="App"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            XPSpendingRequest.objects.create(
+                character=character,
+                trait_name="Strength",
+                trait_type="attribute",
+                trait_value=3,
+                cost=8,
+                approved="Pending",
+            )
+        self.assertEqual(self.breakdown(self.st)["XP Spend Requests"], 1)
+
+    def test_becoming_storyteller_adds_categories(self):
+        Scene.objects.create(
+            name="Waiting", chronicle=self.chronicle, location=self.location, waiting_for_st=True
+        )
+        self.assertEqual(self.breakdown(self.player), {})
+        with self.captureOnCommitCallbacks(execute=True):
+            STRelationship.objects.create(
+                user=self.player, chronicle=self.chronicle, gameline=self.gameline
+            )
+        self.assertEqual(self.breakdown(self.player)["Scenes Needing Attention"], 1)
+
+    def test_changes_wait_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Human.objects.create(
+                name="New", owner=self.player, chronicle=self.chronicle, status="Sub"
+            )
+            self.assertEqual(self.breakdown(self.st), {})
+        self.assertTrue(callbacks)
+
+    def test_post_refreshes_no_counts(self):
+        scene = Scene.objects.create(name="Scene", chronicle=self.chronicle, location=self.location)
+        author = Human.objects.create(name="Author", owner=self.st, chronicle=self.chronicle)
+        reader = Human.objects.create(name="Reader", owner=self.player, chronicle=self.chronicle)
+        scene.characters.add(author, reader)
+        with (
+            patch("accounts.notifications.refresh_counts") as refresh_counts,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            scene.add_post(author, "", "Hello")
+        refresh_counts.assert_not_called()
+        self.assertEqual(self.breakdown(self.player), {"Unread Scenes": 1})
+
+
+class TestRebuildNotificationCountsCommand(NotificationCountsTestCase):
+    def test_rebuilds_stale_counts(self):
+        NotificationCounts.objects.filter(user=self.player).update(
+            counts={"weekly_xp_requests": 5}
+        )
+        out = StringIO()
+        call_command("rebuild_notification_counts", stdout=out)
+        self.assertIn("Rebuilt notification counts for 2 users", out.getvalue())
+        self.assertEqual(self.breakdown(self.player), {})
+
+    def test_single_user(self):
+        call_command("rebuild_notification_counts", "--user", "st", stdout=StringIO())
+        self.assertEqual(NotificationCounts.objects.get(user=self.player).counts, {})
+        self.assertIn("locations_to_approve", NotificationCounts.objects.get(user=self.st).counts)
+
+    def test_unknown_user(self):
+        from django.core.management.base import CommandError
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_notification_counts", "--user", "nobody", stdout=StringIO())
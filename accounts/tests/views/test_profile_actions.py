@@ -531,3 +531,50 @@ class TestMarkSceneReadView(TestCase):
             UserSceneReadStatus.objects.filter(scene=self.scene, user=self.user).count(),
             1,
         )
+
+
+class TestBulkObjectApprovalView(TestCase):
+    """Test approving several objects in one request."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("player", "p@test.com", "password")
+        self.st_user = User.objects.create_user("stuser", "st@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        self.gameline = Gameline.objects.create(name="Test Gameline")
+        STRelationship.objects.create(
+            user=self.st_user, chronicle=self.chronicle, gameline=self.gameline
+        )
+        self.char = Human.objects.create(
+            name="Char", owner=self.user, chronicle=self.chronicle, status="Sub"
+        )
+        self.item = ItemModel.objects.create(
+            name="Item", owner=self.user, chronicle=self.chronicle, status="Sub"
+        )
+        self.url = reverse("accounts:bulk_object_approval")
+
+    def test_st_can_approve_many(self):
+        self.client.login(username="stuser", password="password")
+        response = self.client.post(
+            self.url, {"items": [f"character:{self.char.pk}", f"item:{self.item.pk}"]}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([r["success"] for r in results], [True, True])
+        self.char.refresh_from_db()
+        self.item.refresh_from_db()
+        self.assertEqual((self.char.status, self.item.status), ("App", "App"))
+
+    def test_non_st_is_refused_per_item(self):
+        self.client.login(username="player", password="password")
+        response = self.client.post(self.url, {"items": [f"character:{self.char.pk}"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["results"][0]["success"])
+        self.char.refresh_from_db()
+        self.assertEqual(self.char.status, "Sub")
+
+    def test_malformed_item_is_rejected(self):
+        self.client.login(username="stuser", password="password")
+        response = self.client.post(self.url, {"items": ["character:abc"]})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {})
+        self.assertEqual(response.status_code, 400)
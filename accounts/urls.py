@@ -17,6 +17,11 @@ urlpatterns = [
         views.MarkSceneReadView.as_view(),
         name="mark_scene_read",
     ),
+    path(
+        "approve/bulk/",
+        views.BulkObjectApprovalView.as_view(),
+        name="bulk_object_approval",
+    ),
     path(
         "approve/<str:object_type>/<int:pk>/",
         views.ObjectApprovalView.as_view(),
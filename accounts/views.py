@@ -3,7 +3,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.views import View
@@ -91,6 +91,30 @@ class ObjectApprovalView(LoginRequiredMixin, View):
         return redirect("accounts:profile", pk=request.user.profile.pk)
 
 
+class BulkObjectApprovalView(LoginRequiredMixin, View):
+    """Approve many characters, locations, items and rotes in one request. ST only.
+
+    POST one or more "items" values of the form "<object_type>:<pk>". Responds
+    with JSON {"results": [...]}, one ApprovalResult per item, so the profile
+    page can update its approval queues without reloading.
+    """
+
+    http_method_names = ["post"]
+
+    def post(self, request):
+        items = []
+        for value in request.POST.getlist("items"):
+            object_type, _, pk = value.partition(":")
+            if not pk.isdigit():
+                return JsonResponse({"error": f"Invalid item: {value}"}, status=400)
+            items.append((object_type, int(pk)))
+        if not items:
+            return JsonResponse({"error": "No items to approve"}, status=400)
+
+        results = ApprovalService.approve_objects(items, user=request.user)
+        return JsonResponse({"results": [result.as_dict() for result in results]})
+
+
 class ImageApprovalView(LoginRequiredMixin, View):
     """Approve a pending image for a character, location, or item. ST only."""
 
@@ -248,12 +272,8 @@ class ProfileView(LoginRequiredMixin, DetailView):
                 for c, w in self.object.get_unfulfilled_weekly_xp_requests()
             ]
         context["weekly_xp_request_forms_to_approve"] = [
-            WeeklyXPRequestForm(
-                character=c,
-                week=w,
-                instance=get_object_or_404(WeeklyXPRequest, character=c, week=w),
-            )
-            for c, w in self.object.get_unfulfilled_weekly_xp_requests_to_approve()
+            WeeklyXPRequestForm(character=r.character, week=r.week, instance=r)
+            for r in self.object.weekly_xp_requests_to_approve()
         ]
         # story_xp_request_forms
         # story_xp_request_forms_to_approve
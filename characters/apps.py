@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class CharactersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "characters"
+
+    def ready(self):
+        from characters.models.core.ability_block import Ability
+        from characters.models.core.attribute_block import Attribute
+        from characters.models.core.background_block import Background
+        from characters.models.mage.effect import Effect
+        from characters.models.mage.sphere import Sphere
+        from characters.trait_schema import build_registry
+        from core.cache import CacheInvalidator
+
+        build_registry()
+        # Read through get_cached_reference_list() and the effect index; edits
+        # made in another process (admin, populate scripts) must retire them
+        CacheInvalidator.track(Ability, Attribute, Background, Effect, Sphere)
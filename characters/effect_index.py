@@ -0,0 +1,131 @@
+"""
+In-memory sphere index of every Effect.
+
+Effects are looked up by their sphere requirements all the time: which
+effects a mage could learn with their Spheres and rote points, which fit a
+Chantry's rank, which use one of a Grimoire's Spheres. EffectIndex keeps the
+nine sphere columns of every Effect in a NumPy matrix so these questions are
+answered with a few vectorized comparisons instead of a nine-column filter.
+
+The matrix is rebuilt lazily when the Effect cache version changes (see
+core.cache.CacheInvalidator), which happens on every Effect save or delete
+in any process.
+
+Usage:
+    from characters.effect_index import effect_index
+
+    pks = effect_index.search(spheres=mage.get_spheres(), max_cost=mage.rote_points)
+    effects = effect_index.queryset(spheres=mage.get_spheres(), max_cost=5)
+    similar = effect_index.nearest(effect.sphere_vector(), k=10, exclude=[effect.pk])
+"""
+
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+
+from characters.models.mage.effect import SPHERES, Effect
+from core.cache import CacheInvalidator
+
+
+def sphere_vector(spheres):
+    """A sphere profile as an int array in SPHERES order; missing spheres count as 0."""
+    if isinstance(spheres, Mapping):
+        spheres = [spheres.get(sphere, 0) or 0 for sphere in SPHERES]
+    return np.asarray(spheres, dtype=np.int16)
+
+
+def _pk_list(pks):
+    return [pk for pk in pks if pk is not None]
+
+
+class EffectIndex:
+    """
+    Sphere matrix of all Effects, one row per Effect.
+
+    search() and nearest() return Effect primary keys; queryset() wraps
+    search() in an Effect queryset for form fields.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._data = None
+
+    def _arrays(self):
+        """(pks, sphere matrix, rote costs), rebuilt if Effects changed since the last load."""
+        version = CacheInvalidator.get_version(Effect)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._data = self._build()
+                    self._version = version
+        return self._data
+
+    def _build(self):
+        rows = list(Effect.objects.order_by("pk").values_list("pk", *SPHERES))
+        data = np.array(rows, dtype=np.int64).reshape(len(rows), len(SPHERES) + 1)
+        spheres = data[:, 1:].astype(np.int16)
+        return data[:, 0], spheres, spheres.sum(axis=1)
+
+    def refresh(self):
+        """Drop the matrix; the next lookup reloads it."""
+        self._version = None
+
+    def __len__(self):
+        return len(self._arrays()[0])
+
+    def search(self, spheres=None, max_cost=None, max_sphere=None, uses=(), exclude=()):
+        """
+        Primary keys of the Effects matching every given constraint.
+
+        Args:
+            spheres: Sphere profile (mapping or SPHERES-ordered sequence);
+                every sphere of the effect must be at or below it
+            max_cost: Highest rote cost (sum of sphere dots)
+            max_sphere: Highest dots in any single sphere
+            uses: Sphere names; the effect must use at least one of them
+            exclude: Effect primary keys to leave out
+
+        Returns:
+            list[int]: Matching primary keys, in ascending order
+        """
+        pks, matrix, costs = self._arrays()
+        exclude = _pk_list(exclude)
+        mask = np.ones(len(pks), dtype=bool)
+        if spheres is not None:
+            mask &= (matrix <= sphere_vector(spheres)).all(axis=1)
+        if max_cost is not None:
+            mask &= costs <= max_cost
+        if max_sphere is not None:
+            mask &= matrix.max(axis=1, initial=0) <= max_sphere
+        if uses:
+            columns = [SPHERES.index(sphere) for sphere in uses]
+            mask &= (matrix[:, columns] > 0).any(axis=1)
+        if exclude:
+            mask &= ~np.isin(pks, exclude)
+        return pks[mask].tolist()
+
+    def nearest(self, spheres, k=10, exclude=()):
+        """
+        Primary keys of the k Effects closest to a sphere profile.
+
+        Distance is the total difference in dots across all nine spheres;
+        ties go to the cheaper effect.
+        """
+        pks, matrix, costs = self._arrays()
+        exclude = _pk_list(exclude)
+        if exclude:
+            keep = ~np.isin(pks, exclude)
+            pks, matrix, costs = pks[keep], matrix[keep], costs[keep]
+        distance = np.abs(matrix - sphere_vector(spheres)).sum(axis=1)
+        order = np.lexsort((pks, costs, distance))[: max(k, 0)]
+        return pks[order].tolist()
+
+    def queryset(self, **kwargs):
+        """Effects matching search(**kwargs), as a queryset in the model's ordering."""
+        return Effect.objects.filter(pk__in=self.search(**kwargs))
+
+
+# Shared per-process index
+effect_index = EffectIndex()
@@ -1,25 +1,16 @@
+from functools import cached_property
+
 from django import forms
 
-from characters.costs import get_meritflaw_xp_cost, get_xp_cost
 from characters.forms.constants import XP_CATEGORY_CHOICES
 from characters.models.core.ability_block import Ability
 from characters.models.core.attribute_block import Attribute
 from characters.models.core.background_block import Background, BackgroundRating
 from characters.models.core.merit_flaw_block import MeritFlaw
+from characters.services.xp_catalog import get_xp_catalog, trait_xp_cost
 from widgets import ChainedChoiceField, ChainedSelectMixin
 
 
-def _calculate_xp_cost(trait_type, current_value):
-    """Calculate XP cost for raising a trait, handling new trait costs."""
-    if current_value == 0:
-        # Check for new trait cost
-        new_key = f"new_{trait_type}"
-        new_cost = get_xp_cost(new_key)
-        if new_cost != 10000:  # Found a new trait cost
-            return new_cost
-    return get_xp_cost(trait_type) * current_value
-
-
 class XPForm(ChainedSelectMixin, forms.Form):
     category = ChainedChoiceField(choices=[])
     example = ChainedChoiceField(parent_field="category", choices_map={}, required=False)
@@ -59,83 +50,40 @@ class XPForm(ChainedSelectMixin, forms.Form):
         # Re-run chain setup after choices configured
         self._setup_chains()
 
+    @cached_property
+    def catalog(self):
+        """Affordable options for the character, loaded once per form."""
+        return get_xp_catalog(self.character)
+
     def _build_example_choices_map(self, category_choices):
         """Build the choices_map for example field based on categories."""
         example_choices_map = {}
-        char = self.character
 
         for cat_value, cat_label in category_choices:
-            if cat_value == "Attribute":
-                examples = [
-                    attr
-                    for attr in Attribute.objects.all()
-                    if getattr(char, attr.property_name) < 5
-                    and _calculate_xp_cost("attribute", getattr(char, attr.property_name))
-                    <= char.xp
-                ]
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in examples]
-            elif cat_value == "Ability":
-                examples = [
-                    ability
-                    for ability in Ability.objects.filter(
-                        property_name__in=char.talents + char.skills + char.knowledges
-                    )
-                    if getattr(char, ability.property_name) < 5
-                    and _calculate_xp_cost("ability", getattr(char, ability.property_name))
-                    <= char.xp
+            if cat_value == "Background":
+                new_bg_choices = [
+                    (f"bg_{x.pk}", f"New: {x}") for x in self.catalog.options("New Background")
                 ]
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in examples]
-            elif cat_value == "Background":
-                # New backgrounds
-                new_bgs = Background.objects.filter(
-                    property_name__in=char.allowed_backgrounds
-                ).order_by("name")
-                new_bg_choices = [(f"bg_{x.pk}", f"New: {x}") for x in new_bgs if char.xp >= 5]
-                # Existing backgrounds that can be increased
-                existing_bgs = char.backgrounds.filter(rating__lt=5)
                 existing_bg_choices = [
-                    (f"br_{x.pk}", f"{x}")
-                    for x in existing_bgs
-                    if _calculate_xp_cost("background", x.rating) <= char.xp
+                    (f"br_{x.pk}", f"{x}") for x in self.catalog.options("Existing Background")
                 ]
                 example_choices_map[cat_value] = new_bg_choices + existing_bg_choices
-            elif cat_value == "MeritFlaw":
-                from characters.utils import get_character_object_type
-
-                chartype = get_character_object_type(char.type)
-                filtered_mfs = MeritFlaw.objects.filter(allowed_types=chartype)
-                affordable_mfs = []
-                for mf in filtered_mfs:
-                    current_rating = char.mf_rating(mf)
-                    ratings = mf.get_ratings()
-                    for rating in ratings:
-                        cost = get_meritflaw_xp_cost(current_rating, rating)
-                        if cost <= char.xp and rating != current_rating:
-                            affordable_mfs.append(mf.id)
-                            break
-                filtered_mfs = filtered_mfs.filter(id__in=affordable_mfs)
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in filtered_mfs]
             else:
-                example_choices_map[cat_value] = []
+                example_choices_map[cat_value] = [
+                    (str(x.pk), str(x)) for x in self.catalog.options(cat_value)
+                ]
 
         return example_choices_map
 
     def _build_value_choices_map(self, example_choices_map):
         """Build the choices_map for value field (MeritFlaw ratings)."""
         value_choices_map = {}
-        char = self.character
 
         if "MeritFlaw" in example_choices_map:
-            for mf_pk, mf_label in example_choices_map["MeritFlaw"]:
-                mf = MeritFlaw.objects.get(pk=mf_pk)
-                current_rating = char.mf_rating(mf)
-                ratings = mf.get_ratings()
-                affordable_ratings = []
-                for rating in ratings:
-                    cost = get_meritflaw_xp_cost(current_rating, rating)
-                    if cost <= char.xp and rating != current_rating:
-                        affordable_ratings.append(rating)
-                value_choices_map[mf_pk] = [(str(r), str(r)) for r in affordable_ratings]
+            for mf in self.catalog.options("MeritFlaw"):
+                value_choices_map[str(mf.pk)] = [
+                    (str(r), str(r)) for r in self.catalog.meritflaw_values(mf)
+                ]
 
         return value_choices_map
 
@@ -146,70 +94,23 @@ class XPForm(ChainedSelectMixin, forms.Form):
             return True
 
     def attribute_valid(self):
-        filtered_attributes = [
-            attribute
-            for attribute in Attribute.objects.all()
-            if getattr(self.character, attribute.property_name) < 5
-        ]
-        filtered_for_xp_cost = [
-            x
-            for x in filtered_attributes
-            if _calculate_xp_cost("attribute", getattr(self.character, x.property_name))
-            <= self.character.xp
-        ]
-        return len(filtered_for_xp_cost) > 0
+        return len(self.catalog.options("Attribute")) > 0
 
     def ability_valid(self):
-        filtered_abilities = [
-            ability
-            for ability in Ability.objects.filter(
-                property_name__in=self.character.talents
-                + self.character.skills
-                + self.character.knowledges
-            )
-            if getattr(self.character, ability.property_name) < 5
-        ]
-        filtered_for_xp_cost = [
-            x
-            for x in filtered_abilities
-            if _calculate_xp_cost("ability", getattr(self.character, x.property_name))
-            <= self.character.xp
-        ]
-        return len(filtered_for_xp_cost) > 0
+        return len(self.catalog.options("Ability")) > 0
 
     def background_valid(self):
         """Check if any background (new or existing) is affordable."""
-        # Check if new background is affordable (minimum 5 XP)
-        if self.character.xp >= get_xp_cost("new_background"):
+        if self.catalog.options("New Background"):
             return True
-        # Check if any existing background can be increased
-        bgs = self.character.backgrounds.filter(rating__lt=5)
-        filtered_for_xp_cost = [
-            x for x in bgs if _calculate_xp_cost("background", x.rating) <= self.character.xp
-        ]
-        return len(filtered_for_xp_cost) > 0
+        return len(self.catalog.options("Existing Background")) > 0
 
     def willpower_valid(self):
-        return _calculate_xp_cost("willpower", self.character.willpower) <= self.character.xp
+        return trait_xp_cost("willpower", self.character.willpower) <= self.character.xp
 
     def mf_valid(self):
         # Check if character has any affordable merit/flaws
-        from characters.utils import get_character_object_type
-
-        chartype = get_character_object_type(self.character.type)
-        filtered_mfs = MeritFlaw.objects.filter(allowed_types=chartype)
-
-        # Check if any merit/flaw has an affordable rating
-        for mf in filtered_mfs:
-            current_rating = self.character.mf_rating(mf)
-            ratings = mf.get_ratings()
-
-            for rating in ratings:
-                cost = get_meritflaw_xp_cost(current_rating, rating)
-                if cost <= self.character.xp and rating != current_rating:
-                    return True
-
-        return False
+        return len(self.catalog.options("MeritFlaw")) > 0
 
     def clean_category(self):
         category = self.cleaned_data.get("category")
@@ -1,6 +1,7 @@
 from django import forms
 from django.db.models import Q
 
+from characters.effect_index import effect_index
 from characters.models.core.ability_block import Ability
 from characters.models.core.attribute_block import Attribute
 from characters.models.mage.effect import Effect
@@ -82,17 +83,12 @@ class RoteCreationForm(ChainedSelectMixin, forms.Form):
         spheres = list(Sphere.objects.all())
 
         rote_filter_dict = {}
-        effect_filter_dict = {}
         for sphere in spheres:
             rote_filter_dict["effect__" + sphere.property_name + "__lte"] = getattr(
                 self.instance, sphere.property_name
             )
-            effect_filter_dict[sphere.property_name + "__lte"] = getattr(
-                self.instance, sphere.property_name
-            )
 
         rote_filter_dict["effect__rote_cost__lte"] = self.instance.rote_points
-        effect_filter_dict["rote_cost__lte"] = self.instance.rote_points
 
         rote_filter_dict["practice__in"] = list(self.instance.practices.all()) + [
             getattr(x, "parent_practice", None)
@@ -123,9 +119,11 @@ class RoteCreationForm(ChainedSelectMixin, forms.Form):
             .filter(practice_filter)
             .exclude(id__in=self.instance.rotes.all())
         )
-        self.fields["effect_options"].queryset = Effect.objects.filter(
-            **effect_filter_dict
-        ).exclude(id__in=effects_known)
+        self.fields["effect_options"].queryset = effect_index.queryset(
+            spheres=self.instance.get_spheres(),
+            max_cost=self.instance.rote_points,
+            exclude=effects_known,
+        )
 
         # Re-run chain setup after choices are configured
         self._setup_chains()
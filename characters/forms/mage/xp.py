@@ -3,30 +3,12 @@ from django import forms
 from characters.costs import get_xp_cost
 from characters.forms.constants import XP_CATEGORY_CHOICES
 from characters.forms.core.xp import XPForm
-from characters.models.mage.focus import Practice, SpecializedPractice, Tenet
-from characters.models.mage.mage import PracticeRating
+from characters.models.mage.focus import Practice, Tenet
 from characters.models.mage.resonance import Resonance
 from characters.models.mage.sphere import Sphere
 from core.widgets import AutocompleteTextInput
 
 
-def _mage_sphere_xp_cost(character, sphere):
-    """Calculate XP cost for raising a sphere."""
-    current = getattr(character, sphere.property_name, 0)
-    if current == 0:
-        return get_xp_cost("new_sphere")
-    trait_type = character.sphere_to_trait_type(sphere.property_name)
-    return get_xp_cost(trait_type) * current
-
-
-def _mage_practice_xp_cost(character, practice):
-    """Calculate XP cost for raising a practice."""
-    current = character.practice_rating(practice)
-    if current == 0:
-        return get_xp_cost("new_practice")
-    return get_xp_cost("practice") * current
-
-
 def _mage_arete_xp_cost(character):
     """Calculate XP cost for raising arete."""
     return get_xp_cost("arete") * character.arete
@@ -101,56 +83,8 @@ class MageXPForm(XPForm):
         # Re-run chain setup
         self._setup_chains()
 
-    def _build_example_choices_map(self, category_choices):
-        """Override to add mage-specific categories."""
-        example_choices_map = super()._build_example_choices_map(category_choices)
-        char = self.character
-
-        for cat_value, cat_label in category_choices:
-            if cat_value == "Sphere":
-                examples = [
-                    sphere
-                    for sphere in Sphere.objects.all()
-                    if getattr(char, sphere.property_name) < char.arete
-                    and _mage_sphere_xp_cost(char, sphere) <= char.xp
-                ]
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in examples]
-            elif cat_value == "Tenet":
-                examples = Tenet.objects.all()
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in examples]
-            elif cat_value == "Remove Tenet":
-                examples = char.other_tenets.all()
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in examples]
-            elif cat_value == "Practice":
-                examples = Practice.objects.exclude(
-                    polymorphic_ctype__model="specializedpractice"
-                ).exclude(polymorphic_ctype__model="corruptedpractice")
-                spec = SpecializedPractice.objects.filter(faction=char.faction)
-                if spec.exists():
-                    examples = examples.exclude(
-                        id__in=[x.parent_practice.id for x in spec]
-                    ) | Practice.objects.filter(id__in=[x.id for x in spec])
-                ids = PracticeRating.objects.filter(mage=char, rating=5).values_list(
-                    "practice__id", flat=True
-                )
-                examples = examples.exclude(pk__in=ids).order_by("name")
-                examples = [x for x in examples if _mage_practice_xp_cost(char, x) <= char.xp]
-                example_choices_map[cat_value] = [(str(x.pk), str(x)) for x in examples]
-
-        return example_choices_map
-
     def spheres_valid(self):
-        filtered_spheres = [
-            sphere
-            for sphere in Sphere.objects.all()
-            if getattr(self.character, sphere.property_name) < self.character.arete
-        ]
-        filtered_for_xp_cost = [
-            x
-            for x in filtered_spheres
-            if _mage_sphere_xp_cost(self.character, x) <= self.character.xp
-        ]
-        return len(filtered_for_xp_cost) > 0
+        return len(self.catalog.options("Sphere")) > 0
 
     def rote_points_valid(self):
         return self.character.xp > 0
@@ -169,26 +103,7 @@ class MageXPForm(XPForm):
         return True
 
     def practice_valid(self):
-        examples = Practice.objects.exclude(polymorphic_ctype__model="specializedpractice").exclude(
-            polymorphic_ctype__model="corruptedpractice"
-        )
-        spec = SpecializedPractice.objects.filter(faction=self.character.faction)
-        if spec.exists():
-            examples = examples.exclude(
-                id__in=[x.parent_practice.id for x in spec]
-            ) | Practice.objects.filter(id__in=[x.id for x in spec])
-
-        ids = PracticeRating.objects.filter(mage=self.character, rating=5).values_list(
-            "practice__id", flat=True
-        )
-
-        filtered_practices = examples.exclude(pk__in=ids).order_by("name")
-        filtered_for_xp_cost = [
-            x
-            for x in filtered_practices
-            if _mage_practice_xp_cost(self.character, x) <= self.character.xp
-        ]
-        return len(filtered_for_xp_cost) > 0
+        return len(self.catalog.options("Practice")) > 0
 
     def arete_valid(self):
         return (
@@ -18,6 +18,11 @@ class BackgroundManager:
     but are managed through the BackgroundRating model. This manager provides
     a clean interface to interact with backgrounds.
 
+    Background totals are loaded for every background in one grouped query
+    and kept for the life of the manager. Writes made through the manager, or
+    by saving a BackgroundRating whose char is this character instance, clear
+    the snapshot; call invalidate() after changing ratings any other way.
+
     Usage:
         character.background_manager.add_background('contacts')
         character.background_manager.total_backgrounds()
@@ -31,6 +36,37 @@ class BackgroundManager:
             character: A character model instance (Human or subclass)
         """
         self.character = character
+        self._totals = None
+
+    def invalidate(self):
+        """Discard the cached background totals so the next read reloads them."""
+        self._totals = None
+
+    def background_totals(self):
+        """
+        Get the summed rating of every background the character has.
+
+        Loaded with a single grouped query on first use and cached until
+        invalidate() is called.
+
+        Returns:
+            dict: {property_name: total_rating} for backgrounds with ratings
+        """
+        if self._totals is None:
+            from django.db.models import Sum
+
+            from characters.models.core.background_block import BackgroundRating
+
+            # order_by() drops the model's bg__name ordering, which would
+            # otherwise be added to the GROUP BY
+            rows = (
+                BackgroundRating.objects.filter(char=self.character)
+                .order_by()
+                .values("bg__property_name")
+                .annotate(total=Sum("rating"))
+            )
+            self._totals = {row["bg__property_name"]: row["total"] or 0 for row in rows}
+        return self._totals
 
     def total_background_rating(self, bg_name):
         """
@@ -45,14 +81,7 @@ class BackgroundManager:
         Returns:
             int: Sum of all ratings for this background type
         """
-        from django.db.models import Sum
-
-        from characters.models.core.background_block import BackgroundRating
-
-        result = BackgroundRating.objects.filter(
-            bg__property_name=bg_name, char=self.character
-        ).aggregate(total=Sum("rating"))
-        return result["total"] or 0
+        return self.background_totals().get(bg_name, 0)
 
     def get_backgrounds(self):
         """
@@ -106,6 +135,7 @@ class BackgroundManager:
             return False
         background.rating += 1
         background.save()
+        self.invalidate()
         return True
 
     def total_backgrounds(self):
@@ -189,6 +219,7 @@ class BackgroundManager:
                 pooled=False,
             )
 
+        self.invalidate()
         self.character.freebies -= cost
         trait = str(trait)
         if form.data["note"]:
@@ -220,6 +251,7 @@ class BackgroundManager:
         value = trait.rating + 1
         trait.rating += 1
         trait.save()
+        self.invalidate()
         self.character.freebies -= cost
         trait = str(trait)
         return trait, value, cost
@@ -263,3 +295,4 @@ class BackgroundManager:
             )
         else:
             BackgroundRating.objects.filter(char=self.character, bg__property_name=bg_name).delete()
+        self.invalidate()
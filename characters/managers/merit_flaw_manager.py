@@ -137,6 +137,19 @@ class MeritFlawManager:
         except MeritFlawRating.DoesNotExist:
             return 0
 
+    def rating_map(self):
+        """
+        Get every merit/flaw rating on this character in a single query.
+
+        Returns:
+            dict: MeritFlaw id -> rating, for merits/flaws the character has
+        """
+        from characters.models.core.merit_flaw_block import MeritFlawRating
+
+        return dict(
+            MeritFlawRating.objects.filter(character=self.character).values_list("mf_id", "rating")
+        )
+
     def has_max_flaws(self):
         """
         Check if character has reached maximum flaw limit.
@@ -42,6 +42,22 @@ class BackgroundRating(BaseBackgroundRating):
             ),
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate_char_totals()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_char_totals()
+        return result
+
+    def _invalidate_char_totals(self):
+        # Only a char already loaded on this rating can hold a cached snapshot
+        if BackgroundRating.char.is_cached(self) and self.char is not None:
+            manager = getattr(self.char, "_background_manager", None)
+            if manager is not None:
+                manager.invalidate()
+
     def display_name(self):
         if self.bg.alternate_name == "":
             return self.bg.name
@@ -1,9 +1,11 @@
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import CheckConstraint, OuterRef, Q, Subquery
+from django.db.models import CheckConstraint, Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone
 
+from core.constants import XPApprovalStatus
 from core.models import Model, ModelManager, ModelQuerySet
 from core.utils import CharacterOrganizationRegistry
 
@@ -53,6 +55,39 @@ class CharacterQuerySet(ModelQuerySet):
             .order_by("chronicle__id", "-first_group_id", "name")
         )
 
+    def with_xp_ledger(self):
+        """
+        Annotate each character's XP ledger, computed in the same query.
+
+        Annotations:
+            xp_approved / xp_approved_count: total cost and number of approved spends
+            xp_pending / xp_pending_count: total cost and number of pending spends
+            xp_remaining: current xp minus approved spends
+            xp_awarded: total of the character's XPAward records
+
+        Spends are filtered aggregates over one join. Awards come from a
+        correlated subquery so the two relations don't multiply each other's rows.
+        Only for querysets of Character and its subclasses, which have an xp field.
+        """
+        from game.models import XPAward
+
+        approved = Q(xp_spendings__approved=XPApprovalStatus.APPROVED)
+        pending = Q(xp_spendings__approved=XPApprovalStatus.PENDING)
+        awarded = (
+            XPAward.objects.filter(character_id=OuterRef("pk"))
+            .order_by()
+            .values("character_id")
+            .annotate(total=Sum("amount"))
+            .values("total")
+        )
+        return self.annotate(
+            xp_approved=Coalesce(Sum("xp_spendings__cost", filter=approved), 0),
+            xp_approved_count=Count("xp_spendings", filter=approved),
+            xp_pending=Coalesce(Sum("xp_spendings__cost", filter=pending), 0),
+            xp_pending_count=Count("xp_spendings", filter=pending),
+            xp_awarded=Coalesce(Subquery(awarded), 0),
+        ).annotate(xp_remaining=F("xp") - F("xp_approved"))
+
     def pending_approval_for_user(self, user):
         """
         Characters awaiting approval in user's chronicles (optimized).
@@ -297,7 +332,10 @@ class Character(CharacterModel):
         """Check if character has pending XP requests.
 
         UPDATED: Now uses XPSpendingRequest model instead of JSONField.
+        Uses the with_xp_ledger() annotation when the character was loaded with it.
         """
+        if hasattr(self, "xp_pending_count"):
+            return self.xp_pending_count > 0
         return self.xp_spendings.filter(approved="Pending").exists()
 
     @transaction.atomic
@@ -490,11 +528,13 @@ class Character(CharacterModel):
         """Calculate total XP spent using XPSpendingRequest model.
 
         UPDATED: Simplified to only check XPSpendingRequest (removed JSONField compatibility).
+        Uses the with_xp_ledger() annotation when the character was loaded with it.
 
         Returns:
             int: Total XP spent
         """
-        from django.db.models import Sum
+        if hasattr(self, "xp_approved"):
+            return self.xp_approved
 
         total = (
             self.xp_spendings.filter(approved="Approved").aggregate(total=Sum("cost"))["total"] or 0
@@ -54,14 +54,28 @@ class HealthBlock(models.Model):
             return -5
         return -1000
 
+    def add_damage(self, damage_type, amount=1):
+        """
+        Apply several levels of one damage type in a single operation.
+
+        Equivalent to calling add_bashing/add_lethal/add_aggravated amount
+        times: damage fills empty boxes first, and once the track is full each
+        further level of bashing upgrades one bashing box to lethal.
+        """
+        if damage_type not in ("B", "L", "A"):
+            raise ValueError(f"Unknown damage type: {damage_type}")
+        if amount <= 0:
+            return
+        levels = self.current_health_levels
+        added = min(amount, max(self.max_health_levels - len(levels), 0))
+        levels += damage_type * added
+        if damage_type == "B":
+            upgraded = min(amount - added, levels.count("B"))
+            levels = levels.replace("B", "L", upgraded)
+        self.current_health_levels = "".join(sorted(levels, key=self.sort_damage))
+
     def add_bashing(self):
-        if len(self.current_health_levels) < self.max_health_levels:
-            self.current_health_levels += "B"
-        elif "B" in self.current_health_levels:
-            self.current_health_levels = self.current_health_levels.replace("B", "L", 1)
-        self.current_health_levels = "".join(
-            sorted(self.current_health_levels, key=self.sort_damage)
-        )
+        self.add_damage("B")
 
     @staticmethod
     def sort_damage(damage_type):
@@ -72,15 +86,7 @@ class HealthBlock(models.Model):
         return 0
 
     def add_aggravated(self):
-        if len(self.current_health_levels) < self.max_health_levels:
-            self.current_health_levels += "A"
-        self.current_health_levels = "".join(
-            sorted(self.current_health_levels, key=self.sort_damage)
-        )
+        self.add_damage("A")
 
     def add_lethal(self):
-        if len(self.current_health_levels) < self.max_health_levels:
-            self.current_health_levels += "L"
-        self.current_health_levels = "".join(
-            sorted(self.current_health_levels, key=self.sort_damage)
-        )
+        self.add_damage("L")
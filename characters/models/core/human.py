@@ -13,6 +13,7 @@ from characters.models.core.character import Character
 from characters.models.core.health_block import HealthBlock
 from characters.models.core.merit_flaw_block import MeritFlaw
 from characters.models.core.specialty import Specialty
+from characters.trait_schema import get_trait_schema
 from core.linked_stat import linked_stat_fields
 from core.models import Language
 from core.utils import add_dot, get_short_gameline_name
@@ -171,6 +172,12 @@ class Human(
             self._background_manager = BackgroundManager(self)
         return self._background_manager
 
+    def refresh_from_db(self, *args, **kwargs):
+        """Reload fields and drop the background manager's cached totals."""
+        super().refresh_from_db(*args, **kwargs)
+        if hasattr(self, "_background_manager"):
+            self._background_manager.invalidate()
+
     # ========================================================================
     # URL Methods (formerly from HumanUrlBlock)
     # ========================================================================
@@ -605,21 +612,13 @@ class Human(
     # Dynamic background properties (for backward compatibility with old property system)
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Create dynamic properties for all allowed backgrounds
-        for bg in self.allowed_backgrounds:
-            if not hasattr(self.__class__, bg):
-                setattr(
-                    self.__class__,
-                    bg,
-                    property(
-                        lambda self, bg_name=bg: self.background_manager.get_background_property(
-                            bg_name
-                        ),
-                        lambda self, value, bg_name=bg: self.background_manager.set_background_property(
-                            bg_name, value
-                        ),
-                    ),
-                )
+        # Installs the background properties the first time a class is seen;
+        # afterwards this is a dict lookup
+        get_trait_schema(type(self))
+
+    @property
+    def trait_schema(self):
+        return get_trait_schema(type(self))
 
     # ========================================================================
     # XP and Freebie Spending Methods
@@ -639,29 +638,15 @@ class Human(
         Returns:
             XPSpendingRequest instance
         """
-        # Infer trait type from the trait name
+        # Gameline stats are recorded as "other", as before
         trait_type = "other"
-
-        # Check if it's an attribute
-        if hasattr(Attribute.objects, "filter"):
-            if Attribute.objects.filter(property_name=trait).exists():
-                trait_type = "attribute"
-
-        # Check if it's an ability
-        if trait_type == "other" and hasattr(Ability.objects, "filter"):
-            if Ability.objects.filter(property_name=trait).exists():
-                trait_type = "ability"
-
-        # Check if it's a background
-        if trait_type == "other" and trait in self.allowed_backgrounds:
-            trait_type = "background"
-
-        # Check if it's willpower
-        if trait == "willpower":
-            trait_type = "willpower"
-
-        # Get display name (capitalize the trait)
-        trait_display = trait.replace("_", " ").title()
+        schema_trait = self.trait_schema.get(trait)
+        core_kinds = ("attribute", "ability", "background", "willpower")
+        if schema_trait and schema_trait.kind in core_kinds:
+            trait_type = schema_trait.kind
+            trait_display = schema_trait.display
+        else:
+            trait_display = trait.replace("_", " ").title()
 
         return self.create_xp_spending_request(trait_display, trait_type, value, cost)
 
@@ -698,48 +683,37 @@ class Human(
             return Character.spend_xp(
                 self, trait_name or "", trait_display or "", cost or 0, category or "", trait_value
             )
-        # Check if trait is an attribute
-        if hasattr(Attribute.objects, "filter"):
-            try:
-                attribute = Attribute.objects.filter(property_name=trait).first()
-                if attribute and hasattr(self, trait):
-                    current_value = getattr(self, trait)
-                    cost = get_xp_cost("attribute") * (current_value + 1)
-
-                    if cost <= self.xp:
-                        if self.add_attribute(trait):
-                            self.xp -= cost
-                            self.add_to_spend(trait, getattr(self, trait), cost)
-                            return True
-                        return False
-                    return False
-            except Exception:
-                pass
-
-        # Check if trait is an ability
-        if hasattr(Ability.objects, "filter"):
-            try:
-                ability = Ability.objects.filter(property_name=trait).first()
-                if ability and hasattr(self, trait):
-                    current_value = getattr(self, trait)
-
-                    if current_value == 0:
-                        cost = get_xp_cost("new_ability")
-                    else:
-                        cost = get_xp_cost("ability") * (current_value + 1)
-
-                    if cost <= self.xp:
-                        if self.add_ability(trait):
-                            self.xp -= cost
-                            self.add_to_spend(trait, getattr(self, trait), cost)
-                            return True
-                        return False
-                    return False
-            except Exception:
-                pass
-
-        # Check if trait is a background
-        if trait in self.allowed_backgrounds:
+        kind = self.trait_schema.kind_of(trait)
+
+        if kind == "attribute":
+            current_value = getattr(self, trait)
+            cost = get_xp_cost("attribute") * (current_value + 1)
+
+            if cost <= self.xp:
+                if self.add_attribute(trait):
+                    self.xp -= cost
+                    self.add_to_spend(trait, getattr(self, trait), cost)
+                    return True
+                return False
+            return False
+
+        if kind == "ability":
+            current_value = getattr(self, trait)
+
+            if current_value == 0:
+                cost = get_xp_cost("new_ability")
+            else:
+                cost = get_xp_cost("ability") * (current_value + 1)
+
+            if cost <= self.xp:
+                if self.add_ability(trait):
+                    self.xp -= cost
+                    self.add_to_spend(trait, getattr(self, trait), cost)
+                    return True
+                return False
+            return False
+
+        if kind == "background":
             current_value = getattr(self, trait)
 
             if current_value == 0:
@@ -781,38 +755,27 @@ class Human(
             False if spending failed (insufficient freebies, at maximum, etc.)
             trait (string) if this method doesn't handle this trait (pass to subclass)
         """
-        # Check if trait is an attribute
-        if hasattr(Attribute.objects, "filter"):
-            try:
-                attribute = Attribute.objects.filter(property_name=trait).first()
-                if attribute and hasattr(self, trait):
-                    cost = get_freebie_cost("attribute")
-                    if cost <= self.freebies:
-                        if self.add_attribute(trait):
-                            self.freebies -= cost
-                            return True
-                        return False
-                    return False
-            except Exception:
-                pass
-
-        # Check if trait is an ability
-        if hasattr(Ability.objects, "filter"):
-            try:
-                ability = Ability.objects.filter(property_name=trait).first()
-                if ability and hasattr(self, trait):
-                    cost = get_freebie_cost("ability")
-                    if cost <= self.freebies:
-                        if self.add_ability(trait):
-                            self.freebies -= cost
-                            return True
-                        return False
-                    return False
-            except Exception:
-                pass
-
-        # Check if trait is a background
-        if trait in self.allowed_backgrounds:
+        kind = self.trait_schema.kind_of(trait)
+
+        if kind == "attribute":
+            cost = get_freebie_cost("attribute")
+            if cost <= self.freebies:
+                if self.add_attribute(trait):
+                    self.freebies -= cost
+                    return True
+                return False
+            return False
+
+        if kind == "ability":
+            cost = get_freebie_cost("ability")
+            if cost <= self.freebies:
+                if self.add_ability(trait):
+                    self.freebies -= cost
+                    return True
+                return False
+            return False
+
+        if kind == "background":
             cost = get_freebie_cost("background")
             if cost <= self.freebies:
                 if self.add_background(trait):
@@ -3,6 +3,19 @@ from django.urls import reverse
 
 from core.models import Model
 
+# Sphere columns in the order used by sphere_vector() and characters.effect_index
+SPHERES = (
+    "correspondence",
+    "time",
+    "spirit",
+    "matter",
+    "life",
+    "forces",
+    "entropy",
+    "mind",
+    "prime",
+)
+
 
 class Effect(Model):
     type = "effect"
@@ -24,6 +37,7 @@ class Effect(Model):
         verbose_name = "Effect"
         verbose_name_plural = "Effects"
         ordering = ["max_sphere", "rote_cost", "name"]
+        indexes = [models.Index(fields=["max_sphere", "rote_cost"])]
 
     def __str__(self):
         dots = {
@@ -52,6 +66,11 @@ class Effect(Model):
         return reverse("characters:mage:create:effect")
 
     def save(self, *args, **kwargs):
+        self.set_computed_fields()
+        return super().save(*args, **kwargs)
+
+    def set_computed_fields(self):
+        """Derive rote_cost and max_sphere from the sphere ratings."""
         self.rote_cost = self.cost()
         self.max_sphere = max(
             self.correspondence,
@@ -64,7 +83,6 @@ class Effect(Model):
             self.mind,
             self.prime,
         )
-        return super().save(*args, **kwargs)
 
     def spheres(self):
         dots = {
@@ -95,18 +113,9 @@ class Effect(Model):
             + self.mind
         )
 
+    def sphere_vector(self):
+        """Sphere ratings as a tuple, in SPHERES order."""
+        return tuple(getattr(self, sphere) for sphere in SPHERES)
+
     def is_learnable(self, mage):
-        for sphere in [
-            "correspondence",
-            "time",
-            "spirit",
-            "matter",
-            "life",
-            "forces",
-            "entropy",
-            "mind",
-            "prime",
-        ]:
-            if getattr(self, sphere) > getattr(mage, sphere):
-                return False
-        return True
+        return all(getattr(self, sphere) <= getattr(mage, sphere) for sphere in SPHERES)
@@ -8,7 +8,6 @@ from django.db.models import CheckConstraint, Q
 from characters.costs import get_freebie_cost, get_xp_cost
 from characters.models.core.ability_block import Ability
 from characters.models.core.attribute_block import Attribute
-from characters.models.mage.effect import Effect
 from characters.models.mage.faction import MageFaction
 from characters.models.mage.focus import (
     Instrument,
@@ -485,13 +484,13 @@ class Mage(MtAHuman):
         return self.rote_points == 0
 
     def filter_effects(self, max_cost=100):
-        effects = Effect.objects.filter(rote_cost__lte=max_cost)
-        effects = effects.exclude(id__in=self.rotes.all().values_list("effect", flat=True))
+        from characters.effect_index import effect_index
 
-        spheres = self.get_spheres()
-        spheres = {k + "__lte": v for k, v in spheres.items()}
-        q = Q(**spheres)
-        return effects.filter(q)
+        return effect_index.queryset(
+            spheres=self.get_spheres(),
+            max_cost=max_cost,
+            exclude=self.rotes.values_list("effect", flat=True),
+        )
 
     def total_effects(self):
         return sum(x.effect.cost() for x in self.rotes.all())
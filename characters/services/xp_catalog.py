@@ -0,0 +1,265 @@
+"""
+XP option catalog.
+
+Builds the example dropdowns for XP spending (which attributes, merits,
+spheres, ... a character can afford to raise) from one load of the
+character's current ratings. Reference tables come from
+get_cached_reference_list(), and per-character data (merit/flaw ratings,
+backgrounds, practice ratings) is fetched with one query each, so the
+number of queries doesn't grow with the number of merits or practices.
+
+Usage:
+    from characters.services.xp_catalog import get_xp_catalog
+
+    catalog = get_xp_catalog(character)
+
+    # One category
+    spheres = catalog.options("Sphere")
+
+    # Every category at once
+    for category, options in catalog.all_options().items():
+        ...
+
+    # Ratings a merit/flaw can be moved to
+    values = catalog.meritflaw_values(merit)
+"""
+
+from functools import cached_property
+
+from characters.costs import get_meritflaw_xp_cost, get_xp_cost
+from characters.models.core.ability_block import Ability
+from characters.models.core.attribute_block import Attribute
+from characters.models.core.background_block import Background, BackgroundRating
+from characters.models.core.merit_flaw_block import MeritFlaw
+from characters.models.mage.focus import Practice, SpecializedPractice, Tenet
+from characters.models.mage.mage import PracticeRating
+from characters.models.mage.sphere import Sphere
+from core.cache import get_cached_reference_list
+
+
+def trait_xp_cost(trait_type, current_value):
+    """XP cost for raising a trait, using the new_<trait> cost for unrated traits."""
+    if current_value == 0:
+        new_cost = get_xp_cost(f"new_{trait_type}")
+        if new_cost != 10000:  # Not blocked
+            return new_cost
+    return get_xp_cost(trait_type) * current_value
+
+
+class XPOptionCatalog:
+    """
+    Affordable XP purchases for one character.
+
+    Each <category>_options() method returns the objects that can be bought
+    with the character's current XP. Character data is loaded lazily and at
+    most once per catalog, so build one catalog per request and ask it for
+    as many categories as needed.
+    """
+
+    categories = {
+        "Attribute": "attribute_options",
+        "Ability": "ability_options",
+        "New Background": "new_background_options",
+        "Existing Background": "existing_background_options",
+        "MeritFlaw": "meritflaw_options",
+    }
+
+    def __init__(self, character):
+        self.character = character
+
+    @property
+    def xp(self):
+        return self.character.xp
+
+    def options(self, category):
+        """Affordable options for one category, or [] for an unknown category."""
+        method = self.categories.get(category)
+        if method is None:
+            return []
+        return getattr(self, method)()
+
+    def all_options(self):
+        """Affordable options for every category this catalog knows."""
+        return {category: self.options(category) for category in self.categories}
+
+    def rating(self, trait):
+        return getattr(self.character, trait.property_name, 0)
+
+    # Attributes and abilities
+
+    def attribute_options(self):
+        return [
+            x
+            for x in get_cached_reference_list(Attribute, ordering=None)
+            if self.rating(x) < 5 and trait_xp_cost("attribute", self.rating(x)) <= self.xp
+        ]
+
+    def ability_options(self):
+        char = self.character
+        property_names = set(char.talents + char.skills + char.knowledges)
+        return [
+            x
+            for x in get_cached_reference_list(Ability)
+            if x.property_name in property_names
+            and self.rating(x) < 5
+            and trait_xp_cost("ability", self.rating(x)) <= self.xp
+        ]
+
+    # Backgrounds
+
+    def new_background_options(self):
+        if get_xp_cost("new_background") > self.xp:
+            return []
+        allowed = set(self.character.allowed_backgrounds)
+        return [x for x in get_cached_reference_list(Background) if x.property_name in allowed]
+
+    def existing_background_options(self):
+        ratings = BackgroundRating.objects.filter(char=self.character, rating__lt=5).select_related(
+            "bg"
+        )
+        return [x for x in ratings if trait_xp_cost("background", x.rating) <= self.xp]
+
+    # Merits and flaws
+
+    @cached_property
+    def meritflaws(self):
+        """Merits/flaws this character type may take, with their ratings prefetched."""
+        from characters.utils import get_character_object_type
+
+        chartype = get_character_object_type(self.character.type)
+        return list(MeritFlaw.objects.filter(allowed_types=chartype).prefetch_related("ratings"))
+
+    @cached_property
+    def meritflaw_ratings(self):
+        return self.character.merit_flaw_manager.rating_map()
+
+    def meritflaw_values(self, mf):
+        """Ratings mf can be moved to with the character's XP, in ascending order."""
+        current = self.meritflaw_ratings.get(mf.pk, 0)
+        return sorted(
+            x.value
+            for x in mf.ratings.all()
+            if x.value != current and get_meritflaw_xp_cost(current, x.value) <= self.xp
+        )
+
+    def meritflaw_options(self):
+        return [x for x in self.meritflaws if self.meritflaw_values(x)]
+
+
+class MageXPOptionCatalog(XPOptionCatalog):
+    """Adds Spheres, Tenets and Practices for Awakened mages."""
+
+    categories = {
+        **XPOptionCatalog.categories,
+        "Sphere": "sphere_options",
+        "Tenet": "tenet_options",
+        "Remove Tenet": "remove_tenet_options",
+        "Practice": "practice_options",
+    }
+
+    def sphere_xp_cost(self, sphere):
+        current = self.rating(sphere)
+        if current == 0:
+            return get_xp_cost("new_sphere")
+        return get_xp_cost(self.character.sphere_to_trait_type(sphere.property_name)) * current
+
+    def sphere_options(self):
+        return [
+            x
+            for x in get_cached_reference_list(Sphere, ordering=None)
+            if self.rating(x) < self.character.arete and self.sphere_xp_cost(x) <= self.xp
+        ]
+
+    # Tenets
+
+    @cached_property
+    def other_tenets(self):
+        return list(self.character.other_tenets.all())
+
+    @property
+    def core_tenets(self):
+        char = self.character
+        return [
+            x
+            for x in [char.metaphysical_tenet, char.personal_tenet, char.ascension_tenet]
+            if x is not None
+        ]
+
+    def tenet_options(self):
+        held = {x.pk for x in self.core_tenets + self.other_tenets}
+        return list(Tenet.objects.exclude(pk__in=held))
+
+    def remove_tenet_options(self):
+        """Other tenets, plus each core tenet that an other tenet of its type could replace."""
+        replaceable = {x.tenet_type for x in self.other_tenets}
+        core = [x for x in self.core_tenets if x.tenet_type in replaceable]
+        return sorted(self.other_tenets + core, key=lambda x: x.name)
+
+    # Practices
+
+    @cached_property
+    def practice_ratings(self):
+        return dict(
+            PracticeRating.objects.filter(mage=self.character).values_list("practice_id", "rating")
+        )
+
+    @cached_property
+    def practices(self):
+        """
+        Practices open to this mage, with their abilities prefetched.
+
+        A faction's Specialized Practices replace the practices they specialize.
+        """
+        specialized = list(
+            SpecializedPractice.objects.filter(faction=self.character.faction).prefetch_related(
+                "abilities"
+            )
+        )
+        replaced = {x.parent_practice_id for x in specialized}
+        practices = (
+            Practice.objects.exclude(polymorphic_ctype__model="specializedpractice")
+            .exclude(polymorphic_ctype__model="corruptedpractice")
+            .exclude(pk__in=replaced)
+            .prefetch_related("abilities")
+        )
+        return sorted([*practices, *specialized], key=lambda x: x.name)
+
+    def practice_xp_cost(self, practice):
+        current = self.practice_ratings.get(practice.pk, 0)
+        if current == 0:
+            return get_xp_cost("new_practice")
+        return get_xp_cost("practice") * current
+
+    def practice_options(self, require_abilities=False):
+        """
+        Practices not yet at 5 that the mage can afford to raise.
+
+        With require_abilities, also drop practices whose abilities (halved)
+        don't exceed the next rating.
+        """
+        options = [
+            x
+            for x in self.practices
+            if self.practice_ratings.get(x.pk, 0) != 5 and self.practice_xp_cost(x) <= self.xp
+        ]
+        if require_abilities:
+            options = [
+                x
+                for x in options
+                if sum(self.rating(ability) for ability in x.abilities.all()) / 2
+                > self.practice_ratings.get(x.pk, 0) + 1
+            ]
+        return options
+
+
+_catalog_map: dict[str, type[XPOptionCatalog]] = {"mage": MageXPOptionCatalog}
+
+
+def register_xp_catalog(character_type, catalog_class):
+    """Use catalog_class for characters whose type is character_type."""
+    _catalog_map[character_type] = catalog_class
+
+
+def get_xp_catalog(character):
+    """The XP option catalog for a character, by character.type."""
+    return _catalog_map.get(character.type, XPOptionCatalog)(character)
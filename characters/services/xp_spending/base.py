@@ -530,33 +530,46 @@ class HumanXPSpendingService(XPSpendingService):
     @applier("attribute")
     def _apply_attribute(self, xp_request, approver) -> XPApplyResult:
         """Apply approved attribute XP spending."""
-        from characters.models.core.attribute_block import Attribute
-
-        att = Attribute.objects.get(name=xp_request.trait_name)
+        property_name = self._resolve_property_name(xp_request.trait_name, "attribute")
         self.character.approve_xp_spend(
-            xp_request.id, att.property_name, xp_request.trait_value, approver
+            xp_request.id, property_name, xp_request.trait_value, approver
         )
         return XPApplyResult(
             success=True,
             trait=xp_request.trait_name,
-            message=f"Approved {att.name} increase to {xp_request.trait_value}",
+            message=f"Approved {xp_request.trait_name} increase to {xp_request.trait_value}",
         )
 
     @applier("ability")
     def _apply_ability(self, xp_request, approver) -> XPApplyResult:
         """Apply approved ability XP spending."""
-        from characters.models.core.ability_block import Ability
-
-        abb = Ability.objects.get(name=xp_request.trait_name)
+        property_name = self._resolve_property_name(xp_request.trait_name, "ability")
         self.character.approve_xp_spend(
-            xp_request.id, abb.property_name, xp_request.trait_value, approver
+            xp_request.id, property_name, xp_request.trait_value, approver
         )
         return XPApplyResult(
             success=True,
             trait=xp_request.trait_name,
-            message=f"Approved {abb.name} increase to {xp_request.trait_value}",
+            message=f"Approved {xp_request.trait_name} increase to {xp_request.trait_value}",
         )
 
+    def _resolve_property_name(self, display_name, kind):
+        """
+        Map a stored display name to its field name via the trait schema.
+
+        Falls back to the Attribute/Ability tables for names the schema can't
+        resolve.
+        """
+        from characters.models.core.ability_block import Ability
+        from characters.models.core.attribute_block import Attribute
+        from characters.trait_schema import get_trait_schema
+
+        trait = get_trait_schema(self.character).resolve(display_name)
+        if trait is not None and trait.kind == kind:
+            return trait.property_name
+        model = Attribute if kind == "attribute" else Ability
+        return model.objects.get(name=display_name).property_name
+
     @applier("background")
     def _apply_background(self, xp_request, approver) -> XPApplyResult:
         """Apply approved existing background XP spending."""
@@ -1,4 +1,62 @@
 """Tests for background_manager module."""
 
+from django.contrib.auth.models import User
+from django.test import TestCase
 
-# TODO: Move relevant tests from existing test files here
+from characters.models.core.background_block import Background, BackgroundRating
+from characters.models.core.human import Human
+
+
+class BackgroundTotalsSnapshotTests(TestCase):
+    """Tests for the grouped background totals cached on the manager."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.character = Human.objects.create(name="Test Human", owner=self.user)
+        self.contacts = Background.objects.create(name="Contacts", property_name="contacts")
+        self.mentor = Background.objects.create(name="Mentor", property_name="mentor")
+        BackgroundRating.objects.create(char=self.character, bg=self.contacts, rating=2)
+        BackgroundRating.objects.create(
+            char=self.character, bg=self.contacts, rating=1, note="Work"
+        )
+        BackgroundRating.objects.create(char=self.character, bg=self.mentor, rating=3)
+
+    def test_get_backgrounds_is_one_query(self):
+        with self.assertNumQueries(1):
+            backgrounds = self.character.background_manager.get_backgrounds()
+        self.assertEqual(backgrounds, {"contacts": 3, "mentor": 3})
+
+    def test_reads_share_snapshot(self):
+        manager = self.character.background_manager
+        manager.get_backgrounds()
+        with self.assertNumQueries(0):
+            self.assertEqual(manager.total_backgrounds(), 6)
+            self.assertEqual(manager.filter_backgrounds(minimum=3), {"contacts": 3, "mentor": 3})
+            self.assertEqual(self.character.contacts, 3)
+            self.assertEqual(self.character.mentor, 3)
+
+    def test_add_background_invalidates(self):
+        self.assertEqual(self.character.contacts, 3)
+        self.character.background_manager.add_background("contacts")
+        self.assertEqual(self.character.contacts, 4)
+
+    def test_setter_invalidates(self):
+        self.assertEqual(self.character.mentor, 3)
+        self.character.mentor = 0
+        self.assertEqual(self.character.mentor, 0)
+        self.character.mentor = 2
+        self.assertEqual(self.character.mentor, 2)
+
+    def test_saving_rating_for_character_invalidates(self):
+        self.assertEqual(self.character.contacts, 3)
+        rating = self.character.backgrounds.get(bg=self.contacts, note="Work")
+        rating.rating = 4
+        rating.save()
+        self.assertEqual(self.character.contacts, 6)
+
+    def test_refresh_from_db_invalidates(self):
+        self.assertEqual(self.character.mentor, 3)
+        BackgroundRating.objects.filter(char=self.character, bg=self.mentor).update(rating=5)
+        self.assertEqual(self.character.mentor, 3)
+        self.character.refresh_from_db()
+        self.assertEqual(self.character.mentor, 5)
@@ -379,6 +379,34 @@ class TestCharacterXPSystem(TestCase):
         )
         self.assertEqual(approved_spent, 8)
 
+    def test_with_xp_ledger(self):
+        """Test the ledger annotations match the character's spends and awards."""
+        from core.xp_utils import award_xp_to_characters
+
+        award_xp_to_characters({self.character: 10}, source="story")
+        award_xp_to_characters({self.character: 5}, source="scene")
+        for cost, status in [(3, "Approved"), (4, "Approved"), (2, "Pending"), (6, "Denied")]:
+            self.character.xp_spendings.create(
+                trait_name="Melee", trait_type="ability", trait_value=1, cost=cost, approved=status
+            )
+
+        char = Character.objects.with_xp_ledger().get(pk=self.character.pk)
+        self.assertEqual((char.xp_approved, char.xp_approved_count), (7, 2))
+        self.assertEqual((char.xp_pending, char.xp_pending_count), (2, 1))
+        self.assertEqual(char.xp_awarded, 15)
+        self.assertEqual(char.xp_remaining, 15 - 7)
+        with self.assertNumQueries(0):
+            self.assertEqual(char.total_spent_xp(), 7)
+            self.assertTrue(char.waiting_for_xp_spend())
+
+    def test_with_xp_ledger_without_spends(self):
+        """Test characters with no spends or awards get zero totals."""
+        char = Character.objects.with_xp_ledger().get(pk=self.character.pk)
+        self.assertEqual(
+            (char.xp_approved, char.xp_pending, char.xp_awarded, char.xp_remaining), (0, 0, 0, 0)
+        )
+        self.assertFalse(char.waiting_for_xp_spend())
+
 
 class TestCharacterStatusTransitions(TestCase):
     """Test character status transitions and validation."""
@@ -107,6 +107,43 @@ class TestHuman(TestCase):
         self.character.add_aggravated()
         self.assertEqual(self.character.get_wound_penalty(), -1000)
 
+    def test_add_damage_levels(self):
+        cases = [
+            ("", "B", 3, "BBB"),
+            ("AB", "L", 2, "ALLB"),
+            ("BL", "A", 1, "ALB"),
+            # Levels beyond the last box are lost
+            ("LLBBB", "A", 3, "AALLBBB"),
+            ("", "A", 10, "AAAAAAA"),
+            ("ALBBBBB", "L", 2, "ALBBBBB"),
+            # Bashing on a full track upgrades bashing boxes to lethal
+            ("ALBBBBB", "B", 2, "ALLLBBB"),
+            ("LB", "B", 9, "LLLLLBB"),
+            ("ALLLLLL", "B", 3, "ALLLLLL"),
+            ("BB", "B", 0, "BB"),
+        ]
+        for start, damage_type, amount, expected in cases:
+            with self.subTest(start=start, damage_type=damage_type, amount=amount):
+                self.character.current_health_levels = start
+                self.character.add_damage(damage_type, amount)
+                self.assertEqual(self.character.current_health_levels, expected)
+
+    def test_add_damage_mixed_types(self):
+        self.character.current_health_levels = ""
+        for damage_type, amount, expected in [
+            ("B", 2, "BB"),
+            ("L", 1, "LBB"),
+            ("A", 1, "ALBB"),
+            ("B", 4, "ALLBBBB"),
+            ("A", 2, "ALLBBBB"),
+        ]:
+            self.character.add_damage(damage_type, amount)
+            self.assertEqual(self.character.current_health_levels, expected)
+
+    def test_add_damage_rejects_unknown_type(self):
+        with self.assertRaises(ValueError):
+            self.character.add_damage("X", 1)
+
     def test_has_archetypes(self):
         self.assertFalse(self.character.has_archetypes())
         self.character.nature = Archetype.objects.first()
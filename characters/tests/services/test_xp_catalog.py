@@ -0,0 +1,99 @@
+"""Tests for the XP option catalog."""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from characters.models.core.merit_flaw_block import MeritFlaw
+from characters.models.mage.focus import Practice, Tenet
+from characters.models.mage.mage import Mage, PracticeRating
+from characters.models.mage.sphere import Sphere
+from characters.services.xp_catalog import (
+    MageXPOptionCatalog,
+    XPOptionCatalog,
+    get_xp_catalog,
+)
+from characters.tests.utils import mage_setup
+from core.cache import reference_list_cache
+from game.models import ObjectType
+
+
+class TestXPOptionCatalog(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference_list_cache.clear()
+        mage_setup()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.mage = Mage.objects.create(
+            name="Test Mage",
+            owner=self.user,
+            xp=50,
+            arete=3,
+            metaphysical_tenet=Tenet.objects.filter(tenet_type="met").first(),
+        )
+        self.mage.forces = 2
+        self.mage.save()
+
+    def test_catalog_for_character_type(self):
+        self.assertIsInstance(get_xp_catalog(self.mage), MageXPOptionCatalog)
+        self.mage.type = "human"
+        self.assertIs(type(get_xp_catalog(self.mage)), XPOptionCatalog)
+
+    def test_unknown_category_is_empty(self):
+        self.assertEqual(get_xp_catalog(self.mage).options("Not A Category"), [])
+
+    def test_sphere_options(self):
+        spheres = get_xp_catalog(self.mage).options("Sphere")
+        self.assertIn(Sphere.objects.get(property_name="forces"), spheres)
+
+        self.mage.forces = 3
+        spheres = get_xp_catalog(self.mage).options("Sphere")
+        self.assertNotIn(Sphere.objects.get(property_name="forces"), spheres)
+
+    def test_meritflaw_values(self):
+        merit = MeritFlaw.objects.get(name="Merit 3")
+        self.mage.add_mf(merit, 3)
+        catalog = get_xp_catalog(self.mage)
+
+        self.assertEqual(catalog.meritflaw_values(merit), [])
+        self.assertNotIn(merit, catalog.options("MeritFlaw"))
+        self.assertIn(MeritFlaw.objects.get(name="Merit 2"), catalog.options("MeritFlaw"))
+
+    def test_meritflaws_out_of_reach(self):
+        self.mage.xp = 2
+        self.assertEqual(get_xp_catalog(self.mage).options("MeritFlaw"), [])
+
+    def test_tenets_held_are_excluded(self):
+        tenets = get_xp_catalog(self.mage).options("Tenet")
+        self.assertNotIn(self.mage.metaphysical_tenet, tenets)
+
+    def test_practices_at_five_are_excluded(self):
+        practice = Practice.objects.get(name="Test Practice 0")
+        PracticeRating.objects.create(mage=self.mage, practice=practice, rating=5)
+        self.assertNotIn(practice, get_xp_catalog(self.mage).options("Practice"))
+
+    def test_all_options_covers_every_category(self):
+        options = get_xp_catalog(self.mage).all_options()
+        self.assertEqual(set(options), set(MageXPOptionCatalog.categories))
+
+    def test_query_count_independent_of_merits_and_practices(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                get_xp_catalog(Mage.objects.get(pk=self.mage.pk)).all_options()
+            return len(queries)
+
+        # Warm the reference list cache, then measure
+        count_queries()
+        before = count_queries()
+
+        mage_type = ObjectType.objects.get(name="mage")
+        for i in range(20):
+            mf = MeritFlaw.objects.create(name=f"Extra Merit {i}")
+            mf.add_rating(1)
+            mf.allowed_types.add(mage_type)
+            Practice.objects.create(name=f"Extra Practice {i}")
+
+        count_queries()
+        self.assertEqual(count_queries(), before)
@@ -0,0 +1,64 @@
+"""Tests for the in-memory Effect sphere index."""
+
+from django.test import TestCase
+
+from characters.effect_index import EffectIndex, sphere_vector
+from characters.models.mage.effect import SPHERES, Effect
+
+
+class TestEffectIndex(TestCase):
+    def setUp(self):
+        self.index = EffectIndex()
+        self.fireball = Effect.objects.create(name="Fireball", forces=3, prime=2)
+        self.teleport = Effect.objects.create(name="Teleport", correspondence=3)
+        self.scry = Effect.objects.create(name="Scry", correspondence=2, time=1)
+        self.heal = Effect.objects.create(name="Heal", life=3)
+
+    def test_sphere_vector(self):
+        vector = sphere_vector({"forces": 3, "prime": 2})
+        self.assertEqual(tuple(vector.tolist()), self.fireball.sphere_vector())
+        self.assertEqual(len(sphere_vector({})), len(SPHERES))
+
+    def test_learnable_matches_is_learnable(self):
+        profile = {"correspondence": 3, "time": 1, "forces": 2, "prime": 2}
+        expected = [
+            x.pk
+            for x in Effect.objects.order_by("pk")
+            if all(getattr(x, s) <= profile.get(s, 0) for s in SPHERES)
+        ]
+        self.assertEqual(self.index.search(spheres=profile), expected)
+        self.assertEqual(expected, [self.teleport.pk, self.scry.pk])
+
+    def test_cost_and_max_sphere(self):
+        self.assertEqual(
+            self.index.search(max_cost=3), [self.teleport.pk, self.scry.pk, self.heal.pk]
+        )
+        self.assertEqual(self.index.search(max_sphere=2), [self.scry.pk])
+
+    def test_uses_and_exclude(self):
+        self.assertEqual(
+            self.index.search(uses=["correspondence"]), [self.teleport.pk, self.scry.pk]
+        )
+        self.assertEqual(
+            self.index.search(uses=["correspondence"], exclude=[self.teleport.pk, None]),
+            [self.scry.pk],
+        )
+
+    def test_nearest(self):
+        self.assertEqual(
+            self.index.nearest(self.teleport.sphere_vector(), k=2, exclude=[self.teleport.pk]),
+            [self.scry.pk, self.heal.pk],
+        )
+
+    def test_refreshed_on_save_and_delete(self):
+        self.assertEqual(len(self.index), 4)
+        self.heal.delete()
+        self.assertNotIn(self.heal.pk, self.index.search())
+
+        self.scry.time = 4
+        self.scry.save()
+        self.assertNotIn(self.scry.pk, self.index.search(max_sphere=3))
+
+    def test_queryset(self):
+        effects = self.index.queryset(spheres={"life": 5}, max_cost=5)
+        self.assertEqual(list(effects), [self.heal])
@@ -0,0 +1,63 @@
+"""Tests for the per-class trait schema registry."""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from characters.models.changeling.changeling import Changeling
+from characters.models.core.human import Human
+from characters.models.mage.mage import Mage
+from characters.trait_schema import get_trait_schema, normalize_trait_name
+
+
+class TraitSchemaTests(TestCase):
+    """Tests for schema contents."""
+
+    def test_human_core_traits(self):
+        schema = get_trait_schema(Human)
+        self.assertEqual(len(schema.attributes), 9)
+        self.assertEqual(schema.talents, list(Human.talents))
+        self.assertEqual(schema.backgrounds, list(Human.allowed_backgrounds))
+        self.assertEqual(schema.get("wits").category, "mental")
+        self.assertEqual(schema.get("alertness").new_cost_type, "new_ability")
+        self.assertEqual(schema.kind_of("willpower"), "willpower")
+        self.assertIsNone(schema.get("forces"))
+
+    def test_gameline_stats_from_getters(self):
+        forces = get_trait_schema(Mage).get("forces")
+        self.assertEqual(forces.kind, "sphere")
+        self.assertEqual(forces.cost_type, "sphere")
+        self.assertEqual(forces.new_cost_type, "new_sphere")
+        self.assertEqual(get_trait_schema(Changeling).kind_of("dragons_ire"), "art")
+
+    def test_schema_built_once_per_class(self):
+        self.assertIs(get_trait_schema(Mage), get_trait_schema(Mage()))
+
+    def test_resolve_display_names(self):
+        schema = get_trait_schema(Changeling)
+        self.assertEqual(schema.resolve("Dragon's Ire").property_name, "dragons_ire")
+        self.assertEqual(schema.resolve("Strength").property_name, "strength")
+        self.assertEqual(normalize_trait_name("Lore of the Beast"), "lore_of_the_beast")
+
+
+class TraitSchemaSpendingTests(TestCase):
+    """Spending paths classify traits without querying Statistic tables."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.human = Human.objects.create(name="Test", owner=self.user, xp=50, freebies=50)
+
+    def test_spend_freebies_does_not_query_statistics(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.human.spend_freebies("strength"))
+        self.assertEqual(self.human.strength, 2)
+        self.assertFalse(any("characters_statistic" in q["sql"] for q in queries))
+
+    def test_add_to_spend_classifies_from_schema(self):
+        request = self.human.add_to_spend("alertness", 1, 3)
+        self.assertEqual(request.trait_type, "ability")
+        self.assertEqual(request.trait_name, "Alertness")
+
+    def test_unknown_trait_passed_through(self):
+        self.assertEqual(self.human.spend_freebies("arete"), "arete")
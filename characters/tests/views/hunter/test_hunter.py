@@ -171,3 +171,21 @@ class TestHunterListView(TestCase):
         hunters = list(response.context["hunters"])
         self.assertEqual(hunters[0].name, "Alpha Hunter")
         self.assertEqual(hunters[1].name, "Zebra Hunter")
+
+    def test_list_view_hides_other_players_unapproved_hunters(self):
+        """Players only see other players' approved hunters in their chronicles."""
+        other = User.objects.create_user(username="Other", password="password")
+        chronicle = Chronicle.objects.create(name="Shared Chronicle")
+        Hunter.objects.create(
+            name="Mine", owner=self.player, creed=self.creed, chronicle=chronicle, status="App"
+        )
+        for name, status in [("Approved", "App"), ("Submitted", "Sub"), ("Unfinished", "Un")]:
+            Hunter.objects.create(
+                name=name, owner=other, creed=self.creed, chronicle=chronicle, status=status
+            )
+
+        self.client.login(username="Player", password="password")
+        response = self.client.get(self.url)
+
+        names = {x.name for x in response.context["hunters"]}
+        self.assertEqual(names, {"Mine", "Approved"})
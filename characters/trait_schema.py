@@ -0,0 +1,207 @@
+"""
+Per-class trait schema registry.
+
+Every concrete character class has a fixed set of traits: its attributes,
+the talents/skills/knowledges it declares, its allowed backgrounds and the
+gameline stats exposed through getters like get_spheres() or get_arts().
+This module compiles that layout once per class into a TraitSchema so that
+XP and freebie spending, approval and sheet rendering can classify a trait
+with a dict lookup instead of querying the Statistic tables.
+
+Schemas are built for every concrete Human subclass in
+CharactersConfig.ready(); get_trait_schema() builds any missing one lazily.
+
+Usage:
+    from characters.trait_schema import get_trait_schema
+
+    schema = get_trait_schema(character)
+    trait = schema.get("alertness")
+    trait.kind       # "ability"
+    trait.category   # "talent"
+    trait.cost_type  # "ability"
+"""
+
+import re
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+ATTRIBUTE_CATEGORIES = {
+    "physical": ("strength", "dexterity", "stamina"),
+    "social": ("charisma", "manipulation", "appearance"),
+    "mental": ("perception", "intelligence", "wits"),
+}
+
+ABILITY_CATEGORIES = {
+    "talent": "talents",
+    "skill": "skills",
+    "knowledge": "knowledges",
+}
+
+# Gameline stat getters and the characters.costs keys used to raise them:
+# getter name -> (kind, cost type, cost type for a trait at 0)
+STAT_GETTERS = {
+    "get_spheres": ("sphere", "sphere", "new_sphere"),
+    "get_arts": ("art", "art", "new_art"),
+    "get_realms": ("realm", "realm", "new_realm"),
+    "get_arcanoi": ("arcanos", "arcanos", "new_arcanos"),
+    "get_dark_arcanoi": ("arcanos", "arcanos", "new_arcanos"),
+    "get_lores": ("lore", "lore", "new_lore"),
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_trait_name(name):
+    """Turn a display name ("Dragon's Ire") into its property form ("dragons_ire")."""
+    return _NON_WORD.sub("_", name.lower().replace("'", "")).strip("_")
+
+
+@dataclass(frozen=True)
+class Trait:
+    """A single rated trait on a character class."""
+
+    property_name: str
+    display: str
+    kind: str
+    category: str
+    cost_type: str
+    new_cost_type: str
+
+
+@dataclass
+class TraitSchema:
+    """The compiled trait layout of one character class."""
+
+    model: type
+    traits: dict = field(default_factory=dict)
+
+    def add(self, property_name, kind, category, cost_type, new_cost_type=None):
+        # First registration wins, so core traits shadow same-named gameline stats
+        self.traits.setdefault(
+            property_name,
+            Trait(
+                property_name=property_name,
+                display=property_name.replace("_", " ").title(),
+                kind=kind,
+                category=category,
+                cost_type=cost_type,
+                new_cost_type=new_cost_type or cost_type,
+            ),
+        )
+
+    def get(self, name):
+        """Look up a trait by property name, or None."""
+        return self.traits.get(name)
+
+    def resolve(self, name):
+        """Look up a trait by property name or display name, or None."""
+        return self.traits.get(name) or self.traits.get(normalize_trait_name(name))
+
+    def kind_of(self, name):
+        trait = self.traits.get(name)
+        return trait.kind if trait else None
+
+    def names(self, kind=None, category=None):
+        """Property names in declaration order, optionally filtered."""
+        return [
+            t.property_name
+            for t in self.traits.values()
+            if (kind is None or t.kind == kind) and (category is None or t.category == category)
+        ]
+
+    @property
+    def attributes(self):
+        return self.names(kind="attribute")
+
+    @property
+    def talents(self):
+        return self.names(category="talent")
+
+    @property
+    def skills(self):
+        return self.names(category="skill")
+
+    @property
+    def knowledges(self):
+        return self.names(category="knowledge")
+
+    @property
+    def backgrounds(self):
+        return self.names(kind="background")
+
+    @classmethod
+    def build(cls, model):
+        schema = cls(model=model)
+        for category, names in ATTRIBUTE_CATEGORIES.items():
+            for name in names:
+                schema.add(name, "attribute", category, "attribute")
+        for category, attr in ABILITY_CATEGORIES.items():
+            for name in getattr(model, attr, ()):
+                schema.add(name, "ability", category, "ability", "new_ability")
+        for name in getattr(model, "allowed_backgrounds", ()):
+            schema.add(name, "background", "background", "background", "new_background")
+        schema.add("willpower", "willpower", "willpower", "willpower")
+        for name, kind, cost_type, new_cost_type in _gameline_stats(model):
+            schema.add(name, kind, kind, cost_type, new_cost_type)
+        return schema
+
+
+def _gameline_stats(model):
+    """
+    Discover gameline stats by calling the class's getters on its field defaults.
+
+    The getters only read attributes, so a namespace of defaults is enough and
+    no model instance (or query) is needed.
+    """
+    getters = [name for name in STAT_GETTERS if callable(getattr(model, name, None))]
+    if not getters:
+        return
+    defaults = SimpleNamespace(
+        **{f.attname: f.get_default() for f in model._meta.concrete_fields}
+    )
+    for getter in getters:
+        kind, cost_type, new_cost_type = STAT_GETTERS[getter]
+        try:
+            stats = getattr(model, getter)(defaults)
+        except AttributeError:
+            continue
+        for name in stats:
+            yield name, kind, cost_type, new_cost_type
+
+
+def _background_property(bg_name):
+    return property(
+        lambda self: self.background_manager.get_background_property(bg_name),
+        lambda self, value: self.background_manager.set_background_property(bg_name, value),
+    )
+
+
+_registry = {}
+
+
+def get_trait_schema(model):
+    """
+    Get the compiled schema for a character class or instance.
+
+    Building a schema also installs the dynamic background properties
+    (character.contacts etc.) on the class.
+    """
+    cls = model if isinstance(model, type) else type(model)
+    schema = _registry.get(cls)
+    if schema is None:
+        schema = _registry[cls] = TraitSchema.build(cls)
+        for bg in schema.backgrounds:
+            if not hasattr(cls, bg):
+                setattr(cls, bg, _background_property(bg))
+    return schema
+
+
+def build_registry():
+    """Compile schemas for every concrete character class."""
+    from django.apps import apps
+
+    from characters.models.core.human import Human
+
+    for model in apps.get_models():
+        if issubclass(model, Human):
+            get_trait_schema(model)
@@ -15,9 +15,11 @@ from characters.models.core.background_block import Background, BackgroundRating
 from characters.models.core.merit_flaw_block import MeritFlaw
 from characters.models.core.specialty import Specialty
 from characters.services.freebie_spending import FreebieSpendingServiceFactory
+from characters.services.xp_catalog import get_xp_catalog
 from characters.views.core.backgrounds import HumanBackgroundsView
 from characters.views.core.chargen_mixins import ChargenProgressMixin
 from characters.views.core.character import CharacterDetailView
+from core.cache import get_cached_reference_list
 from core.forms.language import HumanLanguageForm
 from core.mixins import (
     DropdownOptionsView,
@@ -395,13 +397,15 @@ class HumanFreebieFormPopulationView(View):
 
     def attribute_options(self):
         return [
-            x for x in Attribute.objects.all() if getattr(self.character, x.property_name, 0) < 5
+            x
+            for x in get_cached_reference_list(Attribute, ordering=None)
+            if getattr(self.character, x.property_name, 0) < 5
         ]
 
     def ability_options(self):
         return [
             x
-            for x in Ability.objects.order_by("name")
+            for x in get_cached_reference_list(Ability)
             if getattr(self.character, x.property_name, 0) < 5
             and hasattr(self.character, x.property_name)
         ]
@@ -413,36 +417,21 @@ class HumanFreebieFormPopulationView(View):
         return []
 
     def meritflaw_options(self):
-        from characters.utils import get_character_object_type
-
-        chartype = get_character_object_type(self.primary_class.type)
-        examples = MeritFlaw.objects.filter(allowed_types=chartype)
+        # The XP catalog loads the allowed merits/flaws with their ratings in one go
+        meritflaws = get_xp_catalog(self.character).meritflaws
 
         # Filter to only show merit/flaws with at least one affordable rating
-        affordable_mfs = []
         current_flaws = self.character.total_flaws()
         available_freebies = self.character.freebies
 
-        for mf in examples:
-            ratings = mf.get_ratings()
-            has_affordable = False
-
-            for rating in ratings:
-                # Flaws (negative ratings) are affordable if they don't exceed the -7 limit
-                if rating < 0:
-                    if current_flaws + rating >= -7:
-                        has_affordable = True
-                        break
-                # Merits and neutral (0) ratings are affordable if we have enough freebies
-                else:
-                    if rating <= available_freebies:
-                        has_affordable = True
-                        break
-
-            if has_affordable:
-                affordable_mfs.append(mf.id)
+        def affordable(rating):
+            # Flaws (negative ratings) are affordable if they don't exceed the -7 limit
+            if rating < 0:
+                return current_flaws + rating >= -7
+            # Merits and neutral (0) ratings are affordable if we have enough freebies
+            return rating <= available_freebies
 
-        return examples.filter(id__in=affordable_mfs)
+        return [mf for mf in meritflaws if any(affordable(x.value) for x in mf.ratings.all())]
 
 
 class HumanFreebiesView(SpendFreebiesPermissionMixin, UpdateView):
@@ -0,0 +1,599 @@
+"""
+Bulk ingestion for the populate_db/ scripts.
+
+The populate scripts are plain Django code that call get_or_create() once per
+row, so every row costs a SELECT, a full_clean() and an INSERT. BulkLoader
+runs a script with those calls intercepted instead: compile_script() rewrites
+top-level statements of the forms
+
+    Resonance.objects.get_or_create(name="Acquisitive")
+    Resonance.objects.get_or_create(name="Acquisitive")[0]
+    Effect.objects.get_or_create(name="...", life=2)[0].add_source("Book", 12)
+
+    effect, _ = Effect.objects.get_or_create(name="...", spirit=3)
+    effect.description = "..."
+    effect.save()
+    effect.add_source("Book", 87)
+
+into declarations, as long as the bound name is not read again before it is
+rebound and no argument contains a call. Declared rows are queued per model
+and flushed before any other statement runs: the loader looks up the
+declared natural keys that already exist, bulk_creates the missing rows,
+bulk_updates changed attributes on existing ones and links book references
+through the sources table in bulk. Everything else in a script executes
+unchanged, so results that are used later still come from get_or_create().
+
+Only single-table models whose save() adds nothing beyond validation are
+loaded in bulk. A model whose save() derives field values stays eligible by
+moving that work into set_computed_fields(), which the loader calls itself.
+Other models (multi-table subclasses such as items and characters) fall back
+to get_or_create() for the declared row. Rows are validated in memory with
+clean_fields() and clean(); post_save receivers are not sent for bulk rows,
+so the loader bumps each written model's cache version itself.
+
+Usage:
+    from core.bulk_loader import BulkLoader
+
+    loader = BulkLoader()
+    loader.run(path.read_text(), str(path))
+    loader.counts  # Counter of created/updated/unchanged/direct/sources
+"""
+
+import ast
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from polymorphic.models import PolymorphicModel
+
+from core.base import ValidatedSaveMixin
+from core.cache import CacheInvalidator
+from core.models import Book, BookReference
+from core.models import Model as CoreModel
+
+LOADER_NAME = "__bulk_loader__"
+DEFAULT_BATCH_SIZE = 1000
+# Keeps IN (...) lookups under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+# save() implementations that only validate before saving
+BASE_SAVES = {
+    models.Model.save,
+    PolymorphicModel.save,
+    CoreModel.save,
+    ValidatedSaveMixin.save,
+}
+
+_NO_FLUSH = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Pass)
+_NOT_SIMPLE = (ast.Call, ast.NamedExpr, ast.Lambda, ast.Await, ast.Yield, ast.YieldFrom)
+
+
+def compile_script(source, filename="<populate script>"):
+    """Compile a populate script with its get_or_create() rows turned into declarations."""
+    tree = ast.parse(source, filename)
+    statements = tree.body
+    names = [_names(stmt) for stmt in statements]
+    body = []
+    i = 0
+    while i < len(statements):
+        declaration, consumed = _match_declaration(statements, names, i)
+        if declaration is None:
+            stmt = statements[i]
+            if not isinstance(stmt, _NO_FLUSH):
+                body.append(_loader_call(stmt, "flush"))
+            body.append(stmt)
+            i += 1
+        else:
+            body.append(declaration)
+            i += consumed
+    if statements:
+        body.append(_loader_call(statements[-1], "flush"))
+    tree.body = body
+    ast.fix_missing_locations(tree)
+    return compile(tree, filename, "exec")
+
+
+def literal_sources(source, filename="<populate script>"):
+    """The (book_title, page) pairs a script passes to add_source() as literals."""
+    sources = set()
+    for node in ast.walk(ast.parse(source, filename)):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "add_source"
+            and len(node.args) == 2
+            and all(isinstance(arg, ast.Constant) for arg in node.args)
+        ):
+            title, page = (arg.value for arg in node.args)
+            if isinstance(title, str) and isinstance(page, int):
+                sources.add((title, page))
+    return sources
+
+
+def literal_lookups(source, filename="<populate script>"):
+    """
+    The Model.objects.get_or_create() lookups a script makes with literal keywords.
+
+    Returns (model name, ((field, value), ...)) pairs; two scripts sharing one
+    would create the same row. defaults is not part of the lookup.
+    """
+    lookups = set()
+    for node in ast.walk(ast.parse(source, filename)):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "get_or_create"
+            and isinstance(node.func.value, ast.Attribute)
+            and node.func.value.attr == "objects"
+            and isinstance(node.func.value.value, ast.Name)
+            and not node.args
+        ):
+            continue
+        keywords = [kw for kw in node.keywords if kw.arg != "defaults"]
+        if keywords and all(
+            kw.arg is not None and isinstance(kw.value, ast.Constant) for kw in keywords
+        ):
+            lookup = tuple(sorted((kw.arg, kw.value.value) for kw in keywords))
+            lookups.add((node.func.value.value.id, lookup))
+    return lookups
+
+
+def _loads(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+
+
+def _names(stmt):
+    """Names a top-level statement reads, and names it rebinds."""
+    loads = _loads(stmt)
+    stores = set()
+    if isinstance(stmt, ast.FunctionDef | ast.ClassDef):
+        stores.add(stmt.name)
+    elif isinstance(stmt, ast.Assign | ast.AnnAssign):
+        targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+        stores = {
+            n.id
+            for target in targets
+            for n in ast.walk(target)
+            if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)
+        }
+    elif isinstance(stmt, ast.AugAssign) and isinstance(stmt.target, ast.Name):
+        loads.add(stmt.target.id)
+    return loads, stores
+
+
+def _is_simple(node):
+    """True for expressions that can be evaluated early without touching the database."""
+    return not any(isinstance(n, _NOT_SIMPLE) for n in ast.walk(node))
+
+
+def _get_or_create(node):
+    """Return the get_or_create() call in node (optionally indexed with [0]), or None."""
+    if isinstance(node, ast.Subscript):
+        if not (isinstance(node.slice, ast.Constant) and node.slice.value == 0):
+            return None
+        node = node.value
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "get_or_create"
+        and not node.args
+        and all(kw.arg is not None and _is_simple(kw.value) for kw in node.keywords)
+        and _is_simple(node.func.value)
+    ):
+        return node
+    return None
+
+
+def _method_call(stmt, method, nargs):
+    """Return (receiver, args) if stmt is a bare receiver.method(*args) call."""
+    if not isinstance(stmt, ast.Expr):
+        return None
+    call = stmt.value
+    if (
+        isinstance(call, ast.Call)
+        and isinstance(call.func, ast.Attribute)
+        and call.func.attr == method
+        and len(call.args) == nargs
+        and not call.keywords
+        and all(_is_simple(arg) for arg in call.args)
+    ):
+        return call.func.value, call.args
+    return None
+
+
+def _is_name(node, name):
+    return isinstance(node, ast.Name) and node.id == name
+
+
+def _match_declaration(statements, names, i):
+    """
+    Match the row declaration starting at statements[i].
+
+    Returns (replacement statement, number of statements consumed), or
+    (None, 0) when the statement has to run as written.
+    """
+    stmt = statements[i]
+    updates, sources, saved = [], [], False
+
+    if isinstance(stmt, ast.Expr):
+        call = _get_or_create(stmt.value)
+        if call is None:
+            match = _method_call(stmt, "add_source", 2)
+            if match is None or not isinstance(match[0], ast.Subscript):
+                return None, 0
+            call = _get_or_create(match[0])
+            if call is None:
+                return None, 0
+            sources.append(match[1])
+        return _declare(stmt, call, updates, sources, saved), 1
+
+    if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1):
+        return None, 0
+    target = stmt.targets[0]
+    if isinstance(target, ast.Name):
+        call = _get_or_create(stmt.value)
+        bound = [target.id]
+        instance = target.id if isinstance(stmt.value, ast.Subscript) else None
+    elif (
+        isinstance(target, ast.Tuple)
+        and len(target.elts) == 2
+        and all(isinstance(elt, ast.Name) for elt in target.elts)
+        and isinstance(stmt.value, ast.Call)
+    ):
+        call = _get_or_create(stmt.value)
+        bound = [elt.id for elt in target.elts]
+        instance = bound[0]
+    else:
+        return None, 0
+    if call is None:
+        return None, 0
+
+    # Follow-up statements on the instance: attribute assignments, then
+    # save(), then add_source() calls
+    j = i + 1
+    while instance and j < len(statements):
+        follow = statements[j]
+        if (
+            not saved
+            and isinstance(follow, ast.Assign)
+            and len(follow.targets) == 1
+            and isinstance(follow.targets[0], ast.Attribute)
+            and _is_name(follow.targets[0].value, instance)
+            and _is_simple(follow.value)
+            and instance not in _loads(follow.value)
+        ):
+            updates.append((follow.targets[0].attr, follow.value))
+        elif not saved and _is_method_call_on(follow, instance, "save", 0):
+            saved = True
+        elif _is_method_call_on(follow, instance, "add_source", 2):
+            sources.append(_method_call(follow, "add_source", 2)[1])
+        else:
+            break
+        j += 1
+    if updates and not saved:
+        return None, 0
+
+    # The bound names must not be read again before they are rebound
+    remaining = set(bound)
+    for loads, stores in names[j:]:
+        if remaining & loads:
+            return None, 0
+        remaining -= stores
+        if not remaining:
+            break
+    return _declare(stmt, call, updates, sources, saved), j - i
+
+
+def _is_method_call_on(stmt, name, method, nargs):
+    match = _method_call(stmt, method, nargs)
+    return match is not None and _is_name(match[0], name)
+
+
+def _declare(stmt, call, updates, sources, saved):
+    kwargs = ast.Dict(
+        keys=[ast.Constant(kw.arg) for kw in call.keywords],
+        values=[kw.value for kw in call.keywords],
+    )
+    keywords = []
+    if updates:
+        keywords.append(
+            ast.keyword(
+                "updates",
+                ast.Dict(
+                    keys=[ast.Constant(attr) for attr, _ in updates],
+                    values=[value for _, value in updates],
+                ),
+            )
+        )
+    if sources:
+        keywords.append(
+            ast.keyword(
+                "sources",
+                ast.List([ast.Tuple(list(args), ast.Load()) for args in sources], ast.Load()),
+            )
+        )
+    if saved:
+        keywords.append(ast.keyword("save", ast.Constant(True)))
+    return _loader_call(stmt, "declare", [call.func.value, kwargs], keywords)
+
+
+def _loader_call(stmt, method, args=(), keywords=()):
+    node = ast.Expr(
+        ast.Call(
+            func=ast.Attribute(ast.Name(LOADER_NAME, ast.Load()), method, ast.Load()),
+            args=list(args),
+            keywords=list(keywords),
+        )
+    )
+    return ast.copy_location(node, stmt)
+
+
+@dataclass
+class _Row:
+    """A declared row: its natural key lookup plus what to apply on top."""
+
+    lookup: dict
+    defaults: dict
+    updates: dict = field(default_factory=dict)
+    sources: list = field(default_factory=list)
+    pk: object = None
+    created: bool = False
+
+
+class BulkLoader:
+    """Queues declared rows per model and writes them with bulk queries."""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = {}
+        self.counts = Counter()
+        self._safe_models = {}
+
+    def run(self, source, filename="<populate script>"):
+        """Execute a populate script with its rows loaded in bulk."""
+        code = compile_script(source, filename)
+        exec(code, {"__name__": "__main__", LOADER_NAME: self})
+        self.flush()
+
+    def declare(self, manager, kwargs, updates=None, sources=(), save=False):
+        """Queue manager.get_or_create(**kwargs), then setattr/save/add_source on the result."""
+        kwargs = dict(kwargs)
+        defaults = kwargs.pop("defaults", None) or {}
+        updates = updates or {}
+        model = manager.model
+        lookup = self._normalize(model, kwargs)
+        if lookup is None or not self._can_bulk_load(model, defaults, updates, sources):
+            self.flush()
+            self._apply(manager, kwargs, defaults, updates, sources, save)
+            return
+
+        key_fields = tuple(sorted(lookup))
+        group = self.pending.setdefault((manager, key_fields), {})
+        key = tuple(lookup[name] for name in key_fields)
+        row = group.get(key)
+        if row is None:
+            group[key] = _Row(lookup, defaults, dict(updates), list(sources))
+        else:
+            row.updates.update(updates)
+            row.sources.extend(sources)
+        if len(group) >= self.batch_size:
+            self._flush_group(manager, key_fields, self.pending.pop((manager, key_fields)))
+
+    def flush(self):
+        """Write every queued row."""
+        while self.pending:
+            group_key = next(iter(self.pending))
+            manager, key_fields = group_key
+            self._flush_group(manager, key_fields, self.pending.pop(group_key))
+
+    def _apply(self, manager, kwargs, defaults, updates, sources, save):
+        obj, _ = manager.get_or_create(defaults=defaults, **kwargs)
+        for name, value in updates.items():
+            setattr(obj, name, value)
+        if save:
+            obj.save()
+        for book_title, page in sources:
+            obj.add_source(book_title, page)
+        self.counts["direct"] += 1
+
+    def _is_bulk_safe(self, model):
+        if model not in self._safe_models:
+            safe = not model._meta.parents and not model._meta.proxy
+            for klass in model.__mro__:
+                save = klass.__dict__.get("save")
+                if save is None or save in BASE_SAVES:
+                    continue
+                if "set_computed_fields" not in klass.__dict__:
+                    safe = False
+            self._safe_models[model] = safe
+        return self._safe_models[model]
+
+    def _can_bulk_load(self, model, defaults, updates, sources):
+        if not self._is_bulk_safe(model):
+            return False
+        if any(_concrete_field(model, name) is None for name in [*defaults, *updates]):
+            return False
+        if sources:
+            try:
+                return model._meta.get_field("sources").related_model is BookReference
+            except FieldDoesNotExist:
+                return False
+        return True
+
+    def _normalize(self, model, kwargs):
+        """Map a get_or_create() lookup to {attname: python value}, or None if it can't be."""
+        lookup = {}
+        for name, value in kwargs.items():
+            model_field = _concrete_field(model, name)
+            if model_field is None:
+                return None
+            if model_field.is_relation:
+                if isinstance(value, models.Model):
+                    if value.pk is None:
+                        return None
+                    value = value.pk
+            else:
+                value = model_field.to_python(value)
+            lookup[model_field.attname] = value
+        return lookup
+
+    def _flush_group(self, manager, key_fields, rows, counted=True):
+        found = self._existing(manager, key_fields, rows)
+        new = []
+        for key, row in rows.items():
+            row.pk = found.get(key)
+            if row.pk is None:
+                new.append((key, row, self._build(manager.model, row)))
+
+        if new:
+            objs = manager.bulk_create([obj for _, _, obj in new], batch_size=self.batch_size)
+            if counted:
+                self.counts["created"] += len(objs)
+            for (_, row, _), obj in zip(new, objs, strict=True):
+                row.pk = obj.pk
+                row.created = True
+            # Backends that can't return primary keys from bulk inserts
+            missing = [key for key, _, _ in new if rows[key].pk is None]
+            if missing:
+                found = self._existing(manager, key_fields, missing)
+                for key in missing:
+                    rows[key].pk = found.get(key)
+
+        updated = self._update_existing(
+            manager, [r for r in rows.values() if r.updates and not r.created]
+        )
+        if new or updated:
+            CacheInvalidator.invalidate_model_cache(manager.model)
+        self._attach_sources(manager.model, [r for r in rows.values() if r.sources])
+
+    def _existing(self, manager, key_fields, keys):
+        """Map the given natural keys to primary keys of rows that already exist."""
+        keys = list(keys)
+        probe = next(
+            (i for i in range(len(key_fields)) if all(key[i] is not None for key in keys)), None
+        )
+        if probe is None:
+            querysets = [manager.all()]
+        else:
+            values = list({key[probe] for key in keys})
+            querysets = [
+                manager.filter(**{f"{key_fields[probe]}__in": values[i : i + LOOKUP_CHUNK_SIZE]})
+                for i in range(0, len(values), LOOKUP_CHUNK_SIZE)
+            ]
+        found = {}
+        for queryset in querysets:
+            for pk, *values in queryset.order_by("pk").values_list("pk", *key_fields):
+                found.setdefault(tuple(values), pk)
+        return found
+
+    def _build(self, model, row):
+        obj = model(**row.lookup)
+        for name, value in {**row.defaults, **row.updates}.items():
+            setattr(obj, name, value)
+        self._prepare(obj)
+        return obj
+
+    def _prepare(self, obj):
+        """Do in memory what save() would do: derive fields, validate, set the content type."""
+        if hasattr(obj, "set_computed_fields"):
+            obj.set_computed_fields()
+        relations = [f.name for f in obj._meta.concrete_fields if f.is_relation]
+        try:
+            # Foreign keys are skipped; validating them costs a query per row
+            obj.clean_fields(exclude=relations)
+            obj.clean()
+        except ValidationError as e:
+            messages = "; ".join(e.messages)
+            raise ValidationError(f"{obj._meta.object_name} '{obj}': {messages}") from e
+        if isinstance(obj, PolymorphicModel):
+            obj.pre_save_polymorphic()
+
+    def _update_existing(self, manager, rows):
+        """
+        Apply attribute updates to existing rows, writing only the ones that changed.
+
+        Returns:
+            int: Number of rows written
+        """
+        if not rows:
+            return 0
+        by_pk = {row.pk: row for row in rows}
+        pks = list(by_pk)
+        concrete_fields = manager.model._meta.concrete_fields
+        changed, changed_fields = [], set()
+        for i in range(0, len(pks), LOOKUP_CHUNK_SIZE):
+            queryset = manager.filter(pk__in=pks[i : i + LOOKUP_CHUNK_SIZE])
+            if hasattr(queryset, "non_polymorphic"):
+                queryset = queryset.non_polymorphic()
+            for obj in queryset:
+                before = {f.attname: getattr(obj, f.attname) for f in concrete_fields}
+                for name, value in by_pk[obj.pk].updates.items():
+                    setattr(obj, name, value)
+                self._prepare(obj)
+                diff = [
+                    f.name for f in concrete_fields if getattr(obj, f.attname) != before[f.attname]
+                ]
+                if diff:
+                    changed.append(obj)
+                    changed_fields.update(diff)
+                else:
+                    self.counts["unchanged"] += 1
+        if changed:
+            manager.bulk_update(changed, sorted(changed_fields), batch_size=self.batch_size)
+            self.counts["updated"] += len(changed)
+        return len(changed)
+
+    def create_sources(self, sources):
+        """
+        Create the books and book references for (book_title, page) pairs in bulk.
+
+        Returns:
+            dict: BookReference pk per (book_title, page) pair
+        """
+        books = {(title,): _Row({"name": title}, {}) for title, _ in sources}
+        self._flush_group(Book.objects, ("name",), books, counted=False)
+
+        references = {}
+        for title, page in sources:
+            key = (books[(title,)].pk, int(page))
+            references.setdefault(key, _Row({"book_id": key[0], "page": key[1]}, {}))
+        self._flush_group(BookReference.objects, ("book_id", "page"), references, counted=False)
+        return {
+            (title, page): references[(books[(title,)].pk, int(page))].pk
+            for title, page in sources
+        }
+
+    def _attach_sources(self, model, rows):
+        """Bulk equivalent of add_source(book_title, page) for each row's sources."""
+        if not rows:
+            return
+        reference_pks = self.create_sources({source for row in rows for source in row.sources})
+
+        sources_field = model._meta.get_field("sources")
+        through = sources_field.remote_field.through
+        object_field = through._meta.get_field(sources_field.m2m_field_name()).attname
+        reference_field = through._meta.get_field(sources_field.m2m_reverse_field_name()).attname
+        links = {(row.pk, reference_pks[source]) for row in rows for source in row.sources}
+        through.objects.bulk_create(
+            [
+                through(**{object_field: obj_pk, reference_field: ref_pk})
+                for obj_pk, ref_pk in links
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.counts["sources"] += len(links)
+
+
+def _concrete_field(model, name):
+    """The concrete, non-m2m field a lookup name refers to (by name or attname), or None."""
+    if "__" in name:
+        return None
+    try:
+        model_field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        model_field = next((f for f in model._meta.concrete_fields if f.attname == name), None)
+    if model_field is None or not model_field.concrete or model_field.many_to_many:
+        return None
+    return model_field
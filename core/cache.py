@@ -7,8 +7,19 @@ database queries and view rendering. It includes:
 - Queryset caching decorators
 - Cache invalidation helpers
 - Model-based cache invalidation hooks
+
+Model-scoped keys carry a per-model version number. Saving or deleting an
+instance of a tracked model bumps its version (see core.signals), so every
+key built for the old version is simply never read again. Invalidation is a
+single incr on any backend; stale entries age out through their timeout.
+A model is tracked once a versioned cache reads it in this process, or from
+startup if its app calls CacheInvalidator.track() in ready(), which models
+read in one process and written in another need.
 """
 
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import wraps
 from typing import Any
@@ -61,6 +72,18 @@ class CacheKeyGenerator:
         """Generate a cache key for a model queryset."""
         return cls.make_key("queryset", model_class.__name__, **params)
 
+    @classmethod
+    def make_versioned_key(cls, category: str, model_class: type[Model], **params) -> str:
+        """
+        Generate a cache key tied to the model's current cache version.
+
+        Examples:
+            >>> CacheKeyGenerator.make_versioned_key('reference_list', Ability, ordering='name')
+            'tg:reference_list:Ability:v1700000000000000:ordering=name'
+        """
+        version = CacheInvalidator.get_version(model_class)
+        return cls.make_key(category, f"{model_class.__name__}:v{version}", **params)
+
     @classmethod
     def make_view_key(cls, view_name: str, **params) -> str:
         """Generate a cache key for a view."""
@@ -76,70 +99,148 @@ class CacheInvalidator:
     """
     Manages cache invalidation for models.
 
-    When a model instance is saved or deleted, this class can invalidate
-    related cache entries to ensure data consistency.
+    Each model has a version number stored in the cache. Keys built with
+    CacheKeyGenerator.make_versioned_key() embed it, so bumping the version
+    invalidates every such key at once without knowing what they are.
+
+    Only tracked models have their version bumped on save and delete, so
+    writes to models no cache reads cost nothing.
     """
 
+    tracked_models: set[type[Model]] = set()
+
+    @classmethod
+    def track(cls, *models: type[Model]) -> None:
+        """Bump these models' versions whenever an instance is saved or deleted."""
+        cls.tracked_models.update(models)
+
+    @classmethod
+    def is_tracked(cls, model_class: type[Model]) -> bool:
+        """True if the model, or a concrete parent whose querysets include it, is tracked."""
+        return any(
+            model in cls.tracked_models
+            for model in (model_class, *model_class._meta.get_parent_list())
+        )
+
+    @staticmethod
+    def version_key(model_class: type[Model]) -> str:
+        return CacheKeyGenerator.make_key("version", model_class._meta.label_lower)
+
     @staticmethod
-    def invalidate_model_cache(model_class: type[Model]) -> None:
+    def _new_version() -> int:
+        # Time-based, so a version lost to eviction is never handed out again
+        return time.time_ns() // 1000
+
+    @classmethod
+    def get_version(cls, model_class: type[Model]) -> int:
+        """Get a model's current cache version, starting one if there is none."""
+        cls.track(model_class)
+        key = cls.version_key(model_class)
+        version = cache.get(key)
+        if version is None:
+            # add() so that concurrent processes settle on the same version
+            cache.add(key, cls._new_version(), None)
+            version = cache.get(key, cls._new_version())
+        return version
+
+    @classmethod
+    def invalidate_model_cache(cls, model_class: type[Model]) -> None:
         """
         Invalidate all cached data for a specific model.
 
-        This invalidates both queryset caches and reference_list caches
-        to ensure data consistency when models are updated.
+        Bumps the model's version, which retires its queryset and
+        reference_list caches on every backend.
 
         Args:
             model_class: The model class whose cache should be invalidated
         """
-        # Invalidate both queryset and reference_list caches
-        for category in ["queryset", "reference_list"]:
-            pattern = f"{CacheKeyGenerator.PREFIX}:{category}:{model_class.__name__}:*"
-            try:
-                cache.delete_pattern(pattern)
-            except AttributeError:
-                # Fallback for cache backends that don't support delete_pattern
-                # In development with LocMemCache, we can't use patterns
-                # so we'll just clear the entire cache for that model's base key
-                base_key = CacheKeyGenerator.make_key(category, model_class.__name__)
-                cache.delete(base_key)
+        key = cls.version_key(model_class)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, cls._new_version(), None)
 
     @staticmethod
     def invalidate_related_caches(model_instance: Model) -> None:
         """
         Invalidate caches related to a specific model instance.
 
-        This is called when a model is saved or deleted.
-        Override in subclasses to invalidate additional related caches.
+        This is called when a model is saved or deleted. Concrete parent
+        models (e.g. the polymorphic base of a character type) are
+        invalidated too, since their querysets include the instance.
 
         Args:
             model_instance: The model instance that was saved/deleted
         """
-        CacheInvalidator.invalidate_model_cache(model_instance.__class__)
+        model_class = model_instance.__class__
+        CacheInvalidator.invalidate_model_cache(model_class)
+        for parent in model_class._meta.get_parent_list():
+            CacheInvalidator.invalidate_model_cache(parent)
 
-        # Also invalidate any parent model caches if using polymorphic models
-        if hasattr(model_instance, "get_real_instance_class"):
-            # This is a polymorphic model, invalidate the base class cache too
-            base_class = model_instance.__class__.__bases__[0]
-            if base_class != Model:
-                CacheInvalidator.invalidate_model_cache(base_class)
 
+class LocalLRUCache:
+    """
+    A small thread-safe in-process LRU cache with per-entry timeouts.
+
+    Sits in front of the shared cache for hot, versioned keys. Building the
+    key still looks up the model's version in the shared cache, but repeated
+    reads in one process skip fetching and unpickling the value itself.
+    """
 
-def cache_queryset(timeout: int = 300, key_prefix: str = "") -> Callable:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# In-process tier for get_cached_reference_list()
+reference_list_cache = LocalLRUCache()
+
+
+def cache_queryset(
+    timeout: int = 300, key_prefix: str = "", models: tuple[type[Model], ...] = ()
+) -> Callable:
     """
     Decorator to cache the result of a function that returns a QuerySet.
 
     The cache key is automatically generated based on the function name,
-    arguments, and an optional key prefix.
+    arguments, and an optional key prefix. QuerySets are evaluated before
+    caching, so the cached copy carries its rows.
 
     Args:
         timeout: Cache timeout in seconds (default: 5 minutes)
         key_prefix: Optional prefix to add to the cache key
+        models: Models the result depends on; saving or deleting any of
+            them invalidates the cached result
 
     Returns:
         Decorated function that caches its QuerySet result
 
     Example:
-        @cache_queryset(timeout=600, key_prefix="approved_characters")
+        @cache_queryset(timeout=600, key_prefix="approved_characters", models=(Character,))
         def get_approved_characters():
             return Character.objects.filter(status='App')
     """
@@ -154,7 +255,11 @@ def cache_queryset(timeout: int = 300, key_prefix: str = "") -> Callable:
             args_str = ":".join(str(arg) for arg in args if arg)
             kwargs_str = ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
 
-            key_parts = [part for part in [func_name, args_str, kwargs_str] if part]
+            versions = ":".join(
+                f"{model.__name__}=v{CacheInvalidator.get_version(model)}" for model in models
+            )
+
+            key_parts = [part for part in [func_name, args_str, kwargs_str, versions] if part]
             cache_key = CacheKeyGenerator.make_key("queryset", ":".join(key_parts))
 
             # Try to get from cache
@@ -164,6 +269,8 @@ def cache_queryset(timeout: int = 300, key_prefix: str = "") -> Callable:
 
             # Execute function and cache result
             result = func(*args, **kwargs)
+            if isinstance(result, QuerySet):
+                len(result)  # Evaluate so the pickled copy holds rows, not just SQL
             cache.set(cache_key, result, timeout)
 
             return result
@@ -276,7 +383,7 @@ def get_cached_queryset(
         timeout: Cache timeout in seconds
 
     Returns:
-        Cached QuerySet
+        Cached QuerySet, already evaluated
 
     Example:
         characters = get_cached_queryset(
@@ -286,7 +393,7 @@ def get_cached_queryset(
         )
     """
     filters = filters or {}
-    cache_key = CacheKeyGenerator.make_model_key(model_class, **filters)
+    cache_key = CacheKeyGenerator.make_versioned_key("queryset", model_class, **filters)
 
     # Try to get from cache
     cached_result = cache.get(cache_key)
@@ -295,6 +402,7 @@ def get_cached_queryset(
 
     # Query database and cache result
     queryset = model_class.objects.filter(**filters)
+    len(queryset)  # Evaluate so the pickled copy holds rows, not just SQL
     cache.set(cache_key, queryset, timeout)
 
     return queryset
@@ -330,10 +438,14 @@ def get_cached_reference_list(
         List of model instances
 
     Note:
-        Cached data will persist for the timeout duration even if the underlying
-        database records change. This is appropriate for reference data that
-        changes infrequently. CacheInvalidator.invalidate_model_cache() will
-        clear both queryset and reference_list caches for a model.
+        Lists are cached in two tiers: a per-process LRU in front of the
+        shared cache. Each call still reads the model's cache version from
+        the shared cache to build the key; a hit in the LRU then saves
+        fetching and unpickling the list. Both tiers are keyed by that
+        version, so saving or deleting a record of a tracked model (or
+        calling CacheInvalidator.invalidate_model_cache()) retires them in
+        every process. Bulk writes that skip signals should call
+        invalidate_model_cache() themselves.
 
     Example:
         from core.cache import get_cached_reference_list
@@ -351,20 +463,22 @@ def get_cached_reference_list(
     filters = filters or {}
     # Use "reference_list" category instead of "queryset" to avoid cache key collisions
     # with get_cached_queryset, which caches QuerySets rather than evaluated lists
-    cache_key = CacheKeyGenerator.make_key(
-        "reference_list", model_class.__name__, ordering=ordering or "none", **filters
+    cache_key = CacheKeyGenerator.make_versioned_key(
+        "reference_list", model_class, ordering=ordering or "none", **filters
     )
 
-    # Try to get from cache
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        return cached_result
-
-    # Query database, evaluate to list, and cache result
-    queryset = model_class.objects.filter(**filters)
-    if ordering:
-        queryset = queryset.order_by(ordering)
-    result = list(queryset)
-    cache.set(cache_key, result, timeout)
+    # Try the in-process tier, then the shared cache
+    result = reference_list_cache.get(cache_key)
+    if result is None:
+        result = cache.get(cache_key)
+        if result is None:
+            # Query database, evaluate to list, and cache result
+            queryset = model_class.objects.filter(**filters)
+            if ordering:
+                queryset = queryset.order_by(ordering)
+            result = list(queryset)
+            cache.set(cache_key, result, timeout)
+        reference_list_cache.set(cache_key, result, timeout)
 
-    return result
+    # Copy, so callers can't mutate the list other requests share
+    return list(result)
@@ -0,0 +1,117 @@
+"""
+Streaming NDJSON archive format for chronicle export and import.
+
+An archive is one JSON record per line, written and read a record at a time
+so neither side ever holds a whole chronicle in memory. The first record is
+a header; every following record is either the chronicle itself or one
+serialized object tagged with its section:
+
+    {"type": "header", "export_version": "2.0", "export_date": "..."}
+    {"type": "chronicle", "object": {...}, "storytellers": ["alice"]}
+    {"type": "object", "section": "scenes", "object": {"model": "game.scene", ...}}
+
+Archives whose filename ends in .gz are gzip-compressed transparently.
+"""
+
+import gzip
+import json
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+
+ARCHIVE_VERSION = "2.0"
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def open_archive(path, mode):
+    """Open an archive for text reading ("r") or writing ("w"), gzipped by extension."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ArchiveWriter:
+    """Writes archive records to a text file handle."""
+
+    def __init__(self, fh, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.counts = {}
+
+    def write(self, record):
+        self.fh.write(json.dumps(record, cls=DjangoJSONEncoder))
+        self.fh.write("\n")
+
+    def write_header(self, **extra):
+        self.write({"type": "header", "export_version": ARCHIVE_VERSION, **extra})
+
+    def write_queryset(self, section, queryset):
+        """
+        Serialize a queryset into the archive a chunk at a time.
+
+        Rows are streamed with .iterator(chunk_size=...) and auto-created
+        many-to-many fields are prefetched per chunk, so memory use is
+        bounded by the chunk size rather than the queryset size.
+
+        Returns:
+            int: Number of objects written
+        """
+        m2m = [
+            f.name
+            for f in queryset.model._meta.many_to_many
+            if f.remote_field.through._meta.auto_created
+        ]
+        rows = queryset.order_by("pk").prefetch_related(*m2m).iterator(chunk_size=self.chunk_size)
+        count = self.counts.get(section, 0)
+        chunk = []
+        for obj in rows:
+            chunk.append(obj)
+            if len(chunk) >= self.chunk_size:
+                count += self._write_chunk(section, chunk)
+                chunk = []
+                self._report(section, count)
+        if chunk:
+            count += self._write_chunk(section, chunk)
+            self._report(section, count)
+        self.counts[section] = count
+        return count
+
+    def _write_chunk(self, section, chunk):
+        for data in serializers.serialize("python", chunk):
+            self.write({"type": "object", "section": section, "object": data})
+        return len(chunk)
+
+    def _report(self, section, count):
+        if self.progress:
+            self.progress(section, count)
+
+
+def read_archive(fh):
+    """
+    Yield the records of an archive, one line at a time.
+
+    Raises:
+        ValueError: If the first record is not an archive header
+    """
+    header_seen = False
+    for line in fh:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not header_seen:
+            if not isinstance(record, dict) or record.get("type") != "header":
+                raise ValueError("Not a chronicle archive: missing header record")
+            header_seen = True
+        yield record
+
+
+def is_archive(path):
+    """Whether path holds a streaming archive rather than a legacy JSON export."""
+    try:
+        with open_archive(path, "r") as fh:
+            first = fh.readline(4096)
+        record = json.loads(first)
+    except (ValueError, OSError):
+        return False
+    return isinstance(record, dict) and record.get("type") == "header"
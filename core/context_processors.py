@@ -28,6 +28,7 @@ def permissions(request):
             ...
         {% endif %}
     """
+    PermissionManager.for_request(request)
     return {
         "VisibilityTier": VisibilityTier,
         "Permission": Permission,
@@ -0,0 +1,222 @@
+"""
+Vectorized dice engine for World of Darkness rolls.
+
+Rolls whole batches of d10s as a single NumPy array operation and scores
+them without per-die Python loops. Scoring follows the same rules as
+core.utils.dice():
+
+- each die at or above the difficulty is a success
+- each 1 cancels a success
+- a roll with no successes and at least one 1 is a botch (negative result)
+- a roll with successes never drops below zero
+- with a specialty, each 10 adds one extra success
+
+The engine also computes the exact probability distribution of a roll, so
+storytellers can ask how likely a pool is to succeed before calling for it.
+"""
+
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+DIE_SIDES = 10
+
+
+def score_roll(faces, difficulty=6, specialty=False):
+    """Score a single roll given its die faces, in one pass. Returns the net successes."""
+    ones = tens = successes = 0
+    for face in faces:
+        if face >= difficulty:
+            successes += 1
+        if face == 1:
+            ones += 1
+        elif face == DIE_SIDES:
+            tens += 1
+    total = successes - ones
+    if successes == 0:
+        return total
+    if specialty:
+        total += tens
+    return max(total, 0)
+
+
+class DiceEngine:
+    """
+    Batch dice roller backed by a numpy.random.Generator.
+
+    Usage:
+        engine = DiceEngine(seed=42)
+        faces, successes = engine.roll(5, difficulty=6)
+        batch = engine.roll_batch(10, 5, difficulty=7, specialty=True)
+        engine.expected_successes(5, difficulty=6)
+    """
+
+    def __init__(self, seed=None, generator=None):
+        self.rng = generator if generator is not None else np.random.default_rng(seed)
+
+    def roll_faces(self, num_rolls, dicepool):
+        """Roll num_rolls pools of dicepool d10s. Returns an int array (num_rolls, dicepool)."""
+        return self.rng.integers(1, DIE_SIDES + 1, size=(num_rolls, max(dicepool, 0)))
+
+    @staticmethod
+    def face_counts(faces):
+        """Count how many of each face (1-10) appear in every roll.
+
+        Returns an int array of shape (num_rolls, DIE_SIDES + 2) where column
+        ``f`` holds the number of dice showing ``f``. Columns 0 and 11 are
+        always zero so difficulties outside 1-10 can be looked up directly.
+        """
+        num_rolls = faces.shape[0]
+        offsets = np.arange(num_rolls)[:, None] * (DIE_SIDES + 2)
+        counts = np.bincount((faces + offsets).ravel(), minlength=num_rolls * (DIE_SIDES + 2))
+        return counts.reshape(num_rolls, DIE_SIDES + 2)
+
+    @staticmethod
+    def at_least(counts):
+        """Number of dice at or above each face value, per roll.
+
+        ``at_least(counts)[:, d]`` is the success count at difficulty ``d``.
+        """
+        return np.cumsum(counts[:, ::-1], axis=1)[:, ::-1]
+
+    @classmethod
+    def score(cls, faces, difficulty=6, specialty=False):
+        """Score every roll in a (num_rolls, dicepool) face array at once."""
+        faces = np.atleast_2d(faces)
+        counts = cls.face_counts(faces)
+        column = min(max(difficulty, 0), DIE_SIDES + 1)
+        successes = cls.at_least(counts)[:, column]
+        return cls._net(successes, counts[:, 1], counts[:, DIE_SIDES], specialty)
+
+    @staticmethod
+    def _net(successes, ones, tens, specialty):
+        total = successes - ones
+        if specialty:
+            total = total + tens
+        return np.where(successes == 0, successes - ones, np.maximum(total, 0))
+
+    def roll(self, dicepool, difficulty=6, specialty=False):
+        """Roll one pool. Returns (list of faces, net successes) like core.utils.dice()."""
+        faces = self.roll_faces(1, dicepool)
+        successes = self.score(faces, difficulty=difficulty, specialty=specialty)
+        return faces[0].tolist(), int(successes[0])
+
+    def roll_batch(self, num_rolls, dicepool, difficulty=6, specialty=False):
+        """Roll num_rolls pools at a fixed difficulty.
+
+        Returns (faces, successes): a (num_rolls, dicepool) face array and a
+        (num_rolls,) array of net successes.
+        """
+        faces = self.roll_faces(num_rolls, dicepool)
+        return faces, self.score(faces, difficulty=difficulty, specialty=specialty)
+
+    def roll_escalating(self, num_rolls, dicepool, difficulty=6, specialty=False):
+        """Roll a /rolls sequence where each failure raises the next difficulty by one.
+
+        All dice are rolled up front in a single array. Only the difficulty
+        bookkeeping between rolls is sequential, and it works on precomputed
+        per-roll counts rather than individual dice. Stops after a botch.
+
+        Returns a list of (faces, successes, difficulty) tuples.
+        """
+        faces = self.roll_faces(num_rolls, dicepool)
+        counts = self.face_counts(faces)
+        at_least = self.at_least(counts)
+        ones = counts[:, 1]
+        tens = counts[:, DIE_SIDES]
+
+        results = []
+        for i in range(num_rolls):
+            column = min(max(difficulty, 0), DIE_SIDES + 1)
+            successes = int(self._net(at_least[i, column], ones[i], tens[i], specialty))
+            results.append((faces[i].tolist(), successes, difficulty))
+            if successes == 0:
+                difficulty += 1
+            if successes < 0:
+                break
+        return results
+
+    def roll_extended(
+        self, dicepool, target_successes, difficulty=6, specialty=False, max_rolls=100
+    ):
+        """Roll an extended action until the target is reached, a botch, or max_rolls.
+
+        Every possible roll is generated and scored in one batch; the stopping
+        point is found with a cumulative sum rather than a Python loop.
+
+        Returns (faces, successes): the rolls actually made, as lists.
+        """
+        faces, successes = self.roll_batch(max_rolls, dicepool, difficulty, specialty)
+        stop = (successes < 0) | (np.cumsum(successes) >= target_successes)
+        last = int(np.argmax(stop)) if stop.any() else max_rolls - 1
+        return faces[: last + 1].tolist(), successes[: last + 1].tolist()
+
+    @staticmethod
+    def distribution(dicepool, difficulty=6, specialty=False):
+        """Exact probability of every net result for a pool.
+
+        Returns a dict mapping net successes (negative for botches) to
+        probability, ordered by result.
+        """
+        return dict(_distribution(max(dicepool, 0), difficulty, bool(specialty)))
+
+    @classmethod
+    def expected_successes(cls, dicepool, difficulty=6, specialty=False):
+        """Expected net successes, counting botches as zero."""
+        dist = cls.distribution(dicepool, difficulty, specialty)
+        return sum(max(result, 0) * p for result, p in dist.items())
+
+    @classmethod
+    def success_probability(cls, dicepool, difficulty=6, specialty=False, threshold=1):
+        """Probability of scoring at least threshold net successes."""
+        dist = cls.distribution(dicepool, difficulty, specialty)
+        return sum(p for result, p in dist.items() if result >= threshold)
+
+    @classmethod
+    def botch_probability(cls, dicepool, difficulty=6, specialty=False):
+        """Probability that the roll botches."""
+        dist = cls.distribution(dicepool, difficulty, specialty)
+        return sum(p for result, p in dist.items() if result < 0)
+
+
+@lru_cache(maxsize=1024)
+def _distribution(dicepool, difficulty, specialty):
+    """Enumerate die-category counts to build the exact result distribution.
+
+    Each face falls into one of four categories: a 1, a 10, another success
+    (difficulty..9) or another failure (2..difficulty-1). The multinomial over
+    those categories determines the result completely.
+    """
+    mid_success_faces = sum(1 for face in range(2, DIE_SIDES) if face >= difficulty)
+    mid_fail_faces = (DIE_SIDES - 2) - mid_success_faces
+    one_succeeds = difficulty <= 1
+    ten_succeeds = difficulty <= DIE_SIDES
+    p = 1 / DIE_SIDES
+
+    results = {}
+    for ones in range(dicepool + 1):
+        for tens in range(dicepool - ones + 1):
+            rest = dicepool - ones - tens
+            for mid_successes in range(rest + 1):
+                mid_fails = rest - mid_successes
+                ways = (
+                    comb(dicepool, ones)
+                    * comb(dicepool - ones, tens)
+                    * comb(rest, mid_successes)
+                    * mid_success_faces**mid_successes
+                    * mid_fail_faces**mid_fails
+                )
+                if ways == 0:
+                    continue
+                successes = mid_successes + ones * one_succeeds + tens * ten_succeeds
+                if successes == 0:
+                    result = -ones
+                else:
+                    result = successes - ones + (tens if specialty else 0)
+                    result = max(result, 0)
+                results[result] = results.get(result, 0) + ways * p**dicepool
+    return tuple(sorted(results.items()))
+
+
+default_engine = DiceEngine()
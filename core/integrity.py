@@ -0,0 +1,237 @@
+"""
+Rule-based data integrity scanning.
+
+Each IntegrityRule describes one kind of bad row as a Q condition on a
+model, plus an optional fix. IntegrityScanner compiles every rule for a
+model into a conditional aggregate, Count(Case(When(condition, then=1))),
+so all of that model's checks run in a single query, however many rules
+there are. Fixes are applied as one queryset update() per rule.
+
+Usage:
+    from core.integrity import IntegrityScanner
+
+    scanner = IntegrityScanner()
+    report = scanner.scan()
+    for result in report.results:
+        print(result.rule.name, result.count)
+
+    # Fix every failing rule that has a fix, then report as JSON
+    report = scanner.scan(fix=True)
+    json.dumps(report.as_dict())
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from django.db.models import Case, Count, F, Q, Value, When
+from django.utils import timezone
+
+from characters.models.core.character import Character
+from characters.models.core.human import Human
+from characters.trait_schema import ATTRIBUTE_CATEGORIES
+
+VALID_STATUSES = ["Un", "Sub", "App", "Ret", "Dec"]
+
+
+@dataclass(frozen=True)
+class IntegrityRule:
+    """
+    A check for one kind of invalid row.
+
+    Attributes:
+        name: Unique machine-readable name, e.g. "strength_below_1"
+        model: Model whose table the rule scans
+        condition: Q matching the invalid rows
+        description: Human-readable summary, e.g. "strength < 1"
+        group: Category the rule reports under, e.g. "attributes"
+        fix: Field values (or expressions) that repair a matching row,
+            or None if the rule can't be fixed automatically
+        fix_description: Human-readable summary of the fix
+    """
+
+    name: str
+    model: type
+    condition: Q
+    description: str
+    group: str
+    fix: dict | None = None
+    fix_description: str = ""
+
+
+@dataclass
+class RuleResult:
+    rule: IntegrityRule
+    count: int
+    fixed: int = 0
+    fix_seconds: float = 0.0
+
+    def as_dict(self):
+        return {
+            "name": self.rule.name,
+            "model": self.rule.model._meta.label,
+            "group": self.rule.group,
+            "description": self.rule.description,
+            "count": self.count,
+            "fixed": self.fixed,
+            "fix_seconds": round(self.fix_seconds, 6),
+        }
+
+
+@dataclass
+class IntegrityReport:
+    results: list[RuleResult] = field(default_factory=list)
+    # Model label -> seconds spent on that model's single scan query
+    scan_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_issues(self):
+        return sum(result.count for result in self.results)
+
+    @property
+    def total_fixed(self):
+        return sum(result.fixed for result in self.results)
+
+    def failing(self):
+        return [result for result in self.results if result.count]
+
+    def by_group(self):
+        """Issue count per rule group."""
+        groups = {}
+        for result in self.results:
+            groups[result.rule.group] = groups.get(result.rule.group, 0) + result.count
+        return groups
+
+    def as_dict(self):
+        return {
+            "timestamp": timezone.now().isoformat(),
+            "total_issues": self.total_issues,
+            "total_fixed": self.total_fixed,
+            "groups": self.by_group(),
+            "scan_seconds": {label: round(s, 6) for label, s in self.scan_seconds.items()},
+            "rules": [result.as_dict() for result in self.results],
+        }
+
+
+def range_rules(model, field_name, low, high, group, null_below=False):
+    """
+    Rules for field_name below low and above high.
+
+    Out-of-range values are clamped to the bound, except that with
+    null_below, values below low are cleared to NULL instead.
+    """
+    low_fix = None if null_below else low
+    return [
+        IntegrityRule(
+            name=f"{field_name}_below_{low}",
+            model=model,
+            condition=Q(**{f"{field_name}__lt": low}),
+            description=f"{field_name} < {low}",
+            group=group,
+            fix={field_name: low_fix},
+            fix_description="set to NULL" if null_below else f"set to {low}",
+        ),
+        IntegrityRule(
+            name=f"{field_name}_above_{high}",
+            model=model,
+            condition=Q(**{f"{field_name}__gt": high}),
+            description=f"{field_name} > {high}",
+            group=group,
+            fix={field_name: high},
+            fix_description=f"set to {high}",
+        ),
+    ]
+
+
+def default_rules():
+    """The checks run by validate_data_integrity and monitor_validation."""
+    rules = [
+        IntegrityRule(
+            name="negative_xp",
+            model=Character,
+            condition=Q(xp__lt=0),
+            description="negative XP",
+            group="xp",
+            fix={"xp": 0},
+            fix_description="set XP to 0",
+        ),
+        IntegrityRule(
+            name="invalid_status",
+            model=Character,
+            condition=~Q(status__in=VALID_STATUSES),
+            description="invalid status",
+            group="status",
+            fix={"status": "Un"},
+            fix_description="set status to 'Un'",
+        ),
+    ]
+    for names in ATTRIBUTE_CATEGORIES.values():
+        for attribute in names:
+            rules += range_rules(Human, attribute, 1, 10, "attributes")
+    for ability in Human.talents + Human.skills + Human.knowledges:
+        rules += range_rules(Human, ability, 0, 10, "abilities")
+    rules += range_rules(Human, "willpower", 1, 10, "willpower")
+    rules += range_rules(Human, "temporary_willpower", 0, 10, "willpower")
+    rules.append(
+        IntegrityRule(
+            name="temporary_willpower_above_permanent",
+            model=Human,
+            condition=Q(temporary_willpower__gt=F("willpower")),
+            description="temporary willpower > permanent",
+            group="willpower",
+            fix={"temporary_willpower": F("willpower")},
+            fix_description="set temporary = permanent",
+        )
+    )
+    rules += range_rules(Human, "age", 0, 500, "age", null_below=True)
+    rules += range_rules(Human, "apparent_age", 0, 200, "age", null_below=True)
+    return rules
+
+
+class IntegrityScanner:
+    """Runs a set of IntegrityRules with one aggregate query per model."""
+
+    def __init__(self, rules=None):
+        self.rules = default_rules() if rules is None else list(rules)
+        names = [rule.name for rule in self.rules]
+        if len(names) != len(set(names)):
+            raise ValueError("Integrity rule names must be unique")
+
+    def scan(self, fix=False):
+        """
+        Count the rows failing each rule, and fix them if fix is set.
+
+        Returns:
+            IntegrityReport: One RuleResult per rule, in rule order
+        """
+        report = IntegrityReport()
+        counts = {}
+        for model, rules in self._rules_by_model().items():
+            start = time.perf_counter()
+            counts.update(
+                model._base_manager.aggregate(
+                    **{
+                        rule.name: Count(Case(When(rule.condition, then=Value(1))))
+                        for rule in rules
+                    }
+                )
+            )
+            report.scan_seconds[model._meta.label] = time.perf_counter() - start
+
+        for rule in self.rules:
+            result = RuleResult(rule=rule, count=counts[rule.name])
+            if fix and result.count and rule.fix is not None:
+                start = time.perf_counter()
+                result.fixed = rule.model._base_manager.filter(rule.condition).update(**rule.fix)
+                result.fix_seconds = time.perf_counter() - start
+            report.results.append(result)
+        return report
+
+    def offenders(self, rule):
+        """Rows currently failing rule."""
+        return rule.model._base_manager.filter(rule.condition)
+
+    def _rules_by_model(self):
+        grouped = {}
+        for rule in self.rules:
+            grouped.setdefault(rule.model, []).append(rule)
+        return grouped
@@ -7,13 +7,16 @@ Checks for:
 - Characters with negative XP
 - Impossible trait progressions
 - Weekly/Story XP request issues
+
+Each character's ledger comes from Character.objects.with_xp_ledger(), so the
+whole audit is one streamed query rather than several queries per character.
 """
 
 from datetime import timedelta
 
 from django.core.management.base import BaseCommand
 
-from characters.models.core.character import CharacterModel
+from characters.models.core.character import Character
 from game.models import StoryXPRequest, WeeklyXPRequest
 
 
@@ -48,7 +51,7 @@ class Command(BaseCommand):
         self.show_all = options["show_all"]
 
         # Filter characters based on options
-        queryset = CharacterModel.objects.filter(status__in=["Sub", "App"])
+        queryset = Character.objects.non_polymorphic().filter(status__in=["Sub", "App"])
 
         if options["chronicle"]:
             queryset = queryset.filter(chronicle_id=options["chronicle"])
@@ -59,7 +62,7 @@ class Command(BaseCommand):
         # Collect audit results
         self.results = []
 
-        for char in queryset:
+        for char in queryset.with_xp_ledger().iterator(chunk_size=500):
             result = self.audit_character(char)
             if result:
                 self.results.append(result)
@@ -75,30 +78,17 @@ class Command(BaseCommand):
         self.audit_xp_requests()
 
     def audit_character(self, char):
-        """Audit a single character's XP."""
-        if not hasattr(char, "xp"):
-            return None
-
+        """Audit a single character's XP from its with_xp_ledger() annotations."""
         issues = []
         warnings = []
 
-        # Calculate XP totals using XPSpendingRequest model
         total_earned = char.xp
+        total_approved = char.xp_approved
+        total_pending = char.xp_pending
+        approved_count = char.xp_approved_count
+        pending_count = char.xp_pending_count
 
-        # Get spending data from xp_spendings relation
-        from django.db.models import Sum
-
-        approved_count = char.xp_spendings.filter(approved="Approved").count()
-        pending_count = char.xp_spendings.filter(approved="Pending").count()
-
-        total_approved = (
-            char.xp_spendings.filter(approved="Approved").aggregate(total=Sum("cost"))["total"] or 0
-        )
-        total_pending = (
-            char.xp_spendings.filter(approved="Pending").aggregate(total=Sum("cost"))["total"] or 0
-        )
-
-        remaining = total_earned - total_approved
+        remaining = char.xp_remaining
         after_pending = remaining - total_pending
 
         # Check for negative XP
@@ -127,6 +117,7 @@ class Command(BaseCommand):
             return {
                 "character": char,
                 "earned": total_earned,
+                "awarded": char.xp_awarded,
                 "approved": total_approved,
                 "pending": total_pending,
                 "remaining": remaining,
@@ -246,6 +237,7 @@ class Command(BaseCommand):
                 "character_name",
                 "status",
                 "earned",
+                "awarded",
                 "approved",
                 "pending",
                 "remaining",
@@ -264,6 +256,7 @@ class Command(BaseCommand):
                         "character_name": result["character"].name,
                         "status": result["character"].get_status_display(),
                         "earned": result["earned"],
+                        "awarded": result["awarded"],
                         "approved": result["approved"],
                         "pending": result["pending"],
                         "remaining": result["remaining"],
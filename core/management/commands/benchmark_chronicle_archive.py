@@ -0,0 +1,125 @@
+"""
+Management command to benchmark a streaming chronicle export/import round trip.
+
+Builds a synthetic chronicle with many posts, exports it with
+export_chronicle --format ndjson, imports the archive with import_chronicle
+and reports the time and peak Python memory of each step. Everything is
+created inside a transaction that is rolled back at the end.
+
+Usage:
+    python manage.py benchmark_chronicle_archive                 # 100k posts
+    python manage.py benchmark_chronicle_archive --posts 20000 --compress
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.chronicle_archive import DEFAULT_CHUNK_SIZE
+from game.models import Chronicle, Post, Scene
+
+
+class Command(BaseCommand):
+    help = "Benchmark a streaming NDJSON chronicle export/import round trip"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=100_000,
+            help="Number of synthetic posts (default: 100000)",
+        )
+        parser.add_argument(
+            "--scenes",
+            type=int,
+            default=200,
+            help="Number of synthetic scenes the posts are spread over (default: 200)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Export chunk and import batch size (default: {DEFAULT_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Gzip the archive",
+        )
+
+    def handle(self, *args, **options):
+        suffix = ".ndjson.gz" if options["compress"] else ".ndjson"
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        try:
+            with transaction.atomic():
+                self.run(path, options)
+                transaction.set_rollback(True)
+        finally:
+            os.unlink(path)
+
+    def run(self, path, options):
+        chunk_size = str(options["chunk_size"])
+        chronicle = self.build_chronicle(options["scenes"], options["posts"])
+
+        export_time, export_peak = self.measure(
+            "export_chronicle",
+            str(chronicle.pk),
+            "--format",
+            "ndjson",
+            "--output",
+            path,
+            "--chunk-size",
+            chunk_size,
+        )
+        size = os.path.getsize(path)
+        import_time, import_peak = self.measure(
+            "import_chronicle", path, "--batch-size", chunk_size
+        )
+        copy = Chronicle.objects.filter(pk__gt=chronicle.pk, name=chronicle.name).first()
+        imported = Post.objects.filter(scene__chronicle=copy).count() if copy else 0
+
+        self.stdout.write(f"Round trip of {options['posts']} posts ({size / 1024 / 1024:.1f} MB)")
+        self.stdout.write(f"  {'export':<8}{export_time:8.1f} s   peak {export_peak:8.1f} MB")
+        self.stdout.write(f"  {'import':<8}{import_time:8.1f} s   peak {import_peak:8.1f} MB")
+        if imported == options["posts"]:
+            self.stdout.write(self.style.SUCCESS(f"  ✓ {imported} posts imported"))
+        else:
+            self.stdout.write(self.style.ERROR(f"  ✗ {imported} of {options['posts']} imported"))
+
+    def build_chronicle(self, num_scenes, num_posts):
+        self.stdout.write(f"Building {num_scenes} scenes with {num_posts} posts...")
+        chronicle = Chronicle.objects.create(name="Archive Benchmark")
+        scenes = Scene.objects.bulk_create(
+            [Scene(name=f"Scene {i}", chronicle=chronicle) for i in range(max(num_scenes, 1))]
+        )
+        batch = []
+        for i in range(num_posts):
+            post = Post(
+                scene=scenes[i % len(scenes)],
+                display_name=f"Poster {i % 7}",
+                message=f"Post number {i} with a little *markup* to render.",
+            )
+            post.render_html()
+            batch.append(post)
+            if len(batch) >= 5000:
+                Post.objects.bulk_create(batch)
+                batch = []
+        Post.objects.bulk_create(batch)
+        return chronicle
+
+    def measure(self, command, *args):
+        """Run a command, returning (seconds, peak traced memory in MB)."""
+        tracemalloc.start()
+        start = time.perf_counter()
+        call_command(command, *args, stdout=StringIO())
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak / 1024 / 1024
@@ -0,0 +1,70 @@
+"""
+Management command to compare the vectorized dice engine with the legacy roller.
+
+Times the same extended-roll workload through core.utils.dice() (one
+random.randint call per die, rescanned per roll) and through
+core.dice.DiceEngine (one array operation per batch).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.dice import DiceEngine
+from core.utils import dice
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark the NumPy dice engine against the legacy dice() roller"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pool",
+            type=int,
+            default=8,
+            help="Dice per roll (default: 8)",
+        )
+        parser.add_argument(
+            "--rolls",
+            type=int,
+            default=100,
+            help="Rolls per batch, as in an extended roll (default: 100)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=1000,
+            help="Number of batches to time (default: 1000)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Seed for the engine's generator",
+        )
+
+    def handle(self, *args, **options):
+        pool = options["pool"]
+        num_rolls = options["rolls"]
+        iterations = options["iterations"]
+        engine = DiceEngine(seed=options["seed"])
+
+        self.stdout.write(
+            f"Rolling {iterations} batches of {num_rolls} x {pool}d10 at difficulty 6...\n"
+        )
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for _ in range(num_rolls):
+                dice(pool, difficulty=6, specialty=True)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            engine.roll_batch(num_rolls, pool, difficulty=6, specialty=True)
+        vectorized = time.perf_counter() - start
+
+        self.stdout.write(f"  {'legacy dice()':<24}{legacy * 1000:10.1f} ms")
+        self.stdout.write(f"  {'DiceEngine.roll_batch':<24}{vectorized * 1000:10.1f} ms")
+        if vectorized > 0:
+            self.stdout.write(self.style.SUCCESS(f"  Speedup: {legacy / vectorized:.1f}x"))
@@ -10,6 +10,16 @@ Exports:
 - Journals
 - XP requests
 - Setting elements
+- Scene posts (NDJSON format only)
+
+The default JSON format builds the whole export in memory. The NDJSON format
+(see core.chronicle_archive) streams one record per line a chunk of rows at a
+time, so memory use stays flat however many posts the chronicle has.
+
+Usage:
+    python manage.py export_chronicle 3
+    python manage.py export_chronicle 3 --format ndjson --compress
+    python manage.py export_chronicle 3 --format ndjson --chunk-size 5000
 """
 
 import json
@@ -18,9 +28,11 @@ from datetime import date, datetime
 from django.core.management.base import BaseCommand, CommandError
 from django.core.serializers import serialize
 
+from core.chronicle_archive import DEFAULT_CHUNK_SIZE, ArchiveWriter, open_archive
 from game.models import (
     Chronicle,
     Journal,
+    Post,
     Scene,
     StoryXPRequest,
     WeeklyXPRequest,
@@ -56,6 +68,23 @@ class Command(BaseCommand):
             action="store_true",
             help="Pretty-print JSON output",
         )
+        parser.add_argument(
+            "--format",
+            choices=["json", "ndjson"],
+            default="json",
+            help="json: single document (default); ndjson: streamed, one record per line",
+        )
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Gzip the output file",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows fetched per query in ndjson format (default: {DEFAULT_CHUNK_SIZE})",
+        )
 
     def handle(self, *args, **options):
         chronicle_id = options["chronicle_id"]
@@ -70,7 +99,41 @@ class Command(BaseCommand):
             self.style.SUCCESS(f"\nExporting chronicle: {chronicle.name} (ID: {chronicle_id})\n")
         )
 
-        # Build export data
+        # Generate filename
+        extension = "ndjson" if options["format"] == "ndjson" else "json"
+        if options["output"]:
+            filename = options["output"]
+        else:
+            safe_name = "".join(c if c.isalnum() else "_" for c in chronicle.name)
+            filename = f"chronicle_{chronicle_id}_{safe_name}_{date.today()}.{extension}"
+        if options["compress"] and not filename.endswith(".gz"):
+            filename += ".gz"
+
+        if options["format"] == "ndjson":
+            counts = self.write_archive(chronicle, filename, options)
+        else:
+            counts = self.write_json(chronicle, filename, options)
+
+        # Summary
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write(self.style.SUCCESS("EXPORT SUMMARY"))
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Chronicle: {chronicle.name}")
+        self.stdout.write(f"Characters: {counts.get('characters', 0)}")
+        self.stdout.write(f"Items: {counts.get('items', 0)}")
+        self.stdout.write(f"Locations: {counts.get('locations', 0)}")
+        if not options["exclude_scenes"]:
+            self.stdout.write(f"Scenes: {counts.get('scenes', 0)}")
+            self.stdout.write(f"Journals: {counts.get('journals', 0)}")
+            if "posts" in counts:
+                self.stdout.write(f"Posts: {counts['posts']}")
+        xp_requests = counts.get("weekly_xp_requests", 0) + counts.get("story_xp_requests", 0)
+        self.stdout.write(f"XP Requests: {xp_requests}")
+        self.stdout.write("=" * 70)
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Export complete: {filename}\n"))
+
+    def write_json(self, chronicle, filename, options):
+        """Build the whole export as one JSON document and write it."""
         export_data = {
             "export_date": datetime.now().isoformat(),
             "export_version": "1.0",
@@ -92,34 +155,75 @@ class Command(BaseCommand):
         if options["include_users"]:
             export_data["users"] = self.export_users(chronicle)
 
-        # Generate filename
-        if options["output"]:
-            filename = options["output"]
-        else:
-            safe_name = "".join(c if c.isalnum() else "_" for c in chronicle.name)
-            filename = f"chronicle_{chronicle_id}_{safe_name}_{date.today()}.json"
-
-        # Write to file
-        with open(filename, "w") as f:
+        with open_archive(filename, "w") as f:
             if options["pretty"]:
                 json.dump(export_data, f, indent=2, default=str)
             else:
                 json.dump(export_data, f, default=str)
 
-        # Summary
-        self.stdout.write("\n" + "=" * 70)
-        self.stdout.write(self.style.SUCCESS("EXPORT SUMMARY"))
-        self.stdout.write("=" * 70)
-        self.stdout.write(f"Chronicle: {chronicle.name}")
-        self.stdout.write(f"Characters: {len(export_data['characters'])}")
-        self.stdout.write(f"Items: {len(export_data['items'])}")
-        self.stdout.write(f"Locations: {len(export_data['locations'])}")
+        counts = {
+            section: len(export_data[section])
+            for section in ("characters", "items", "locations", "scenes", "journals")
+            if section in export_data
+        }
+        counts["weekly_xp_requests"] = len(export_data["xp_requests"]["weekly"])
+        counts["story_xp_requests"] = len(export_data["xp_requests"]["story"])
+        return counts
+
+    def write_archive(self, chronicle, filename, options):
+        """Stream the export to an NDJSON archive, one section at a time."""
+        with open_archive(filename, "w") as fh:
+            writer = ArchiveWriter(fh, options["chunk_size"], progress=self.report_progress)
+            writer.write_header(export_date=datetime.now().isoformat(), chronicle_id=chronicle.pk)
+            writer.write(
+                {
+                    "type": "chronicle",
+                    "object": json.loads(serialize("json", [chronicle]))[0],
+                    "storytellers": list(chronicle.storytellers.values_list("username", flat=True)),
+                }
+            )
+            for section, queryset in self.archive_sections(chronicle, options):
+                self.stdout.write(f"Exporting {section}...")
+                writer.write_queryset(section, queryset)
+        return writer.counts
+
+    def archive_sections(self, chronicle, options):
+        """(section, queryset) pairs in the order import needs them."""
+        from django.contrib.auth.models import User
+
+        from characters.models.core.character import CharacterModel
+        from items.models.core.item import ItemModel
+        from locations.models.core.location import LocationModel
+
+        characters = CharacterModel.objects.filter(chronicle=chronicle)
+        sections = []
+        if options["include_users"]:
+            user_ids = set(chronicle.storytellers.values_list("id", flat=True))
+            user_ids.update(
+                characters.exclude(owner__isnull=True).values_list("owner_id", flat=True)
+            )
+            sections.append(("users", User.objects.filter(id__in=user_ids)))
+        sections += [
+            ("setting_elements", chronicle.common_knowledge_elements.all()),
+            ("locations", LocationModel.objects.filter(chronicle=chronicle)),
+            ("characters", characters),
+            ("items", ItemModel.objects.filter(chronicle=chronicle)),
+        ]
         if not options["exclude_scenes"]:
-            self.stdout.write(f"Scenes: {len(export_data['scenes'])}")
-            self.stdout.write(f"Journals: {len(export_data['journals'])}")
-        self.stdout.write(f"XP Requests: {len(export_data['xp_requests'])}")
-        self.stdout.write("=" * 70)
-        self.stdout.write(self.style.SUCCESS(f"\n✓ Export complete: {filename}\n"))
+            sections += [
+                ("scenes", Scene.objects.filter(chronicle=chronicle)),
+                ("posts", Post.objects.filter(scene__chronicle=chronicle)),
+                ("journals", Journal.objects.filter(character__chronicle=chronicle)),
+            ]
+        character_ids = characters.values("id")
+        sections += [
+            ("weekly_xp_requests", WeeklyXPRequest.objects.filter(character_id__in=character_ids)),
+            ("story_xp_requests", StoryXPRequest.objects.filter(character_id__in=character_ids)),
+        ]
+        return sections
+
+    def report_progress(self, section, count):
+        self.stdout.write(f"  {section}: {count} written")
 
     def export_chronicle(self, chronicle):
         """Export chronicle data."""
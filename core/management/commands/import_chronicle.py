@@ -1,16 +1,27 @@
 """
 Management command to import a chronicle from JSON export.
 
-Imports all data exported by export_chronicle command.
+Imports all data exported by export_chronicle command. Legacy JSON exports
+are loaded whole; NDJSON archives (export_chronicle --format ndjson) are read
+a record at a time and their scenes and posts are created with bulk_create in
+batches, with foreign keys remapped from exported to new primary keys.
+
+Usage:
+    python manage.py import_chronicle chronicle_3.json
+    python manage.py import_chronicle chronicle_3.ndjson.gz --batch-size 5000
 """
 
 import json
 import logging
+import os
+from collections import defaultdict
 
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from core.chronicle_archive import DEFAULT_CHUNK_SIZE, is_archive, open_archive, read_archive
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,13 +49,22 @@ class Command(BaseCommand):
             type=str,
             help="JSON file mapping old usernames to new usernames",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows per bulk insert for NDJSON archives (default: {DEFAULT_CHUNK_SIZE})",
+        )
 
     def handle(self, *args, **options):
         filename = options["filename"]
 
+        if os.path.exists(filename) and is_archive(filename):
+            return self.handle_archive(filename, options)
+
         # Load import file
         try:
-            with open(filename) as f:
+            with open_archive(filename, "r") as f:
                 import_data = json.load(f)
         except FileNotFoundError:
             raise CommandError(f"File not found: {filename}")
@@ -55,11 +75,7 @@ class Command(BaseCommand):
         if "chronicle" not in import_data:
             raise CommandError("Invalid import file: missing chronicle data")
 
-        # Load user remapping if provided
-        user_map = {}
-        if options["remap_users"]:
-            with open(options["remap_users"]) as f:
-                user_map = json.load(f)
+        user_map = self.load_user_map(options)
 
         # Display summary
         self.stdout.write("\n" + "=" * 70)
@@ -88,6 +104,191 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS("\n✓ Import complete!\n"))
 
+    def load_user_map(self, options):
+        """Load user remapping if provided."""
+        user_map = {}
+        if options["remap_users"]:
+            with open(options["remap_users"]) as f:
+                user_map = json.load(f)
+        return user_map
+
+    def handle_archive(self, filename, options):
+        """Import a streaming NDJSON archive."""
+        user_map = self.load_user_map(options)
+
+        if options["dry_run"]:
+            header, counts = self.count_archive(filename)
+            self.write_archive_summary(header, counts)
+            self.stdout.write(self.style.WARNING("[DRY RUN] No data was actually imported"))
+            return
+
+        try:
+            with transaction.atomic():
+                header, counts = self.import_archive(filename, options, user_map)
+        except Exception as e:
+            logger.error(f"Chronicle import failed: {e}", exc_info=True)
+            raise CommandError(f"Import failed: {e}") from e
+
+        self.write_archive_summary(header, counts)
+        self.stdout.write(self.style.SUCCESS("\n✓ Import complete!\n"))
+
+    def count_archive(self, filename):
+        """Stream an archive and count its records per section."""
+        header = {}
+        counts = defaultdict(int)
+        try:
+            with open_archive(filename, "r") as fh:
+                for record in read_archive(fh):
+                    if record["type"] == "header":
+                        header = record
+                    elif record["type"] == "object":
+                        counts[record["section"]] += 1
+        except ValueError as e:
+            raise CommandError(f"Invalid archive file: {e}") from e
+        return header, counts
+
+    def write_archive_summary(self, header, counts):
+        self.stdout.write("\n" + "=" * 70)
+        self.stdout.write(self.style.SUCCESS("IMPORT SUMMARY"))
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"Export Date: {header.get('export_date', 'Unknown')}")
+        self.stdout.write(f"Export Version: {header.get('export_version', 'Unknown')}")
+        for section, count in counts.items():
+            self.stdout.write(f"{section.replace('_', ' ').title()}: {count}")
+        self.stdout.write("=" * 70 + "\n")
+
+    def import_archive(self, filename, options, user_map):
+        """
+        Stream an archive into the database.
+
+        Records of a section arrive together, so they are buffered and flushed
+        whenever the batch fills or the section changes. self.pk_map records
+        exported pk -> new pk per model so later sections can remap their
+        foreign keys.
+        """
+        self.pk_map = defaultdict(dict)
+        self.unmapped = defaultdict(int)
+        batch_size = options["batch_size"]
+        header = {}
+        counts = defaultdict(int)
+        chronicle = None
+        section, batch = None, []
+
+        def flush():
+            if batch:
+                self.import_archive_batch(section, batch, chronicle, options, user_map)
+                counts[section] += len(batch)
+                self.stdout.write(f"  {section}: {counts[section]} read")
+                batch.clear()
+
+        with open_archive(filename, "r") as fh:
+            for record in read_archive(fh):
+                if record["type"] == "header":
+                    header = record
+                elif record["type"] == "chronicle":
+                    chronicle = self.import_chronicle(
+                        {**record["object"], "storytellers": record.get("storytellers", [])},
+                        user_map,
+                    )
+                elif record["type"] == "object":
+                    if record["section"] != section or len(batch) >= batch_size:
+                        flush()
+                        section = record["section"]
+                    batch.append(record["object"])
+            flush()
+
+        if chronicle is None:
+            raise CommandError("Invalid import file: missing chronicle data")
+
+        # bulk_create sends no post_save, so refresh the counts scenes feed
+        from accounts import notifications
+
+        notifications.mark_stale(notifications.CHRONICLE, [chronicle.pk], ["scene_xp_requests"])
+        notifications.mark_stale(notifications.STORYTELLERS, None, ["scenes_needing_attention"])
+        for section in ("characters", "items", "locations"):
+            if counts.get(section):
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"  {section.title()} import is complex and requires manual review"
+                    )
+                )
+        for (label, field_name), count in sorted(self.unmapped.items()):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  {count} {label}.{field_name} reference(s) point to objects that "
+                    "weren't imported and were cleared"
+                )
+            )
+        return header, counts
+
+    def import_archive_batch(self, section, objects, chronicle, options, user_map):
+        """Import one batch of serialized objects from an archive section."""
+        from game.models import Post, Scene
+
+        if section == "users":
+            if not options["skip_users"]:
+                self.import_users(objects, user_map)
+        elif section == "setting_elements":
+            self.import_setting_elements(objects, chronicle)
+        elif section == "scenes":
+            self.bulk_import(Scene, objects, chronicle=chronicle)
+        elif section == "posts":
+            posts = [self.build_instance(Post, data) for data in objects]
+            for post in posts:
+                post.render_html()
+            self.bulk_import(Post, objects, instances=posts)
+        # Characters, items, locations, journals and XP requests are counted
+        # but, as with legacy exports, need manual review
+
+    def build_instance(self, model, data, **overrides):
+        """
+        Build an unsaved instance from a serialized object.
+
+        Foreign keys are remapped through self.pk_map; references to objects
+        that weren't imported become None and are counted in self.unmapped.
+        """
+        kwargs = {}
+        fields = data["fields"]
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.name not in fields or field.name in overrides:
+                continue
+            value = fields[field.name]
+            if field.is_relation:
+                mapped = self.pk_map[field.related_model._meta.label_lower].get(value)
+                if value is not None and mapped is None:
+                    self.unmapped[(model._meta.label_lower, field.name)] += 1
+                value = mapped
+            else:
+                value = field.to_python(value)
+            kwargs[field.attname] = value
+        kwargs.update(overrides)
+        return model(**kwargs)
+
+    def bulk_import(self, model, objects, instances=None, **overrides):
+        """bulk_create a batch and record its exported -> new pk mapping."""
+        if instances is None:
+            instances = [self.build_instance(model, data, **overrides) for data in objects]
+        created = model.objects.bulk_create(instances)
+        label = model._meta.label_lower
+        for data, instance in zip(objects, created, strict=True):
+            self.pk_map[label][data["pk"]] = instance.pk
+
+        # bulk_create stamps auto_now_add fields (Scene.date_played) with
+        # today, so put the exported values back
+        stamped = [
+            field
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now_add", False) or getattr(field, "auto_now", False)
+        ]
+        restored = set()
+        for data, instance in zip(objects, created, strict=True):
+            for field in stamped:
+                if data["fields"].get(field.name) is not None:
+                    setattr(instance, field.attname, field.to_python(data["fields"][field.name]))
+                    restored.add(field.name)
+        if restored:
+            model.objects.bulk_update(created, sorted(restored))
+
     def import_data(self, data, options, user_map):
         """Import all data."""
         # Import users first if included and not skipped
@@ -0,0 +1,253 @@
+"""
+Management command to load test scene chat across several worker processes.
+
+Each worker process opens its share of simulated websocket clients against
+the real SceneChatConsumer, every client sends a presence heartbeat, and the
+first worker posts a burst of messages. A broadcast only reaches clients in
+other workers through the configured channel layer, so running with
+--workers 2 checks that the layer (Redis in production) actually fans out
+between processes, and reports delivery counts and latency.
+
+The clients connect to a throwaway copy of --scene with the same
+characters, chronicle and location, which is deleted along with its posts
+when the run ends, so the live scene is left untouched.
+
+Usage:
+    CHANNEL_REDIS_URL=redis://127.0.0.1:6379/0 \\
+        python manage.py loadtest_scene_chat --scene 12 --clients 100 --workers 2
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from game.models import Post, Scene, UserSceneReadStatus
+
+IN_MEMORY_LAYER = "channels.layers.InMemoryChannelLayer"
+
+
+async def _run_clients(worker, num_clients, members, num_messages, barrier, timeout):
+    """Drive num_clients websocket clients in this process. Returns a stats dict."""
+    from channels.routing import URLRouter
+    from channels.testing import WebsocketCommunicator
+
+    from game.routing import websocket_urlpatterns
+
+    application = URLRouter(websocket_urlpatterns)
+    scene_id, poster = members["scene_id"], members["poster"]
+    users = members["users"]
+
+    clients = []
+    for i in range(num_clients):
+        communicator = WebsocketCommunicator(application, f"/ws/scene/{scene_id}/")
+        communicator.scope["user"] = users[i % len(users)]
+        connected, _ = await communicator.connect(timeout=timeout)
+        if connected:
+            clients.append(communicator)
+
+    for client in clients:
+        await client.send_json_to({"type": "heartbeat"})
+
+    # Wait until every worker has connected before anyone posts
+    await asyncio.to_thread(barrier.wait)
+
+    expected = num_messages
+    if worker == 0 and clients:
+        for n in range(num_messages):
+            await clients[0].send_json_to(
+                {
+                    "type": "chat_message",
+                    "character_id": poster["character_id"],
+                    "message": f"loadtest {n} {time.time():.6f}",
+                }
+            )
+
+    async def receive_posts(client):
+        latencies = []
+        deadline = time.monotonic() + timeout
+        while len(latencies) < expected and time.monotonic() < deadline:
+            try:
+                event = await client.receive_json_from(timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+            if event.get("type") == "new_post" and event["post"]["message"].startswith("loadtest "):
+                sent_at = float(event["post"]["message"].split()[-1])
+                latencies.append(time.time() - sent_at)
+        return latencies
+
+    results = await asyncio.gather(*(receive_posts(client) for client in clients))
+
+    for client in clients:
+        await client.disconnect()
+
+    latencies = [latency for client_latencies in results for latency in client_latencies]
+    return {
+        "worker": worker,
+        "connected": len(clients),
+        "expected": expected * len(clients),
+        "received": len(latencies),
+        "latencies": latencies,
+    }
+
+
+def _worker(worker, num_clients, members, num_messages, barrier, timeout, queue):
+    # Each process needs its own database connections
+    connections.close_all()
+    stats = asyncio.run(_run_clients(worker, num_clients, members, num_messages, barrier, timeout))
+    queue.put(stats)
+
+
+class Command(BaseCommand):
+    help = "Load test scene chat with simulated websocket clients spread over worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scene",
+            type=int,
+            required=True,
+            help="ID of an active scene with at least one character",
+        )
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=20,
+            help="Total number of simulated clients (default: 20)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Number of worker processes to spread clients over (default: 2)",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=10,
+            help="Number of posts to broadcast (default: 10)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10.0,
+            help="Seconds to wait for connections and deliveries (default: 10)",
+        )
+
+    def handle(self, *args, **options):
+        num_clients = options["clients"]
+        num_workers = options["workers"]
+        num_messages = options["messages"]
+        timeout = options["timeout"]
+
+        if num_workers < 1 or num_clients < num_workers:
+            raise CommandError("Need at least one worker and one client per worker")
+
+        backend = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+        if num_workers > 1 and backend == IN_MEMORY_LAYER:
+            raise CommandError(
+                "The in-memory channel layer cannot reach other processes. "
+                "Set CHANNEL_REDIS_URL or run with --workers 1."
+            )
+
+        try:
+            scene = Scene.objects.get(pk=options["scene"])
+        except Scene.DoesNotExist:
+            raise CommandError(f"Scene {options['scene']} does not exist") from None
+        if scene.finished:
+            raise CommandError(f"Scene {scene.pk} is finished")
+
+        characters = list(scene.characters.select_related("owner"))
+        if not characters:
+            raise CommandError(f"Scene {scene.pk} has no characters to post as")
+        load_scene = Scene.objects.create(
+            name=f"Load test of {scene.name}"[:100],
+            chronicle=scene.chronicle,
+            location=scene.location,
+        )
+        load_scene.characters.add(*characters)
+        members = {
+            "scene_id": load_scene.pk,
+            "users": [character.owner for character in characters],
+            "poster": {"character_id": characters[0].pk},
+        }
+
+        self.stdout.write(
+            f"Connecting {num_clients} clients to a copy of scene {scene.pk} over "
+            f"{num_workers} worker(s) using {backend}...\n"
+        )
+
+        shares = [num_clients // num_workers] * num_workers
+        for i in range(num_clients % num_workers):
+            shares[i] += 1
+
+        try:
+            start = time.perf_counter()
+            if num_workers == 1:
+                stats = [
+                    asyncio.run(
+                        _run_clients(0, shares[0], members, num_messages, _NoBarrier(), timeout)
+                    )
+                ]
+            else:
+                stats = self._run_workers(shares, members, num_messages, timeout)
+            elapsed = time.perf_counter() - start
+        finally:
+            self._delete_scene(load_scene)
+
+        self._report(stats, elapsed)
+
+    def _delete_scene(self, scene):
+        # Posts and read statuses only null their scene, so delete them first
+        Post.objects.filter(scene=scene).delete()
+        UserSceneReadStatus.objects.filter(scene=scene).delete()
+        scene.delete()
+
+    def _run_workers(self, shares, members, num_messages, timeout):
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(len(shares))
+        queue = context.Queue()
+        connections.close_all()
+        processes = [
+            context.Process(
+                target=_worker,
+                args=(worker, share, members, num_messages, barrier, timeout, queue),
+            )
+            for worker, share in enumerate(shares)
+        ]
+        for process in processes:
+            process.start()
+        stats = [queue.get(timeout=timeout * 4) for _ in processes]
+        for process in processes:
+            process.join()
+        return sorted(stats, key=lambda s: s["worker"])
+
+    def _report(self, stats, elapsed):
+        latencies = sorted(latency for s in stats for latency in s["latencies"])
+        for s in stats:
+            self.stdout.write(
+                f"  worker {s['worker']}: {s['connected']} connected, "
+                f"{s['received']}/{s['expected']} posts delivered"
+            )
+
+        expected = sum(s["expected"] for s in stats)
+        received = sum(s["received"] for s in stats)
+        self.stdout.write(f"  total: {received}/{expected} deliveries in {elapsed:.2f}s")
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(f"  latency: p50 {p50 * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+
+        if received == expected:
+            self.stdout.write(self.style.SUCCESS("All broadcasts delivered"))
+        else:
+            self.stdout.write(self.style.ERROR(f"{expected - received} deliveries missing"))
+
+
+class _NoBarrier:
+    """Stand-in for multiprocessing.Barrier when everything runs in one process."""
+
+    def wait(self):
+        pass
@@ -19,11 +19,11 @@ import json
 from datetime import timedelta
 
 from django.core.management.base import BaseCommand
-from django.db.models import Avg, Count, F, Q
+from django.db.models import Avg, Count
 from django.utils import timezone
 
 from characters.models.core.character import Character
-from characters.models.core.human import Human
+from core.integrity import IntegrityScanner
 from game.models import Scene
 
 
@@ -84,17 +84,16 @@ class Command(BaseCommand):
             self.send_alerts(metrics)
 
     def check_data_integrity(self):
-        """Check for data integrity issues."""
+        """Check for data integrity issues, one scan query per table."""
+        report = IntegrityScanner().scan()
+        groups = report.by_group()
+        counts = {result.rule.name: result.count for result in report.results}
         issues = {
-            "negative_xp": Character.objects.filter(xp__lt=0).count(),
-            "invalid_status": Character.objects.exclude(
-                status__in=["Un", "Sub", "App", "Ret", "Dec"]
-            ).count(),
-            "attributes_out_of_range": self.count_attribute_issues(),
-            "abilities_out_of_range": self.count_ability_issues(),
-            "willpower_violations": Human.objects.filter(
-                temporary_willpower__gt=F("willpower")
-            ).count(),
+            "negative_xp": counts["negative_xp"],
+            "invalid_status": counts["invalid_status"],
+            "attributes_out_of_range": groups["attributes"],
+            "abilities_out_of_range": groups["abilities"],
+            "willpower_violations": counts["temporary_willpower_above_permanent"],
         }
 
         issues["total"] = sum(issues.values())
@@ -102,60 +101,6 @@ class Command(BaseCommand):
 
         return issues
 
-    def count_attribute_issues(self):
-        """Count characters with attributes outside valid range."""
-        count = 0
-        attributes = [
-            "strength",
-            "dexterity",
-            "stamina",
-            "perception",
-            "intelligence",
-            "wits",
-            "charisma",
-            "manipulation",
-            "appearance",
-        ]
-
-        for attr in attributes:
-            count += Human.objects.filter(
-                Q(**{f"{attr}__lt": 1}) | Q(**{f"{attr}__gt": 10})
-            ).count()
-
-        return count
-
-    def count_ability_issues(self):
-        """Count characters with abilities outside valid range."""
-        count = 0
-        abilities = [
-            "alertness",
-            "athletics",
-            "brawl",
-            "empathy",
-            "expression",
-            "intimidation",
-            "streetwise",
-            "subterfuge",
-            "crafts",
-            "drive",
-            "etiquette",
-            "firearms",
-            "melee",
-            "stealth",
-            "academics",
-            "computer",
-            "investigation",
-            "medicine",
-            "science",
-        ]
-
-        for ability in abilities:
-            count += Human.objects.filter(
-                Q(**{f"{ability}__lt": 0}) | Q(**{f"{ability}__gt": 10})
-            ).count()
-
-        return count
-
     def check_xp_activity(self, since):
         """Check XP spending activity and patterns."""
         from game.models import XPSpendingRequest
@@ -3,13 +3,48 @@ Management command to populate the database with game data from populate_db/ dir
 
 This command recursively searches populate_db/ and all subdirectories for .py scripts
 and provides more control over data loading.
+
+Scripts are run through core.bulk_loader, which turns their get_or_create() rows
+into bulk inserts and updates; --no-bulk executes them statement by statement.
+Gameline subdirectories only depend on the main directory and core/, so with
+--jobs they are loaded in parallel once those have finished (not on SQLite,
+which allows a single writer). Parallel workers don't see each other's
+uncommitted rows, so the books and book references the parallel groups cite
+are created up front, and directories that get_or_create() the same rows
+(mage/ and werewolf/ both define spirits) are loaded by a single worker.
+
+A full run on an empty database loads the reference snapshot for the current
+populate_db/ hash instead, if one exists (see core.reference_snapshot);
+--write-snapshot saves one after the scripts have run on an empty database.
+
+Usage:
+    python manage.py populate_gamedata
+    python manage.py populate_gamedata --gameline mta --verbose
+    python manage.py populate_gamedata --jobs 4
+    python manage.py populate_gamedata --no-bulk
+    python manage.py populate_gamedata --write-snapshot
 """
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, groupby
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, connections, transaction
+
+from core.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader, literal_lookups, literal_sources
+from core.reference_snapshot import (
+    content_hash,
+    empty_tables,
+    find_snapshot,
+    load_snapshot,
+    reference_tables_empty,
+    snapshot_path,
+    write_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +79,33 @@ class Command(BaseCommand):
             action="store_true",
             help="Show detailed output for each file",
         )
+        parser.add_argument(
+            "--no-bulk",
+            action="store_true",
+            help="Execute scripts statement by statement instead of loading rows in bulk",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per bulk insert/update (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Load independent gameline directories in parallel (default: 1)",
+        )
+        parser.add_argument(
+            "--no-snapshot",
+            action="store_true",
+            help="Always run the scripts, even if a matching reference snapshot exists",
+        )
+        parser.add_argument(
+            "--write-snapshot",
+            action="store_true",
+            help="Write a reference snapshot after a full, error-free run",
+        )
 
     def get_sort_key(self, file, populate_dir):
         """
@@ -113,33 +175,191 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("\n[DRY RUN] No data was actually loaded"))
             return
 
+        full_run = not (options["gameline"] or options["only"] or options["skip"])
+        if full_run and not options["no_snapshot"] and self.load_from_snapshot(populate_dir):
+            return
+
         # Load each file
         self.stdout.write(self.style.SUCCESS("\nLoading data...\n"))
 
-        success_count = 0
-        error_count = 0
-
-        for file in files_to_load:
-            try:
-                self.load_file(file, populate_dir, options["verbose"])
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                relative_path = file.relative_to(populate_dir)
-                self.stdout.write(self.style.ERROR(f"✗ {relative_path}: {str(e)}"))
-                logger.error(f"Failed to load game data file {relative_path}: {e}", exc_info=True)
-                if options["verbose"]:
-                    import traceback
-
-                    self.stdout.write(traceback.format_exc())
+        self.options = options
+        self.success_count = 0
+        self.error_count = 0
+        self.output_lock = threading.Lock()
+        jobs = options["jobs"]
+        if jobs > 1 and connection.vendor == "sqlite":
+            self.stdout.write(
+                self.style.WARNING("SQLite allows a single writer; loading files sequentially")
+            )
+            jobs = 1
+
+        # Only tables the scripts filled from empty may go into a snapshot
+        empty_before = empty_tables() if options["write_snapshot"] else set()
+
+        start = time.perf_counter()
+        for parallel, groups in self.get_stages(files_to_load, populate_dir):
+            if parallel and jobs > 1 and len(groups) > 1:
+                groups = self.merge_shared_groups(groups, populate_dir)
+                self.create_sources(groups)
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    # list() re-raises anything a worker raised
+                    list(executor.map(lambda g: self.load_group_in_thread(g, populate_dir), groups))
+            else:
+                for group in groups:
+                    self.load_group(group, populate_dir)
+        elapsed = time.perf_counter() - start
 
         # Summary
         self.stdout.write("\n" + "=" * 60)
-        self.stdout.write(self.style.SUCCESS(f"Successfully loaded: {success_count} file(s)"))
-        if error_count > 0:
-            self.stdout.write(self.style.ERROR(f"Failed to load: {error_count} file(s)"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully loaded: {self.success_count} file(s) in {elapsed:.1f}s"
+            )
+        )
+        if self.error_count > 0:
+            self.stdout.write(self.style.ERROR(f"Failed to load: {self.error_count} file(s)"))
         self.stdout.write("=" * 60 + "\n")
 
+        if options["write_snapshot"]:
+            if full_run and self.error_count == 0:
+                digest = content_hash(populate_dir)
+                path = snapshot_path(digest)
+                try:
+                    tables = write_snapshot(path, digest, empty_before)
+                except ValueError as e:
+                    self.stdout.write(self.style.WARNING(f"Snapshot not written: {e}"))
+                    return
+                self.stdout.write(
+                    self.style.SUCCESS(f"✓ Wrote {sum(tables.values())} rows to {path}")
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING("Snapshot not written: it needs a full, error-free run")
+                )
+
+    def load_from_snapshot(self, populate_dir):
+        """Load the snapshot matching populate_dir into an empty database, if there is one."""
+        path = find_snapshot(populate_dir)
+        if path is None:
+            return False
+        if not reference_tables_empty(path):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"\nIgnoring snapshot {path.name}: reference tables already contain data"
+                )
+            )
+            return False
+
+        start = time.perf_counter()
+        tables = load_snapshot(path)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✓ Loaded {sum(tables.values())} rows from snapshot {path.name} "
+                f"in {elapsed:.1f}s"
+            )
+        )
+        return True
+
+    def get_stages(self, files, populate_dir):
+        """
+        Split sorted files into loading stages of (parallel, [file groups]).
+
+        The main directory, core/ and chronicles/ each load in order as one
+        group. Other subdirectories form one group each; a group loads its
+        files in order, and groups of the same stage may run in parallel once
+        merge_shared_groups() has combined the ones creating the same rows.
+        """
+        stages = []
+        for priority, files_at_priority in groupby(
+            files, key=lambda f: self.get_sort_key(f, populate_dir)[0]
+        ):
+            files_at_priority = list(files_at_priority)
+            if priority == 500:
+                groups = [
+                    list(group)
+                    for _, group in groupby(
+                        files_at_priority, key=lambda f: self.get_sort_key(f, populate_dir)[1]
+                    )
+                ]
+                stages.append((True, groups))
+            else:
+                stages.append((False, [files_at_priority]))
+        return stages
+
+    def merge_shared_groups(self, groups, populate_dir):
+        """
+        Combine groups whose scripts get_or_create() the same rows into one group.
+
+        Two workers would each insert such a row, just like a shared book page.
+        Only lookups with literal keyword arguments are compared.
+        """
+        merged = []
+        for files in groups:
+            lookups = set()
+            for file in files:
+                try:
+                    lookups |= literal_lookups(file.read_text(), str(file))
+                except SyntaxError:
+                    # load_file() reports the broken script
+                    continue
+            shared = [group for group in merged if group[1] & lookups]
+            for group in shared:
+                merged.remove(group)
+                files = files + group[0]
+                lookups |= group[1]
+            merged.append((files, lookups))
+        return [
+            sorted(files, key=lambda f: self.get_sort_key(f, populate_dir)) for files, _ in merged
+        ]
+
+    def create_sources(self, groups):
+        """
+        Create the books and book references cited by files about to load in parallel.
+
+        Two workers citing the same new page would each create it, and the
+        duplicate rows make add_source()'s get_or_create() raise
+        MultipleObjectsReturned from then on. Only add_source() calls with
+        literal arguments are collected.
+        """
+        sources = set()
+        for file in chain.from_iterable(groups):
+            try:
+                sources |= literal_sources(file.read_text(), str(file))
+            except SyntaxError:
+                # load_file() reports the broken script
+                continue
+        loader = BulkLoader(batch_size=self.options.get("batch_size", DEFAULT_BATCH_SIZE))
+        with transaction.atomic():
+            loader.create_sources(sources)
+
+    def load_group(self, files, populate_dir):
+        """Load files in order, reporting failures without stopping."""
+        for file in files:
+            try:
+                self.load_file(file, populate_dir, self.options["verbose"])
+                with self.output_lock:
+                    self.success_count += 1
+            except Exception as e:
+                relative_path = file.relative_to(populate_dir)
+                with self.output_lock:
+                    self.error_count += 1
+                    self.stdout.write(self.style.ERROR(f"✗ {relative_path}: {str(e)}"))
+                    logger.error(
+                        f"Failed to load game data file {relative_path}: {e}", exc_info=True
+                    )
+                    if self.options["verbose"]:
+                        import traceback
+
+                        self.stdout.write(traceback.format_exc())
+
+    def load_group_in_thread(self, files, populate_dir):
+        """Load a group on a worker thread, which gets its own database connection."""
+        try:
+            self.load_group(files, populate_dir)
+        finally:
+            connections.close_all()
+
     def filter_files(self, files, options):
         """Filter files based on command-line options."""
         filtered = list(files)
@@ -185,21 +405,31 @@ class Command(BaseCommand):
         return any(gl in stem for gl in gamelines)
 
     def load_file(self, file, populate_dir, verbose=False):
-        """Execute a populate script file."""
+        """Execute a populate script file, reporting how long it took."""
         relative_path = file.relative_to(populate_dir)
-
-        if verbose:
-            self.stdout.write(f"Loading {relative_path}...", ending="")
+        options = self.options
 
         # Read and execute the file
         with open(file) as f:
             code = f.read()
 
+        start = time.perf_counter()
+        loader = None
         # Execute in a transaction for safety
         with transaction.atomic():
-            exec(code, {"__name__": "__main__"})
-
-        if verbose:
-            self.stdout.write(self.style.SUCCESS(" ✓"))
-        else:
-            self.stdout.write(f"✓ {relative_path}")
+            if options.get("no_bulk"):
+                exec(code, {"__name__": "__main__"})
+            else:
+                loader = BulkLoader(batch_size=options.get("batch_size", DEFAULT_BATCH_SIZE))
+                loader.run(code, str(file))
+        elapsed = time.perf_counter() - start
+
+        line = f"✓ {relative_path} ({elapsed:.2f}s)"
+        if verbose and loader is not None:
+            counts = loader.counts
+            line += (
+                f" - {counts['created']} created, {counts['updated']} updated,"
+                f" {counts['direct']} via get_or_create"
+            )
+        with self.output_lock:
+            self.stdout.write(line)
@@ -3,6 +3,15 @@ Management command to process weekly XP for characters.
 
 Creates Week objects and generates WeeklyXPRequest objects for characters
 who participated in finished scenes during the week.
+
+Characters are streamed in batches; each batch costs a fixed number of
+queries however many characters it holds.
+
+Usage:
+    python manage.py process_weekly_xp                          # Last week, all chronicles
+    python manage.py process_weekly_xp --week-ending 2024-01-14
+    python manage.py process_weekly_xp --chronicle 3 --auto-approve
+    python manage.py process_weekly_xp --batch-size 200
 """
 
 from datetime import timedelta
@@ -39,6 +48,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be created without actually creating it",
         )
+        parser.add_argument(
+            "--chronicle",
+            type=int,
+            help="Only process characters in this chronicle (by ID)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of characters to process per batch (default: 500)",
+        )
 
     def handle(self, *args, **options):
         """Execute the process_weekly_xp command.
@@ -123,84 +143,93 @@ class Command(BaseCommand):
                 .order_by("name")
             )
 
+        if options["chronicle"]:
+            characters = characters.filter(chronicle_id=options["chronicle"])
+
         # Display summary
+        character_count = characters.count()
         self.stdout.write("\n" + "=" * 70)
         self.stdout.write(self.style.SUCCESS("WEEKLY XP PROCESSING"))
         self.stdout.write("=" * 70)
         self.stdout.write(f"Week: {week_ending - timedelta(days=7)} to {week_ending}")
-        self.stdout.write(f"Characters participating: {characters.count()}")
+        self.stdout.write(f"Characters participating: {character_count}")
         self.stdout.write("=" * 70 + "\n")
 
-        if not characters.exists():
+        if not character_count:
             self.stdout.write(self.style.WARNING("No characters participated in scenes this week."))
             return
 
-        # Create XP requests for each character
-        created_count = 0
-        existing_count = 0
-        approved_count = 0
+        # Create XP requests a batch at a time
+        self.created_count = 0
+        self.existing_count = 0
+        self.approved_count = 0
 
-        for character in characters:
-            # Check if request already exists
-            if not self.dry_run:
-                existing = WeeklyXPRequest.objects.filter(week=week, character=character).first()
-
-                if existing:
-                    existing_count += 1
-                    self.stdout.write(
-                        f"  ≈ {character.name}: Request already exists (ID: {existing.id})"
-                    )
-                    continue
-
-            # Create request
-            if self.dry_run:
-                self.stdout.write(
-                    self.style.WARNING(f"  [DRY RUN] Would create XP request for {character.name}")
-                )
-                created_count += 1
-            else:
-                # Use atomic transaction for request creation and auto-approval
-                with transaction.atomic():
-                    request = WeeklyXPRequest.objects.create(
-                        week=week,
-                        character=character,
-                        finishing=True,  # Default to just finishing XP
-                        approved=self.auto_approve,
-                    )
-                    created_count += 1
-
-                    if self.auto_approve:
-                        approved_count += 1
-                        # Award XP to character
-                        character.add_xp(request.total_xp())
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"  ✓ {character.name}: Created and approved "
-                                f"(+{request.total_xp()} XP)"
-                            )
-                        )
-                    else:
-                        self.stdout.write(
-                            f"  ✓ {character.name}: Created request (ID: {request.id})"
-                        )
+        for batch in self.batches(characters, options["batch_size"]):
+            self.process_batch(week, batch)
 
         # Summary
         self.stdout.write("\n" + "=" * 70)
         self.stdout.write(self.style.SUCCESS("PROCESSING COMPLETE"))
         self.stdout.write("=" * 70)
-        self.stdout.write(f"Created: {created_count} request(s)")
-        if existing_count > 0:
-            self.stdout.write(f"Already existed: {existing_count} request(s)")
-        if approved_count > 0:
-            self.stdout.write(f"Auto-approved: {approved_count} request(s)")
+        self.stdout.write(f"Created: {self.created_count} request(s)")
+        if self.existing_count > 0:
+            self.stdout.write(f"Already existed: {self.existing_count} request(s)")
+        if self.approved_count > 0:
+            self.stdout.write(f"Auto-approved: {self.approved_count} request(s)")
         self.stdout.write("=" * 70 + "\n")
 
         if self.dry_run:
             self.stdout.write(self.style.WARNING("[DRY RUN] No data was actually created"))
 
         # Send notifications if requested
-        if options["notify"] and not self.dry_run and created_count > 0:
-            self.send_notifications(week, created_count)
+        if options["notify"] and not self.dry_run and self.created_count > 0:
+            self.send_notifications(week, self.created_count)
+
+    def batches(self, characters, batch_size):
+        """Stream characters from the database in lists of batch_size."""
+        batch = []
+        for character in characters.iterator(chunk_size=batch_size):
+            batch.append(character)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def process_batch(self, week, characters):
+        """Create (and optionally approve) requests for one batch of characters."""
+        if self.dry_run:
+            for character in characters:
+                self.stdout.write(
+                    self.style.WARNING(f"  [DRY RUN] Would create XP request for {character.name}")
+                )
+            self.created_count += len(characters)
+            return
+
+        with transaction.atomic():
+            created = WeeklyXPRequest.objects.create_for_week(week, characters)
+            if self.auto_approve and created:
+                WeeklyXPRequest.objects.filter(pk__in=[r.pk for r in created]).approve_all()
+                for request in created:
+                    request.approved = True
+
+        created_by_character = {request.character_id: request for request in created}
+        for character in characters:
+            request = created_by_character.get(character.pk)
+            if request is None:
+                self.existing_count += 1
+                self.stdout.write(f"  ≈ {character.name}: Request already exists")
+            elif self.auto_approve:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"  ✓ {character.name}: Created and approved (+{request.total_xp()} XP)"
+                    )
+                )
+            else:
+                self.stdout.write(f"  ✓ {character.name}: Created request (ID: {request.id})")
+        self.created_count += len(created)
+        if self.auto_approve:
+            self.approved_count += len(created)
 
     def send_notifications(self, week, count):
         """Send notifications to STs about pending requests."""
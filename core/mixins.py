@@ -138,7 +138,10 @@ class VisibilityFilterMixin:
     def get_queryset(self):
         """Filter queryset to only viewable objects."""
         qs = super().get_queryset()
-        return PermissionManager.filter_queryset_for_user(self.request.user, qs)
+        user = self.request.user
+        if user.is_authenticated and hasattr(qs, "viewable_by"):
+            return qs.viewable_by(user)
+        return PermissionManager.filter_queryset_for_user(user, qs)
 
     def get_context_data(self, **kwargs):
         """Add visibility tier to context."""
@@ -146,6 +149,8 @@ class VisibilityFilterMixin:
 
         # For detail views, add visibility information
         if hasattr(self, "object") and self.object:
+            # Resolve the user's roles once for all of the checks below
+            PermissionManager.for_request(self.request)
             context["visibility_tier"] = PermissionManager.get_visibility_tier(
                 self.request.user, self.object
             )
@@ -777,6 +782,10 @@ class XPApprovalMixin(ApprovalMixin):
     request_key_prefix = "xp_request_"
     spending_type = "XP spending"
 
+    def get_queryset(self):
+        """Load the character with its XP ledger for the sheet's spent/pending totals."""
+        return super().get_queryset().with_xp_ledger()
+
     def get_service_factory(self):
         from characters.services.xp_spending import XPSpendingServiceFactory
 
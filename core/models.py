@@ -80,6 +80,23 @@ class ModelQuerySet(PolymorphicQuerySet):
         """Objects in any of the user's chronicles"""
         return self.filter(chronicle__in=user.chronicle_set.all())
 
+    def viewable_by(self, user, tier=None):
+        """
+        Objects the user can view, resolved entirely in SQL.
+
+        Equivalent to filtering with PermissionManager.user_can_view() object
+        by object (or get_visibility_tier() >= tier), so list views can
+        paginate in the database.
+        """
+        from core.permissions import PermissionManager, VisibilityTier
+
+        view_filter = PermissionManager.build_view_filter(
+            user, self.model, tier or VisibilityTier.PARTIAL
+        )
+        if view_filter is None:
+            return self
+        return self.filter(view_filter)
+
 
 # Create custom manager with ModelQuerySet methods
 class ModelManager(PolymorphicManager.from_queryset(ModelQuerySet)):
@@ -111,6 +111,10 @@ class PermissionManager:
         Returns:
             Set of Role enums
         """
+        resolver = getattr(user, "_role_resolver", None)
+        if resolver is not None:
+            return resolver.get_user_roles(obj)
+
         roles = set()
 
         # Anonymous check
@@ -171,6 +175,42 @@ class PermissionManager:
 
         return roles
 
+    @staticmethod
+    def get_user_roles_many(user: User, objs) -> dict:
+        """
+        Determine roles for many objects at once.
+
+        Loads the user's chronicle memberships and observer grants with a
+        fixed number of queries, then resolves every object in memory.
+        Intended for list views that need per-row permission checks.
+
+        Args:
+            user: Django User instance
+            objs: Iterable of objects to check
+
+        Returns:
+            Dict mapping each object to its set of Role enums
+        """
+        resolver = getattr(user, "_role_resolver", None) or RoleResolver(user)
+        return resolver.get_user_roles_many(objs)
+
+    @staticmethod
+    def for_request(request) -> "RoleResolver":
+        """
+        Enable role memoization for the rest of the request.
+
+        Attaches a RoleResolver to request.user, which lives exactly as long
+        as the request. Once attached, every PermissionManager check for that
+        user is answered from the prefetched relationships instead of issuing
+        per-object queries.
+        """
+        user = request.user
+        resolver = getattr(user, "_role_resolver", None)
+        if resolver is None:
+            resolver = RoleResolver(user)
+            user._role_resolver = resolver
+        return resolver
+
     @staticmethod
     def user_has_permission(
         user: User, obj, permission: Permission, status_aware: bool = True
@@ -410,6 +450,126 @@ class PermissionManager:
 
         return filters
 
+    @staticmethod
+    def _roles_for_tier(tier: VisibilityTier) -> set[Role]:
+        """Roles whose permissions grant at least the given visibility tier."""
+        if tier == VisibilityTier.FULL:
+            wanted = {Permission.VIEW_FULL}
+        else:
+            wanted = {Permission.VIEW_FULL, Permission.VIEW_PARTIAL}
+        return {
+            role
+            for role, permissions in PermissionManager.ROLE_PERMISSIONS.items()
+            if permissions & wanted
+        }
+
+    @staticmethod
+    def _observer_content_types(model) -> list:
+        """Content types an Observer row may use for instances of model.
+
+        Observers are keyed on the instance's concrete class, so polymorphic
+        querysets must match the content types of every subclass as well.
+        """
+        from django.apps import apps
+
+        models = [m for m in apps.get_models() if issubclass(m, model)]
+        return list(ContentType.objects.get_for_models(*models).values())
+
+    @staticmethod
+    def _build_role_filter(role: Role, user: User, model) -> Q | None:
+        """
+        Build the Q filter selecting objects where user holds role.
+
+        Mirrors the checks in get_user_roles() so that a queryset filtered
+        with it agrees with the per-object path. Returns None when the role
+        cannot apply to this model.
+        """
+        from game.models import Chronicle
+
+        has_field = PermissionManager._model_has_field
+        has_chronicle = has_field(model, "chronicle")
+
+        if role == Role.OWNER:
+            filters = []
+            if has_field(model, "owner"):
+                filters.append(Q(owner=user))
+            if has_field(model, "user"):
+                filters.append(Q(user=user))
+            if has_field(model, "owned_by"):
+                owned_by = model._meta.get_field("owned_by")
+                if owned_by.many_to_one and has_field(owned_by.related_model, "owner"):
+                    # For locations owned through characters
+                    filters.append(Q(owned_by__owner=user))
+            if not filters:
+                return None
+            combined = filters[0]
+            for q in filters[1:]:
+                combined |= q
+            return combined
+
+        if role == Role.CHRONICLE_HEAD_ST and has_chronicle:
+            chronicles = Chronicle.objects.filter(Q(head_st=user) | Q(storytellers=user))
+            return Q(chronicle__in=chronicles.values("pk"))
+
+        if role == Role.GAME_ST and has_chronicle:
+            chronicles = Chronicle.objects.filter(game_storytellers=user)
+            return Q(chronicle__in=chronicles.values("pk"))
+
+        if role == Role.PLAYER and has_chronicle and has_field(model, "status"):
+            from characters.models.core.character import Character
+
+            # Players see approved objects in chronicles where they have an
+            # approved character, as in filter_queryset_for_user()
+            player_chronicles = Character.objects.filter(
+                owner=user, status="App", chronicle__isnull=False
+            ).values("chronicle")
+            return Q(chronicle__in=player_chronicles, status="App")
+
+        if role == Role.OBSERVER and has_field(model, "observers"):
+            from core.models import Observer
+
+            observed = Observer.objects.filter(
+                user=user,
+                content_type__in=PermissionManager._observer_content_types(model),
+            ).values("object_id")
+            return Q(pk__in=observed)
+
+        return None
+
+    @staticmethod
+    def build_view_filter(
+        user: User, model, tier: VisibilityTier = VisibilityTier.PARTIAL
+    ) -> Q | None:
+        """
+        Compile ROLE_PERMISSIONS into a single Q selecting viewable objects.
+
+        Every role that grants VIEW_FULL (or VIEW_PARTIAL, for the partial
+        tier) contributes one clause; relationship lookups are expressed as
+        subqueries so the whole check runs inside the list query and needs
+        no DISTINCT.
+
+        Args:
+            user: Django User instance
+            model: Model class being listed
+            tier: Minimum VisibilityTier the user must have
+
+        Returns:
+            Q object, or None if the user can view every object (admins)
+        """
+        if not user.is_authenticated:
+            return Q(pk__in=[])
+
+        roles = PermissionManager._roles_for_tier(tier)
+        if Role.ADMIN in roles and (user.is_superuser or user.is_staff):
+            return None
+
+        filters = Q(pk__in=[])
+        for role in sorted(roles, key=lambda r: r.value):
+            role_filter = PermissionManager._build_role_filter(role, user, model)
+            if role_filter is not None:
+                filters |= role_filter
+        return filters
+
     @staticmethod
     def filter_queryset_for_user(user: User, queryset):
         """
@@ -480,3 +640,134 @@ class PermissionManager:
             filters |= Q(pk__in=observed_ids)
 
         return queryset.filter(filters).distinct()
+
+
+class RoleResolver:
+    """
+    Memoizing role resolver for a single user.
+
+    Mirrors PermissionManager.get_user_roles(), but loads the user's head ST,
+    storyteller, game ST, player and observer relationships once and then
+    resolves roles for any object without further queries. Results are cached
+    per object, so a resolver should not outlive the request it was built for.
+
+    Usage:
+        PermissionManager.for_request(request)
+        PermissionManager.user_can_view(request.user, character)  # no queries
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+        self._memberships = None
+        self._roles_cache = {}
+
+    def _load_memberships(self) -> dict:
+        """Fetch every chronicle and observer relationship for the user."""
+        if self._memberships is not None:
+            return self._memberships
+
+        from characters.models.core.character import Character, CharacterModel
+        from core.models import Observer
+        from game.models import Chronicle, STRelationship
+
+        user = self.user
+        game_st_through = Chronicle.game_storytellers.through
+        self._memberships = {
+            "head_st": set(Chronicle.objects.filter(head_st=user).values_list("pk", flat=True)),
+            "storyteller": set(
+                STRelationship.objects.filter(user=user).values_list("chronicle_id", flat=True)
+            ),
+            "game_st": set(
+                game_st_through.objects.filter(user=user).values_list("chronicle_id", flat=True)
+            ),
+            "player": set(
+                Character.objects.filter(owner=user)
+                .exclude(chronicle__isnull=True)
+                .values_list("chronicle_id", flat=True)
+            ),
+            "owned_characters": set(
+                CharacterModel.objects.filter(owner=user).values_list("pk", flat=True)
+            ),
+            "observed": set(
+                Observer.objects.filter(user=user).values_list("content_type_id", "object_id")
+            ),
+        }
+        return self._memberships
+
+    @staticmethod
+    def _cache_key(obj):
+        return (type(obj), obj.pk) if getattr(obj, "pk", None) is not None else id(obj)
+
+    def _is_owner(self, obj, memberships) -> bool:
+        user = self.user
+        if hasattr(obj, "owner_id"):
+            if obj.owner_id is not None and obj.owner_id == user.pk:
+                return True
+        elif hasattr(obj, "owner") and obj.owner == user:
+            return True
+        if hasattr(obj, "user_id"):
+            if obj.user_id is not None and obj.user_id == user.pk:
+                return True
+        elif hasattr(obj, "user") and obj.user == user:
+            return True
+        if hasattr(obj, "owned_by_id"):
+            # For locations owned through characters
+            return obj.owned_by_id in memberships["owned_characters"]
+        return bool(
+            hasattr(obj, "owned_by")
+            and obj.owned_by
+            and hasattr(obj.owned_by, "owner")
+            and obj.owned_by.owner == user
+        )
+
+    @staticmethod
+    def _chronicle_id(obj):
+        if hasattr(obj, "chronicle_id"):
+            return obj.chronicle_id
+        chronicle = getattr(obj, "chronicle", None)
+        return getattr(chronicle, "pk", None) if chronicle else None
+
+    def _resolve(self, obj) -> set[Role]:
+        user = self.user
+        roles = set()
+
+        if not user.is_authenticated:
+            roles.add(Role.ANONYMOUS)
+            return roles
+
+        roles.add(Role.AUTHENTICATED)
+
+        if user.is_superuser or user.is_staff:
+            roles.add(Role.ADMIN)
+
+        memberships = self._load_memberships()
+
+        if self._is_owner(obj, memberships):
+            roles.add(Role.OWNER)
+
+        chronicle_id = self._chronicle_id(obj)
+        if chronicle_id is not None:
+            if chronicle_id in memberships["head_st"] or chronicle_id in memberships["storyteller"]:
+                roles.add(Role.CHRONICLE_HEAD_ST)
+            if chronicle_id in memberships["game_st"]:
+                roles.add(Role.GAME_ST)
+            if chronicle_id in memberships["player"]:
+                roles.add(Role.PLAYER)
+
+        if hasattr(obj, "observers") and obj.pk is not None:
+            content_type_id = ContentType.objects.get_for_model(obj).pk
+            if (content_type_id, obj.pk) in memberships["observed"]:
+                roles.add(Role.OBSERVER)
+
+        return roles
+
+    def get_user_roles(self, obj) -> set[Role]:
+        """Determine all roles the user has for this object (memoized)."""
+        key = self._cache_key(obj)
+        if key not in self._roles_cache:
+            self._roles_cache[key] = self._resolve(obj)
+        return set(self._roles_cache[key])
+
+    def get_user_roles_many(self, objs) -> dict:
+        """Determine roles for every object in objs."""
+        return {obj: self.get_user_roles(obj) for obj in objs}
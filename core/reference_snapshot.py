@@ -0,0 +1,255 @@
+"""
+Content-hashed snapshots of the reference data loaded by populate_db/.
+
+Replaying every populate_db/ script through the ORM takes minutes. After a
+full populate_gamedata run on an empty database, write_snapshot() dumps every
+table that now holds rows into a gzipped NDJSON file, and load_snapshot()
+restores it on another empty database with raw executemany() inserts. The
+caller passes the tables that were empty before the scripts ran, and
+write_snapshot() refuses to dump any other table with rows in it, so
+characters, chronicles and other user data never end up in a snapshot.
+
+Snapshots are named after a hash of the populate_db/ scripts and of the
+database schema, so a stale snapshot is never picked up: editing a script or
+adding a column changes the hash, and populate_gamedata replays the scripts
+again (and can write a fresh snapshot with --write-snapshot).
+
+File layout:
+
+    {"type": "header", "version": 1, "hash": "...", "tables": {"core.book": 1234, ...}}
+    {"type": "table", "model": "core.book", "columns": ["id", "name", ...]}
+    [1, "Mage: The Ascension (Revised)", ...]
+    ...
+
+Content type foreign keys (polymorphic_ctype) are stored as natural keys,
+since content type ids differ between databases.
+
+Usage:
+    from core.reference_snapshot import find_snapshot, load_snapshot, reference_tables_empty
+
+    path = find_snapshot()
+    if path and reference_tables_empty(path):
+        load_snapshot(path)
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from core.cache import CacheInvalidator
+from core.chronicle_archive import DEFAULT_CHUNK_SIZE, open_archive
+
+SNAPSHOT_VERSION = 1
+# User accounts, sessions and Django bookkeeping are never part of a snapshot
+EXCLUDED_APPS = {"accounts", "admin", "auth", "contenttypes", "sessions"}
+
+
+def snapshot_dir():
+    return Path(getattr(settings, "REFERENCE_SNAPSHOT_DIR", settings.BASE_DIR / "snapshots"))
+
+
+def snapshot_models():
+    """Concrete models (including auto-created m2m tables) a snapshot may contain."""
+    return [
+        model
+        for model in apps.get_models(include_auto_created=True)
+        if model._meta.app_label not in EXCLUDED_APPS
+        and model._meta.managed
+        and not model._meta.proxy
+    ]
+
+
+def _columns(model):
+    """A model's own table columns; parent tables are snapshotted separately."""
+    return model._meta.local_concrete_fields
+
+
+def content_hash(populate_dir="populate_db"):
+    """Hash the populate_db/ scripts together with the current database schema."""
+    digest = hashlib.sha256(f"snapshot-v{SNAPSHOT_VERSION}".encode())
+    populate_dir = Path(populate_dir)
+    for path in sorted(populate_dir.rglob("*.py")):
+        digest.update(str(path.relative_to(populate_dir)).encode())
+        digest.update(path.read_bytes())
+    for model in snapshot_models():
+        digest.update(model._meta.db_table.encode())
+        digest.update(",".join(f.column for f in _columns(model)).encode())
+    return digest.hexdigest()
+
+
+def snapshot_path(digest):
+    return snapshot_dir() / f"reference-{digest[:16]}.ndjson.gz"
+
+
+def find_snapshot(populate_dir="populate_db"):
+    """Path of the snapshot matching the current scripts and schema, or None."""
+    path = snapshot_path(content_hash(populate_dir))
+    return path if path.exists() else None
+
+
+def read_header(path):
+    with open_archive(path, "r") as fh:
+        header = json.loads(fh.readline())
+    if header.get("type") != "header" or header.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} reference snapshot")
+    return header
+
+
+def empty_tables():
+    """Labels of the snapshot tables that hold no rows."""
+    return {
+        model._meta.label_lower
+        for model in snapshot_models()
+        if not model._base_manager.exists()
+    }
+
+
+def reference_tables_empty(path):
+    """True if none of the tables in a snapshot hold rows yet."""
+    return not any(
+        apps.get_model(label)._base_manager.exists() for label in read_header(path)["tables"]
+    )
+
+
+def write_snapshot(path, digest, empty_before, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Dump every non-empty snapshot table to path.
+
+    Args:
+        empty_before: Labels of the tables that were empty before the
+            populate_db/ scripts ran, from empty_tables()
+
+    Returns:
+        dict: Row count per model label
+
+    Raises:
+        ValueError: If a table that already held rows before the scripts ran
+            holds rows now, since those rows may be user data
+    """
+    tables = {}
+    for model in snapshot_models():
+        count = model._base_manager.count()
+        if count:
+            tables[model._meta.label_lower] = count
+
+    not_reference = sorted(set(tables) - set(empty_before))
+    if not_reference:
+        raise ValueError(
+            "Tables held data before populate_db/ ran, so a snapshot could include "
+            f"user data: {', '.join(not_reference)}"
+        )
+
+    content_types = {ct.pk: list(ct.natural_key()) for ct in ContentType.objects.all()}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open_archive(path, "w") as fh:
+
+        def write(record):
+            fh.write(json.dumps(record, cls=DjangoJSONEncoder))
+            fh.write("\n")
+
+        write({"type": "header", "version": SNAPSHOT_VERSION, "hash": digest, "tables": tables})
+        for label in tables:
+            model = apps.get_model(label)
+            fields = _columns(model)
+            ct_columns = [i for i, f in enumerate(fields) if f.related_model is ContentType]
+            write({"type": "table", "model": label, "columns": [f.attname for f in fields]})
+            rows = (
+                model._base_manager.order_by("pk")
+                .values_list(*[f.attname for f in fields])
+                .iterator(chunk_size=chunk_size)
+            )
+            for row in rows:
+                row = list(row)
+                for i in ct_columns:
+                    row[i] = content_types.get(row[i])
+                write(row)
+    return tables
+
+
+@transaction.atomic
+def load_snapshot(path, batch_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert a snapshot's rows with raw SQL, the way loaddata does.
+
+    Constraint checks are disabled while loading and run once at the end.
+    Afterwards sequences are reset so later inserts get fresh ids, and the
+    cache versions of the loaded models are bumped.
+
+    Returns:
+        dict: Row count per model label
+    """
+    header = read_header(path)
+    content_types = {}
+    loaded = {}
+    with connection.constraint_checks_disabled(), open_archive(path, "r") as fh:
+        fh.readline()
+        with connection.cursor() as cursor:
+            inserter = None
+            for line in fh:
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    if inserter:
+                        inserter.flush(cursor)
+                    inserter = _TableInserter(apps.get_model(record["model"]), record["columns"])
+                    loaded[record["model"]] = inserter
+                    continue
+                inserter.add(record, content_types)
+                if len(inserter.rows) >= batch_size:
+                    inserter.flush(cursor)
+            if inserter:
+                inserter.flush(cursor)
+
+    models = [apps.get_model(label) for label in loaded]
+    connection.check_constraints(table_names=[m._meta.db_table for m in models])
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    for model in models:
+        CacheInvalidator.invalidate_model_cache(model)
+
+    counts = {label: inserter.count for label, inserter in loaded.items()}
+    if counts != header["tables"]:
+        raise ValueError(f"{path} is truncated or corrupt: row counts don't match its header")
+    return counts
+
+
+class _TableInserter:
+    """Buffers rows for one table and writes them with executemany()."""
+
+    def __init__(self, model, columns):
+        fields = {f.attname: f for f in _columns(model)}
+        self.fields = [fields[column] for column in columns]
+        qn = connection.ops.quote_name
+        self.sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            qn(model._meta.db_table),
+            ", ".join(qn(f.column) for f in self.fields),
+            ", ".join(["%s"] * len(self.fields)),
+        )
+        self.rows = []
+        self.count = 0
+
+    def add(self, row, content_types):
+        values = []
+        for model_field, value in zip(self.fields, row, strict=True):
+            if model_field.related_model is ContentType and value is not None:
+                key = tuple(value)
+                if key not in content_types:
+                    content_types[key] = ContentType.objects.get_by_natural_key(*key).pk
+                value = content_types[key]
+            elif value is not None:
+                value = model_field.to_python(value)
+            values.append(model_field.get_db_prep_save(value, connection))
+        self.rows.append(values)
+
+    def flush(self, cursor):
+        if self.rows:
+            cursor.executemany(self.sql, self.rows)
+            self.count += len(self.rows)
+            self.rows = []
@@ -2,5 +2,6 @@
 
 from core.services.approval import ApprovalService
 from core.services.chronicle_data import ChronicleDataService
+from core.services.chronicle_summary import ChronicleSummaryService
 
-__all__ = ["ApprovalService", "ChronicleDataService"]
+__all__ = ["ApprovalService", "ChronicleDataService", "ChronicleSummaryService"]
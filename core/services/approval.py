@@ -1,14 +1,33 @@
 """Service for handling object and image approvals."""
 
+from dataclasses import asdict, dataclass
+
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
 from characters.models.core.character import Character
+from characters.models.core.group import Group
 from characters.models.mage.rote import Rote
 from items.models.core import ItemModel
 from locations.models.core.location import LocationModel
 
 
+@dataclass
+class ApprovalResult:
+    """Result of approving one object in a bulk approval."""
+
+    model_type: str
+    object_id: int
+    success: bool
+    message: str
+    error: str | None = None
+
+    def as_dict(self):
+        return asdict(self)
+
+
 class ApprovalService:
     """
     Service class for managing approval workflows.
@@ -66,6 +85,127 @@ class ApprovalService:
         type_display = model_type.title()
         return obj, f"{type_display} '{obj.name}' approved successfully!"
 
+    @classmethod
+    def approve_objects(cls, items, user=None) -> list:
+        """
+        Approve many objects at once.
+
+        Objects are locked with one query per model type and approved with one
+        bulk_update per model type. Pooled backgrounds are recomputed once per
+        group that has an approved character, however many of its members were
+        approved. Character status transitions are validated as in
+        Character.clean(); no other fields change, so full_clean() is not run.
+
+        Args:
+            items: Iterable of (model_type, object_id) pairs
+            user: If given, objects outside the chronicles this user is a
+                storyteller for are refused
+
+        Returns:
+            list[ApprovalResult]: One result per distinct item, in input order
+        """
+        results = {}
+        ids_by_type = {}
+        for model_type, object_id in items:
+            key = (model_type, int(object_id))
+            if key in results:
+                continue
+            if model_type not in cls.OBJECT_MODEL_MAP:
+                results[key] = ApprovalResult(
+                    model_type, key[1], False, "", f"Invalid model type: {model_type}"
+                )
+                continue
+            results[key] = None
+            ids_by_type.setdefault(model_type, []).append(key[1])
+
+        st_chronicles = None
+        if user is not None:
+            from game.models import Chronicle
+
+            st_chronicles = set(
+                Chronicle.objects.filter(Q(head_st=user) | Q(storytellers=user)).values_list(
+                    "pk", flat=True
+                )
+            )
+
+        approved = []
+        with transaction.atomic():
+            for model_type, object_ids in ids_by_type.items():
+                model_class = cls.OBJECT_MODEL_MAP[model_type]
+                objects = {
+                    obj.pk: obj
+                    for obj in model_class.objects.non_polymorphic()
+                    .select_for_update(of=("self",))
+                    .filter(pk__in=object_ids)
+                    .order_by("pk")
+                }
+                to_update = []
+                for object_id in object_ids:
+                    obj = objects.get(object_id)
+                    error = cls._approval_error(model_type, obj, st_chronicles)
+                    if error:
+                        results[(model_type, object_id)] = ApprovalResult(
+                            model_type, object_id, False, "", error
+                        )
+                        continue
+                    obj.status = "App"
+                    to_update.append(obj)
+                    results[(model_type, object_id)] = ApprovalResult(
+                        model_type,
+                        object_id,
+                        True,
+                        f"{model_type.title()} '{obj.name}' approved successfully!",
+                    )
+                model_class.objects.bulk_update(to_update, ["status"])
+                approved += to_update
+
+            characters = [obj.pk for obj in approved if isinstance(obj, Character)]
+            if characters:
+                for group in Group.objects.filter(members__in=characters).distinct():
+                    group.update_pooled_backgrounds()
+
+            cls._objects_changed(approved)
+
+        return list(results.values())
+
+    @staticmethod
+    def _approval_error(model_type, obj, st_chronicles):
+        """Why obj can't be approved, or None if it can."""
+        if obj is None:
+            return f"{model_type.title()} not found"
+        if st_chronicles is not None and obj.chronicle_id not in st_chronicles:
+            return f"You are not a storyteller for the chronicle of '{obj.name}'"
+        if obj.status == "App":
+            return f"'{obj.name}' is already approved"
+        if isinstance(obj, Character):
+            try:
+                obj._validate_status_transition(obj.status, "App")
+            except ValidationError as e:
+                return "; ".join(e.messages)
+        return None
+
+    @staticmethod
+    def _objects_changed(objects):
+        """
+        Do the work post_save receivers would have done for objects.
+
+        bulk_update sends no post_save, so the approval queues, chronicle
+        summaries and model caches the receivers maintain are refreshed here,
+        once per chronicle and model class.
+        """
+        from accounts.signals import game_objects_changed
+        from core.cache import CacheInvalidator
+        from core.services.chronicle_summary import ChronicleSummaryService
+
+        game_objects_changed(objects)
+        model_classes = {obj.get_real_instance_class() or type(obj) for obj in objects}
+        for chronicle_id in {obj.chronicle_id for obj in objects}:
+            ChronicleSummaryService.invalidate(chronicle_id)
+        for model_class in model_classes:
+            CacheInvalidator.invalidate_model_cache(model_class)
+            for parent in model_class._meta.get_parent_list():
+                CacheInvalidator.invalidate_model_cache(parent)
+
     @classmethod
     def approve_image(cls, model_type: str, object_id: int) -> tuple:
         """
@@ -135,7 +135,7 @@ class ChronicleDataService:
             return result
 
         # All shows everything - only root locations
-        root_locations = [loc for loc in all_locations if loc.parent is None]
+        root_locations = [loc for loc in all_locations if loc.parent_id is None]
         result["wod"] = {
             "name": cls.get_display_name("wod"),
             "locations": root_locations,
@@ -149,7 +149,7 @@ class ChronicleDataService:
             filtered = [
                 loc
                 for loc in all_locations
-                if loc.gameline in (gl_code, "wod") and loc.parent is None
+                if loc.gameline in (gl_code, "wod") and loc.parent_id is None
             ]
             if filtered:
                 result[gl_code] = {
@@ -204,7 +204,7 @@ class ChronicleDataService:
         Group scenes by year/month.
 
         Args:
-            queryset: Scene queryset to group
+            queryset: Scene queryset (or list) to group
 
         Returns:
             List of (date, scenes) tuples
@@ -228,31 +228,32 @@ class ChronicleDataService:
         """
         Group scenes by gameline.
 
-        Scenes have a direct gameline field. Each gameline entry includes
-        scenes grouped by month.
+        Scenes have a direct gameline field. Fetches all scenes once and
+        filters in Python; each gameline entry includes scenes grouped by month.
 
         Args:
-            queryset: Scene queryset to group
+            queryset: Scene queryset (or list) to group
 
         Returns:
             OrderedDict with gameline codes as keys
         """
         result = OrderedDict()
+        all_scenes = list(queryset)
 
         # All shows everything if there's any content
-        if queryset.exists():
+        if all_scenes:
             result["wod"] = {
                 "name": cls.get_display_name("wod"),
-                "scenes": queryset,
-                "scenes_by_month": cls.group_scenes_by_month(queryset),
+                "scenes": all_scenes,
+                "scenes_by_month": cls.group_scenes_by_month(all_scenes),
             }
 
         # Add specific gamelines that have content
         for gl_code in cls.GAMELINE_ORDER:
             if gl_code == "wod":
                 continue
-            filtered = queryset.filter(gameline=gl_code)
-            if filtered.exists():
+            filtered = [scene for scene in all_scenes if scene.gameline == gl_code]
+            if filtered:
                 result[gl_code] = {
                     "name": cls.get_display_name(gl_code),
                     "scenes": filtered,
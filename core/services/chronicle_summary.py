@@ -0,0 +1,143 @@
+"""Service for building the chronicle detail page's data in one pass."""
+
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+from core.cache import CACHE_TIMEOUT_LONG, CacheKeyGenerator
+from core.services.chronicle_data import ChronicleDataService
+
+ACTIVE_STATUSES = ("Un", "Sub", "App")
+
+
+class ChronicleSummaryService:
+    """
+    Builds and caches the characters, locations, items and scenes shown on a
+    chronicle's detail page.
+
+    Each entity set is fetched with a single query and bucketed in memory by
+    status, gameline and month, rather than re-filtered per tab. The result is
+    cached per chronicle; game.signals invalidates it when anything shown in
+    it changes.
+    """
+
+    CACHE_TIMEOUT = CACHE_TIMEOUT_LONG
+
+    @classmethod
+    def cache_key(cls, chronicle_id):
+        return CacheKeyGenerator.make_key("chronicle_summary", str(chronicle_id))
+
+    @classmethod
+    def get_summary(cls, chronicle):
+        """
+        Get the summary for a chronicle, building and caching it on a miss.
+
+        Returns:
+            dict: Context entries for game/chronicle/detail.html
+        """
+        key = cls.cache_key(chronicle.pk)
+        summary = cache.get(key)
+        if summary is None:
+            summary = cls.build_summary(chronicle)
+            cache.set(key, summary, cls.CACHE_TIMEOUT)
+        return summary
+
+    @classmethod
+    def invalidate(cls, chronicle_id):
+        """Drop a chronicle's cached summary. A chronicle_id of None is ignored."""
+        if chronicle_id is not None:
+            cache.delete(cls.cache_key(chronicle_id))
+
+    @classmethod
+    def build_summary(cls, chronicle):
+        """Fetch and bucket everything for a chronicle without touching the cache."""
+        summary = {}
+        summary.update(cls._character_summary(chronicle))
+        summary.update(cls._location_summary(chronicle))
+        summary.update(cls._item_summary(chronicle))
+        summary.update(cls._scene_summary(chronicle))
+        return summary
+
+    @classmethod
+    def _character_summary(cls, chronicle):
+        from characters.models.core.character import Character
+
+        characters = list(
+            Character.objects.filter(
+                chronicle=chronicle, status__in=[*ACTIVE_STATUSES, "Ret", "Dec"]
+            )
+            .with_group_ordering()
+            .select_related("owner", "owner__profile")
+        )
+        active = [c for c in characters if c.status in ACTIVE_STATUSES and not c.npc]
+        retired = [c for c in characters if c.status == "Ret" and not c.npc]
+        deceased = [c for c in characters if c.status == "Dec" and not c.npc]
+        npcs = [c for c in characters if c.status in ACTIVE_STATUSES and c.npc]
+        return {
+            "character_list": active,
+            "retired_characters": retired,
+            "deceased_characters": deceased,
+            "npc_characters": npcs,
+            "active_by_gameline": ChronicleDataService.group_characters_by_gameline(active),
+            "retired_by_gameline": ChronicleDataService.group_characters_by_gameline(retired),
+            "deceased_by_gameline": ChronicleDataService.group_characters_by_gameline(deceased),
+            "npc_by_gameline": ChronicleDataService.group_characters_by_gameline(npcs),
+        }
+
+    @classmethod
+    def _location_summary(cls, chronicle):
+        from locations.models.core.location import LocationModel
+
+        # The whole parent hierarchy is loaded at once and linked in Python;
+        # location_row.html walks tree_children instead of querying
+        top_level_ids = set(
+            LocationModel.objects.top_level()
+            .filter(chronicle=chronicle)
+            .values_list("pk", flat=True)
+        )
+        location_tree = (
+            LocationModel.objects.filter(chronicle=chronicle)
+            .select_related("polymorphic_ctype", "owner")
+            .as_tree()
+        )
+        top_locations = [loc for loc in location_tree if loc.pk in top_level_ids]
+        return {
+            "top_locations": top_locations,
+            "locations_by_gameline": ChronicleDataService.group_locations_by_gameline(
+                top_locations
+            ),
+        }
+
+    @classmethod
+    def _item_summary(cls, chronicle):
+        from items.models.core.item import ItemModel
+
+        items = list(ItemModel.objects.for_chronicle(chronicle).order_by("name"))
+        return {
+            "items": items,
+            "items_by_gameline": ChronicleDataService.group_items_by_gameline(items),
+        }
+
+    @classmethod
+    def _scene_summary(cls, chronicle):
+        from game.models import Post, Scene
+
+        latest_post = Post.objects.filter(scene=OuterRef("pk")).order_by("-datetime_created")
+        scenes = list(
+            Scene.objects.filter(chronicle=chronicle)
+            .select_related("location")
+            .annotate(
+                latest_post_name=Subquery(latest_post.values("display_name")[:1]),
+                latest_post_at=Subquery(latest_post.values("datetime_created")[:1]),
+            )
+            .order_by("-date_of_scene")
+        )
+        active = [scene for scene in scenes if not scene.finished]
+        completed = [scene for scene in scenes if scene.finished]
+        return {
+            "all_scenes_by_gameline": ChronicleDataService.group_scenes_by_gameline(scenes),
+            "active_scenes_by_gameline": ChronicleDataService.group_scenes_by_gameline(active),
+            "completed_scenes_by_gameline": ChronicleDataService.group_scenes_by_gameline(
+                completed
+            ),
+            "active_scenes": active,
+        }
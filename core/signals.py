@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import CacheInvalidator
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_model_cache_version(sender, instance, **kwargs):
+    """Retire versioned cache entries (reference lists, cached querysets) for tracked models."""
+    if CacheInvalidator.is_tracked(sender):
+        CacheInvalidator.invalidate_related_caches(instance)
@@ -23,31 +23,38 @@ from core.permissions import Permission, PermissionManager, VisibilityTier
 register = template.Library()
 
 
+def _request_user(context):
+    """Return the request user with role memoization enabled for the request."""
+    request = context["request"]
+    PermissionManager.for_request(request)
+    return request.user
+
+
 @register.simple_tag(takes_context=True)
 def user_can_view(context, obj):
     """Check if current user can view object."""
-    user = context["request"].user
+    user = _request_user(context)
     return PermissionManager.user_can_view(user, obj)
 
 
 @register.simple_tag(takes_context=True)
 def user_can_edit(context, obj):
     """Check if current user can edit object (EDIT_FULL)."""
-    user = context["request"].user
+    user = _request_user(context)
     return PermissionManager.user_can_edit(user, obj)
 
 
 @register.simple_tag(takes_context=True)
 def user_can_spend_xp(context, obj):
     """Check if current user can spend XP on object."""
-    user = context["request"].user
+    user = _request_user(context)
     return PermissionManager.user_can_spend_xp(user, obj)
 
 
 @register.simple_tag(takes_context=True)
 def user_can_spend_freebies(context, obj):
     """Check if current user can spend freebies on object."""
-    user = context["request"].user
+    user = _request_user(context)
     return PermissionManager.user_can_spend_freebies(user, obj)
 
 
@@ -64,7 +71,7 @@ def user_has_permission(context, obj, permission_name):
         {% user_has_permission object 'EDIT_LIMITED' as can_edit_notes %}
         {% if can_edit_notes %}...{% endif %}
     """
-    user = context["request"].user
+    user = _request_user(context)
     try:
         permission = Permission[permission_name]
         return PermissionManager.user_has_permission(user, obj, permission)
@@ -81,7 +88,7 @@ def visibility_tier(context, obj):
         {% visibility_tier object as tier %}
         {% if tier|is_full %}...{% endif %}
     """
-    user = context["request"].user
+    user = _request_user(context)
     return PermissionManager.get_visibility_tier(user, obj)
 
 
@@ -96,7 +103,7 @@ def user_roles(context, obj):
             {{ role.value }}
         {% endfor %}
     """
-    user = context["request"].user
+    user = _request_user(context)
     return PermissionManager.get_user_roles(user, obj)
 
 
@@ -7,6 +7,11 @@ from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+# Version of the post rendering rules (_clean_html and render_post_html).
+# game.Post stores its rendered HTML with this version; bump it whenever the
+# rules change and run `python manage.py render_posts` to re-render old posts.
+POST_HTML_VERSION = 1
+
 
 def _clean_html(value):
     """Sanitize HTML with bleach, allowing only a safe subset of tags."""
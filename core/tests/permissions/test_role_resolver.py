@@ -0,0 +1,111 @@
+"""Tests for RoleResolver and request-scoped role memoization."""
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import RequestFactory, TestCase
+
+from characters.models.core.character import Character
+from core.permissions import PermissionManager, Role, RoleResolver
+from game.models import Chronicle, Gameline, STRelationship
+from locations.models.core import LocationModel
+
+
+class RoleResolverTest(TestCase):
+    """RoleResolver must agree with PermissionManager.get_user_roles()."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass123")
+        self.head_st = User.objects.create_user(username="head_st", password="testpass123")
+        self.storyteller = User.objects.create_user(username="st", password="testpass123")
+        self.game_st = User.objects.create_user(username="game_st", password="testpass123")
+        self.player = User.objects.create_user(username="player", password="testpass123")
+        self.observer = User.objects.create_user(username="observer", password="testpass123")
+        self.stranger = User.objects.create_user(username="stranger", password="testpass123")
+        self.admin = User.objects.create_user(
+            username="admin", password="testpass123", is_staff=True, is_superuser=True
+        )
+
+        self.chronicle = Chronicle.objects.create(name="Resolver Chronicle", head_st=self.head_st)
+        self.chronicle.game_storytellers.add(self.game_st)
+        STRelationship.objects.create(
+            user=self.storyteller,
+            chronicle=self.chronicle,
+            gameline=Gameline.objects.create(name="Resolver Gameline"),
+        )
+        self.other_chronicle = Chronicle.objects.create(name="Other Chronicle")
+
+        self.character = Character.objects.create(
+            name="Owned", owner=self.owner, chronicle=self.chronicle, status="App"
+        )
+        Character.objects.create(
+            name="Player Character", owner=self.player, chronicle=self.chronicle, status="App"
+        )
+        self.other_character = Character.objects.create(
+            name="Elsewhere", owner=self.stranger, chronicle=self.other_chronicle, status="App"
+        )
+        self.character.add_observer(self.observer, self.owner)
+        self.location = LocationModel.objects.create(
+            name="Sanctum", chronicle=self.chronicle, owned_by=self.character
+        )
+
+        self.users = [
+            self.owner,
+            self.head_st,
+            self.storyteller,
+            self.game_st,
+            self.player,
+            self.observer,
+            self.stranger,
+            self.admin,
+            AnonymousUser(),
+        ]
+        self.objects = [self.character, self.other_character, self.location]
+
+    def test_matches_get_user_roles(self):
+        """Test resolved roles equal the per-object query path for every user."""
+        for user in self.users:
+            resolver = RoleResolver(user)
+            for obj in self.objects:
+                with self.subTest(user=str(user), obj=str(obj)):
+                    self.assertEqual(
+                        resolver.get_user_roles(obj),
+                        PermissionManager.get_user_roles(user, obj),
+                    )
+
+    def test_get_user_roles_many_uses_fixed_queries(self):
+        """Test the bulk API cost does not depend on the number of objects."""
+        characters = [
+            Character.objects.create(
+                name=f"Bulk {i}", owner=self.stranger, chronicle=self.chronicle, status="App"
+            )
+            for i in range(20)
+        ]
+        # Warm the ContentType cache so only relationship queries are counted
+        RoleResolver(self.player).get_user_roles_many(characters[:1])
+
+        with self.assertNumQueries(6):
+            roles = PermissionManager.get_user_roles_many(self.player, characters)
+
+        self.assertEqual(len(roles), 20)
+        for character in characters:
+            self.assertIn(Role.PLAYER, roles[character])
+            self.assertNotIn(Role.OWNER, roles[character])
+
+    def test_anonymous_user_issues_no_queries(self):
+        """Test anonymous users resolve without loading relationships."""
+        with self.assertNumQueries(0):
+            roles = RoleResolver(AnonymousUser()).get_user_roles(self.character)
+        self.assertEqual(roles, {Role.ANONYMOUS})
+
+    def test_for_request_memoizes_permission_checks(self):
+        """Test repeated checks in one request reuse the resolver."""
+        request = RequestFactory().get("/")
+        request.user = User.objects.get(pk=self.head_st.pk)
+
+        resolver = PermissionManager.for_request(request)
+        self.assertIs(PermissionManager.for_request(request), resolver)
+
+        PermissionManager.user_can_view(request.user, self.character)
+        with self.assertNumQueries(0):
+            self.assertTrue(PermissionManager.user_can_view(request.user, self.character))
+            self.assertTrue(PermissionManager.user_can_edit(request.user, self.character))
+            self.assertTrue(PermissionManager.user_can_view(request.user, self.location))
@@ -0,0 +1,135 @@
+"""Equivalence tests for ModelQuerySet.viewable_by() against the per-object path."""
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import TestCase
+
+from characters.models.core.character import Character
+from core.permissions import Permission, PermissionManager, Role, VisibilityTier
+from game.models import Chronicle, Gameline, STRelationship
+from items.models.core import ItemModel
+from locations.models.core import LocationModel
+
+
+class ViewableByEquivalenceTest(TestCase):
+    """viewable_by() must select exactly the objects user_can_view() allows in a list."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass123")
+        self.head_st = User.objects.create_user(username="head_st", password="testpass123")
+        self.storyteller = User.objects.create_user(username="st", password="testpass123")
+        self.game_st = User.objects.create_user(username="game_st", password="testpass123")
+        self.player = User.objects.create_user(username="player", password="testpass123")
+        self.observer = User.objects.create_user(username="observer", password="testpass123")
+        self.stranger = User.objects.create_user(username="stranger", password="testpass123")
+        self.admin = User.objects.create_user(
+            username="admin", password="testpass123", is_staff=True, is_superuser=True
+        )
+
+        self.chronicle = Chronicle.objects.create(name="Main Chronicle", head_st=self.head_st)
+        self.chronicle.game_storytellers.add(self.game_st)
+        STRelationship.objects.create(
+            user=self.storyteller,
+            chronicle=self.chronicle,
+            gameline=Gameline.objects.create(name="Equivalence Gameline"),
+        )
+        self.other_chronicle = Chronicle.objects.create(name="Other Chronicle")
+
+        self.owned = Character.objects.create(
+            name="Owned", owner=self.owner, chronicle=self.chronicle, status="App"
+        )
+        Character.objects.create(
+            name="Player Character", owner=self.player, chronicle=self.chronicle, status="Un"
+        )
+        Character.objects.create(
+            name="Player Approved", owner=self.player, chronicle=self.chronicle, status="App"
+        )
+        Character.objects.create(
+            name="Submitted", owner=self.stranger, chronicle=self.chronicle, status="Sub"
+        )
+        observed = Character.objects.create(
+            name="Observed", owner=self.stranger, chronicle=self.other_chronicle, status="App"
+        )
+        observed.add_observer(self.observer, self.stranger)
+        Character.objects.create(name="Unassigned", owner=self.stranger, status="App")
+
+        LocationModel.objects.create(name="Sanctum", owned_by=self.owned)
+        LocationModel.objects.create(name="Chronicle Location", chronicle=self.chronicle)
+        location = LocationModel.objects.create(name="Hidden", chronicle=self.other_chronicle)
+        location.add_observer(self.observer, self.stranger)
+
+        ItemModel.objects.create(name="Owned Item", owner=self.owner)
+        ItemModel.objects.create(name="Chronicle Item", chronicle=self.chronicle)
+        ItemModel.objects.create(name="Other Item", chronicle=self.other_chronicle)
+
+        self.users = [
+            self.owner,
+            self.head_st,
+            self.storyteller,
+            self.game_st,
+            self.player,
+            self.observer,
+            self.stranger,
+            self.admin,
+            AnonymousUser(),
+        ]
+        self.models = [Character, LocationModel, ItemModel]
+
+    def _expected(self, user, model, tier):
+        if tier == VisibilityTier.FULL:
+            allowed = {VisibilityTier.FULL}
+        else:
+            allowed = {VisibilityTier.FULL, VisibilityTier.PARTIAL}
+        return {
+            obj.pk
+            for obj in model.objects.all()
+            if PermissionManager.get_visibility_tier(user, obj) in allowed
+            and self._listable(user, obj)
+        }
+
+    def _listable(self, user, obj):
+        """
+        Lists narrow player access, as filter_queryset_for_user() always did.
+
+        An object the user can only view as a player is listed only if it is
+        approved and the user has an approved character in its chronicle.
+        """
+        view = {Permission.VIEW_FULL, Permission.VIEW_PARTIAL}
+        granting = {
+            role
+            for role in PermissionManager.get_user_roles(user, obj)
+            if PermissionManager.ROLE_PERMISSIONS.get(role, set()) & view
+        }
+        if granting != {Role.PLAYER}:
+            return True
+        return (
+            obj.status == "App"
+            and Character.objects.filter(
+                owner=user, status="App", chronicle_id=obj.chronicle_id
+            ).exists()
+        )
+
+    def test_partial_tier_matches_user_can_view(self):
+        """Test the default tier matches the per-object view check."""
+        for model in self.models:
+            for user in self.users:
+                with self.subTest(model=model.__name__, user=str(user)):
+                    actual = set(model.objects.viewable_by(user).values_list("pk", flat=True))
+                    self.assertEqual(actual, self._expected(user, model, VisibilityTier.PARTIAL))
+
+    def test_full_tier_matches_visibility_tier(self):
+        """Test tier=FULL matches objects whose visibility tier is FULL."""
+        for model in self.models:
+            for user in self.users:
+                with self.subTest(model=model.__name__, user=str(user)):
+                    qs = model.objects.viewable_by(user, tier=VisibilityTier.FULL)
+                    actual = set(qs.values_list("pk", flat=True))
+                    self.assertEqual(actual, self._expected(user, model, VisibilityTier.FULL))
+
+    def test_single_query_without_duplicates(self):
+        """Test the filter runs as one query and needs no DISTINCT."""
+        # Warm the ContentType cache used for observer lookups
+        list(Character.objects.viewable_by(self.head_st))
+
+        with self.assertNumQueries(1):
+            pks = list(Character.objects.viewable_by(self.head_st).values_list("pk", flat=True))
+        self.assertEqual(len(pks), len(set(pks)))
@@ -1,10 +1,16 @@
 """Tests for ApprovalService."""
 
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
+from django.db import connection
 from django.http import Http404
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
+from accounts.notifications import CHRONICLE, USER
 from characters.models.core import Ability, Attribute, Human
+from characters.models.core.group import Group
 from characters.models.mage.effect import Effect
 from characters.models.mage.rote import Rote
 from core.services import ApprovalService
@@ -191,3 +197,119 @@ class TestApprovalServiceParseImageId(TestCase):
         """Test parsing None returns None."""
         result = ApprovalService.parse_image_id(None)
         self.assertIsNone(result)
+
+
+class TestApprovalServiceBulkApproval(TestCase):
+    """Tests for ApprovalService.approve_objects()."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("testuser", "test@test.com", "password")
+        self.st_user = User.objects.create_user("stuser", "st@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle", head_st=self.st_user)
+        self.chars = [
+            Human.objects.create(
+                name=f"Char {i}", owner=self.user, chronicle=self.chronicle, status="Sub"
+            )
+            for i in range(3)
+        ]
+        self.loc = LocationModel.objects.create(
+            name="Test Location", chronicle=self.chronicle, status="Sub"
+        )
+
+    def test_approves_every_item(self):
+        items = [("character", c.pk) for c in self.chars] + [("location", self.loc.pk)]
+        results = ApprovalService.approve_objects(items)
+
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual([(r.model_type, r.object_id) for r in results], items)
+        for obj in [*self.chars, self.loc]:
+            obj.refresh_from_db()
+            self.assertEqual(obj.status, "App")
+
+    def test_query_count_independent_of_item_count(self):
+        def approve(count):
+            chars = [
+                Human.objects.create(
+                    name=f"Extra {count} {i}", chronicle=self.chronicle, status="Sub"
+                )
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                ApprovalService.approve_objects([("character", c.pk) for c in chars])
+            return len(queries)
+
+        self.assertEqual(approve(2), approve(6))
+
+    def test_per_item_failures(self):
+        self.chars[1].status = "Un"
+        self.chars[1].save()
+        results = ApprovalService.approve_objects(
+            [
+                ("character", self.chars[0].pk),
+                ("character", self.chars[1].pk),
+                ("character", 99999),
+                ("invalid_type", 1),
+                ("character", self.chars[0].pk),
+            ]
+        )
+
+        self.assertEqual([r.success for r in results], [True, False, False, False])
+        self.assertIn("Cannot transition", results[1].error)
+        self.assertIn("not found", results[2].error)
+        self.assertIn("Invalid model type", results[3].error)
+        self.chars[1].refresh_from_db()
+        self.assertEqual(self.chars[1].status, "Un")
+
+    def test_already_approved(self):
+        ApprovalService.approve_objects([("location", self.loc.pk)])
+        result = ApprovalService.approve_objects([("location", self.loc.pk)])[0]
+        self.assertFalse(result.success)
+        self.assertIn("already approved", result.error)
+
+    def test_user_must_storytell_the_chronicle(self):
+        other = Chronicle.objects.create(name="Other Chronicle")
+        outsider = Human.objects.create(name="Outsider", chronicle=other, status="Sub")
+        results = ApprovalService.approve_objects(
+            [("character", self.chars[0].pk), ("character", outsider.pk)], user=self.st_user
+        )
+
+        self.assertEqual([r.success for r in results], [True, False])
+        outsider.refresh_from_db()
+        self.assertEqual(outsider.status, "Sub")
+
+    def test_pooled_backgrounds_updated_once_per_group(self):
+        group = Group.objects.create(name="Cabal", chronicle=self.chronicle)
+        group.members.add(*self.chars)
+        with patch.object(Group, "update_pooled_backgrounds") as update:
+            ApprovalService.approve_objects([("character", c.pk) for c in self.chars])
+        update.assert_called_once()
+
+    def test_queues_marked_stale_once_per_model_kind(self):
+        items = [("character", c.pk) for c in self.chars] + [("location", self.loc.pk)]
+        with patch("accounts.notifications.mark_stale") as mark_stale:
+            ApprovalService.approve_objects(items)
+        # Characters: chronicle queues and owners' XP requests; locations: chronicle queues
+        targets = sorted((args[0], args[1]) for args, _ in mark_stale.call_args_list)
+        self.assertEqual(
+            targets,
+            sorted(
+                [
+                    (CHRONICLE, [self.chronicle.pk]),
+                    (CHRONICLE, [self.chronicle.pk]),
+                    (USER, [self.user.pk]),
+                ]
+            ),
+        )
+
+    def test_result_as_dict(self):
+        result = ApprovalService.approve_objects([("location", self.loc.pk)])[0]
+        self.assertEqual(
+            result.as_dict(),
+            {
+                "model_type": "location",
+                "object_id": self.loc.pk,
+                "success": True,
+                "message": "Location 'Test Location' approved successfully!",
+                "error": None,
+            },
+        )
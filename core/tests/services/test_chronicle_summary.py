@@ -0,0 +1,136 @@
+"""Tests for ChronicleSummaryService."""
+
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from characters.models.core import Human
+from core.services import ChronicleSummaryService
+from game.models import Chronicle, Post, Scene
+from locations.models.core.location import LocationModel
+
+
+class ChronicleSummaryTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("testuser", "test@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        self.location = LocationModel.objects.create(name="Bar", chronicle=self.chronicle)
+
+    def add_scenes(self, count, **kwargs):
+        for i in range(count):
+            Scene.objects.create(
+                name=f"Scene {i}",
+                chronicle=self.chronicle,
+                location=self.location,
+                date_of_scene=date(2024, 1 + i % 12, 1),
+                **kwargs,
+            )
+
+
+class TestBuildSummary(ChronicleSummaryTestCase):
+    def test_characters_bucketed_by_status(self):
+        active = Human.objects.create(
+            name="Active", owner=self.user, chronicle=self.chronicle, status="App"
+        )
+        retired = Human.objects.create(
+            name="Retired", owner=self.user, chronicle=self.chronicle, status="Ret"
+        )
+        npc = Human.objects.create(
+            name="NPC", owner=self.user, chronicle=self.chronicle, status="App", npc=True
+        )
+
+        summary = ChronicleSummaryService.build_summary(self.chronicle)
+
+        self.assertEqual(summary["character_list"], [active])
+        self.assertEqual(summary["retired_characters"], [retired])
+        self.assertEqual(summary["deceased_characters"], [])
+        self.assertEqual(summary["npc_characters"], [npc])
+
+    def test_scenes_bucketed_by_status_and_gameline(self):
+        self.add_scenes(2, gameline="vtm")
+        self.add_scenes(1, gameline="mta", finished=True)
+
+        summary = ChronicleSummaryService.build_summary(self.chronicle)
+
+        self.assertEqual(len(summary["all_scenes_by_gameline"]["wod"]["scenes"]), 3)
+        self.assertEqual(set(summary["active_scenes_by_gameline"]), {"wod", "vtm"})
+        self.assertEqual(set(summary["completed_scenes_by_gameline"]), {"wod", "mta"})
+
+    def test_latest_post_annotated(self):
+        self.add_scenes(1)
+        scene = Scene.objects.get()
+        character = Human.objects.create(name="Poster", owner=self.user, chronicle=self.chronicle)
+        Post.objects.create(scene=scene, character=character, display_name="First", message="a")
+        Post.objects.create(scene=scene, character=character, display_name="Second", message="b")
+
+        summary = ChronicleSummaryService.build_summary(self.chronicle)
+
+        (scene,) = summary["active_scenes"]
+        self.assertEqual(scene.latest_post_name, "Second")
+
+    def test_query_count_independent_of_scene_count(self):
+        """Regression: scenes are fetched once, not once per status and gameline."""
+        self.add_scenes(2, gameline="vtm")
+        with CaptureQueriesContext(connection) as few:
+            ChronicleSummaryService.build_summary(self.chronicle)
+
+        self.add_scenes(20, gameline="wta")
+        self.add_scenes(20, gameline="mta", finished=True)
+        with CaptureQueriesContext(connection) as many:
+            ChronicleSummaryService.build_summary(self.chronicle)
+
+        self.assertEqual(len(few), len(many))
+
+
+class TestSummaryCache(ChronicleSummaryTestCase):
+    def test_cached_summary_needs_no_queries(self):
+        ChronicleSummaryService.get_summary(self.chronicle)
+        with self.assertNumQueries(0):
+            ChronicleSummaryService.get_summary(self.chronicle)
+
+    def test_new_scene_invalidates(self):
+        ChronicleSummaryService.get_summary(self.chronicle)
+        self.add_scenes(1)
+        summary = ChronicleSummaryService.get_summary(self.chronicle)
+        self.assertEqual(len(summary["active_scenes"]), 1)
+
+    def test_character_status_change_invalidates(self):
+        character = Human.objects.create(
+            name="Active", owner=self.user, chronicle=self.chronicle, status="App"
+        )
+        ChronicleSummaryService.get_summary(self.chronicle)
+        character.status = "Dec"
+        character.save()
+        summary = ChronicleSummaryService.get_summary(self.chronicle)
+        self.assertEqual(summary["deceased_characters"], [character])
+
+    def test_other_chronicle_untouched(self):
+        other = Chronicle.objects.create(name="Other")
+        ChronicleSummaryService.get_summary(self.chronicle)
+        Scene.objects.create(name="Elsewhere", chronicle=other, location=self.location)
+        with self.assertNumQueries(0):
+            ChronicleSummaryService.get_summary(self.chronicle)
+
+
+class TestChronicleDetailViewQueries(ChronicleSummaryTestCase):
+    def test_page_queries_independent_of_scene_count(self):
+        """Regression: the detail page must not issue queries per scene."""
+        self.client.login(username="testuser", password="password")
+        url = f"/game/chronicle/{self.chronicle.id}/"
+
+        self.add_scenes(2)
+        cache.clear()
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+
+        self.add_scenes(20)
+        cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url)
+
+        self.assertEqual(len(few), len(many))
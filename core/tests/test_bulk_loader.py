@@ -0,0 +1,136 @@
+"""Tests for the populate_db bulk loader."""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from characters.models.mage.effect import Effect
+from core.bulk_loader import BulkLoader, compile_script, literal_lookups, literal_sources
+from core.models import Book, BookReference, Noun
+
+EFFECT_SCRIPT = """
+from characters.models.mage.effect import Effect
+
+effect, _ = Effect.objects.get_or_create(name="Voidcast", correspondence=4, spirit=3)
+effect.description = "Teleport the contents of a Faraday cage."
+effect.save()
+effect.add_source("Convention Book: Void Engineers", 87)
+Effect.objects.get_or_create(name="Breach the Gauntlet", spirit=4)[0].add_source(
+    "Mage: The Ascension", 215
+)
+"""
+
+
+class CompileScriptTests(TestCase):
+    def declared(self, source):
+        return "declare" in compile_script(source).co_names
+
+    def test_discarded_rows_are_declared(self):
+        self.assertTrue(self.declared('Noun.objects.get_or_create(name="a")[0]\n'))
+
+    def test_used_results_run_as_written(self):
+        source = 'book = Book.objects.get_or_create(name="a")[0]\nprint(book.pk)\n'
+        self.assertFalse(self.declared(source))
+
+    def test_calls_in_arguments_run_as_written(self):
+        source = "Noun.objects.get_or_create(name=Book.objects.get(pk=1).name)\n"
+        self.assertFalse(self.declared(source))
+
+    def test_attributes_without_save_run_as_written(self):
+        source = 'noun, _ = Noun.objects.get_or_create(name="a")\nnoun.name = "b"\n'
+        self.assertFalse(self.declared(source))
+
+
+class BulkLoaderTests(TestCase):
+    def run_script(self, source):
+        loader = BulkLoader()
+        loader.run(source)
+        return loader.counts
+
+    def test_creates_rows_once(self):
+        source = "from core.models import Noun\n" + "".join(
+            f'Noun.objects.get_or_create(name="noun {i % 50}")\n' for i in range(100)
+        )
+        counts = self.run_script(source)
+        self.assertEqual(counts["created"], 50)
+        self.assertEqual(Noun.objects.count(), 50)
+
+        counts = self.run_script(source)
+        self.assertEqual(counts["created"], 0)
+        self.assertEqual(Noun.objects.count(), 50)
+
+    def test_query_count_independent_of_row_count(self):
+        def script(count):
+            return "from core.models import Noun\n" + "".join(
+                f'Noun.objects.get_or_create(name="noun {i}")\n' for i in range(count)
+            )
+
+        with CaptureQueriesContext(connection) as few:
+            self.run_script(script(2))
+        Noun.objects.all().delete()
+        with CaptureQueriesContext(connection) as many:
+            self.run_script(script(200))
+        self.assertEqual(len(few), len(many))
+
+    def test_updates_computed_fields_and_sources(self):
+        counts = self.run_script(EFFECT_SCRIPT)
+
+        voidcast = Effect.objects.get(name="Voidcast")
+        self.assertEqual(counts["created"], 2)
+        self.assertEqual(voidcast.description, "Teleport the contents of a Faraday cage.")
+        self.assertEqual(voidcast.rote_cost, Effect(correspondence=4, spirit=3).cost())
+        self.assertEqual(voidcast.max_sphere, 4)
+        self.assertEqual(voidcast.sources.get().page, 87)
+        self.assertEqual(Effect.objects.get(name="Breach the Gauntlet").sources.count(), 1)
+
+    def test_rerun_is_a_no_op(self):
+        self.run_script(EFFECT_SCRIPT)
+        counts = self.run_script(EFFECT_SCRIPT)
+
+        self.assertEqual(counts["created"], 0)
+        self.assertEqual(counts["updated"], 0)
+        self.assertEqual(Effect.objects.count(), 2)
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(BookReference.objects.count(), 2)
+        self.assertEqual(Effect.objects.get(name="Voidcast").sources.count(), 1)
+
+    def test_existing_row_updated(self):
+        Effect.objects.create(name="Voidcast", correspondence=4, spirit=3)
+        counts = self.run_script(EFFECT_SCRIPT)
+
+        self.assertEqual(counts["updated"], 1)
+        self.assertEqual(
+            Effect.objects.get(name="Voidcast").description,
+            "Teleport the contents of a Faraday cage.",
+        )
+
+    def test_used_results_still_available(self):
+        self.run_script(
+            "from core.models import Book, BookReference\n"
+            'book = Book.objects.get_or_create(name="Book of Shadows")[0]\n'
+            "BookReference.objects.get_or_create(book=book, page=3)\n"
+        )
+        self.assertEqual(BookReference.objects.get().book.name, "Book of Shadows")
+
+    def test_sources_created_up_front_are_reused(self):
+        sources = literal_sources(EFFECT_SCRIPT)
+        self.assertEqual(
+            sources,
+            {("Convention Book: Void Engineers", 87), ("Mage: The Ascension", 215)},
+        )
+        BulkLoader().create_sources(sources)
+        self.run_script(EFFECT_SCRIPT)
+
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(BookReference.objects.count(), 2)
+        self.assertEqual(Effect.objects.get(name="Voidcast").sources.get().page, 87)
+
+    def test_literal_lookups(self):
+        self.assertEqual(
+            literal_lookups(EFFECT_SCRIPT),
+            {
+                ("Effect", (("correspondence", 4), ("name", "Voidcast"), ("spirit", 3))),
+                ("Effect", (("name", "Breach the Gauntlet"), ("spirit", 4))),
+            },
+        )
+        self.assertEqual(literal_lookups("Effect.objects.get_or_create(name=name)"), set())
@@ -14,6 +14,7 @@ from core.cache import (
     CACHE_TIMEOUT_VERY_LONG,
     CacheInvalidator,
     CacheKeyGenerator,
+    LocalLRUCache,
     cache_function,
     cache_queryset,
     get_cached_queryset,
@@ -113,37 +114,46 @@ class CacheInvalidatorTest(TestCase):
         """Clear cache before each test."""
         cache.clear()
 
-    def test_invalidate_model_cache_with_delete_pattern(self):
-        """Test invalidate_model_cache with pattern deletion support."""
-        # Set some cache values
-        cache.set("tg:queryset:FakeModel:status=App", "value1")
-        cache.set("tg:queryset:FakeModel:status=Un", "value2")
-        cache.set("tg:reference_list:FakeModel:ordering=name", "value3")
-
-        # Use create=True to allow patching non-existent attribute
-        with patch.object(cache, "delete_pattern", create=True) as mock_delete_pattern:
-            CacheInvalidator.invalidate_model_cache(FakeModel)
-            # Should be called twice: once for queryset, once for reference_list
-            self.assertEqual(mock_delete_pattern.call_count, 2)
-            mock_delete_pattern.assert_any_call("tg:queryset:FakeModel:*")
-            mock_delete_pattern.assert_any_call("tg:reference_list:FakeModel:*")
-
-    def test_invalidate_model_cache_fallback_without_delete_pattern(self):
-        """Test invalidate_model_cache falls back when delete_pattern not supported."""
-        # Set cache values for both categories
-        queryset_key = CacheKeyGenerator.make_model_key(FakeModel)
-        reference_list_key = CacheKeyGenerator.make_key("reference_list", FakeModel.__name__)
-        cache.set(queryset_key, "test_value1")
-        cache.set(reference_list_key, "test_value2")
-
-        # Mock delete_pattern to raise AttributeError (create=True for non-existent attribute)
-        with patch.object(cache, "delete_pattern", side_effect=AttributeError, create=True):
-            with patch.object(cache, "delete") as mock_delete:
-                CacheInvalidator.invalidate_model_cache(FakeModel)
-                # Should be called twice: once for queryset, once for reference_list
-                self.assertEqual(mock_delete.call_count, 2)
-                mock_delete.assert_any_call(queryset_key)
-                mock_delete.assert_any_call(reference_list_key)
+    def test_invalidate_model_cache_bumps_version(self):
+        """Test invalidate_model_cache retires keys built for the old version."""
+        key = CacheKeyGenerator.make_versioned_key("reference_list", FakeModel, ordering="name")
+        cache.set(key, "value")
+
+        CacheInvalidator.invalidate_model_cache(FakeModel)
+
+        new_key = CacheKeyGenerator.make_versioned_key("reference_list", FakeModel, ordering="name")
+        self.assertNotEqual(key, new_key)
+        self.assertIsNone(cache.get(new_key))
+
+    def test_invalidate_model_cache_without_version_key(self):
+        """Test invalidate_model_cache starts a fresh version if the old one was evicted."""
+        version = CacheInvalidator.get_version(FakeModel)
+        cache.delete(CacheInvalidator.version_key(FakeModel))
+
+        CacheInvalidator.invalidate_model_cache(FakeModel)
+
+        self.assertGreater(CacheInvalidator.get_version(FakeModel), version)
+
+    def test_version_stable_without_changes(self):
+        """Test get_version returns the same version until it is bumped."""
+        self.assertEqual(
+            CacheInvalidator.get_version(FakeModel), CacheInvalidator.get_version(FakeModel)
+        )
+
+    def test_only_tracked_models_bump_on_save(self):
+        """Test saves skip the version bump until a versioned cache reads the model."""
+        from core.models import Noun
+
+        CacheInvalidator.tracked_models.discard(Noun)
+        self.addCleanup(CacheInvalidator.tracked_models.discard, Noun)
+        key = CacheInvalidator.version_key(Noun)
+
+        Noun.objects.create(name="Raven")
+        self.assertIsNone(cache.get(key))
+
+        version = CacheInvalidator.get_version(Noun)
+        Noun.objects.create(name="Crow")
+        self.assertGreater(CacheInvalidator.get_version(Noun), version)
 
     def test_invalidate_related_caches(self):
         """Test invalidate_related_caches calls invalidate_model_cache."""
@@ -250,6 +260,19 @@ class CacheQuerysetDecoratorTest(TestCase):
         result3 = get_items(status="active", chronicle=2)
         self.assertEqual(call_count, 2)  # Different kwargs
 
+    def test_cache_queryset_invalidated_by_models(self):
+        """Test that saving a listed model invalidates the cached result."""
+        from django.contrib.auth.models import User
+
+        @cache_queryset(timeout=60, models=(User,))
+        def get_users():
+            return User.objects.order_by("username")
+
+        User.objects.create_user(username="alpha", password="test123")
+        self.assertEqual(len(get_users()), 1)
+        User.objects.create_user(username="zebra", password="test123")
+        self.assertEqual(len(get_users()), 2)
+
     def test_cache_queryset_preserves_function_metadata(self):
         """Test that cache_queryset preserves function metadata."""
 
@@ -431,6 +454,17 @@ class GetCachedQuerysetTest(TestCase):
         result = get_cached_queryset(User, timeout=600)
         self.assertIsNotNone(result)
 
+    def test_get_cached_queryset_caches_rows(self):
+        """Test that the cached queryset is evaluated and needs no queries."""
+        from django.contrib.auth.models import User
+
+        User.objects.create_user(username="test", password="test123")
+        get_cached_queryset(User)
+
+        with self.assertNumQueries(0):
+            result = get_cached_queryset(User)
+            self.assertEqual([u.username for u in result], ["test"])
+
 
 class GetCachedReferenceListTest(TestCase):
     """Tests for get_cached_reference_list function."""
@@ -464,9 +498,40 @@ class GetCachedReferenceListTest(TestCase):
         # Create new record after caching
         User.objects.create_user(username="test2", password="test123")
 
-        # Second call should return cached list (without new record)
+        # Second call should return the new record: saving bumped the version
         result2 = get_cached_reference_list(User, ordering="username")
-        self.assertEqual(len(result2), count1)  # Should not include new record
+        self.assertEqual(len(result2), count1 + 1)
+
+    def test_second_call_needs_no_queries(self):
+        """Test that an unchanged model is served from cache."""
+        from django.contrib.auth.models import User
+
+        User.objects.create_user(username="test", password="test123")
+        get_cached_reference_list(User, ordering="username")
+
+        with self.assertNumQueries(0):
+            result = get_cached_reference_list(User, ordering="username")
+        self.assertEqual(len(result), 1)
+
+    def test_local_tier_serves_after_shared_cache_eviction(self):
+        """Test that the in-process tier answers while the version is unchanged."""
+        from django.contrib.auth.models import User
+
+        User.objects.create_user(username="test", password="test123")
+        key = CacheKeyGenerator.make_versioned_key("reference_list", User, ordering="username")
+        get_cached_reference_list(User, ordering="username")
+        cache.delete(key)
+
+        with self.assertNumQueries(0):
+            get_cached_reference_list(User, ordering="username")
+
+    def test_returns_copy(self):
+        """Test that mutating a returned list doesn't affect the cached one."""
+        from django.contrib.auth.models import User
+
+        User.objects.create_user(username="test", password="test123")
+        get_cached_reference_list(User, ordering="username").clear()
+        self.assertEqual(len(get_cached_reference_list(User, ordering="username")), 1)
 
     def test_ordering_parameter(self):
         """Test that ordering parameter works correctly."""
@@ -534,26 +599,43 @@ class GetCachedReferenceListTest(TestCase):
         result1 = get_cached_reference_list(User, ordering="username")
         self.assertEqual(len(result1), 1)
 
-        # Create new record
-        User.objects.create_user(username="test2", password="test123")
-
-        # Before invalidation - should still return cached result
+        # Bulk writes skip signals, so the list stays cached...
+        User.objects.bulk_create([User(username="test2")])
         result2 = get_cached_reference_list(User, ordering="username")
-        self.assertEqual(len(result2), 1)  # Still cached
+        self.assertEqual(len(result2), 1)
 
-        # Mock delete_pattern to simulate Redis cache behavior (which supports patterns)
-        # LocMemCache doesn't support delete_pattern, so we need to mock it
-        with patch.object(cache, "delete_pattern", create=True) as mock_delete_pattern:
-            CacheInvalidator.invalidate_model_cache(User)
-            # Verify delete_pattern was called for reference_list category
-            mock_delete_pattern.assert_any_call("tg:reference_list:User:*")
+        # ...until the model's cache is invalidated, on LocMemCache as on Redis
+        CacheInvalidator.invalidate_model_cache(User)
+        result3 = get_cached_reference_list(User, ordering="username")
+        self.assertEqual(len(result3), 2)
 
-        # Manually clear cache to simulate what delete_pattern would do
-        cache.clear()
+    def test_delete_invalidates(self):
+        """Test that deleting a record invalidates reference lists."""
+        from django.contrib.auth.models import User
 
-        # After invalidation - should get fresh data
-        result3 = get_cached_reference_list(User, ordering="username")
-        self.assertEqual(len(result3), 2)  # Should include new record
+        user = User.objects.create_user(username="test", password="test123")
+        get_cached_reference_list(User, ordering="username")
+        user.delete()
+        self.assertEqual(get_cached_reference_list(User, ordering="username"), [])
+
+
+class LocalLRUCacheTest(TestCase):
+    """Tests for the in-process LRU tier."""
+
+    def test_evicts_least_recently_used(self):
+        local = LocalLRUCache(max_entries=2)
+        local.set("a", 1, 60)
+        local.set("b", 2, 60)
+        local.get("a")
+        local.set("c", 3, 60)
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("c"), 3)
+
+    def test_entries_expire(self):
+        local = LocalLRUCache()
+        local.set("a", 1, -1)
+        self.assertIsNone(local.get("a"))
 
 
 class CacheTimeoutConstantsTest(TestCase):
@@ -0,0 +1,133 @@
+"""Tests for the vectorized dice engine in core/dice.py."""
+
+from io import StringIO
+from itertools import product
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.dice import DiceEngine, score_roll
+
+
+class TestScoreRoll(TestCase):
+    """score_roll() follows the legacy dice() rules."""
+
+    def test_botch(self):
+        self.assertEqual(score_roll([1, 1, 3, 4, 5]), -2)
+
+    def test_ones_cancel_but_never_below_zero(self):
+        self.assertEqual(score_roll([1, 1, 7, 4, 5]), 0)
+
+    def test_specialty_tens(self):
+        self.assertEqual(score_roll([10, 10, 3, 6, 5], specialty=True), 5)
+
+    def test_difficulty(self):
+        self.assertEqual(score_roll([4, 2, 3, 4, 5], difficulty=5), 1)
+
+
+class TestDiceEngine(TestCase):
+    """Tests for DiceEngine rolling and scoring."""
+
+    def test_roll_returns_faces_and_successes(self):
+        """Test roll() mirrors the (faces, successes) format of dice()."""
+        faces, successes = DiceEngine(seed=1).roll(5)
+        self.assertIsInstance(faces, list)
+        self.assertIsInstance(successes, int)
+        self.assertEqual(len(faces), 5)
+        self.assertTrue(all(1 <= face <= 10 for face in faces))
+        self.assertEqual(successes, score_roll(faces))
+
+    def test_seeded_rolls_are_reproducible(self):
+        """Test two engines with the same seed roll the same dice."""
+        first, _ = DiceEngine(seed=7).roll_batch(20, 6)
+        second, _ = DiceEngine(seed=7).roll_batch(20, 6)
+        np.testing.assert_array_equal(first, second)
+
+    def test_empty_pool(self):
+        """Test a zero-dice pool scores zero."""
+        faces, successes = DiceEngine(seed=1).roll(0)
+        self.assertEqual(faces, [])
+        self.assertEqual(successes, 0)
+
+    def test_vectorized_score_matches_single_roll_scoring(self):
+        """Test batch scoring agrees with score_roll() for every difficulty."""
+        faces = DiceEngine(seed=3).roll_faces(500, 7)
+        for difficulty in range(2, 12):
+            for specialty in (False, True):
+                batch = DiceEngine.score(faces, difficulty=difficulty, specialty=specialty)
+                expected = [score_roll(row, difficulty, specialty) for row in faces.tolist()]
+                self.assertEqual(batch.tolist(), expected)
+
+    def test_roll_escalating_raises_difficulty_after_failure(self):
+        """Test each zero-success roll bumps the next roll's difficulty."""
+        results = DiceEngine(seed=11).roll_escalating(20, 3, difficulty=6)
+        difficulty = 6
+        for faces, successes, roll_difficulty in results:
+            self.assertEqual(roll_difficulty, difficulty)
+            self.assertEqual(successes, score_roll(faces, roll_difficulty))
+            if successes == 0:
+                difficulty += 1
+        # Only a botch may end the sequence early
+        if len(results) < 20:
+            self.assertLess(results[-1][1], 0)
+
+    def test_roll_extended_stops_at_target_or_botch(self):
+        """Test extended rolls stop on the first roll that reaches the target or botches."""
+        for seed in range(20):
+            faces, successes = DiceEngine(seed=seed).roll_extended(4, 6, max_rolls=50)
+            self.assertEqual(len(faces), len(successes))
+            totals = np.cumsum(successes)
+            for i in range(len(successes) - 1):
+                self.assertGreaterEqual(successes[i], 0)
+                self.assertLess(totals[i], 6)
+            self.assertTrue(successes[-1] < 0 or totals[-1] >= 6 or len(successes) == 50)
+
+    def test_roll_extended_respects_max_rolls(self):
+        """Test an unreachable target stops after max_rolls."""
+        faces, _ = DiceEngine(seed=5).roll_extended(1, 1000, difficulty=11, max_rolls=3)
+        self.assertLessEqual(len(faces), 3)
+
+
+class TestDiceProbability(TestCase):
+    """Tests for the exact distribution API."""
+
+    def _brute_force(self, pool, difficulty, specialty):
+        counts = {}
+        for faces in product(range(1, 11), repeat=pool):
+            result = score_roll(faces, difficulty, specialty)
+            counts[result] = counts.get(result, 0) + 1
+        return {result: count / 10**pool for result, count in counts.items()}
+
+    def test_distribution_matches_enumeration(self):
+        """Test the distribution equals a brute-force enumeration of small pools."""
+        for pool in range(4):
+            for difficulty in range(2, 12):
+                for specialty in (False, True):
+                    expected = self._brute_force(pool, difficulty, specialty)
+                    actual = DiceEngine.distribution(pool, difficulty, specialty)
+                    self.assertEqual(set(actual), set(expected))
+                    for result, probability in expected.items():
+                        self.assertAlmostEqual(actual[result], probability)
+
+    def test_distribution_sums_to_one(self):
+        dist = DiceEngine.distribution(12, difficulty=7, specialty=True)
+        self.assertAlmostEqual(sum(dist.values()), 1.0)
+
+    def test_single_die_odds(self):
+        """Test the odds of one die at difficulty 6."""
+        self.assertAlmostEqual(DiceEngine.success_probability(1, 6), 0.5)
+        self.assertAlmostEqual(DiceEngine.botch_probability(1, 6), 0.1)
+        self.assertAlmostEqual(DiceEngine.expected_successes(1, 6), 0.5)
+        self.assertAlmostEqual(DiceEngine.expected_successes(1, 6, specialty=True), 0.6)
+
+
+class TestBenchmarkDiceCommand(TestCase):
+    """Tests for the benchmark_dice management command."""
+
+    def test_command_reports_both_paths(self):
+        out = StringIO()
+        call_command("benchmark_dice", iterations=2, rolls=5, seed=1, stdout=out)
+        output = out.getvalue()
+        self.assertIn("legacy dice()", output)
+        self.assertIn("DiceEngine.roll_batch", output)
@@ -0,0 +1,73 @@
+"""Tests for the rule-based data integrity scanner."""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from characters.models.core.character import Character
+from characters.models.core.human import Human
+from core.integrity import IntegrityRule, IntegrityScanner, default_rules
+
+
+class TestIntegrityScanner(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.low = Human.objects.create(name="Low", owner=self.user, xp=2, willpower=3)
+        self.high = Human.objects.create(name="High", owner=self.user, xp=40, willpower=7)
+        self.rules = [
+            IntegrityRule(
+                name="xp_below_5",
+                model=Character,
+                condition=Q(xp__lt=5),
+                description="xp < 5",
+                group="xp",
+                fix={"xp": 5},
+                fix_description="set to 5",
+            ),
+            IntegrityRule(
+                name="willpower_above_5",
+                model=Human,
+                condition=Q(willpower__gt=5),
+                description="willpower > 5",
+                group="willpower",
+            ),
+        ]
+
+    def test_default_rules_scan_clean_data(self):
+        report = IntegrityScanner().scan()
+        self.assertEqual(report.total_issues, 0)
+        self.assertEqual(len(report.results), len(default_rules()))
+
+    def test_one_query_per_model(self):
+        with CaptureQueriesContext(connection) as queries:
+            IntegrityScanner().scan()
+        self.assertEqual(len(queries), 2)
+
+    def test_counts_and_groups(self):
+        report = IntegrityScanner(self.rules).scan()
+        self.assertEqual([x.count for x in report.results], [1, 1])
+        self.assertEqual(report.by_group(), {"xp": 1, "willpower": 1})
+        self.assertEqual(list(IntegrityScanner(self.rules).offenders(self.rules[1])), [self.high])
+
+    def test_fix(self):
+        report = IntegrityScanner(self.rules).scan(fix=True)
+        self.assertEqual([x.fixed for x in report.results], [1, 0])
+        self.low.refresh_from_db()
+        self.assertEqual(self.low.xp, 5)
+        self.assertEqual(IntegrityScanner(self.rules).scan().results[0].count, 0)
+
+    def test_as_dict(self):
+        data = IntegrityScanner(self.rules).scan().as_dict()
+        self.assertEqual(data["total_issues"], 2)
+        self.assertEqual(data["rules"][0]["name"], "xp_below_5")
+        self.assertIn("characters.Human", data["scan_seconds"])
+
+    def test_rule_names_must_be_unique(self):
+        with self.assertRaises(ValueError):
+            IntegrityScanner(self.rules + self.rules[:1])
+
+    def test_negative_age_fixes_to_null(self):
+        rule = next(x for x in default_rules() if x.name == "age_below_0")
+        self.assertEqual(rule.fix, {"age": None})
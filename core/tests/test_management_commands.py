@@ -14,6 +14,7 @@ from django.test import TestCase
 from accounts.models import Profile
 from characters.models.core.human import Human
 from game.models import Chronicle, Scene, Week
+from locations.models.core.location import LocationModel
 
 
 class ManagementCommandTestBase(TestCase):
@@ -107,6 +108,50 @@ class TestValidateDataIntegrityCommand(ManagementCommandTestBase):
         # Command should report no issues since constraints prevent invalid statuses
         self.assertIn("Data Integrity", out)
 
+    def test_json_includes_relationship_and_scene_checks(self):
+        """Test --json reports the ST relationship and scene XP checks too."""
+        Scene.objects.create(name="Finished Scene", chronicle=self.chronicle, finished=True)
+        out, err = self.call_command_capture_output("validate_data_integrity", "--json", "--fix")
+        data = json.loads(out)
+        self.assertEqual(data["total_issues"], 0)
+        self.assertEqual(
+            data["duplicate_st_relationships"], {"count": 0, "fixed": 0, "groups": []}
+        )
+        self.assertEqual(data["scene_xp"], {"xp_given": 0, "awaiting_xp": 1})
+
+
+class TestPopulateGamedataStages(TestCase):
+    """Tests for how populate_gamedata groups directories for --jobs."""
+
+    def test_directories_creating_the_same_rows_share_a_group(self):
+        from pathlib import Path
+
+        from core.management.commands.populate_gamedata import Command
+
+        scripts = {
+            "mage/spirits.py": 'SpiritCharacter.objects.get_or_create(name="Gaffling")\n',
+            "vampire/disciplines.py": 'Discipline.objects.get_or_create(name="Auspex")\n',
+            "werewolf/spirits.py": 'SpiritCharacter.objects.get_or_create(name="Gaffling")\n',
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            populate_dir = Path(tmp)
+            for name, code in scripts.items():
+                (populate_dir / name).parent.mkdir()
+                (populate_dir / name).write_text(code)
+            command = Command()
+            files = sorted(
+                populate_dir.rglob("*.py"), key=lambda f: command.get_sort_key(f, populate_dir)
+            )
+            ((_, groups),) = command.get_stages(files, populate_dir)
+            merged = command.merge_shared_groups(groups, populate_dir)
+
+            names = sorted(
+                [str(f.relative_to(populate_dir)) for f in group] for group in merged
+            )
+        self.assertEqual(
+            names, [["mage/spirits.py", "werewolf/spirits.py"], ["vampire/disciplines.py"]]
+        )
+
 
 class TestValidateCharacterDataCommand(ManagementCommandTestBase):
     """Tests for the validate_character_data management command."""
@@ -219,6 +264,96 @@ class TestExportChronicleCommand(ManagementCommandTestBase):
             call_command("export_chronicle", "99999")
 
 
+class TestChronicleArchiveRoundTrip(ManagementCommandTestBase):
+    """Tests for the streaming NDJSON export/import format."""
+
+    def setUp(self):
+        from game.models import Post
+
+        location = LocationModel.objects.create(name="Bar", chronicle=self.chronicle)
+        self.scenes = [
+            Scene.objects.create(name=f"Scene {i}", chronicle=self.chronicle, location=location)
+            for i in range(2)
+        ]
+        for i in range(5):
+            Post.objects.create(
+                scene=self.scenes[i % 2],
+                character=self.character,
+                display_name="Test Character",
+                message=f"Message {i}",
+            )
+        fd, self.archive = tempfile.mkstemp(suffix=".ndjson.gz")
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.archive)
+
+    def export(self, *args):
+        return self.call_command_capture_output(
+            "export_chronicle",
+            str(self.chronicle.id),
+            "--format",
+            "ndjson",
+            "--output",
+            self.archive,
+            "--chunk-size",
+            "2",
+            *args,
+        )
+
+    def test_export_writes_one_record_per_line(self):
+        import gzip
+
+        out, err = self.export()
+        self.assertIn("Posts: 5", out)
+        with gzip.open(self.archive, "rt") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]["type"], "header")
+        self.assertEqual(records[1]["type"], "chronicle")
+        sections = [r["section"] for r in records if r["type"] == "object"]
+        self.assertEqual(sections.count("posts"), 5)
+        self.assertEqual(sections.count("scenes"), 2)
+
+    def test_round_trip_remaps_scenes_and_posts(self):
+        from game.models import Post
+
+        Scene.objects.filter(pk__in=[s.pk for s in self.scenes]).update(
+            date_played=date(2020, 5, 1)
+        )
+        self.export()
+        out, err = self.call_command_capture_output(
+            "import_chronicle", self.archive, "--batch-size", "2"
+        )
+        self.assertIn("Import complete", out)
+
+        imported = Chronicle.objects.exclude(pk=self.chronicle.pk).get()
+        self.assertEqual(imported.name, self.chronicle.name)
+        new_scenes = Scene.objects.filter(chronicle=imported)
+        self.assertEqual(new_scenes.count(), 2)
+        self.assertEqual(set(new_scenes.values_list("date_played", flat=True)), {date(2020, 5, 1)})
+        posts = Post.objects.filter(scene__chronicle=imported)
+        self.assertEqual(posts.count(), 5)
+        self.assertEqual(
+            sorted(posts.values_list("message", flat=True)),
+            [f"Message {i}" for i in range(5)],
+        )
+        self.assertTrue(all(post.rendered_html for post in posts))
+        # Characters and locations aren't imported: the links are cleared,
+        # with a warning, and posts keep the name they were written under
+        self.assertTrue(all(post.character is None for post in posts))
+        self.assertTrue(all(post.display_name == "Test Character" for post in posts))
+        self.assertFalse(new_scenes.exclude(location=None).exists())
+        self.assertIn("5 game.post.character reference(s)", out)
+        self.assertIn("2 game.scene.location reference(s)", out)
+
+    def test_dry_run_counts_without_importing(self):
+        self.export()
+        out, err = self.call_command_capture_output("import_chronicle", self.archive, "--dry-run")
+        self.assertIn("DRY RUN", out)
+        self.assertIn("Posts: 5", out)
+        self.assertEqual(Chronicle.objects.count(), 1)
+
+
 class TestImportChronicleCommand(ManagementCommandTestBase):
     """Tests for the import_chronicle management command."""
 
@@ -288,6 +423,61 @@ class TestProcessWeeklyXPCommand(ManagementCommandTestBase):
         )
         self.assertIn("Invalid date format", out)
 
+    def _finish_scene_this_week(self, characters):
+        from game.models import Post
+
+        location = LocationModel.objects.create(name="Bar", chronicle=self.chronicle)
+        scene = Scene.objects.create(
+            name="Weekly Scene", chronicle=self.chronicle, location=location, finished=True
+        )
+        scene.characters.add(*characters)
+        Post.objects.create(scene=scene, character=characters[0], display_name="A", message="a")
+        return scene
+
+    def test_batches_create_and_approve_requests(self):
+        """Test requests are created and approved across several batches."""
+        from game.models import WeeklyXPRequest
+
+        week_ending = date.today()
+        characters = [self.character, self.submitted_character]
+        self._finish_scene_this_week(characters)
+
+        out, err = self.call_command_capture_output(
+            "process_weekly_xp",
+            "--week-ending",
+            week_ending.isoformat(),
+            "--batch-size",
+            "1",
+            "--auto-approve",
+        )
+
+        self.assertIn("Created: 2 request(s)", out)
+        self.assertEqual(WeeklyXPRequest.objects.filter(approved=True).count(), 2)
+        self.character.refresh_from_db()
+        self.assertEqual(self.character.xp, 101)
+
+        # A second run finds the existing requests instead of duplicating them
+        out, err = self.call_command_capture_output(
+            "process_weekly_xp", "--week-ending", week_ending.isoformat()
+        )
+        self.assertIn("Already existed: 2 request(s)", out)
+
+    def test_chronicle_filter(self):
+        """Test --chronicle limits processing to one chronicle."""
+        from game.models import WeeklyXPRequest
+
+        self._finish_scene_this_week([self.character])
+        other = Chronicle.objects.create(name="Other Chronicle")
+
+        self.call_command_capture_output(
+            "process_weekly_xp",
+            "--week-ending",
+            date.today().isoformat(),
+            "--chronicle",
+            str(other.pk),
+        )
+        self.assertFalse(WeeklyXPRequest.objects.exists())
+
 
 class TestAuditXPSpendingCommand(ManagementCommandTestBase):
     """Tests for the audit_xp_spending management command."""
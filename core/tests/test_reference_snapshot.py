@@ -0,0 +1,73 @@
+"""Tests for reference-data snapshots."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from characters.models.mage.effect import Effect
+from core.models import Book, BookReference, Noun
+from core.reference_snapshot import (
+    content_hash,
+    empty_tables,
+    load_snapshot,
+    read_header,
+    reference_tables_empty,
+    write_snapshot,
+)
+
+
+class ReferenceSnapshotTests(TestCase):
+    def setUp(self):
+        fd, path = tempfile.mkstemp(suffix=".ndjson.gz")
+        os.close(fd)
+        self.path = Path(path)
+        self.addCleanup(self.path.unlink)
+
+        self.empty_before = empty_tables()
+        self.noun = Noun.objects.create(name="Raven")
+        self.effect = Effect.objects.create(name="Voidcast", correspondence=4, spirit=3)
+        self.effect.add_source("Convention Book: Void Engineers", 87)
+
+    def clear(self):
+        Effect.objects.all().delete()
+        BookReference.objects.all().delete()
+        Book.objects.all().delete()
+        Noun.objects.all().delete()
+
+    def test_round_trip(self):
+        tables = write_snapshot(self.path, "abc", self.empty_before)
+        self.assertEqual(tables["core.noun"], 1)
+        self.assertEqual(read_header(self.path)["hash"], "abc")
+
+        self.clear()
+        self.assertTrue(reference_tables_empty(self.path))
+        counts = load_snapshot(self.path)
+
+        self.assertEqual(counts, tables)
+        self.assertEqual(Noun.objects.get().pk, self.noun.pk)
+        effect = Effect.objects.get()
+        self.assertIsInstance(effect, Effect)
+        self.assertEqual(effect.rote_cost, self.effect.rote_cost)
+        self.assertEqual(effect.sources.get().book.name, "Convention Book: Void Engineers")
+        self.assertFalse(reference_tables_empty(self.path))
+
+    def test_new_rows_get_fresh_ids(self):
+        write_snapshot(self.path, "abc", self.empty_before)
+        self.clear()
+        load_snapshot(self.path)
+        self.assertGreater(Noun.objects.create(name="Crow").pk, self.noun.pk)
+
+    def test_refuses_tables_with_earlier_data(self):
+        with self.assertRaisesMessage(ValueError, "core.noun"):
+            write_snapshot(self.path, "abc", self.empty_before - {"core.noun"})
+
+    def test_hash_follows_scripts(self):
+        with tempfile.TemporaryDirectory() as populate_dir:
+            script = Path(populate_dir) / "nouns.py"
+            script.write_text('Noun.objects.get_or_create(name="Raven")\n')
+            before = content_hash(populate_dir)
+            self.assertEqual(content_hash(populate_dir), before)
+            script.write_text('Noun.objects.get_or_create(name="Crow")\n')
+            self.assertNotEqual(content_hash(populate_dir), before)
@@ -2,11 +2,18 @@
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from characters.models.core.human import Human
-from core.xp_utils import award_xp_atomically, calculate_story_xp
-from game.models import Chronicle, Scene, Story
+from core.xp_utils import (
+    award_xp_atomically,
+    award_xp_entries,
+    award_xp_to_characters,
+    calculate_story_xp,
+)
+from game.models import Chronicle, Scene, Story, XPAward
 from locations.models import LocationModel
 
 
@@ -321,3 +328,75 @@ class AwardXPAtomicallyEdgeCaseTests(TestCase):
 
         character.refresh_from_db()
         self.assertEqual(character.xp, 1000)
+
+
+class AwardXPToCharactersTests(TestCase):
+    """Tests for the set-based award_xp_to_characters engine."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@test.com", password="password"
+        )
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+
+    def make_characters(self, count):
+        return [
+            Human.objects.create(name=f"Hero {i}", owner=self.user, chronicle=self.chronicle)
+            for i in range(count)
+        ]
+
+    def test_awards_and_audits(self):
+        """Each character gets its own increment and one audit row."""
+        char1, char2, char3 = self.make_characters(3)
+        char2.xp = 4
+        char2.save()
+
+        count = award_xp_to_characters({char1: 2, char2: 3, char3: 0}, source="story", source_id=7)
+
+        self.assertEqual(count, 2)
+        char1.refresh_from_db()
+        char2.refresh_from_db()
+        char3.refresh_from_db()
+        self.assertEqual((char1.xp, char2.xp, char3.xp), (2, 7, 0))
+        self.assertEqual(
+            set(XPAward.objects.values_list("character_id", "amount", "source", "source_id")),
+            {(char1.pk, 2, "story", 7), (char2.pk, 3, "story", 7)},
+        )
+
+    def test_accepts_pks(self):
+        """Amounts may be keyed by pk, as the weekly batch approval does."""
+        (character,) = self.make_characters(1)
+        award_xp_to_characters({character.pk: 3})
+        character.refresh_from_db()
+        self.assertEqual(character.xp, 3)
+
+    def test_entries_keep_one_award_per_source(self):
+        """A character's entries share one increment but keep their own audit rows."""
+        char1, char2 = self.make_characters(2)
+
+        count = award_xp_entries([(char1, 1, 10), (char1.pk, 2, 11), (char2, 3, 10)], "weekly")
+
+        self.assertEqual(count, 2)
+        char1.refresh_from_db()
+        self.assertEqual(char1.xp, 3)
+        self.assertEqual(
+            set(XPAward.objects.values_list("character_id", "amount", "source_id")),
+            {(char1.pk, 1, 10), (char1.pk, 2, 11), (char2.pk, 3, 10)},
+        )
+
+    def test_nothing_to_award(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(award_xp_to_characters({}), 0)
+
+    def test_query_count_independent_of_character_count(self):
+        """Regression: awarding 50 characters costs the same queries as 2."""
+        few = {char: 1 for char in self.make_characters(2)}
+        many = {char: 1 for char in self.make_characters(50)}
+
+        with CaptureQueriesContext(connection) as few_queries:
+            award_xp_atomically(Story, Story.objects.create(name="Small").pk, few)
+        with CaptureQueriesContext(connection) as many_queries:
+            award_xp_atomically(Story, Story.objects.create(name="Big").pk, many)
+
+        self.assertEqual(len(few_queries), len(many_queries))
+        self.assertEqual(XPAward.objects.filter(source="story").count(), 52)
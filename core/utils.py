@@ -1,6 +1,8 @@
 import logging
 import random
 
+from core.dice import score_roll
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,19 +34,20 @@ def weighted_choice(dictionary, floor=0, ceiling=5):
 
 
 def dice(dicepool, difficulty=6, specialty=False):
+    """Roll a single pool with the stdlib RNG.
+
+    Batch callers should prefer core.dice.DiceEngine, which rolls and scores
+    whole arrays of dice at once.
+    """
     dice_list = [random.randint(1, 10) for _ in range(dicepool)]
-    ones = len([x for x in dice_list if x == 1])
-    tens = len([x for x in dice_list if x == 10])
-    successes = len([x for x in dice_list if x >= difficulty])
-    total = successes - ones
-    if successes == 0:
-        return dice_list, total
-    if specialty:
-        total += tens
-    return dice_list, max([total, 0])
+    return dice_list, score_roll(dice_list, difficulty=difficulty, specialty=specialty)
 
 
 def compute_level(x, level=0):
+    # Locations keep their depth in a materialized path; no need to walk parents
+    tree_depth = getattr(x, "tree_depth", None)
+    if tree_depth is not None:
+        return level + tree_depth
     if x.parent is None:
         return level
     return compute_level(x.parent, level=level + 1)
@@ -55,14 +58,30 @@ def level_name(x):
 
 
 def tree_sort(x, l=None):
+    from locations.models.core import LocationModel
+
     if l is None:
         l = []
+    if isinstance(x, LocationModel):
+        # Materialized hierarchy: load the subtree in one query and walk it in
+        # memory. Query the base model, since children can be of any location type.
+        l.append(x)
+        for root in LocationModel.objects.subtree(x).as_tree():
+            for child in root.tree_children:
+                _walk_tree(child, l)
+        return l
     l.append(x)
     for y in x.children.order_by("name"):
         tree_sort(y, l=l)
     return l
 
 
+def _walk_tree(x, l):
+    l.append(x)
+    for y in x.tree_children:
+        _walk_tree(y, l)
+
+
 def filepath(instance, filename):
     s = str(instance.__class__).split(" ")[-1][:-1][1:-1]
     s = "/".join([x for x in s.split(".") if x != "models"])
@@ -5,6 +5,7 @@ This module contains utility functions for atomically awarding XP to characters.
 """
 
 from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
 
 
 @transaction.atomic
@@ -14,7 +15,7 @@ def award_xp_atomically(parent_model, parent_pk, character_xp_map):
     This function handles the common pattern of:
     1. Locking the parent object (Story/Scene) to prevent concurrent awards
     2. Checking if XP has already been awarded
-    3. Locking each character and updating their XP
+    3. Locking the characters and updating their XP in bulk
     4. Marking the parent as complete
 
     Args:
@@ -37,8 +38,6 @@ def award_xp_atomically(parent_model, parent_pk, character_xp_map):
     # Import here to avoid circular dependency with game.models
     from django.core.exceptions import ValidationError
 
-    from characters.models import Character
-
     # Lock the parent to prevent concurrent awards
     parent = parent_model.objects.select_for_update().get(pk=parent_pk)
 
@@ -48,16 +47,8 @@ def award_xp_atomically(parent_model, parent_pk, character_xp_map):
             code="xp_already_given"
         )
 
-    # Award to all characters atomically
-    awarded_count = 0
-    for char, xp_amount in character_xp_map.items():
-        if xp_amount > 0:
-            # Re-fetch and lock each character to ensure fresh data and prevent
-            # race conditions with concurrent XP awards from other sources
-            locked_char = Character.objects.select_for_update().get(pk=char.pk)
-            locked_char.xp += xp_amount
-            locked_char.save(update_fields=["xp"])
-            awarded_count += 1
+    source = parent._meta.model_name
+    awarded_count = award_xp_to_characters(character_xp_map, source=source, source_id=parent.pk)
 
     # Mark parent as complete
     parent.xp_given = True
@@ -66,6 +57,85 @@ def award_xp_atomically(parent_model, parent_pk, character_xp_map):
     return awarded_count
 
 
+def award_xp_to_characters(character_xp_map, source="other", source_id=None):
+    """Award XP to many characters with a constant number of queries.
+
+    All affected rows are locked in one query, ordered by pk so concurrent
+    awards always lock in the same order and can't deadlock. The increments
+    are applied in a single UPDATE with a CASE per character, and one
+    XPAward audit row per character is written with bulk_create.
+
+    Args:
+        character_xp_map: Dict mapping Character objects (or pks) to XP amounts.
+                          Non-positive amounts are skipped.
+        source: XPAward source ("story", "scene", "weekly" or "other")
+        source_id: Primary key of the object behind the award, if any
+
+    Returns:
+        int: Number of characters who received XP
+    """
+    return award_xp_entries(
+        [(char, xp_amount, source_id) for char, xp_amount in character_xp_map.items()],
+        source=source,
+    )
+
+
+@transaction.atomic
+def award_xp_entries(entries, source="other"):
+    """Award XP from several source objects at once, like award_xp_to_characters.
+
+    Each character's entries are added up into one increment, but every
+    source_id keeps its own XPAward row, so a batch of weekly requests can
+    still be traced request by request.
+
+    Args:
+        entries: Iterable of (Character or pk, XP amount, source_id) tuples.
+                 Non-positive amounts are skipped.
+        source: XPAward source ("story", "scene", "weekly" or "other")
+
+    Returns:
+        int: Number of characters who received XP
+    """
+    from characters.models import Character
+    from game.models import XPAward
+
+    # {character pk: {source_id: amount}}
+    awards = {}
+    for char, xp_amount, source_id in entries:
+        if xp_amount > 0:
+            by_source = awards.setdefault(getattr(char, "pk", char), {})
+            by_source[source_id] = by_source.get(source_id, 0) + xp_amount
+    if not awards:
+        return 0
+
+    # Lock every affected character up front, in pk order
+    locked_pks = list(
+        Character.objects.select_for_update()
+        .filter(pk__in=awards)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    if not locked_pks:
+        return 0
+
+    Character.objects.filter(pk__in=locked_pks).update(
+        xp=F("xp")
+        + Case(
+            *[When(pk=pk, then=Value(sum(awards[pk].values()))) for pk in locked_pks],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    XPAward.objects.bulk_create(
+        [
+            XPAward(character_id=pk, amount=amount, source=source, source_id=source_id)
+            for pk in locked_pks
+            for source_id, amount in awards[pk].items()
+        ]
+    )
+    return len(locked_pks)
+
+
 def calculate_story_xp(xp_categories):
     """Calculate total XP from story XP categories.
 
@@ -16,6 +16,7 @@ from game.models import (
     UserSceneReadStatus,
     Week,
     WeeklyXPRequest,
+    XPAward,
     XPSpendingRequest,
 )
 
@@ -215,6 +216,14 @@ class JournalEntryAdmin(admin.ModelAdmin):
     has_st_message.short_description = "Has ST Message"
 
 
+@admin.register(XPAward)
+class XPAwardAdmin(admin.ModelAdmin):
+    list_display = ("character", "amount", "source", "source_id", "created_at")
+    list_filter = ("source", "created_at")
+    search_fields = ("character__name",)
+    readonly_fields = ("created_at",)
+
+
 @admin.register(XPSpendingRequest)
 class XPSpendingRequestAdmin(admin.ModelAdmin):
     list_display = (
@@ -9,8 +9,9 @@ from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
 from characters.models.core import CharacterModel
-from core.templatetags.sanitize_text import render_post_html
 from game.models import Scene
+from game.presence import ScenePresence
+from game.scene_log import PAGE_SIZE, get_post_page, serialize_page, serialize_post
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,14 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
     - Broadcasting new posts to all connected clients
     - Saving posts to database via Scene.add_post()
     - Authentication and authorization checks
+    - Tracking who is connected, refreshed by client heartbeats
+
+    Each connection keeps a snapshot of the scene, the pks of the user's
+    characters in it and whether the user is a storyteller, loaded once on
+    connect. Signal handlers in game.signals send scene_closed and
+    scene_characters_changed group events when that state changes. Posting
+    re-fetches the character so that dice and spend commands save current
+    values rather than a copy from connect time.
     """
 
     async def connect(self):
@@ -41,25 +50,33 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             return
 
         # Verify scene exists and user has access
-        scene = await self.get_scene()
-        if scene is None:
+        snapshot = await self.load_snapshot()
+        if snapshot is None:
             logger.warning(f"Scene {self.scene_id} not found for WebSocket connection")
             await self.close()
             return
 
+        self.scene, self.character_pks, self.user_is_st = snapshot
         # Check if scene is finished (read-only)
-        self.scene_finished = scene.finished
+        self.scene_finished = self.scene.finished
 
         # Join the scene group
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
+        self.presence = ScenePresence(self.scene_id)
+        await self.join_presence()
+        await self.broadcast_presence()
+
         logger.info(f"User {self.user.username} connected to scene {self.scene_id}")
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
         # Leave the scene group
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        if hasattr(self, "presence"):
+            await self.leave_presence()
+            await self.broadcast_presence()
         logger.info(f"User {self.user.username} disconnected from scene {self.scene_id}")
 
     async def receive(self, text_data):
@@ -72,6 +89,10 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
                 await self.handle_chat_message(data)
             elif message_type == "add_character":
                 await self.handle_add_character(data)
+            elif message_type == "heartbeat":
+                await self.handle_heartbeat()
+            elif message_type == "backfill":
+                await self.handle_backfill(data)
             else:
                 logger.warning(f"Unknown message type: {message_type}")
         except json.JSONDecodeError:
@@ -92,32 +113,21 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             return
 
         # Check scene is not finished
-        scene = await self.get_scene()
-        if scene is None or scene.finished:
+        if self.scene_finished:
             await self.send_error("Cannot post to a finished scene")
             return
 
-        # Get and validate character
-        character = await self.get_character(character_id)
-        if character is None:
-            await self.send_error("Character not found")
-            return
-
-        # Verify user owns this character
-        if not await self.user_owns_character(character):
-            await self.send_error("You can only post as your own characters")
-            return
-
-        # Verify character is in the scene
-        if not await self.character_in_scene(character, scene):
-            await self.send_error("Character is not in this scene")
+        # The user's characters in the scene come from the connection snapshot
+        character_pk = self.character_pk(character_id)
+        if character_pk not in self.character_pks:
+            await self.send_error(await self.character_rejection(character_id))
             return
 
         # Straighten quotes in the message (matching view behavior)
         message = self.straighten_quotes(message)
 
         # Create the post using the Scene.add_post method
-        result = await self.create_post(scene, character, display_name, message)
+        result = await self.create_post(self.scene, character_pk, display_name, message)
 
         if result is None:
             # add_post returns None for @storyteller messages or errors
@@ -135,7 +145,7 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
         post = result
 
         # Prepare post data for broadcast
-        post_data = await self.serialize_post(post, character)
+        post_data = self.serialize_post(post, post.character)
 
         # Broadcast to all clients in the scene group
         await self.channel_layer.group_send(
@@ -146,13 +156,41 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             },
         )
 
+    async def handle_backfill(self, data):
+        """Send a page of older posts (before) or posts missed while disconnected (after)."""
+        try:
+            page = await self.get_backfill_page(
+                data.get("before"), data.get("after"), data.get("limit", PAGE_SIZE)
+            )
+        except (TypeError, ValueError):
+            await self.send_error("Invalid backfill request")
+            return
+        direction = "newer" if data.get("after") else "older"
+        await self.send(text_data=json.dumps({"type": "backfill", "direction": direction, **page}))
+
+    async def handle_heartbeat(self):
+        """Refresh this connection's presence entry."""
+        if not await self.refresh_presence():
+            # Expired (e.g. a long pause in the client); announce the rejoin
+            await self.join_presence()
+            await self.broadcast_presence()
+        await self.send(text_data=json.dumps({"type": "heartbeat_ack"}))
+
+    async def broadcast_presence(self):
+        """Send the current connected-user list to everyone in the scene."""
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                "type": "presence_broadcast",
+                "users": await self.get_present_users(),
+            },
+        )
+
     async def handle_add_character(self, data):
         """Handle adding a character to the scene."""
         character_id = data.get("character_id")
 
-        # Get scene
-        scene = await self.get_scene()
-        if scene is None or scene.finished:
+        if self.scene_finished:
             await self.send_error("Cannot add character to finished scene")
             return
 
@@ -163,12 +201,13 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             return
 
         # Verify user owns this character
-        if not await self.user_owns_character(character):
+        if character.owner_id != self.user.pk:
             await self.send_error("You can only add your own characters")
             return
 
-        # Add character to scene
-        await self.add_character_to_scene(scene, character)
+        # Add character to scene; other connections refresh on scene_characters_changed
+        await self.add_character_to_scene(self.scene, character)
+        self.character_pks.add(character.pk)
 
         # Broadcast character added notification
         await self.channel_layer.group_send(
@@ -205,6 +244,29 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             )
         )
 
+    async def scene_closed(self, event):
+        """Mark the snapshot finished and tell the WebSocket the scene is read-only."""
+        self.scene_finished = True
+        self.scene.finished = True
+        await self.send(text_data=json.dumps({"type": "scene_closed"}))
+
+    async def scene_characters_changed(self, event):
+        """Reload the user's characters when one of theirs joined or left the scene."""
+        owner_ids = event["owner_ids"]
+        if owner_ids is None or self.user.pk in owner_ids:
+            self.character_pks = await self.get_scene_characters()
+
+    async def presence_broadcast(self, event):
+        """Send the connected-user list to WebSocket."""
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "presence",
+                    "users": event["users"],
+                }
+            )
+        )
+
     async def send_error(self, message):
         """Send error message to client."""
         await self.send(
@@ -216,6 +278,14 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             )
         )
 
+    @staticmethod
+    def character_pk(character_id):
+        """Normalize a character id from the client to an int, or None."""
+        try:
+            return int(character_id)
+        except (TypeError, ValueError):
+            return None
+
     @staticmethod
     def straighten_quotes(s):
         """Normalize various quotation marks to standard ASCII."""
@@ -256,12 +326,23 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
     # Database operations (must be wrapped for async)
 
     @database_sync_to_async
-    def get_scene(self):
-        """Get scene by ID."""
+    def load_snapshot(self):
+        """Load (scene, characters, user_is_st) for this connection, or None if no scene."""
         try:
-            return Scene.objects.select_related("chronicle", "location").get(pk=self.scene_id)
+            scene = Scene.objects.select_related("chronicle", "location").get(pk=self.scene_id)
         except Scene.DoesNotExist:
             return None
+        user_is_st = self.user.profile.is_st() if hasattr(self.user, "profile") else False
+        return scene, self._scene_characters(), user_is_st
+
+    def _scene_characters(self):
+        characters = CharacterModel.objects.filter(scenes__pk=self.scene_id, owner=self.user)
+        return set(characters.values_list("pk", flat=True))
+
+    @database_sync_to_async
+    def get_scene_characters(self):
+        """Get the pks of the user's characters in the scene."""
+        return self._scene_characters()
 
     @database_sync_to_async
     def get_character(self, character_id):
@@ -272,18 +353,21 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
             return None
 
     @database_sync_to_async
-    def user_owns_character(self, character):
-        """Check if current user owns the character."""
-        return character.owner_id == self.user.pk
-
-    @database_sync_to_async
-    def character_in_scene(self, character, scene):
-        """Check if character is in the scene."""
-        return scene.characters.filter(pk=character.pk).exists()
+    def character_rejection(self, character_id):
+        """Explain why a character is not in the snapshot."""
+        try:
+            character = CharacterModel.objects.get(pk=character_id)
+        except (CharacterModel.DoesNotExist, TypeError, ValueError):
+            return "Character not found"
+        if character.owner_id != self.user.pk:
+            return "You can only post as your own characters"
+        return "Character is not in this scene"
 
     @database_sync_to_async
-    def create_post(self, scene, character, display_name, message):
+    def create_post(self, scene, character_pk, display_name, message):
         """Create a post using Scene.add_post method."""
+        # Commands in the message save the character, so load its current state
+        character = CharacterModel.objects.select_related("owner").get(pk=character_pk)
         try:
             post = scene.add_post(character, display_name, message)
             return post
@@ -296,18 +380,30 @@ class SceneChatConsumer(AsyncWebsocketConsumer):
         scene.add_character(character)
 
     @database_sync_to_async
+    def join_presence(self):
+        """Register this connection in the scene's presence set."""
+        self.presence.join(self.channel_name, self.user)
+
+    @database_sync_to_async
+    def refresh_presence(self):
+        """Refresh this connection's heartbeat. Returns False if it had expired."""
+        return self.presence.heartbeat(self.channel_name)
+
+    @database_sync_to_async
+    def leave_presence(self):
+        """Remove this connection from the scene's presence set."""
+        self.presence.leave(self.channel_name)
+
+    @database_sync_to_async
+    def get_present_users(self):
+        """Get the users currently connected to the scene."""
+        return self.presence.users()
+
+    @database_sync_to_async
+    def get_backfill_page(self, before, after, limit):
+        """Get a serialized page of the scene's posts."""
+        return serialize_page(get_post_page(self.scene, before, after, int(limit)))
+
     def serialize_post(self, post, character):
         """Serialize post data for WebSocket transmission."""
-        is_st = character.owner.profile.is_st() if hasattr(character.owner, "profile") else False
-        return {
-            "id": post.pk,
-            "character_id": character.pk,
-            "character_name": character.name,
-            "character_url": character.get_absolute_url(),
-            "display_name": post.display_name,
-            "message": post.message,
-            "message_html": render_post_html(post.message),
-            "datetime_created": post.datetime_created.isoformat(),
-            "owner_id": character.owner_id,
-            "is_st": is_st,
-        }
+        return serialize_post(post, self.user_is_st)
@@ -0,0 +1,106 @@
+"""
+Management command to render stored post HTML.
+
+Post.rendered_html is filled in when a post is saved. Run this command once
+after adding the column to backfill existing posts, and again whenever
+POST_HTML_VERSION in core.templatetags.sanitize_text is bumped.
+
+Usage:
+    python manage.py render_posts              # Posts rendered under older rules
+    python manage.py render_posts --all        # Every post
+    python manage.py render_posts --benchmark  # Compare per-view and stored rendering
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.templatetags.sanitize_text import POST_HTML_VERSION, render_post_html
+from game.models import Post
+
+SAMPLE_MESSAGES = [
+    'Marcus leans against the bar. "You\'re late," he says, not looking up.',
+    "<b>Dexterity + Firearms</b>: roll of 6 dice at difficulty 6: 3, 8, 10, 1, 6, 9: <b>3</b>",
+    '<i>She hesitates</i>, then: "Fine. But <a href="https://example.com">this</a> stays '
+    'between us." #WP',
+    "The rain doesn't stop. Somewhere below, a siren starts and stops again.",
+]
+
+
+class Command(BaseCommand):
+    help = "Render Post.rendered_html for posts stored under older sanitizer rules"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-render every post, not only those with an older version",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Posts to render and update per query (default: 500)",
+        )
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="Time rendering a scene's posts per view versus reading stored HTML, then exit",
+        )
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=2000,
+            help="Posts in the benchmark scene (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        if options["benchmark"]:
+            self.benchmark(options["posts"])
+            return
+
+        posts = Post.objects.order_by("pk")
+        if not options["all"]:
+            posts = posts.exclude(rendered_html_version=POST_HTML_VERSION)
+
+        batch_size = options["batch_size"]
+        rendered = 0
+        last_pk = 0
+        while True:
+            # Keyset batches: each batch is a fresh indexed query, and re-rendered
+            # posts drop out of the version filter without shifting later batches
+            batch = list(posts.filter(pk__gt=last_pk).only("pk", "message")[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.render_html()
+            Post.objects.bulk_update(batch, ["rendered_html", "rendered_html_version"])
+            rendered += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"  Rendered {rendered} posts...")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rendered {rendered} posts with version {POST_HTML_VERSION}")
+        )
+
+    def benchmark(self, num_posts):
+        posts = [Post(message=SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]) for i in range(num_posts)]
+        for post in posts:
+            post.render_html()
+
+        self.stdout.write(f"Rendering a scene of {num_posts} posts...\n")
+
+        start = time.perf_counter()
+        for post in posts:
+            render_post_html(post.message)
+        per_view = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for post in posts:
+            str(post.html)
+        stored = time.perf_counter() - start
+
+        self.stdout.write(f"  {'sanitize per view':<24}{per_view * 1000:10.1f} ms")
+        self.stdout.write(f"  {'stored rendered_html':<24}{stored * 1000:10.1f} ms")
+        if stored > 0:
+            self.stdout.write(self.style.SUCCESS(f"  Speedup: {per_view / stored:.0f}x"))
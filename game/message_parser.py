@@ -0,0 +1,217 @@
+"""
+Single-pass parser for scene post and journal commands.
+
+A post may contain any number of point spends and at most one roll command:
+
+    #WP, #WP2        spend willpower (a bare #WP also adds an automatic success)
+    #Q3              spend quintessence
+    #P1              gain paradox
+    #2B, #1L, #1A    take bashing, lethal or aggravated damage
+
+    /roll 5 difficulty 7 true
+    /rolls 3 rolls @ 5 difficulty 6
+    /stat Dexterity + Firearms + 2 difficulty 6 true
+    /extended 4 target 10 difficulty 7 true
+
+parse_message() scans the message once with patterns compiled at import
+time and returns a typed ParsedMessage. It does not touch the database;
+game.models.message_processing() applies the result to a character.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+SPEND_PATTERN = re.compile(r"#WP(-?\d+)|#WP|#Q(-?\d+)|#P(-?\d+)|#(-?\d+)(B|L|A)")
+
+# "rolls" must come before "roll" so "/rolls" is not read as "/roll" + "s"
+COMMAND_PATTERN = re.compile(r"/(extended|rolls|stat|roll)")
+
+# When a message contains several different commands, the first kind in this
+# order wins and the others are left in its trailing text.
+COMMAND_PRIORITY = ("extended", "rolls", "stat", "roll")
+
+ARGUMENT_PATTERNS = {
+    "extended": re.compile(
+        r"^(?P<num_dice>\d+)\s+target\s+(?P<target>\d+)"
+        r"(?:\s+difficulty\s+(?P<difficulty>\d+))?(?:\s+(?P<specialty>\S+))?",
+        re.IGNORECASE,
+    ),
+    "rolls": re.compile(
+        r"^(?P<num_rolls>\d+)\s+rolls\s+@\s+(?P<num_dice>\d+)"
+        r"(?:\s+difficulty\s+(?P<difficulty>\d+))?(?:\s+(?P<specialty>\S+))?",
+        re.IGNORECASE,
+    ),
+    # The stats group must stop at 'difficulty' or end of string, and a
+    # specialty may only follow an explicit difficulty
+    "stat": re.compile(
+        r"^(?P<stats>[a-zA-Z0-9\s+]+?)"
+        r"(?:\s+difficulty\s+(?P<difficulty>\d+)(?:\s+(?P<specialty>\S+))?)?$",
+        re.IGNORECASE,
+    ),
+    "roll": re.compile(
+        r"^(?P<num_dice>\d+)(?:\s+difficulty\s+(?P<difficulty>\d+))?(?:\s+(?P<specialty>\S+))?",
+        re.IGNORECASE,
+    ),
+}
+
+DEFAULT_DIFFICULTY = 6
+
+
+@dataclass(frozen=True)
+class WillpowerSpend:
+    amount: int = 1
+    # A bare "#WP" buys an automatic success on this post's roll
+    automatic_success: bool = False
+
+
+@dataclass(frozen=True)
+class QuintessenceSpend:
+    amount: int
+
+
+@dataclass(frozen=True)
+class ParadoxGain:
+    amount: int
+
+
+@dataclass(frozen=True)
+class Damage:
+    damage_type: str  # "B", "L" or "A"
+    amount: int
+
+
+@dataclass(frozen=True)
+class Roll:
+    num_dice: int
+    difficulty: int = DEFAULT_DIFFICULTY
+    specialty: bool = False
+
+
+@dataclass(frozen=True)
+class MultiRoll:
+    num_rolls: int
+    num_dice: int
+    difficulty: int = DEFAULT_DIFFICULTY
+    specialty: bool = False
+
+
+@dataclass(frozen=True)
+class StatRoll:
+    # Stat names (as typed) and flat integer modifiers, in order
+    terms: tuple
+    difficulty: int = DEFAULT_DIFFICULTY
+    specialty: bool = False
+
+
+@dataclass(frozen=True)
+class ExtendedRoll:
+    num_dice: int
+    target: int
+    difficulty: int = DEFAULT_DIFFICULTY
+    specialty: bool = False
+
+
+@dataclass(frozen=True)
+class ParsedMessage:
+    message: str
+    spends: tuple = field(default_factory=tuple)
+    command: Roll | MultiRoll | StatRoll | ExtendedRoll | None = None
+    # Text before the command, stripped; only meaningful when command is set
+    text: str = ""
+
+    @property
+    def willpower_success(self):
+        return any(
+            isinstance(spend, WillpowerSpend) and spend.automatic_success for spend in self.spends
+        )
+
+
+def _parse_spends(message):
+    spends = []
+    for match in SPEND_PATTERN.finditer(message):
+        if match.group(1):
+            spends.append(WillpowerSpend(amount=int(match.group(1))))
+        elif match.group(0) == "#WP":
+            spends.append(WillpowerSpend(amount=1, automatic_success=True))
+        elif match.group(2):
+            spends.append(QuintessenceSpend(amount=int(match.group(2))))
+        elif match.group(3):
+            spends.append(ParadoxGain(amount=int(match.group(3))))
+        elif match.group(4):
+            spends.append(Damage(damage_type=match.group(5), amount=int(match.group(4))))
+    return tuple(spends)
+
+
+def _difficulty(match):
+    return int(match.group("difficulty")) if match.group("difficulty") else DEFAULT_DIFFICULTY
+
+
+def _specialty(match):
+    specialty = match.group("specialty")
+    return specialty.lower() == "true" if specialty else False
+
+
+def _build_command(kind, match):
+    if kind == "extended":
+        return ExtendedRoll(
+            num_dice=int(match.group("num_dice")),
+            target=int(match.group("target")),
+            difficulty=_difficulty(match),
+            specialty=_specialty(match),
+        )
+    if kind == "rolls":
+        return MultiRoll(
+            num_rolls=int(match.group("num_rolls")),
+            num_dice=int(match.group("num_dice")),
+            difficulty=_difficulty(match),
+            specialty=_specialty(match),
+        )
+    if kind == "stat":
+        terms = []
+        for term in match.group("stats").strip().split("+"):
+            term = term.strip()
+            terms.append(int(term) if term.isdigit() else term)
+        return StatRoll(
+            terms=tuple(terms),
+            difficulty=_difficulty(match),
+            specialty=_specialty(match),
+        )
+    return Roll(
+        num_dice=int(match.group("num_dice")),
+        difficulty=_difficulty(match),
+        specialty=_specialty(match),
+    )
+
+
+def parse_message(message):
+    """
+    Parse a post into its point spends and roll command.
+
+    Raises:
+        ValueError: If the message contains a roll command that does not
+            match its expected format, or repeats the same command.
+    """
+    spends = _parse_spends(message)
+
+    commands = {}
+    for match in COMMAND_PATTERN.finditer(message):
+        commands.setdefault(match.group(1), []).append(match)
+    kind = next((kind for kind in COMMAND_PRIORITY if kind in commands), None)
+    if kind is None:
+        return ParsedMessage(message=message, spends=spends)
+
+    if len(commands[kind]) > 1:
+        raise ValueError(f"Only one /{kind} command is allowed per message.")
+    token = commands[kind][0]
+    text = message[: token.start()].strip()
+    arguments = message[token.end() :].strip()
+
+    match = ARGUMENT_PATTERNS[kind].match(arguments)
+    if match is None:
+        raise ValueError("Command does not match the expected format.")
+    return ParsedMessage(
+        message=message,
+        spends=spends,
+        command=_build_command(kind, match),
+        text=text,
+    )
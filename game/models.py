@@ -1,12 +1,12 @@
-import re
 from datetime import date, datetime, timedelta
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Max, OuterRef, Subquery
+from django.db.models import Exists, Max, OuterRef, Subquery
 from django.urls import reverse
 from django.utils.functional import cached_property
+from django.utils.safestring import mark_safe
 from django.utils.timezone import (  # ensure timezone-aware now if using TIME_ZONE settings
     make_aware,
     now,
@@ -14,8 +14,19 @@ from django.utils.timezone import (  # ensure timezone-aware now if using TIME_Z
 
 from core.base import ValidatedSaveMixin
 from core.constants import GameLine, HeadingChoices, ObjectTypeChoices, XPApprovalStatus
-from core.utils import dice
+from core.dice import default_engine
+from core.templatetags.sanitize_text import POST_HTML_VERSION, render_post_html
 from core.validators import validate_gameline, validate_non_empty_name
+from game.message_parser import (
+    Damage,
+    ExtendedRoll,
+    MultiRoll,
+    ParadoxGain,
+    QuintessenceSpend,
+    StatRoll,
+    WillpowerSpend,
+    parse_message,
+)
 
 
 class ObjectType(ValidatedSaveMixin, models.Model):
@@ -529,16 +540,19 @@ class Scene(models.Model):
         if message.lower().startswith("@storyteller"):
             self.waiting_for_st = True
             self.st_message = message[len("@storyteller ") :]
-            self.save()
+            # Only these fields: chat connections hold long-lived Scene instances
+            self.save(update_fields=["waiting_for_st", "st_message"])
             return None
+        # Check the stored flag rather than self.waiting_for_st: chat connections
+        # hold Scene instances from before the @storyteller post
         if (
             character is not None
-            and self.waiting_for_st
+            and Scene.objects.filter(pk=self.pk, waiting_for_st=True).exists()
             and character.owner
             and character.owner.profile.is_st()
         ):
             self.waiting_for_st = False
-            self.save()
+            self.save(update_fields=["waiting_for_st"])
         try:
             message = message_processing(character, message)
         except ValueError:
@@ -547,15 +561,7 @@ class Scene(models.Model):
             character=character, message=message, display_name=display, scene=self
         )
         character_owner = character.owner if character else None
-        for user in User.objects.filter(charactermodel__scenes=self).distinct():
-            if user != character_owner:
-                status = UserSceneReadStatus.objects.get_or_create(user=user, scene=self)[0]
-                status.read = False
-                status.save()
-            else:
-                status = UserSceneReadStatus.objects.get_or_create(user=user, scene=self)[0]
-                status.read = True
-                status.save()
+        UserSceneReadStatus.objects.mark_posted(self, character_owner)
         return post
 
     def most_recent_post(self):
@@ -584,6 +590,37 @@ class Scene(models.Model):
         return award_xp_atomically(Scene, self.pk, character_xp_map)
 
 
+class UserSceneReadStatusManager(models.Manager):
+    """Custom manager for UserSceneReadStatus with set-based updates."""
+
+    def mark_posted(self, scene, author=None):
+        """Flag a scene unread for every participant except the author.
+
+        Upserts one row per participating user in a single statement, so the
+        cost of a post does not grow with the number of players in the scene.
+        The author's own status is marked read. Unread-scene badge counts are
+        counted when read, so nothing else is written per participant.
+        """
+        author_id = author.pk if author is not None else None
+        participant_ids = (
+            User.objects.filter(charactermodel__scenes=scene)
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+        statuses = [
+            self.model(user_id=user_id, scene=scene, read=user_id == author_id)
+            for user_id in participant_ids
+        ]
+        if not statuses:
+            return []
+        return self.bulk_create(
+            statuses,
+            update_conflicts=True,
+            unique_fields=["user", "scene"],
+            update_fields=["read"],
+        )
+
+
 class UserSceneReadStatus(models.Model):
     user = models.ForeignKey(
         User,
@@ -601,10 +638,18 @@ class UserSceneReadStatus(models.Model):
     )
     read = models.BooleanField(default=True)
 
+    objects = UserSceneReadStatusManager()
+
     class Meta:
         indexes = [
             models.Index(fields=["user", "scene"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "scene"],
+                name="unique_read_status_per_user_scene",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user}-{self.scene}: {self.read}"
@@ -626,6 +671,9 @@ class Post(models.Model):
     scene = models.ForeignKey("game.Scene", on_delete=models.SET_NULL, null=True, db_index=True)
     message = models.TextField(default="")
     datetime_created = models.DateTimeField(default=now, db_index=True)
+    # Sanitized HTML of message, rendered once on save rather than on every view
+    rendered_html = models.TextField(default="", blank=True, editable=False)
+    rendered_html_version = models.PositiveSmallIntegerField(default=0, editable=False)
 
     objects = PostManager()
 
@@ -647,6 +695,29 @@ class Post(models.Model):
             return self.display_name + ": " + self.message
         return self.character.name + ": " + self.message
 
+    def save(self, *args, **kwargs):
+        self.render_html()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "message" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "rendered_html", "rendered_html_version"}
+        super().save(*args, **kwargs)
+
+    def render_html(self):
+        """Render message into rendered_html with the current sanitizer rules."""
+        self.rendered_html = render_post_html(self.message)
+        self.rendered_html_version = POST_HTML_VERSION
+
+    @property
+    def html(self):
+        """Sanitized message HTML, safe for templates.
+
+        Falls back to rendering on the fly for posts stored under older rules
+        that render_posts has not re-rendered yet.
+        """
+        if self.rendered_html_version == POST_HTML_VERSION:
+            return mark_safe(self.rendered_html)
+        return mark_safe(render_post_html(self.message))
+
 
 class JournalEntry(models.Model):
     journal = models.ForeignKey(
@@ -710,213 +781,117 @@ class Journal(models.Model):
 
 
 def message_processing(character, message):
-    temporary_point_regex = re.compile(r"#WP(-?\d+)|#WP|#Q(-?\d+)|#P(-?\d+)|#(-?\d+)(B|L|A)")
-    wp_spend = False
+    """
+    Apply the point spends and roll command in a post and return the rendered message.
+
+    The message is parsed once by game.message_parser before anything is
+    changed, so a malformed command never leaves the character half-updated.
+    All spends are then applied to the character in memory and saved once,
+    after the roll command has been checked against the character's stats.
+    """
+    parsed = parse_message(message)
+
     expenditures = []
-    needs_save = False
-
-    for match in temporary_point_regex.finditer(message):
-        full_match = match.group(0)
-        if match.group(1):
-            wp_amount = int(match.group(1))
-            character.temporary_willpower = max(0, character.temporary_willpower - wp_amount)
-            expenditures.append(f"{wp_amount}WP")
-            needs_save = True
-        elif full_match == "#WP":
-            character.temporary_willpower = max(0, character.temporary_willpower - 1)
-            wp_spend = True
-            expenditures.append("WP")
-            needs_save = True
-        elif match.group(2):
+    for spend in parsed.spends:
+        if isinstance(spend, WillpowerSpend):
+            character.temporary_willpower = max(0, character.temporary_willpower - spend.amount)
+            expenditures.append("WP" if spend.automatic_success else f"{spend.amount}WP")
+        elif isinstance(spend, QuintessenceSpend):
             if hasattr(character, "quintessence"):
-                character.quintessence -= int(match.group(2))
-                expenditures.append(f"{int(match.group(2))}Q")
-                needs_save = True
-        elif match.group(3):
+                character.quintessence -= spend.amount
+                expenditures.append(f"{spend.amount}Q")
+        elif isinstance(spend, ParadoxGain):
             if hasattr(character, "paradox"):
-                character.paradox += int(match.group(3))
-                expenditures.append(f"{int(match.group(3))}P")
-                needs_save = True
-        elif match.group(4):
-            damage_type = match.group(5)
-            damage_amount = int(match.group(4))
-            expenditures.append(f"{damage_amount}{damage_type}")
-            if damage_type == "B":
-                for _ in range(damage_amount):
-                    character.add_bashing()
-            if damage_type == "L":
-                for _ in range(damage_amount):
-                    character.add_lethal()
-            if damage_type == "A":
-                for _ in range(damage_amount):
-                    character.add_aggravated()
-            needs_save = True
-
-    # Save once at the end if any changes were made
-    if needs_save:
+                character.paradox += spend.amount
+                expenditures.append(f"{spend.amount}P")
+        elif isinstance(spend, Damage):
+            # One health-block operation per spend rather than one per level
+            character.add_damage(spend.damage_type, spend.amount)
+            expenditures.append(f"{spend.amount}{spend.damage_type}")
+
+    command = parsed.command
+    if command is None:
+        if expenditures:
+            character.save()
+        return message
+
+    if isinstance(command, ExtendedRoll):
+        r = extended_roll(
+            command.num_dice,
+            command.target,
+            difficulty=command.difficulty,
+            specialty=command.specialty,
+        )
+        roll_description = (
+            f"extended roll of {command.num_dice} dice at difficulty {command.difficulty} "
+            f"targeting {command.target} successes"
+        )
+    elif isinstance(command, MultiRoll):
+        r = rolls(
+            command.num_rolls,
+            command.num_dice,
+            difficulty=command.difficulty,
+            specialty=command.specialty,
+        )
+        roll_description = (
+            f"{command.num_rolls} rolls of {command.num_dice} dice "
+            f"at difficulty {command.difficulty}"
+        )
+    elif isinstance(command, StatRoll):
+        num_dice = 0
+        stat_display_parts = []
+        for stat in command.terms:
+            # Flat modifier
+            if isinstance(stat, int):
+                num_dice += stat
+                stat_display_parts.append(str(stat))
+            else:
+                stat_value = getattr(character, stat.lower().replace(" ", "_"), None)
+                if stat_value is None:
+                    raise ValueError(f"Stat '{stat}' not found on character")
+                num_dice += stat_value
+                stat_display_parts.append(f"{stat.title()} ({stat_value})")
+
+        if num_dice <= 0:
+            raise ValueError("Dice pool must be at least 1")
+
+        r = roll_once(
+            num_dice,
+            difficulty=command.difficulty,
+            specialty=command.specialty,
+            willpower=parsed.willpower_success,
+        )
+        pool_description = " + ".join(stat_display_parts)
+        roll_description = (
+            f"roll of {pool_description} = {num_dice} dice at difficulty {command.difficulty}"
+        )
+    else:
+        r = roll_once(
+            command.num_dice,
+            difficulty=command.difficulty,
+            specialty=command.specialty,
+            willpower=parsed.willpower_success,
+        )
+        roll_description = f"roll of {command.num_dice} dice at difficulty {command.difficulty}"
+    if command.specialty:
+        roll_description += " with relevant specialty"
+
+    # Save once, now that the whole command is known to be valid
+    if expenditures:
         character.save()
 
-    expenditures = ", ".join(["#" + x for x in expenditures])
-    if "/extended" in message:
-        text, roll = message.split("/extended")
-        text = text.strip()
-        roll = roll.strip()
-        if match := re.match(
-            r"^(?P<num_dice>\d+)\s+target\s+(?P<target>\d+)(?:\s+difficulty\s+(?P<difficulty>\d+))?(?:\s+(?P<specialty>\S+))?",
-            roll,
-            re.IGNORECASE,
-        ):
-            num_dice = int(match.group("num_dice"))
-            target_successes = int(match.group("target"))
-            difficulty = int(match.group("difficulty")) if match.group("difficulty") else 6
-            specialty_str = match.group("specialty")
-            specialty = specialty_str.lower() == "true" if specialty_str else False
-            r = extended_roll(
-                num_dice,
-                target_successes,
-                difficulty=difficulty,
-                specialty=specialty,
-            )
-            roll_description = f"extended roll of {num_dice} dice at difficulty {difficulty} targeting {target_successes} successes"
-            if specialty:
-                roll_description += " with relevant specialty"
-            m = ""
-            if text:
-                m += text + ": "
-            if expenditures:
-                m += expenditures + ": "
-            m += roll_description + ": " + r
-            message = m
-        else:
-            raise ValueError("Command does not match the expected format.")
-    elif "/rolls" in message:
-        text, roll = message.split("/rolls")
-        text = text.strip()
-        roll = roll.strip()
-        if match := re.match(
-            r"^(?P<num_rolls>\d+)\s+rolls\s+@\s+(?P<num_dice>\d+)(?:\s+difficulty\s+(?P<difficulty>\d+))?(?:\s+(?P<specialty>\S+))?",
-            roll,
-            re.IGNORECASE,
-        ):
-            num_rolls = int(match.group("num_rolls"))
-            num_dice = int(match.group("num_dice"))
-            difficulty = int(match.group("difficulty")) if match.group("difficulty") else 6
-            specialty_str = match.group("specialty")
-            specialty = specialty_str.lower() == "true" if specialty_str else False
-            r = rolls(
-                num_rolls,
-                num_dice,
-                difficulty=difficulty,
-                specialty=specialty,
-            )
-            roll_description = f"{num_rolls} rolls of {num_dice} dice at difficulty {difficulty}"
-            if specialty:
-                roll_description += " with relevant specialty"
-            m = ""
-            if text:
-                m += text + ": "
-            if expenditures:
-                m += expenditures + ": "
-            m += roll_description + ": " + r
-            message = m
-        else:
-            raise ValueError("Command does not match the expected format.")
-    elif "/stat" in message:
-        text, roll = message.split("/stat")
-        text = text.strip()
-        roll = roll.strip()
-        # Pattern for stat-based roll: "Dexterity + Firearms" or "Strength + Brawl + 2" difficulty 6
-        # The stats group must stop at 'difficulty' or end of string, and specialty only follows difficulty
-        if match := re.match(
-            r"^(?P<stats>[a-zA-Z0-9\s+]+?)(?:\s+difficulty\s+(?P<difficulty>\d+)(?:\s+(?P<specialty>\S+))?)?$",
-            roll,
-            re.IGNORECASE,
-        ):
-            stats_string = match.group("stats").strip()
-            difficulty = int(match.group("difficulty")) if match.group("difficulty") else 6
-            specialty_str = match.group("specialty")
-            specialty = specialty_str.lower() == "true" if specialty_str else False
-
-            # Parse the stats (e.g., "Dexterity + Firearms" or "Strength + Brawl + 2")
-            stat_parts = [s.strip() for s in stats_string.split("+")]
-            num_dice = 0
-            stat_display_parts = []
-
-            for stat in stat_parts:
-                # Check if it's a number (flat modifier)
-                if stat.isdigit():
-                    num_dice += int(stat)
-                    stat_display_parts.append(stat)
-                else:
-                    # Convert to lowercase for attribute lookup
-                    stat_lower = stat.lower().replace(" ", "_")
-                    stat_value = getattr(character, stat_lower, None)
-                    if stat_value is None:
-                        raise ValueError(f"Stat '{stat}' not found on character")
-                    num_dice += stat_value
-                    stat_display_parts.append(f"{stat.title()} ({stat_value})")
-
-            if num_dice <= 0:
-                raise ValueError("Dice pool must be at least 1")
-
-            r = roll_once(
-                num_dice,
-                difficulty=difficulty,
-                specialty=specialty,
-                willpower=wp_spend,
-            )
-            pool_description = " + ".join(stat_display_parts)
-            roll_description = (
-                f"roll of {pool_description} = {num_dice} dice at difficulty {difficulty}"
-            )
-            if specialty:
-                roll_description += " with relevant specialty"
-            m = ""
-            if text:
-                m += text + ": "
-            if expenditures:
-                m += expenditures + ": "
-            m += roll_description + ": " + r
-            message = m
-        else:
-            raise ValueError("Command does not match the expected format.")
-    elif "/roll" in message:
-        text, roll = message.split("/roll")
-        text = text.strip()
-        roll = roll.strip()
-        # Full Pattern
-        if match := re.match(
-            r"^(?P<num_dice>\d+)(?:\s+difficulty\s+(?P<difficulty>\d+))?(?:\s+(?P<specialty>\S+))?",
-            roll,
-            re.IGNORECASE,
-        ):
-            num_dice = int(match.group("num_dice"))
-            difficulty = int(match.group("difficulty")) if match.group("difficulty") else 6
-            specialty_str = match.group("specialty")
-            specialty = specialty_str.lower() == "true" if specialty_str else False
-            r = roll_once(
-                num_dice,
-                difficulty=difficulty,
-                specialty=specialty,
-                willpower=wp_spend,
-            )
-            roll_description = f"roll of {num_dice} dice at difficulty {difficulty}"
-            if specialty:
-                roll_description += " with relevant specialty"
-            m = ""
-            if text:
-                m += text + ": "
-            if expenditures:
-                m += expenditures + ": "
-            m += roll_description + ": " + r
-            message = m
-        else:
-            raise ValueError("Command does not match the expected format.")
-    return message
+    m = ""
+    if parsed.text:
+        m += parsed.text + ": "
+    if expenditures:
+        m += ", ".join(["#" + x for x in expenditures]) + ": "
+    return m + roll_description + ": " + r
 
 
 def roll_once(number_of_dice, difficulty=6, specialty=False, willpower=False):
-    roll, success_count = dice(number_of_dice, difficulty=difficulty, specialty=specialty)
+    roll, success_count = default_engine.roll(
+        number_of_dice, difficulty=difficulty, specialty=specialty
+    )
     if willpower:
         success_count += 1
         if success_count < 0:
@@ -926,22 +901,11 @@ def roll_once(number_of_dice, difficulty=6, specialty=False, willpower=False):
 
 
 def rolls(num_rolls, num_dice, difficulty, specialty):
-    roll_list = []
-    successes = []
-    difficulties = []
-    for _ in range(num_rolls):
-        difficulties.append(difficulty)
-        roll, success_count = dice(num_dice, difficulty=difficulty, specialty=specialty)
-        roll = ", ".join(map(str, roll))
-        roll_list.append(roll)
-        successes.append(success_count)
-        if success_count == 0:
-            difficulty += 1
-        if success_count < 0:
-            break
     join_list = []
-    for roll, suxx, diff in zip(roll_list, successes, difficulties, strict=False):
-        join_list.append(f"{roll}: <b>{suxx}</b>")
+    for roll, suxx, diff in default_engine.roll_escalating(
+        num_rolls, num_dice, difficulty=difficulty, specialty=specialty
+    ):
+        join_list.append(f"{', '.join(map(str, roll))}: <b>{suxx}</b>")
         if suxx == 0:
             join_list[-1] = join_list[-1] + f": difficulty increased to {diff + 1}"
     return "Rolls:<br>" + "<br>".join(join_list)
@@ -961,33 +925,24 @@ def extended_roll(num_dice, target_successes, difficulty=6, specialty=False, max
     Returns:
         HTML string showing each roll and cumulative progress
     """
-    roll_list = []
-    successes_per_roll = []
-    cumulative_successes = 0
-    botched = False
-
-    for roll_num in range(max_rolls):
-        roll, success_count = dice(num_dice, difficulty=difficulty, specialty=specialty)
-        roll_str = ", ".join(map(str, roll))
-        roll_list.append(roll_str)
-        successes_per_roll.append(success_count)
-        cumulative_successes += success_count
-
-        # Check for botch (negative successes means catastrophic failure)
-        if success_count < 0:
-            botched = True
-            break
-
-        # Check if target reached
-        if cumulative_successes >= target_successes:
-            break
+    roll_list, successes_per_roll = default_engine.roll_extended(
+        num_dice,
+        target_successes,
+        difficulty=difficulty,
+        specialty=specialty,
+        max_rolls=max_rolls,
+    )
+    botched = bool(successes_per_roll) and successes_per_roll[-1] < 0
+    cumulative_successes = sum(successes_per_roll)
 
     # Build output
     join_list = []
     running_total = 0
     for i, (roll, suxx) in enumerate(zip(roll_list, successes_per_roll, strict=False), 1):
         running_total += suxx
-        join_list.append(f"Roll {i}: {roll}: <b>{suxx}</b> (Total: {running_total})")
+        join_list.append(
+            f"Roll {i}: {', '.join(map(str, roll))}: <b>{suxx}</b> (Total: {running_total})"
+        )
 
     result = "Extended Roll:<br>" + "<br>".join(join_list)
 
@@ -1004,6 +959,131 @@ def extended_roll(num_dice, target_successes, difficulty=6, specialty=False, max
     return result
 
 
+class WeeklyXPRequestQuerySet(models.QuerySet):
+    """Set-based access to the weekly XP ledger."""
+
+    def pending(self):
+        return self.filter(approved=False)
+
+    def for_storyteller(self, user):
+        """Requests for characters in chronicles where user is a storyteller."""
+        return self.filter(
+            character__chronicle__in=Chronicle.objects.filter(st_relationships__user=user)
+        )
+
+    def in_chronicle(self, chronicle):
+        return self.filter(character__chronicle=chronicle)
+
+    def participated(self):
+        """Only requests whose character is recorded on the request's week."""
+        return self.filter(
+            Exists(
+                Week.characters.through.objects.filter(
+                    week_id=OuterRef("week_id"), charactermodel_id=OuterRef("character_id")
+                )
+            )
+        )
+
+    def missing_for(self, characters):
+        """
+        Week participation rows for characters with no request yet.
+
+        An anti-join over Week.characters, returned as through-model rows with
+        the week joined; charactermodel_id identifies the character.
+        """
+        existing = self.model.objects.filter(
+            character_id=OuterRef("charactermodel_id"), week_id=OuterRef("week_id")
+        )
+        return (
+            Week.characters.through.objects.filter(charactermodel__in=characters)
+            .filter(~Exists(existing))
+            .select_related("week")
+            .order_by("pk")
+        )
+
+    def resolved(self):
+        """
+        Evaluate with weeks joined and characters as their concrete classes.
+
+        Costs one query for the requests plus one per character class,
+        however many requests there are.
+        """
+        from characters.models.core.character import CharacterModel
+
+        requests = list(self.select_related("week"))
+        character_ids = {r.character_id for r in requests if r.character_id}
+        characters = CharacterModel.objects.in_bulk(character_ids)
+        for request in requests:
+            if request.character_id:
+                request.character = characters[request.character_id]
+        return requests
+
+    def create_for_week(self, week, characters):
+        """
+        Create finishing-only requests for characters on a week in one INSERT.
+
+        Characters that already have a request for the week are skipped.
+
+        Returns:
+            list: The created requests
+        """
+        from accounts import notifications
+
+        existing = set(
+            self.model.objects.filter(week=week, character__in=characters).values_list(
+                "character_id", flat=True
+            )
+        )
+        requests = self.model.objects.bulk_create(
+            [
+                self.model(week=week, character=character, finishing=True)
+                for character in characters
+                if character.pk not in existing
+            ]
+        )
+        notifications.mark_stale(
+            notifications.CHARACTER,
+            [r.character_id for r in requests],
+            ["weekly_xp_requests", "weekly_xp_to_approve"],
+        )
+        return requests
+
+    def approve_all(self):
+        """
+        Approve every pending request in the queryset and award the XP in bulk.
+
+        Requests are locked, marked approved with one UPDATE and their XP is
+        awarded through core.xp_utils.award_xp_entries, so the number of
+        queries doesn't grow with the number of requests. Each request gets
+        its own XPAward. The UPDATE sends no post_save, so the affected
+        notification counts are marked stale here.
+
+        Returns:
+            tuple: (list of approved requests, total XP awarded)
+        """
+        from accounts import notifications
+        from core.xp_utils import award_xp_entries
+
+        with transaction.atomic():
+            requests = list(self.pending().select_for_update(of=("self",)).order_by("pk"))
+            entries = [
+                (request.character_id, request.total_xp(), request.pk) for request in requests
+            ]
+            total_xp = sum(xp_increase for _, xp_increase, _ in entries)
+            self.model.objects.filter(pk__in=[r.pk for r in requests]).update(approved=True)
+            award_xp_entries(
+                [entry for entry in entries if entry[0] is not None], source="weekly"
+            )
+            notifications.mark_stale(
+                notifications.CHARACTER,
+                list({character_id for character_id, _, _ in entries}),
+                ["weekly_xp_requests", "weekly_xp_to_approve"],
+            )
+        for request in requests:
+            request.approved = True
+        return requests, total_xp
+
+
 class WeeklyXPRequest(ValidatedSaveMixin, models.Model):
     week = models.ForeignKey(Week, on_delete=models.SET_NULL, null=True)
     character = models.ForeignKey("characters.CharacterModel", on_delete=models.SET_NULL, null=True)
@@ -1026,6 +1106,8 @@ class WeeklyXPRequest(ValidatedSaveMixin, models.Model):
     )
     approved = models.BooleanField(default=False)
 
+    objects = WeeklyXPRequestQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=["character", "week"]),
@@ -1166,6 +1248,46 @@ class XPSpendingRequest(models.Model):
         return f"{self.character.name} - {self.trait_name} ({self.approved})"
 
 
+class XPAward(models.Model):
+    """
+    Audit record of XP awarded to a character.
+
+    Written in bulk by core.xp_utils.award_xp_entries, one row per character
+    per story, scene or weekly request behind the award.
+    """
+
+    SOURCE_CHOICES = [
+        ("story", "Story"),
+        ("scene", "Scene"),
+        ("weekly", "Weekly XP Request"),
+        ("other", "Other"),
+    ]
+
+    character = models.ForeignKey(
+        "characters.CharacterModel",
+        on_delete=models.CASCADE,
+        related_name="xp_awards",
+    )
+    amount = models.IntegerField(help_text="XP awarded")
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default="other")
+    source_id = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Primary key of the story, scene or weekly request"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "XP Award"
+        verbose_name_plural = "XP Awards"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["character", "-created_at"]),
+            models.Index(fields=["source", "source_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.character.name} +{self.amount} XP ({self.get_source_display()})"
+
+
 class FreebieSpendingRecord(models.Model):
     """
     Model for tracking freebie point spending during character creation.
@@ -0,0 +1,125 @@
+"""
+Per-scene presence tracking for scene chat.
+
+Each open websocket registers itself under its channel name and refreshes
+its entry with a heartbeat. Entries that have not been refreshed within
+SCENE_PRESENCE_TTL seconds are treated as gone, so a worker that dies
+without running disconnect() does not leave ghosts behind.
+
+Presence lives in the default cache. In production that is Redis, so every
+Daphne worker sees the same set; in development it is per-process. Every
+connection has its own cache key, so a heartbeat only writes that key. The
+index of channel names in a scene is changed on join and leave only, under
+a short cache.add() lock, so concurrent workers do not drop each other's
+entries.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import CacheKeyGenerator
+
+# How long join/leave wait for the index lock before going ahead without it
+INDEX_LOCK_WAIT = 1.0
+INDEX_LOCK_TIMEOUT = 5
+
+
+def presence_ttl():
+    return getattr(settings, "SCENE_PRESENCE_TTL", 60)
+
+
+class ScenePresence:
+    """
+    Who is connected to a scene's chat.
+
+    Usage:
+        presence = ScenePresence(scene.pk)
+        presence.join(channel_name, user)
+        presence.heartbeat(channel_name)
+        presence.users()  # [{"id": 1, "username": "alice"}, ...]
+        presence.leave(channel_name)
+    """
+
+    def __init__(self, scene_id):
+        self.scene_id = scene_id
+        self.key = CacheKeyGenerator.make_key("presence", "scene", id=scene_id)
+        self.lock_key = f"{self.key}:lock"
+
+    def _entry_key(self, channel_name):
+        return f"{self.key}:{channel_name}"
+
+    def _live(self, entry, now):
+        return entry is not None and now - entry["last_seen"] <= presence_ttl()
+
+    def _set_entry(self, channel_name, entry):
+        # Outlive the entry by one TTL; stale entries are filtered on read
+        cache.set(self._entry_key(channel_name), entry, presence_ttl() * 2)
+
+    @contextmanager
+    def _index_lock(self):
+        deadline = time.monotonic() + INDEX_LOCK_WAIT
+        acquired = cache.add(self.lock_key, 1, INDEX_LOCK_TIMEOUT)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.01)
+            acquired = cache.add(self.lock_key, 1, INDEX_LOCK_TIMEOUT)
+        try:
+            yield
+        finally:
+            if acquired:
+                cache.delete(self.lock_key)
+
+    def _connections(self, now=None):
+        """Live connections, keyed by channel name, with expired entries dropped."""
+        now = time.time() if now is None else now
+        channels = cache.get(self.key) or []
+        entries = cache.get_many([self._entry_key(channel) for channel in channels])
+        connections = {}
+        for channel in channels:
+            entry = entries.get(self._entry_key(channel))
+            if self._live(entry, now):
+                connections[channel] = entry
+        return connections
+
+    def _update_index(self, add=None, remove=None):
+        """Rewrite the channel index, pruning expired connections on the way."""
+        with self._index_lock():
+            channels = set(self._connections())
+            if add is not None:
+                channels.add(add)
+            channels.discard(remove)
+            if channels:
+                cache.set(self.key, sorted(channels), None)
+            else:
+                cache.delete(self.key)
+
+    def join(self, channel_name, user):
+        entry = {"user_id": user.pk, "username": user.username, "last_seen": time.time()}
+        self._set_entry(channel_name, entry)
+        self._update_index(add=channel_name)
+
+    def heartbeat(self, channel_name):
+        """Refresh a connection. Returns False if it had already expired."""
+        now = time.time()
+        entry = cache.get(self._entry_key(channel_name))
+        if not self._live(entry, now):
+            return False
+        entry["last_seen"] = now
+        self._set_entry(channel_name, entry)
+        # Put back a connection whose join lost the lock or whose index was evicted
+        if channel_name not in (cache.get(self.key) or []):
+            self._update_index(add=channel_name)
+        return True
+
+    def leave(self, channel_name):
+        cache.delete(self._entry_key(channel_name))
+        self._update_index(remove=channel_name)
+
+    def users(self):
+        """Distinct connected users, ordered by username. A user with two tabs appears once."""
+        users = {}
+        for entry in self._connections().values():
+            users[entry["user_id"]] = {"id": entry["user_id"], "username": entry["username"]}
+        return sorted(users.values(), key=lambda user: user["username"].lower())
@@ -0,0 +1,148 @@
+"""
+Cursor pagination of scene posts.
+
+Posts are ordered by (datetime_created, id), which the
+("scene", "-datetime_created") index on Post serves directly. A cursor names
+one post's position in that order, so a page never shifts when new posts
+arrive, unlike offset pagination.
+
+Pages are fetched either backwards from the newest post (the scene page
+loads the tail first and then older history on demand) or forwards from a
+cursor (a client catching up after a reconnect).
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from django.db.models import Q
+
+from characters.models.core import CharacterModel
+from game.models import Post, STRelationship
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def encode_cursor(post):
+    """Cursor for a post's position: '<microseconds since epoch>.<id>'."""
+    micros = (post.datetime_created - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{post.pk}"
+
+
+def decode_cursor(cursor):
+    """Return (datetime_created, id) for a cursor. Raises ValueError if malformed."""
+    try:
+        micros, pk = cursor.split(".")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (AttributeError, TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+@dataclass
+class ScenePostPage:
+    # Oldest first, ready to render
+    posts: list
+    # Pass as before= to get the page of older posts; None at the start of the scene
+    # and for pages fetched with after=
+    older_cursor: str | None
+    # Pass as after= to get newer posts, None if there are none yet
+    newer_cursor: str | None
+    has_newer: bool = False
+
+
+def get_post_page(scene, before=None, after=None, limit=PAGE_SIZE):
+    """
+    Fetch one page of a scene's posts.
+
+    With neither cursor, returns the newest posts. With before, the posts
+    immediately older than that cursor; with after, the posts immediately
+    newer. Each post gets .cursor and .owner_is_st attributes.
+
+    Raises:
+        ValueError: If a cursor is malformed or both cursors are given.
+    """
+    if before and after:
+        raise ValueError("Pass either before or after, not both")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    queryset = Post.objects.filter(scene=scene)
+    if after:
+        created, pk = decode_cursor(after)
+        queryset = queryset.filter(
+            Q(datetime_created__gt=created) | Q(datetime_created=created, pk__gt=pk)
+        ).order_by("datetime_created", "pk")
+    else:
+        if before:
+            created, pk = decode_cursor(before)
+            queryset = queryset.filter(
+                Q(datetime_created__lt=created) | Q(datetime_created=created, pk__lt=pk)
+            )
+        queryset = queryset.order_by("-datetime_created", "-pk")
+
+    # One extra row tells us whether another page exists
+    posts = list(queryset[: limit + 1])
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+    if not after:
+        posts.reverse()
+    _annotate(posts)
+
+    if after:
+        older_cursor = None
+        has_newer = has_more
+    else:
+        older_cursor = posts[0].cursor if posts and has_more else None
+        has_newer = bool(before)
+    newer_cursor = posts[-1].cursor if posts else (after or None)
+    return ScenePostPage(posts, older_cursor, newer_cursor, has_newer)
+
+
+def _annotate(posts):
+    """Attach characters, cursors and each author's storyteller flag in bulk."""
+    # Polymorphic in_bulk rather than select_related, which would give base
+    # CharacterModel rows without the subclass URLs
+    characters = CharacterModel.objects.in_bulk(
+        {post.character_id for post in posts if post.character_id}
+    )
+    for post in posts:
+        if post.character_id:
+            post.character = characters.get(post.character_id)
+
+    owner_ids = {post.character.owner_id for post in posts if post.character}
+    st_owner_ids = set()
+    if owner_ids:
+        st_owner_ids = set(
+            STRelationship.objects.filter(user_id__in=owner_ids).values_list("user_id", flat=True)
+        )
+    for post in posts:
+        post.cursor = encode_cursor(post)
+        post.owner_is_st = bool(post.character) and post.character.owner_id in st_owner_ids
+
+
+def serialize_post(post, is_st):
+    """Post data as sent to scene chat clients, over the websocket or as JSON."""
+    character = post.character
+    return {
+        "id": post.pk,
+        "cursor": encode_cursor(post),
+        "character_id": character.pk if character else None,
+        "character_name": character.name if character else "",
+        "character_url": character.get_absolute_url() if character else "",
+        "display_name": post.display_name,
+        "message": post.message,
+        "message_html": str(post.html),
+        "datetime_created": post.datetime_created.isoformat(),
+        "owner_id": character.owner_id if character else None,
+        "is_st": is_st,
+    }
+
+
+def serialize_page(page):
+    return {
+        "posts": [serialize_post(post, post.owner_is_st) for post in page.posts],
+        "older_cursor": page.older_cursor,
+        "newer_cursor": page.newer_cursor,
+        "has_newer": page.has_newer,
+    }
@@ -1,10 +1,15 @@
 # game/signals.py
-from django.db import IntegrityError
-from django.db.models.signals import post_save
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import IntegrityError, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from characters.models.core.character import CharacterModel
-from game.models import Journal
+from characters.models.core.group import Group
+from core.models import Model
+from core.services import ChronicleSummaryService
+from game.models import Chronicle, Journal, Post, Scene
 
 
 @receiver(post_save)
@@ -22,3 +27,82 @@ def create_journal_for_character(sender, instance, created, **kwargs):
             # Race condition: another process already created the Journal.
             # This is fine - the Journal exists, which is what we want.
             pass
+
+
+def send_scene_event(scene_id, event):
+    """Send an event to a scene's chat group once the current transaction commits."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    transaction.on_commit(
+        lambda: async_to_sync(channel_layer.group_send)(f"scene_{scene_id}", event)
+    )
+
+
+@receiver(post_save, sender=Scene)
+def notify_scene_closed(sender, instance, **kwargs):
+    """Tell connected chat clients that a scene has been closed.
+
+    SceneChatConsumer keeps the finished flag in its connection snapshot
+    rather than re-reading the scene for every message.
+    """
+    if instance.finished:
+        send_scene_event(instance.pk, {"type": "scene_closed"})
+
+
+@receiver(m2m_changed, sender=Scene.characters.through)
+def notify_scene_characters_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Tell connected chat clients whose characters joined or left a scene.
+
+    owner_ids is None when the change cannot be attributed (a clear), which
+    makes every connection reload its characters.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if pk_set is not None and not pk_set:
+        # Nothing actually changed, e.g. adding a character already in the scene
+        return
+    if reverse:
+        # character.scenes.add(...): instance is the character, pk_set the scenes
+        scene_ids = pk_set or []
+        owner_ids = [instance.owner_id]
+    else:
+        scene_ids = [instance.pk]
+        owner_ids = None
+        if pk_set:
+            owner_ids = list(
+                CharacterModel.objects.filter(pk__in=pk_set).values_list("owner_id", flat=True)
+            )
+    for scene_id in scene_ids:
+        send_scene_event(scene_id, {"type": "scene_characters_changed", "owner_ids": owner_ids})
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_chronicle_summary(sender, instance, **kwargs):
+    """Drop the cached chronicle page data when something shown on it changes.
+
+    Covers characters, groups, locations and items (all core Model subclasses),
+    scenes, and posts, which supply each scene's latest post.
+    """
+    if isinstance(instance, Model | Scene):
+        ChronicleSummaryService.invalidate(instance.chronicle_id)
+    elif isinstance(instance, Chronicle):
+        ChronicleSummaryService.invalidate(instance.pk)
+    elif isinstance(instance, Post):
+        if Post.scene.is_cached(instance):
+            chronicle_id = instance.scene.chronicle_id if instance.scene else None
+        else:
+            chronicle_id = (
+                Scene.objects.filter(pk=instance.scene_id)
+                .values_list("chronicle_id", flat=True)
+                .first()
+            )
+        ChronicleSummaryService.invalidate(chronicle_id)
+
+
+@receiver(m2m_changed, sender=Group.members.through)
+def invalidate_chronicle_summary_for_group(sender, instance, action, reverse, **kwargs):
+    """Group membership decides how a chronicle's characters are ordered."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        ChronicleSummaryService.invalidate(instance.chronicle_id)
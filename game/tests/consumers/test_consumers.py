@@ -5,13 +5,20 @@ These tests cover the SceneChatConsumer for real-time scene chat functionality.
 """
 
 import json
+from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
 from django.contrib.auth.models import AnonymousUser, User
+from django.db.backends.utils import CursorWrapper
 from django.test import TestCase, TransactionTestCase
 
-from characters.models.core import Human
+from characters.models.core import CharacterModel, Human
 from game.consumers import SceneChatConsumer
 from game.models import Chronicle, Scene
+from game.routing import websocket_urlpatterns
 from locations.models.core import LocationModel
 
 
@@ -320,3 +327,234 @@ class TestSceneChatConsumerRoomGroupName(TestCase):
         scene_1_group = "scene_1"
         scene_2_group = "scene_2"
         self.assertNotEqual(scene_1_group, scene_2_group)
+
+
+class TestSceneChatConsumerSnapshot(TransactionTestCase):
+    """SceneChatConsumer posts from its connection snapshot and refreshes it on group events."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("testuser", "test@test.com", "password")
+        self.other_user = User.objects.create_user("otheruser", "other@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        self.location = LocationModel.objects.create(
+            name="Test Location",
+            chronicle=self.chronicle,
+        )
+        self.scene = Scene.objects.create(
+            name="Test Scene",
+            chronicle=self.chronicle,
+            location=self.location,
+        )
+        self.character = Human.objects.create(
+            name="Test Character",
+            owner=self.user,
+            chronicle=self.chronicle,
+        )
+        self.scene.characters.add(self.character)
+        self.late_character = Human.objects.create(
+            name="Late Character",
+            owner=self.user,
+            chronicle=self.chronicle,
+        )
+        self.other_character = Human.objects.create(
+            name="Other Character",
+            owner=self.other_user,
+            chronicle=self.chronicle,
+        )
+
+    def communicator(self):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/scene/{self.scene.pk}/"
+        )
+        communicator.scope["user"] = self.user
+        return communicator
+
+    async def receive_type(self, communicator, message_type):
+        while True:
+            event = await communicator.receive_json_from()
+            if event["type"] == message_type:
+                return event
+
+    def count_queries(self):
+        """Count queries on every thread; consumers run their database work off this one."""
+        real_execute = CursorWrapper._execute
+        calls = []
+
+        def execute(cursor, sql, *args, **kwargs):
+            calls.append(sql)
+            return real_execute(cursor, sql, *args, **kwargs)
+
+        return patch.object(CursorWrapper, "_execute", execute), calls
+
+    def test_post_only_queries_for_the_insert(self):
+        """Test a chat message costs the same queries as loading the character and posting."""
+        scene = Scene.objects.get(pk=self.scene.pk)
+        # The first post warms the ContentType cache
+        scene.add_post(self.character, "", "Warm up")
+        patcher, add_post_queries = self.count_queries()
+        with patcher:
+            character = CharacterModel.objects.select_related("owner").get(pk=self.character.pk)
+            scene.add_post(character, "", "Direct post")
+
+        patcher, consumer_queries = self.count_queries()
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            await self.receive_type(communicator, "presence")
+            with patcher:
+                await communicator.send_json_to(
+                    {
+                        "type": "chat_message",
+                        "character_id": self.character.pk,
+                        "message": "Socket post",
+                    }
+                )
+                event = await self.receive_type(communicator, "new_post")
+            await communicator.disconnect()
+            return event
+
+        event = async_to_sync(run)()
+        self.assertEqual(event["post"]["message"], "Socket post")
+        self.assertEqual(len(consumer_queries), len(add_post_queries))
+
+    def test_rejections(self):
+        """Test characters outside the snapshot are rejected with the old messages."""
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            errors = []
+            for character_id in (99999, self.other_character.pk, self.late_character.pk):
+                await communicator.send_json_to(
+                    {"type": "chat_message", "character_id": character_id, "message": "Hi"}
+                )
+                errors.append((await self.receive_type(communicator, "error"))["message"])
+            await communicator.disconnect()
+            return errors
+
+        self.assertEqual(
+            async_to_sync(run)(),
+            [
+                "Character not found",
+                "You can only post as your own characters",
+                "Character is not in this scene",
+            ],
+        )
+
+    def test_spend_keeps_changes_made_after_connect(self):
+        """Test a spend command saves the character's current state, not the one from connect."""
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            await self.receive_type(communicator, "presence")
+            await database_sync_to_async(
+                Human.objects.filter(pk=self.character.pk).update
+            )(xp=25, temporary_willpower=5)
+            await communicator.send_json_to(
+                {"type": "chat_message", "character_id": self.character.pk, "message": "#WP1 Go"}
+            )
+            await self.receive_type(communicator, "new_post")
+            await communicator.disconnect()
+
+        async_to_sync(run)()
+        self.character.refresh_from_db()
+        self.assertEqual(self.character.xp, 25)
+        self.assertEqual(self.character.temporary_willpower, 4)
+
+    def test_storyteller_reply_clears_flag_set_after_connect(self):
+        """Test a storyteller's socket clears waiting_for_st set after it connected."""
+        from game.models import Gameline, STRelationship
+
+        STRelationship.objects.create(
+            user=self.user, chronicle=self.chronicle, gameline=Gameline.objects.create(name="Mage")
+        )
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            await self.receive_type(communicator, "presence")
+            scene = await database_sync_to_async(Scene.objects.get)(pk=self.scene.pk)
+            await database_sync_to_async(scene.add_post)(
+                self.other_character, "", "@storyteller Can I climb the wall?"
+            )
+            await communicator.send_json_to(
+                {"type": "chat_message", "character_id": self.character.pk, "message": "Yes."}
+            )
+            await self.receive_type(communicator, "new_post")
+            await communicator.disconnect()
+
+        async_to_sync(run)()
+        self.scene.refresh_from_db()
+        self.assertFalse(self.scene.waiting_for_st)
+
+    def test_character_joining_elsewhere_refreshes_snapshot(self):
+        """Test a character added outside the socket can post without reconnecting."""
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            await database_sync_to_async(self.scene.characters.add)(self.late_character)
+            # Let the group event reach the consumer before posting
+            await communicator.send_json_to({"type": "heartbeat"})
+            await self.receive_type(communicator, "heartbeat_ack")
+            await communicator.send_json_to(
+                {
+                    "type": "chat_message",
+                    "character_id": self.late_character.pk,
+                    "message": "Made it",
+                }
+            )
+            event = await self.receive_type(communicator, "new_post")
+            await communicator.disconnect()
+            return event
+
+        self.assertEqual(async_to_sync(run)()["post"]["character_id"], self.late_character.pk)
+
+    def test_scene_closed_event(self):
+        """Test closing the scene updates the snapshot and blocks further posts."""
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            await database_sync_to_async(lambda: Scene.objects.get(pk=self.scene.pk).close())()
+            await self.receive_type(communicator, "scene_closed")
+            await communicator.send_json_to(
+                {"type": "chat_message", "character_id": self.character.pk, "message": "Hi"}
+            )
+            error = await self.receive_type(communicator, "error")
+            await communicator.disconnect()
+            return error
+
+        self.assertEqual(async_to_sync(run)()["message"], "Cannot post to a finished scene")
+
+    def test_backfill(self):
+        """Test clients can page back through history and catch up after a reconnect."""
+        for i in range(5):
+            self.scene.add_post(self.character, "", f"Post {i}")
+
+        async def run():
+            communicator = self.communicator()
+            await communicator.connect()
+            await communicator.send_json_to({"type": "backfill", "limit": 2})
+            tail = await self.receive_type(communicator, "backfill")
+            await communicator.send_json_to(
+                {"type": "backfill", "before": tail["older_cursor"], "limit": 2}
+            )
+            older = await self.receive_type(communicator, "backfill")
+            await communicator.send_json_to(
+                {"type": "backfill", "after": older["posts"][0]["cursor"]}
+            )
+            newer = await self.receive_type(communicator, "backfill")
+            await communicator.disconnect()
+            return tail, older, newer
+
+        tail, older, newer = async_to_sync(run)()
+        self.assertEqual([post["message"] for post in tail["posts"]], ["Post 3", "Post 4"])
+        self.assertEqual(older["direction"], "older")
+        self.assertEqual([post["message"] for post in older["posts"]], ["Post 1", "Post 2"])
+        self.assertEqual(newer["direction"], "newer")
+        self.assertEqual(
+            [post["message"] for post in newer["posts"]], ["Post 2", "Post 3", "Post 4"]
+        )
@@ -0,0 +1,133 @@
+"""
+Tests for scene chat presence tracking.
+"""
+
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from characters.models.core import Human
+from game.models import Chronicle, Post, Scene
+from game.presence import ScenePresence
+from game.routing import websocket_urlpatterns
+from locations.models.core import LocationModel
+
+
+class TestScenePresence(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user("alice")
+        self.bob = User.objects.create_user("bob")
+        self.presence = ScenePresence(1)
+
+    def test_join_and_leave(self):
+        self.presence.join("channel-1", self.alice)
+        self.presence.join("channel-2", self.bob)
+        self.assertEqual(
+            self.presence.users(),
+            [
+                {"id": self.alice.pk, "username": "alice"},
+                {"id": self.bob.pk, "username": "bob"},
+            ],
+        )
+        self.presence.leave("channel-1")
+        self.assertEqual(self.presence.users(), [{"id": self.bob.pk, "username": "bob"}])
+
+    def test_user_with_two_connections_listed_once(self):
+        self.presence.join("channel-1", self.alice)
+        self.presence.join("channel-2", self.alice)
+        self.assertEqual(len(self.presence.users()), 1)
+        self.presence.leave("channel-1")
+        self.assertEqual(len(self.presence.users()), 1)
+
+    def test_scenes_are_separate(self):
+        self.presence.join("channel-1", self.alice)
+        self.assertEqual(ScenePresence(2).users(), [])
+
+    def test_heartbeat_restores_lost_index_entry(self):
+        self.presence.join("channel-1", self.alice)
+        cache.delete(self.presence.key)
+        self.assertEqual(self.presence.users(), [])
+        self.assertTrue(self.presence.heartbeat("channel-1"))
+        self.assertEqual(self.presence.users(), [{"id": self.alice.pk, "username": "alice"}])
+
+    @override_settings(SCENE_PRESENCE_TTL=30)
+    def test_connections_expire_without_heartbeat(self):
+        now = time.time()
+        with patch("game.presence.time.time", return_value=now):
+            self.presence.join("channel-1", self.alice)
+            self.presence.join("channel-2", self.bob)
+        with patch("game.presence.time.time", return_value=now + 20):
+            self.assertTrue(self.presence.heartbeat("channel-2"))
+        with patch("game.presence.time.time", return_value=now + 40):
+            self.assertEqual(self.presence.users(), [{"id": self.bob.pk, "username": "bob"}])
+            self.assertFalse(self.presence.heartbeat("channel-1"))
+
+
+class TestSceneChatPresence(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("player")
+        chronicle = Chronicle.objects.create(name="Test Chronicle")
+        location = LocationModel.objects.create(name="Test Location", chronicle=chronicle)
+        self.scene = Scene.objects.create(name="Test Scene", chronicle=chronicle, location=location)
+        self.character = Human.objects.create(
+            name="Test Character", owner=self.user, chronicle=chronicle
+        )
+        self.scene.characters.add(self.character)
+
+    def test_connect_heartbeat_and_disconnect(self):
+        async def run():
+            communicator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns), f"/ws/scene/{self.scene.pk}/"
+            )
+            communicator.scope["user"] = self.user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            event = await communicator.receive_json_from()
+            self.assertEqual(event["type"], "presence")
+            self.assertEqual(event["users"], [{"id": self.user.pk, "username": "player"}])
+
+            await communicator.send_json_to({"type": "heartbeat"})
+            self.assertEqual(await communicator.receive_json_from(), {"type": "heartbeat_ack"})
+            await communicator.disconnect()
+
+        async_to_sync(run)()
+        self.assertEqual(ScenePresence(self.scene.pk).users(), [])
+
+    def test_scene_page_lists_present_users(self):
+        ScenePresence(self.scene.pk).join("channel-1", self.user)
+        self.client.force_login(self.user)
+        response = self.client.get(self.scene.get_absolute_url())
+        self.assertEqual(
+            response.context["present_users"], [{"id": self.user.pk, "username": "player"}]
+        )
+
+    def test_loadtest_single_worker(self):
+        out = StringIO()
+        call_command(
+            "loadtest_scene_chat",
+            scene=self.scene.pk,
+            clients=3,
+            workers=1,
+            messages=2,
+            timeout=5,
+            stdout=out,
+        )
+        self.assertIn("6/6 deliveries", out.getvalue())
+        # The run used a throwaway scene and left nothing behind
+        self.assertEqual(Scene.objects.count(), 1)
+        self.assertFalse(Post.objects.exists())
+
+    def test_loadtest_requires_shared_layer_for_several_workers(self):
+        with self.assertRaises(CommandError):
+            call_command("loadtest_scene_chat", scene=self.scene.pk, workers=2, stdout=StringIO())
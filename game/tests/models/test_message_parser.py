@@ -0,0 +1,82 @@
+"""Tests for the scene post command parser in game/message_parser.py."""
+
+from django.test import SimpleTestCase
+
+from game.message_parser import (
+    Damage,
+    ExtendedRoll,
+    MultiRoll,
+    ParadoxGain,
+    QuintessenceSpend,
+    Roll,
+    StatRoll,
+    WillpowerSpend,
+    parse_message,
+)
+
+
+class TestParseSpends(SimpleTestCase):
+    def test_plain_message(self):
+        parsed = parse_message("Just talking.")
+        self.assertEqual(parsed.spends, ())
+        self.assertIsNone(parsed.command)
+
+    def test_spends_in_order(self):
+        parsed = parse_message("#WP #WP2 #Q3 #P1 #2B #1A")
+        self.assertEqual(
+            parsed.spends,
+            (
+                WillpowerSpend(amount=1, automatic_success=True),
+                WillpowerSpend(amount=2),
+                QuintessenceSpend(amount=3),
+                ParadoxGain(amount=1),
+                Damage(damage_type="B", amount=2),
+                Damage(damage_type="A", amount=1),
+            ),
+        )
+
+    def test_only_bare_willpower_buys_a_success(self):
+        self.assertTrue(parse_message("#WP /roll 3").willpower_success)
+        self.assertFalse(parse_message("#WP1 /roll 3").willpower_success)
+
+
+class TestParseCommands(SimpleTestCase):
+    def test_roll(self):
+        parsed = parse_message("I shoot /roll 5 difficulty 7 true")
+        self.assertEqual(parsed.command, Roll(num_dice=5, difficulty=7, specialty=True))
+        self.assertEqual(parsed.text, "I shoot")
+
+    def test_roll_defaults(self):
+        self.assertEqual(parse_message("/roll 4").command, Roll(num_dice=4))
+
+    def test_rolls_is_not_read_as_roll(self):
+        parsed = parse_message("/rolls 3 rolls @ 5 difficulty 8")
+        self.assertEqual(parsed.command, MultiRoll(num_rolls=3, num_dice=5, difficulty=8))
+
+    def test_stat(self):
+        parsed = parse_message("/stat Dexterity + Firearms + 2 difficulty 6 true")
+        self.assertEqual(
+            parsed.command,
+            StatRoll(terms=("Dexterity", "Firearms", 2), difficulty=6, specialty=True),
+        )
+
+    def test_extended(self):
+        parsed = parse_message("Research /extended 4 target 10")
+        self.assertEqual(parsed.command, ExtendedRoll(num_dice=4, target=10))
+        self.assertEqual(parsed.text, "Research")
+
+    def test_extended_takes_priority(self):
+        parsed = parse_message("/extended 4 target 10 /roll 3")
+        self.assertIsInstance(parsed.command, ExtendedRoll)
+
+    def test_bad_arguments(self):
+        for message in ("/roll many", "/rolls 3 @ 5", "/extended 4", "/stat Dex - 1"):
+            with self.subTest(message=message):
+                with self.assertRaisesMessage(
+                    ValueError, "Command does not match the expected format."
+                ):
+                    parse_message(message)
+
+    def test_repeated_command(self):
+        with self.assertRaises(ValueError):
+            parse_message("/roll 3 and /roll 4")
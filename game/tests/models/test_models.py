@@ -25,8 +25,10 @@ from game.models import (
     Scene,
     SettingElement,
     Story,
+    STRelationship,
     Week,
     WeeklyXPRequest,
+    XPAward,
 )
 from locations.models.core import LocationModel
 
@@ -1494,6 +1496,92 @@ class TestWeeklyXPRequestModel(TestCase):
         self.assertTrue(hasattr(request.approve, "__wrapped__"))
 
 
+class TestWeeklyXPRequestQuerySet(TestCase):
+    """Tests for the set-based weekly XP ledger queries."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("player", "player@test.com", "password")
+        self.st_user = User.objects.create_user("st", "st@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        STRelationship.objects.create(
+            user=self.st_user,
+            chronicle=self.chronicle,
+            gameline=Gameline.objects.create(name="Test Gameline"),
+        )
+        self.week = Week.objects.create(end_date=date(2024, 1, 14))
+        self.characters = [
+            Human.objects.create(name=f"Char {i}", owner=self.user, chronicle=self.chronicle)
+            for i in range(3)
+        ]
+        self.week.characters.add(*self.characters)
+
+    def test_missing_for_is_anti_join(self):
+        WeeklyXPRequest.objects.create(week=self.week, character=self.characters[0])
+        rows = WeeklyXPRequest.objects.missing_for(self.characters)
+        self.assertEqual(
+            {row.charactermodel_id for row in rows},
+            {self.characters[1].pk, self.characters[2].pk},
+        )
+
+    def test_create_for_week_skips_existing(self):
+        WeeklyXPRequest.objects.create(week=self.week, character=self.characters[0])
+        created = WeeklyXPRequest.objects.create_for_week(self.week, self.characters)
+        self.assertEqual(len(created), 2)
+        self.assertEqual(WeeklyXPRequest.objects.filter(week=self.week).count(), 3)
+
+    def test_resolved_loads_concrete_characters(self):
+        WeeklyXPRequest.objects.create_for_week(self.week, self.characters)
+        requests = WeeklyXPRequest.objects.for_storyteller(self.st_user).participated()
+        resolved = requests.order_by("pk").resolved()
+        with self.assertNumQueries(0):
+            self.assertEqual([r.character for r in resolved], self.characters)
+            self.assertEqual({r.week for r in resolved}, {self.week})
+        self.assertIsInstance(resolved[0].character, Human)
+
+    def test_for_storyteller_excludes_other_chronicles(self):
+        other = Human.objects.create(
+            name="Elsewhere", owner=self.user, chronicle=Chronicle.objects.create(name="Other")
+        )
+        WeeklyXPRequest.objects.create(week=self.week, character=other)
+        self.assertFalse(WeeklyXPRequest.objects.for_storyteller(self.st_user).exists())
+
+    def test_approve_all(self):
+        WeeklyXPRequest.objects.create_for_week(self.week, self.characters)
+        WeeklyXPRequest.objects.filter(character=self.characters[0]).update(rp=True)
+
+        approved, total_xp = WeeklyXPRequest.objects.filter(week=self.week).approve_all()
+
+        self.assertEqual((len(approved), total_xp), (3, 4))
+        self.assertFalse(WeeklyXPRequest.objects.pending().exists())
+        for character in self.characters:
+            character.refresh_from_db()
+        self.assertEqual([c.xp for c in self.characters], [2, 1, 1])
+        self.assertEqual(
+            set(XPAward.objects.values_list("source", "source_id", "amount")),
+            {("weekly", r.pk, r.total_xp()) for r in approved},
+        )
+
+    def test_approve_all_writes_one_award_per_request(self):
+        next_week = Week.objects.create(end_date=date(2024, 1, 21))
+        requests = [
+            WeeklyXPRequest.objects.create(week=week, character=self.characters[0])
+            for week in (self.week, next_week)
+        ]
+
+        WeeklyXPRequest.objects.approve_all()
+
+        self.characters[0].refresh_from_db()
+        self.assertEqual(self.characters[0].xp, 2)
+        self.assertEqual(
+            sorted(XPAward.objects.values_list("source_id", flat=True)), [r.pk for r in requests]
+        )
+
+    def test_approve_all_skips_approved(self):
+        WeeklyXPRequest.objects.create(week=self.week, character=self.characters[0], approved=True)
+        approved, total_xp = WeeklyXPRequest.objects.approve_all()
+        self.assertEqual((approved, total_xp), ([], 0))
+
+
 class TestStoryXPRequestModel(TestCase):
     """Tests for StoryXPRequest model."""
 
@@ -1667,6 +1755,58 @@ class TestPostModel(TestCase):
         # Should be ordered by datetime_created ascending
         self.assertEqual(posts.first().message, "First post")
 
+    def test_post_html_rendered_on_save(self):
+        """Test a post stores its sanitized HTML when saved."""
+        from core.templatetags.sanitize_text import POST_HTML_VERSION
+        from game.models import Post
+
+        post = Post.objects.create(
+            character=self.character,
+            scene=self.scene,
+            message='<script>x</script>He says "hi"',
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.rendered_html, 'xHe says <span class="quote">"hi"</span>')
+        self.assertEqual(post.rendered_html_version, POST_HTML_VERSION)
+        self.assertEqual(post.html, post.rendered_html)
+
+        post.message = "<b>Edited</b>"
+        post.save(update_fields=["message"])
+        post.refresh_from_db()
+        self.assertEqual(post.rendered_html, "<b>Edited</b>")
+
+    def test_post_html_falls_back_for_old_versions(self):
+        """Test posts rendered under older rules are rendered on the fly."""
+        from game.models import Post
+
+        post = Post.objects.create(character=self.character, scene=self.scene, message="<b>Hi</b>")
+        Post.objects.filter(pk=post.pk).update(rendered_html="stale", rendered_html_version=0)
+        post.refresh_from_db()
+        self.assertEqual(post.html, "<b>Hi</b>")
+
+    def test_render_posts_command(self):
+        """Test render_posts backfills posts with an older version."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from core.templatetags.sanitize_text import POST_HTML_VERSION
+        from game.models import Post
+
+        for i in range(5):
+            Post.objects.create(character=self.character, scene=self.scene, message=f"<i>{i}</i>")
+        Post.objects.update(rendered_html="", rendered_html_version=0)
+
+        out = StringIO()
+        call_command("render_posts", batch_size=2, stdout=out)
+        self.assertIn("Rendered 5 posts", out.getvalue())
+        self.assertFalse(Post.objects.exclude(rendered_html_version=POST_HTML_VERSION).exists())
+        self.assertEqual(Post.objects.order_by("pk").first().rendered_html, "<i>0</i>")
+
+        out = StringIO()
+        call_command("render_posts", stdout=out)
+        self.assertIn("Rendered 0 posts", out.getvalue())
+
 
 class TestUserSceneReadStatus(TestCase):
     """Tests for UserSceneReadStatus model."""
@@ -1698,6 +1838,132 @@ class TestUserSceneReadStatus(TestCase):
         self.assertIn("True", str_repr)
 
 
+class TestSceneAddPostReadStatus(TestCase):
+    """Tests for the set-based read status fan-out in Scene.add_post."""
+
+    def setUp(self):
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        self.location = LocationModel.objects.create(name="Test Location", chronicle=self.chronicle)
+        self.scene = Scene.objects.create(
+            name="Test Scene",
+            chronicle=self.chronicle,
+            location=self.location,
+        )
+
+    def _add_participants(self, count, prefix="player"):
+        characters = []
+        for i in range(count):
+            user = User.objects.create_user(
+                username=f"{prefix}{i}", email=f"{prefix}{i}@test.com", password="password"
+            )
+            character = Human.objects.create(
+                name=f"{prefix} Character {i}", owner=user, chronicle=self.chronicle
+            )
+            self.scene.characters.add(character)
+            characters.append(character)
+        return characters
+
+    def test_author_read_and_others_unread(self):
+        """Test the author is marked read and every other participant unread."""
+        from game.models import UserSceneReadStatus
+
+        author, *others = self._add_participants(3)
+        self.scene.add_post(author, "", "Hello")
+
+        self.assertTrue(UserSceneReadStatus.objects.get(user=author.owner, scene=self.scene).read)
+        for character in others:
+            status = UserSceneReadStatus.objects.get(user=character.owner, scene=self.scene)
+            self.assertFalse(status.read)
+
+    def test_existing_statuses_are_updated_not_duplicated(self):
+        """Test repeated posts flip existing rows instead of creating new ones."""
+        from game.models import UserSceneReadStatus
+
+        first, second = self._add_participants(2)
+        self.scene.add_post(first, "", "First")
+        self.scene.add_post(second, "", "Reply")
+
+        self.assertEqual(UserSceneReadStatus.objects.filter(scene=self.scene).count(), 2)
+        self.assertFalse(UserSceneReadStatus.objects.get(user=first.owner, scene=self.scene).read)
+        self.assertTrue(UserSceneReadStatus.objects.get(user=second.owner, scene=self.scene).read)
+
+    def test_user_with_multiple_characters_gets_one_status(self):
+        """Test a user playing two characters in the scene gets a single status row."""
+        from game.models import UserSceneReadStatus
+
+        (author,) = self._add_participants(1)
+        alt = Human.objects.create(name="Alt", owner=author.owner, chronicle=self.chronicle)
+        self.scene.characters.add(alt)
+
+        self.scene.add_post(author, "", "Hello")
+
+        self.assertEqual(
+            UserSceneReadStatus.objects.filter(scene=self.scene, user=author.owner).count(), 1
+        )
+
+    def test_storyteller_post_marks_everyone_unread(self):
+        """Test a post without a character marks all participants unread."""
+        from game.models import UserSceneReadStatus
+
+        self._add_participants(2)
+        self.scene.add_post(None, "Storyteller", "The lights go out.")
+
+        statuses = UserSceneReadStatus.objects.filter(scene=self.scene)
+        self.assertEqual(statuses.count(), 2)
+        self.assertFalse(statuses.filter(read=True).exists())
+
+    def test_unique_per_user_and_scene(self):
+        """Test the database rejects duplicate (user, scene) read statuses."""
+        from django.db import IntegrityError, transaction
+
+        from game.models import UserSceneReadStatus
+
+        user = User.objects.create_user(username="dup", email="dup@test.com", password="pw")
+        UserSceneReadStatus.objects.create(user=user, scene=self.scene)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UserSceneReadStatus.objects.create(user=user, scene=self.scene)
+
+    def test_query_count_constant_in_participant_count(self):
+        """Test the cost of a post does not grow with the number of participants."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        characters = self._add_participants(12)
+        author = characters[0]
+        # Warm up so every participant already has a status row
+        self.scene.add_post(author, "", "Warm up")
+
+        query_counts = {}
+        for participants in (2, 8, 12):
+            self.scene.characters.set(characters[:participants])
+            with CaptureQueriesContext(connection) as ctx:
+                self.scene.add_post(author, "", f"Post with {participants} players")
+            query_counts[participants] = len(ctx.captured_queries)
+
+        self.assertEqual(len(set(query_counts.values())), 1, query_counts)
+
+    def test_query_count_constant_after_commit(self):
+        """Test on-commit work triggered by a post does not grow with participants either."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        characters = self._add_participants(12)
+        author = characters[0]
+        self.scene.add_post(author, "", "Warm up")
+
+        query_counts = {}
+        for participants in (2, 8, 12):
+            self.scene.characters.set(characters[:participants])
+            with (
+                CaptureQueriesContext(connection) as ctx,
+                self.captureOnCommitCallbacks(execute=True),
+            ):
+                self.scene.add_post(author, "", f"Post with {participants} players")
+            query_counts[participants] = len(ctx.captured_queries)
+
+        self.assertEqual(len(set(query_counts.values())), 1, query_counts)
+
+
 class TestGetNextSunday(TestCase):
     """Tests for get_next_sunday utility function."""
 
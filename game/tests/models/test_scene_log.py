@@ -0,0 +1,104 @@
+"""Tests for cursor pagination of scene posts in game/scene_log.py."""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils.timezone import now
+
+from characters.models.core import Human
+from game.models import Chronicle, Gameline, Post, Scene, STRelationship
+from game.scene_log import decode_cursor, encode_cursor, get_post_page, serialize_page
+from locations.models.core import LocationModel
+
+
+class TestScenePostPages(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("player")
+        self.st = User.objects.create_user("st")
+        chronicle = Chronicle.objects.create(name="Test Chronicle")
+        STRelationship.objects.create(
+            user=self.st, chronicle=chronicle, gameline=Gameline.objects.create(name="Gameline")
+        )
+        location = LocationModel.objects.create(name="Test Location", chronicle=chronicle)
+        self.scene = Scene.objects.create(name="Scene", chronicle=chronicle, location=location)
+        self.character = Human.objects.create(name="Player Character", owner=self.user)
+        self.st_character = Human.objects.create(name="ST Character", owner=self.st)
+
+        start = now() - timedelta(hours=1)
+        self.posts = [
+            Post.objects.create(
+                scene=self.scene,
+                character=self.st_character if i % 5 == 0 else self.character,
+                display_name="Poster",
+                message=f"Post {i}",
+                datetime_created=start + timedelta(seconds=i),
+            )
+            for i in range(12)
+        ]
+        # Two posts with the same timestamp are ordered by id
+        self.posts.append(
+            Post.objects.create(
+                scene=self.scene,
+                character=self.character,
+                display_name="Poster",
+                message="Post 12",
+                datetime_created=self.posts[-1].datetime_created,
+            )
+        )
+
+    def messages(self, page):
+        return [post.message for post in page.posts]
+
+    def test_cursor_round_trip(self):
+        post = self.posts[3]
+        self.assertEqual(decode_cursor(encode_cursor(post)), (post.datetime_created, post.pk))
+
+    def test_invalid_cursor(self):
+        for cursor in ("", "abc", "1.2.3", "x.1"):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_newest_page_first(self):
+        page = get_post_page(self.scene, limit=5)
+        self.assertEqual(self.messages(page), [f"Post {i}" for i in range(8, 13)])
+        self.assertEqual(page.older_cursor, encode_cursor(self.posts[8]))
+        self.assertFalse(page.has_newer)
+
+    def test_walk_backwards_through_history(self):
+        seen = []
+        page = get_post_page(self.scene, limit=5)
+        while True:
+            seen = self.messages(page) + seen
+            if page.older_cursor is None:
+                break
+            page = get_post_page(self.scene, before=page.older_cursor, limit=5)
+        self.assertEqual(seen, [f"Post {i}" for i in range(13)])
+
+    def test_posts_since_cursor(self):
+        page = get_post_page(self.scene, after=encode_cursor(self.posts[6]), limit=4)
+        self.assertEqual(self.messages(page), ["Post 7", "Post 8", "Post 9", "Post 10"])
+        self.assertTrue(page.has_newer)
+        page = get_post_page(self.scene, after=page.newer_cursor, limit=4)
+        self.assertEqual(self.messages(page), ["Post 11", "Post 12"])
+        self.assertFalse(page.has_newer)
+
+    def test_nothing_new_keeps_cursor(self):
+        cursor = encode_cursor(self.posts[-1])
+        page = get_post_page(self.scene, after=cursor)
+        self.assertEqual(page.posts, [])
+        self.assertEqual(page.newer_cursor, cursor)
+
+    def test_before_and_after_are_exclusive(self):
+        cursor = encode_cursor(self.posts[0])
+        with self.assertRaises(ValueError):
+            get_post_page(self.scene, before=cursor, after=cursor)
+
+    def test_page_queries_do_not_grow_with_posts(self):
+        # Posts, characters (base and Human rows) and storyteller flags
+        with self.assertNumQueries(4):
+            page = get_post_page(self.scene, limit=13)
+        data = serialize_page(page)
+        flags = {post["message"]: post["is_st"] for post in data["posts"]}
+        self.assertTrue(flags["Post 10"])
+        self.assertFalse(flags["Post 11"])
@@ -12,6 +12,7 @@ from game.models import (
     Journal,
     JournalEntry,
     ObjectType,
+    Post,
     Scene,
     Story,
     StoryXPRequest,
@@ -409,6 +410,97 @@ class TestExtendedRoll(TestCase):
         self.assertIn("Extended Roll:", result)
 
 
+class TestScenePostsView(TestCase):
+    """Test the JSON scene posts endpoint and the paginated scene page."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("testuser", "test@test.com", "password")
+        self.chronicle = Chronicle.objects.create(name="Test Chronicle")
+        self.location = LocationModel.objects.create(name="Test Location", chronicle=self.chronicle)
+        self.scene = Scene.objects.create(
+            name="Test Scene", chronicle=self.chronicle, location=self.location
+        )
+        self.char = Human.objects.create(name="Test Character", owner=self.user)
+        for i in range(60):
+            Post.objects.create(
+                scene=self.scene, character=self.char, display_name="Test", message=f"Post {i}"
+            )
+        self.url = reverse("game:scene_posts", kwargs={"pk": self.scene.pk})
+
+    def test_requires_login(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_newest_posts_then_older(self):
+        self.client.login(username="testuser", password="password")
+        data = self.client.get(self.url, {"limit": 40}).json()
+        self.assertEqual(len(data["posts"]), 40)
+        self.assertEqual(data["posts"][-1]["message"], "Post 59")
+
+        older = self.client.get(self.url, {"before": data["older_cursor"], "limit": 40}).json()
+        self.assertEqual([post["message"] for post in older["posts"]][-1], "Post 19")
+        self.assertEqual(len(older["posts"]), 20)
+        self.assertIsNone(older["older_cursor"])
+
+    def test_posts_since_cursor(self):
+        self.client.login(username="testuser", password="password")
+        data = self.client.get(self.url, {"limit": 1}).json()
+        Post.objects.create(
+            scene=self.scene, character=self.char, display_name="Test", message="New post"
+        )
+        newer = self.client.get(self.url, {"after": data["newer_cursor"]}).json()
+        self.assertEqual([post["message"] for post in newer["posts"]], ["New post"])
+
+    def test_invalid_cursor(self):
+        self.client.login(username="testuser", password="password")
+        response = self.client.get(self.url, {"before": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_scene_page_renders_only_the_tail(self):
+        self.client.login(username="testuser", password="password")
+        response = self.client.get(f"/game/scene/{self.scene.id}/")
+        self.assertEqual(len(response.context["posts"]), 50)
+        self.assertEqual(response.context["posts"][0].message, "Post 10")
+        self.assertIsNotNone(response.context["older_posts_cursor"])
+        self.assertNotContains(response, "Post 9")
+
+
+class TestDiceProbabilityView(TestCase):
+    """Test the storyteller dice probability endpoint."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("player", "player@test.com", "password")
+        self.st_user = User.objects.create_user("stuser", "st@test.com", "password")
+        STRelationship.objects.create(
+            user=self.st_user,
+            chronicle=Chronicle.objects.create(name="Test Chronicle"),
+            gameline=Gameline.objects.create(name="Test Gameline"),
+        )
+        self.url = reverse("game:dice_probability")
+
+    def test_storyteller_gets_distribution(self):
+        self.client.login(username="stuser", password="password")
+        response = self.client.get(self.url, {"pool": 1, "difficulty": 6, "specialty": "true"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertAlmostEqual(data["success_probability"], 0.5)
+        self.assertAlmostEqual(data["botch_probability"], 0.1)
+        self.assertAlmostEqual(data["expected_successes"], 0.6)
+        self.assertAlmostEqual(sum(data["distribution"].values()), 1.0)
+
+    def test_invalid_pool_rejected(self):
+        self.client.login(username="stuser", password="password")
+        response = self.client.get(self.url, {"pool": "many"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {"pool": 500})
+        self.assertEqual(response.status_code, 400)
+
+    def test_players_denied(self):
+        self.client.login(username="player", password="password")
+        response = self.client.get(self.url, {"pool": 3})
+        self.assertEqual(response.status_code, 403)
+
+
 class TestExtendedRollMessageProcessing(TestCase):
     """Test extended roll command parsing in message processing."""
 
@@ -538,6 +630,15 @@ class TestStatRollMessageProcessing(TestCase):
             message_processing(self.char, msg)
         self.assertIn("not found", str(context.exception))
 
+    def test_invalid_stat_roll_spends_nothing(self):
+        """Test that spends are not saved when the roll command is rejected."""
+        willpower = self.char.temporary_willpower
+        for msg in ["#WP1 /stat InvalidStat + Firearms", "#WP1 /stat Medicine"]:
+            with self.assertRaises(ValueError):
+                message_processing(self.char, msg)
+        self.char.refresh_from_db()
+        self.assertEqual(self.char.temporary_willpower, willpower)
+
     def test_stat_command_single_stat(self):
         """Test /stat command with single stat."""
         msg = "Raw strength /stat Strength"
@@ -107,7 +107,9 @@ urlpatterns = [
     path("chronicle/<int:pk>/npc/", char_views.core.NPCCharacterIndex.as_view(), name="npc"),
     path("scenes/", views.SceneListView.as_view(), name="scenes"),
     path("scene/<int:pk>/", views.SceneDetailView.as_view(), name="scene"),
+    path("scene/<int:pk>/posts/", views.ScenePostsView.as_view(), name="scene_posts"),
     path("commands/", views.CommandsView.as_view(), name="commands"),
+    path("dice/probability/", views.DiceProbabilityView.as_view(), name="dice_probability"),
     path("journals/", views.JournalListView.as_view(), name="journals"),
     path("journal/<int:pk>/", views.JournalDetailView.as_view(), name="journal"),
     path("story/", include((story_urls, "story"))),
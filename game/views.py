@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
-from django.db import models, transaction
+from django.db import models
 from django.db.models import Count, Max, OuterRef, Subquery
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views import View
@@ -15,7 +17,7 @@ from django.views.generic import (
 )
 
 from characters.models.core import CharacterModel
-from characters.models.core.character import Character
+from core.dice import DiceEngine
 from core.mixins import (
     CharacterOwnerOrSTMixin,
     MessageMixin,
@@ -24,7 +26,7 @@ from core.mixins import (
     StorytellerRequiredMixin,
     ViewPermissionMixin,
 )
-from core.services import ChronicleDataService
+from core.services import ChronicleDataService, ChronicleSummaryService
 from game.forms import (
     AddCharForm,
     ChronicleCharacterCreationForm,
@@ -58,7 +60,8 @@ from game.models import (
     WeeklyXPRequest,
     XPSpendingRequest,
 )
-from items.models.core import ItemModel
+from game.presence import ScenePresence
+from game.scene_log import PAGE_SIZE, get_post_page, serialize_page
 from locations.models.core import LocationModel
 
 
@@ -81,92 +84,17 @@ class ChronicleDetailView(LoginRequiredMixin, DetailView):
             all_setting_elements, gameline_attr="gameline"
         )
 
-        # --- Locations ---
-        top_locations = (
-            LocationModel.objects.top_level().filter(chronicle=chronicle).order_by("name")
-        )
-        locations_by_gameline = ChronicleDataService.group_locations_by_gameline(top_locations)
-
-        # --- Characters by status ---
-        # Use select_related to prevent N+1 queries when accessing owner.username
-        # and owner.profile in templates
-        active_characters = (
-            Character.objects.active()
-            .player_characters()
-            .with_group_ordering()
-            .filter(chronicle=chronicle)
-            .select_related("owner", "owner__profile")
-        )
-        retired_characters = (
-            Character.objects.retired()
-            .player_characters()
-            .with_group_ordering()
-            .filter(chronicle=chronicle)
-            .select_related("owner", "owner__profile")
-        )
-        deceased_characters = (
-            Character.objects.deceased()
-            .player_characters()
-            .with_group_ordering()
-            .filter(chronicle=chronicle)
-            .select_related("owner", "owner__profile")
-        )
-        npc_characters = (
-            Character.objects.active()
-            .npcs()
-            .with_group_ordering()
-            .filter(chronicle=chronicle)
-            .select_related("owner", "owner__profile")
-        )
-
-        # --- Items ---
-        all_items = ItemModel.objects.for_chronicle(chronicle).order_by("name")
-        items_by_gameline = ChronicleDataService.group_items_by_gameline(all_items)
-
-        # --- Scenes by status ---
-        all_scenes = Scene.objects.filter(chronicle=chronicle).order_by("-date_of_scene")
-        active_scenes = all_scenes.filter(finished=False)
-        completed_scenes = all_scenes.filter(finished=True)
+        # --- Characters, locations, items and scenes ---
+        # Fetched once per entity set, bucketed in memory and cached per chronicle
+        summary = ChronicleSummaryService.get_summary(chronicle)
 
         context.update(
             {
                 # Common Knowledge
                 "setting_elements_by_gameline": setting_elements_by_gameline,
-                # Characters (base querysets for backward compatibility)
-                "character_list": active_characters,
-                "retired_characters": retired_characters,
-                "deceased_characters": deceased_characters,
-                "npc_characters": npc_characters,
-                # Characters by gameline
-                "active_by_gameline": ChronicleDataService.group_characters_by_gameline(
-                    active_characters
-                ),
-                "retired_by_gameline": ChronicleDataService.group_characters_by_gameline(
-                    retired_characters
-                ),
-                "deceased_by_gameline": ChronicleDataService.group_characters_by_gameline(
-                    deceased_characters
-                ),
-                "npc_by_gameline": ChronicleDataService.group_characters_by_gameline(
-                    npc_characters
-                ),
-                # Locations
-                "top_locations": top_locations,
-                "locations_by_gameline": locations_by_gameline,
-                # Items
-                "items": all_items,
-                "items_by_gameline": items_by_gameline,
-                # Scenes by status and gameline
-                "all_scenes_by_gameline": ChronicleDataService.group_scenes_by_gameline(all_scenes),
-                "active_scenes_by_gameline": ChronicleDataService.group_scenes_by_gameline(
-                    active_scenes
-                ),
-                "completed_scenes_by_gameline": ChronicleDataService.group_scenes_by_gameline(
-                    completed_scenes
-                ),
+                **summary,
                 # Forms and other
                 "form": SceneCreationForm(chronicle=chronicle),
-                "active_scenes": active_scenes,  # Keep for backward compatibility
                 "story_form": StoryForm(),
                 "header": chronicle.headings,
                 # Creation forms for Characters, Locations, Items
@@ -279,7 +207,12 @@ class SceneDetailView(LoginRequiredMixin, DetailView):
         scene = self.object
         user = self.request.user
 
-        context["posts"] = Post.objects.for_scene_optimized(scene)
+        # Only the newest posts; older history is loaded on demand from ScenePostsView
+        page = get_post_page(scene)
+        context["posts"] = page.posts
+        context["older_posts_cursor"] = page.older_cursor
+        context["present_users"] = ScenePresence(scene.pk).users()
+        context["presence_heartbeat"] = settings.SCENE_PRESENCE_HEARTBEAT
 
         if user.is_authenticated:
             add_char_form = AddCharForm(user=user, scene=scene)
@@ -390,6 +323,69 @@ class CommandsView(LoginRequiredMixin, TemplateView):
     template_name = "game/scene/commands.html"
 
 
+class ScenePostsView(LoginRequiredMixin, View):
+    """A page of a scene's posts as JSON.
+
+    Query parameters: before (cursor; older posts), after (cursor; newer
+    posts) and limit. With no cursor, returns the newest posts.
+    """
+
+    def get(self, request, pk, *args, **kwargs):
+        scene = get_object_or_404(Scene, pk=pk)
+        try:
+            limit = int(request.GET.get("limit", PAGE_SIZE))
+            page = get_post_page(
+                scene,
+                before=request.GET.get("before"),
+                after=request.GET.get("after"),
+                limit=limit,
+            )
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse(serialize_page(page))
+
+
+class DiceProbabilityView(StorytellerRequiredMixin, View):
+    """Exact odds for a dice pool, for storytellers setting difficulties.
+
+    Query parameters: pool (required), difficulty (default 6) and
+    specialty (true/false).
+    """
+
+    MAX_POOL = 30
+
+    def get(self, request, *args, **kwargs):
+        try:
+            pool = int(request.GET["pool"])
+            difficulty = int(request.GET.get("difficulty", 6))
+        except (KeyError, ValueError):
+            return JsonResponse({"error": "pool and difficulty must be integers"}, status=400)
+        if not 0 <= pool <= self.MAX_POOL or not 2 <= difficulty <= 10:
+            return JsonResponse(
+                {"error": f"pool must be 0-{self.MAX_POOL} and difficulty 2-10"}, status=400
+            )
+        specialty = request.GET.get("specialty", "").lower() in ("1", "true", "yes")
+
+        return JsonResponse(
+            {
+                "pool": pool,
+                "difficulty": difficulty,
+                "specialty": specialty,
+                "expected_successes": DiceEngine.expected_successes(pool, difficulty, specialty),
+                "success_probability": DiceEngine.success_probability(
+                    pool, difficulty, specialty
+                ),
+                "botch_probability": DiceEngine.botch_probability(pool, difficulty, specialty),
+                "distribution": {
+                    str(result): probability
+                    for result, probability in DiceEngine.distribution(
+                        pool, difficulty, specialty
+                    ).items()
+                },
+            }
+        )
+
+
 class JournalDetailView(SpecialUserMixin, ViewPermissionMixin, DetailView):
     model = Journal
     template_name = "game/journal/detail.html"
@@ -744,20 +740,11 @@ class WeeklyXPRequestBatchApproveView(StorytellerRequiredMixin, View):
             messages.warning(request, "No pending requests found to approve.")
             return redirect(request.META.get("HTTP_REFERER", "game:week:list"))
 
-        # Track results
-        approved_count = 0
-        total_xp = 0
-        week_pk = None
-
-        # Use atomic transaction to ensure all approvals succeed or all fail
-        with transaction.atomic():
-            for xp_request in pending_requests:
-                # Approve the request using model method
-                xp_increase = xp_request.approve()
-
-                approved_count += 1
-                total_xp += xp_increase
-                week_pk = xp_request.week.pk
+        # Approve every request and award all of the XP with a constant number
+        # of queries; either all approvals succeed or none do
+        approved, total_xp = pending_requests.approve_all()
+        approved_count = len(approved)
+        week_pk = approved[-1].week_id if approved else None
 
         if approved_count > 0:
             messages.success(
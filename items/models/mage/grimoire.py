@@ -6,6 +6,7 @@ from django.db import models
 from django.db.models import Q
 from django.urls import reverse
 
+from characters.effect_index import effect_index
 from characters.models.core.ability_block import Ability
 from characters.models.mage.effect import Effect
 from characters.models.mage.focus import Instrument, Practice
@@ -323,17 +324,10 @@ class Grimoire(Wonder):
         if not self.spheres.exists():
             raise ValueError("Spheres must be determiend before rotes")
         if rotes is None:
-            effects = []
-
-            kwargs = {f"{sphere.property_name}__gt": 0 for sphere in self.spheres.all()}
-            q_objects = Q()
-            for key, value in kwargs.items():
-                q_objects |= Q(**{key: value})
-            effects = Effect.objects.filter(q_objects)
-
-            kwargs = {f"{sphere.property_name}__lte": self.rank for sphere in Sphere.objects.all()}
-            for key, value in kwargs.items():
-                effects = effects.filter(Q(**{key: value}))
+            # Effects using one of the grimoire's spheres, none above its rank
+            effects = effect_index.search(
+                max_sphere=self.rank, uses=[x.property_name for x in self.spheres.all()]
+            )
             num_rotes = self.rank
             if self.spheres.count() > 1:
                 num_rotes -= self.spheres.count() - 1
@@ -368,7 +362,8 @@ class Grimoire(Wonder):
                 if self.is_primer:
                     num_rotes -= 1
 
-            rotes = list(effects.order_by("?")[:num_rotes])
+            effects = random.sample(effects, min(num_rotes, len(effects)))
+            rotes = list(Effect.objects.filter(pk__in=effects))
             rotes = [Rote.objects.create(effect=x) for x in rotes]
             for x in rotes:
                 x.random(book=self)
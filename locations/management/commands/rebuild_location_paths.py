@@ -0,0 +1,66 @@
+"""
+Management command to rebuild materialized location paths.
+
+LocationModel.path is maintained by save() and by the post_delete handler in
+locations.signals. Run this once after adding the column to backfill existing
+locations, and after any parent changes made with queryset.update() or raw SQL.
+
+Usage:
+    python manage.py rebuild_location_paths
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Case, CharField, Value, When
+
+from locations.models.core.location import LocationModel
+
+
+class Command(BaseCommand):
+    help = "Recompute LocationModel.path from the parent hierarchy"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Locations to update per query (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        rows = LocationModel.objects.non_polymorphic().values_list("pk", "parent_id", "path")
+        parents = {}
+        stored = {}
+        for pk, parent_id, path in rows:
+            parents[pk] = parent_id
+            stored[pk] = path
+
+        paths = {}
+        for pk in parents:
+            # Walk up to the first location with a known path, then fill in on the way down
+            chain = []
+            node = pk
+            while node is not None and node not in paths and node not in chain:
+                chain.append(node)
+                node = parents.get(node)
+            if node in chain:
+                self.stderr.write(f"Parent cycle through location {node}; treating it as a root")
+                paths[node] = ""
+                chain = chain[: chain.index(node)]
+            for node in reversed(chain):
+                parent_id = parents[node]
+                paths[node] = "" if parent_id is None else f"{paths[parent_id]}{parent_id}/"
+
+        changed = [pk for pk, path in paths.items() if stored[pk] != path]
+        batch_size = options["batch_size"]
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start : start + batch_size]
+            LocationModel.objects.filter(pk__in=batch).update(
+                path=Case(
+                    *[When(pk=pk, then=Value(paths[pk])) for pk in batch],
+                    output_field=CharField(),
+                )
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt paths for {len(changed)} of {len(paths)} locations")
+        )
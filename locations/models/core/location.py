@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Substr
 from django.urls import reverse
 
 from characters.models.core import CharacterModel
@@ -14,6 +16,38 @@ class LocationQuerySet(ModelQuerySet):
         """Top-level locations (not contained within any other location)"""
         return self.filter(contained_within__isnull=True)
 
+    def subtree(self, root):
+        """A location and everything below it in the parent hierarchy"""
+        return self.filter(Q(pk=root.pk) | Q(path__startswith=root.descendant_prefix))
+
+    def as_tree(self):
+        """
+        Evaluate the queryset and link the results into a tree in Python.
+
+        Each location gets tree_children, a name-ordered list of its children
+        within the results. Locations whose parent is not in the results are
+        returned as the roots, so subtree(root).as_tree() is [root] and
+        filter(chronicle=...).as_tree() is a whole chronicle's hierarchy.
+
+        Returns:
+            list: Root locations ordered by name
+        """
+        locations = list(self)
+        by_pk = {location.pk: location for location in locations}
+        roots = []
+        for location in locations:
+            location.tree_children = []
+        for location in locations:
+            parent = by_pk.get(location.parent_id)
+            if parent is None:
+                roots.append(location)
+            else:
+                parent.tree_children.append(location)
+        for location in locations:
+            location.tree_children.sort(key=lambda child: child.name)
+        roots.sort(key=lambda root: root.name)
+        return roots
+
 
 # Create LocationModelManager from ModelManager to inherit polymorphic_ctype optimization
 LocationModelManager = ModelManager.from_queryset(LocationQuerySet)
@@ -35,6 +69,9 @@ class LocationModel(Model):
         related_name="contains",
     )
     owned_by = models.ForeignKey(CharacterModel, blank=True, null=True, on_delete=models.SET_NULL)
+    # Materialized ancestor ids along parent, root first: "12/40/" for a
+    # location whose parent is 40 and grandparent 12. Maintained by save().
+    path = models.CharField(max_length=1000, default="", blank=True, editable=False, db_index=True)
 
     gauntlet = models.IntegerField(default=7)
     shroud = models.IntegerField(default=7)
@@ -50,6 +87,27 @@ class LocationModel(Model):
     def get_absolute_url(self):
         return reverse("locations:location", args=[str(self.id)])
 
+    @property
+    def tree_depth(self):
+        """Number of ancestors above this location in the parent hierarchy"""
+        return self.path.count("/")
+
+    @property
+    def descendant_prefix(self):
+        """The path prefix shared by every location below this one"""
+        return f"{self.path}{self.pk}/"
+
+    def path_from_parent(self):
+        """Compute path from the parent's stored path (one query when there is a parent)."""
+        if self.parent_id is None:
+            return ""
+        parent_path = (
+            LocationModel.objects.filter(pk=self.parent_id)
+            .values_list("path", flat=True)
+            .first()
+        )
+        return f"{parent_path or ''}{self.parent_id}/"
+
     def get_update_url(self):
         return reverse("locations:update:location", args=[str(self.id)])
 
@@ -87,7 +145,27 @@ class LocationModel(Model):
         if self.creation_status < 0:
             errors["creation_status"] = "Creation status cannot be negative"
 
+        # Validate parent is not this location or one of its descendants
+        if self.pk is not None and str(self.pk) in self.path_from_parent().split("/"):
+            errors["parent"] = "A location cannot be contained within itself"
+
         if errors:
             raise ValidationError(errors)
 
-    # Note: save() method inherited from Model base class already calls full_clean()
+    def save(self, *args, **kwargs):
+        """Keep path current, moving the whole subtree along when the parent changes."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "parent" not in update_fields:
+            super().save(*args, **kwargs)
+            return
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "path"}
+
+        old_prefix = self.descendant_prefix if self.pk is not None else None
+        self.path = self.path_from_parent()
+        super().save(*args, **kwargs)  # Model.save() runs full_clean()
+
+        if old_prefix is not None and old_prefix != self.descendant_prefix:
+            LocationModel.objects.filter(path__startswith=old_prefix).update(
+                path=Concat(Value(self.descendant_prefix), Substr("path", len(old_prefix) + 1))
+            )
@@ -0,0 +1,19 @@
+from django.db.models.functions import Substr
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from locations.models.core.location import LocationModel
+
+
+@receiver(post_delete, sender=LocationModel)
+def reroot_orphaned_locations(sender, instance, **kwargs):
+    """
+    Drop a deleted location's ancestors from the paths below it.
+
+    Its children lose their parent (SET_NULL) without going through save(),
+    so the subtree's paths are rewritten here to start at those children.
+    """
+    prefix = instance.descendant_prefix
+    LocationModel.objects.filter(path__startswith=prefix).update(
+        path=Substr("path", len(prefix) + 1)
+    )
@@ -115,6 +115,77 @@ class TestLocationTopLevel(TestCase):
         self.assertNotIn(self.contained_location, top_level_qs)
 
 
+class TestLocationHierarchy(TestCase):
+    """Tests for the materialized parent path and the subtree()/as_tree() API."""
+
+    def setUp(self) -> None:
+        self.city = LocationModel.objects.create(name="City")
+        self.district = LocationModel.objects.create(name="District", parent=self.city)
+        self.bar = LocationModel.objects.create(name="Bar", parent=self.district)
+        self.alley = LocationModel.objects.create(name="Alley", parent=self.district)
+        self.elsewhere = LocationModel.objects.create(name="Elsewhere")
+
+    def refresh(self, *locations):
+        for location in locations:
+            location.refresh_from_db()
+
+    def test_path_records_ancestors(self):
+        self.assertEqual(self.city.path, "")
+        self.assertEqual(self.bar.path, f"{self.city.pk}/{self.district.pk}/")
+        self.assertEqual(self.bar.tree_depth, 2)
+
+    def test_subtree(self):
+        self.assertEqual(
+            set(LocationModel.objects.subtree(self.district)),
+            {self.district, self.bar, self.alley},
+        )
+
+    def test_as_tree_is_one_query(self):
+        with self.assertNumQueries(1):
+            roots = LocationModel.objects.non_polymorphic().as_tree()
+        self.assertEqual([root.name for root in roots], ["City", "Elsewhere"])
+        (district,) = roots[0].tree_children
+        self.assertEqual([child.name for child in district.tree_children], ["Alley", "Bar"])
+
+    def test_tree_sort_includes_children_of_other_types(self):
+        from core.utils import tree_sort
+        from locations.models.core.city import City
+
+        city = City.objects.create(name="Typed City")
+        bar = LocationModel.objects.create(name="Bar", parent=city)
+        self.assertEqual(tree_sort(city), [city, bar])
+
+    def test_reparent_moves_subtree(self):
+        self.district.parent = self.elsewhere
+        self.district.save()
+        self.refresh(self.bar)
+        self.assertEqual(self.bar.path, f"{self.elsewhere.pk}/{self.district.pk}/")
+        self.assertEqual(set(LocationModel.objects.subtree(self.city)), {self.city})
+
+    def test_parent_cannot_be_descendant(self):
+        from django.core.exceptions import ValidationError
+
+        self.city.parent = self.bar
+        with self.assertRaises(ValidationError):
+            self.city.save()
+
+    def test_delete_reroots_children(self):
+        self.district.delete()
+        self.refresh(self.bar)
+        self.assertIsNone(self.bar.parent)
+        self.assertEqual(self.bar.path, "")
+
+    def test_rebuild_command(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        LocationModel.objects.update(path="")
+        call_command("rebuild_location_paths", stdout=StringIO())
+        self.refresh(self.bar)
+        self.assertEqual(self.bar.path, f"{self.city.pk}/{self.district.pk}/")
+
+
 class TestLocationDetailView(TestCase):
     def setUp(self) -> None:
         self.user = User.objects.create_user(username="testuser", password="password")
@@ -12,4 +12,4 @@ rm -rf collected_static/
 yes yes | python manage.py collectstatic
 
 # Populate game data
-python manage.py populate_gamedata
+python manage.py populate_gamedata --write-snapshot
@@ -411,3 +411,8 @@ CHANNEL_LAYERS = {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
     }
 }
+
+# Seconds a scene chat connection stays listed as present without a heartbeat.
+# Clients send a heartbeat every SCENE_PRESENCE_HEARTBEAT seconds.
+SCENE_PRESENCE_TTL = 60
+SCENE_PRESENCE_HEARTBEAT = 20
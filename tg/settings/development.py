@@ -90,3 +90,17 @@ CACHES = {
         },
     }
 }
+
+# Channel Layers Configuration for Development
+# ============================================
+# The in-memory layer from base.py only reaches clients on the same process.
+# Set CHANNEL_REDIS_URL to share scene chat between several local workers.
+if os.environ.get("CHANNEL_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [os.environ["CHANNEL_REDIS_URL"]],
+            },
+        },
+    }
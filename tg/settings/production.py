@@ -248,7 +248,11 @@ CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
-            "hosts": [os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0")],
+            "hosts": [
+                os.environ.get(
+                    "CHANNEL_REDIS_URL", os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0")
+                )
+            ],
             "capacity": 1500,
             "expiry": 10,
         },